@@ -1,15 +1,27 @@
-class AttendancePolicy:
+from policy_engine import CompiledCurve, PenaltyRule
+
+
+class AttendancePolicy(PenaltyRule):
     DEFAULT_PENALTY = 3.0
+    BOOLEAN_INPUT = True
+
+    __slots__ = ("penalty_points",)
 
     def __init__(self, penalty_points: float = DEFAULT_PENALTY):
         if not isinstance(penalty_points, (int, float)):
             raise ValueError("Los puntos de penalización deben ser un número")
         if penalty_points < 0:
             raise ValueError("Los puntos de penalización no pueden ser negativos")
-        self.penalty_points = float(penalty_points)
+        object.__setattr__(self, "penalty_points", float(penalty_points))
+
+    def _params(self) -> tuple:
+        return (self.penalty_points,)
+
+    def compile(self) -> CompiledCurve:
+        # False (0.0) recibe la penalización completa; True (1.0) no recibe penalización.
+        return CompiledCurve(CompiledCurve.STEP, (1.0,), (self.penalty_points, 0.0))
 
     def calculate_penalty(self, hasReachedMinimumClasses: bool) -> float:
         if not isinstance(hasReachedMinimumClasses, bool):
             raise ValueError("hasReachedMinimumClasses debe ser un valor booleano")
         return 0.0 if hasReachedMinimumClasses else self.penalty_points
-
@@ -0,0 +1,313 @@
+import csv
+import json
+from collections import namedtuple
+from typing import Iterable, Iterator, TextIO
+import numpy as np
+from binary_gradebook import BinaryGradebook, BinaryGradebookWriter
+from evaluation_set import EvaluationSet
+from grade_calculator import GradeCalculator
+
+
+ParsedRow = namedtuple("ParsedRow", ["line_number", "raw", "student_id", "names", "grades", "weights", "hasReachedMinimumClasses"])
+ValidatedRow = namedtuple("ValidatedRow", ["line_number", "raw", "student_id", "evaluations", "hasReachedMinimumClasses"])
+ComputedRow = namedtuple("ComputedRow", ["line_number", "student_id", "details"])
+RejectedRow = namedtuple("RejectedRow", ["line_number", "raw", "error"])
+BatchSummary = namedtuple("BatchSummary", ["processed", "rejected"])
+
+
+class BatchGradeProcessor:
+    DEFAULT_BUFFER_SIZE = 1 << 20
+    OUTPUT_FIELDS = ("student_id", "weighted_average", "attendance_penalty", "extra_points", "final_grade")
+    REJECT_FIELDS = ("line_number", "error", "raw")
+    TRUE_VALUES = ("s", "si", "sí", "true", "1", "yes", "y")
+    FALSE_VALUES = ("n", "no", "false", "0")
+    BINARY_EXTENSION = ".grdb"
+    BINARY_CHUNK_SIZE = 65536
+
+    def __init__(self, calculator: GradeCalculator, buffer_size: int = DEFAULT_BUFFER_SIZE):
+        if not isinstance(calculator, GradeCalculator):
+            raise ValueError("calculator debe ser una instancia de GradeCalculator")
+        if not isinstance(buffer_size, int) or buffer_size <= 0:
+            raise ValueError("buffer_size debe ser un entero positivo")
+
+        self.calculator = calculator
+        self.buffer_size = buffer_size
+
+    def process_file(self, input_path: str, output_path: str, rejects_path: str) -> BatchSummary:
+        input_format = self._detect_format(input_path)
+        output_format = self._detect_format(output_path)
+        if input_format == "binary":
+            return self.process_binary(input_path, output_path, output_format, rejects_path)
+        if output_format == "binary":
+            return self.convert_to_binary(input_path, output_path, rejects_path)
+
+        # Con surrogateescape los bytes que no son UTF-8 no cortan la lectura: la fila se rechaza y se copia
+        # tal cual al archivo de rechazos.
+        with open(input_path, "r", encoding="utf-8", errors="surrogateescape", newline="") as input_file, \
+                open(output_path, "w", encoding="utf-8", newline="", buffering=self.buffer_size) as output_file, \
+                open(rejects_path, "w", encoding="utf-8", errors="surrogateescape", newline="",
+                     buffering=self.buffer_size) as rejects_file:
+            return self.process(input_file, input_format, output_file, output_format, rejects_file)
+
+    def process(self, input_file: TextIO, input_format: str, output_file: TextIO, output_format: str,
+                rejects_file: TextIO) -> BatchSummary:
+        rows = self.read_csv(input_file) if input_format == "csv" else self.read_jsonl(input_file)
+        results = self.compute(self.validate(rows))
+        return self.write(results, output_file, output_format, rejects_file)
+
+    def process_binary(self, input_path: str, output_path: str, output_format: str, rejects_path: str) -> BatchSummary:
+        # El archivo binario ya está validado por registro: se calcula por tramos del mmap y cada tramo se
+        # escribe antes de leer el siguiente, así la memoria no crece con la cohorte.
+        processed = 0
+        with BinaryGradebook(input_path) as gradebook, \
+                open(output_path, "w", encoding="utf-8", newline="", buffering=self.buffer_size) as output_file, \
+                open(rejects_path, "w", encoding="utf-8", newline="") as rejects_file:
+            csv.writer(rejects_file).writerow(self.REJECT_FIELDS)
+            if output_format == "csv":
+                output_writer = csv.writer(output_file)
+                output_writer.writerow(self.OUTPUT_FIELDS)
+            for student_ids, details in gradebook.iter_details(self.calculator, self.BINARY_CHUNK_SIZE):
+                columns = zip(student_ids, details.weighted_average.tolist(), details.attendance_penalty.tolist(),
+                              details.extra_points.tolist(), details.final_grade.tolist())
+                if output_format == "csv":
+                    output_writer.writerows(columns)
+                else:
+                    for values in columns:
+                        output_file.write(json.dumps(dict(zip(self.OUTPUT_FIELDS, values)), ensure_ascii=False))
+                        output_file.write("\n")
+                processed += len(student_ids)
+
+        return BatchSummary(processed, 0)
+
+    def convert_to_binary(self, input_path: str, output_path: str, rejects_path: str, course: str = "",
+                          id_width: int = BinaryGradebookWriter.DEFAULT_ID_WIDTH) -> BatchSummary:
+        input_format = self._detect_format(input_path)
+        with open(input_path, "r", encoding="utf-8", errors="surrogateescape", newline="") as input_file, \
+                open(rejects_path, "w", encoding="utf-8", errors="surrogateescape", newline="",
+                     buffering=self.buffer_size) as rejects_file:
+            rows = self.read_csv(input_file) if input_format == "csv" else self.read_jsonl(input_file)
+            return self._write_binary(self.validate(rows), output_path, rejects_file, course, id_width)
+
+    def _write_binary(self, rows: Iterable, output_path: str, rejects_file: TextIO, course: str,
+                      id_width: int) -> BatchSummary:
+        rejects_writer = csv.writer(rejects_file)
+        rejects_writer.writerow(self.REJECT_FIELDS)
+        writer = None
+        pending = []
+        processed = 0
+        rejected = 0
+
+        try:
+            for row in rows:
+                if not isinstance(row, RejectedRow):
+                    if writer is None:
+                        # El esquema del curso lo define la primera fila válida.
+                        writer = BinaryGradebookWriter(output_path, row.evaluations.names, course, id_width,
+                                                       self.calculator.max_evaluations)
+                    row = self._check_binary_row(row, writer)
+                if isinstance(row, RejectedRow):
+                    rejects_writer.writerow((row.line_number, row.error, row.raw))
+                    rejected += 1
+                    continue
+
+                pending.append(row)
+                if len(pending) >= self.BINARY_CHUNK_SIZE:
+                    processed += self._flush_binary(writer, pending)
+            if writer is None:
+                raise ValueError("No hay filas válidas para convertir")
+            processed += self._flush_binary(writer, pending)
+        finally:
+            if writer is not None:
+                writer.close()
+
+        return BatchSummary(processed, rejected)
+
+    def _check_binary_row(self, row: ValidatedRow, writer: BinaryGradebookWriter):
+        if len(row.evaluations) != len(writer.evaluation_names):
+            return RejectedRow(row.line_number, row.raw, f"La fila debe tener {len(writer.evaluation_names)} evaluaciones")
+        if len(row.student_id.encode("utf-8")) > writer.id_width:
+            return RejectedRow(row.line_number, row.raw,
+                               f"El codigo del estudiante debe tener entre 1 y {writer.id_width} bytes")
+        return row
+
+    def _flush_binary(self, writer: BinaryGradebookWriter, pending: list) -> int:
+        if not pending:
+            return 0
+        writer.write_batch(
+            [row.student_id for row in pending],
+            [row.evaluations.grades for row in pending],
+            [row.evaluations.weights for row in pending],
+            np.array([row.hasReachedMinimumClasses for row in pending], dtype=bool)
+        )
+        written = len(pending)
+        pending.clear()
+        return written
+
+    def read_csv(self, input_file: TextIO) -> Iterator:
+        # Se guardan las líneas que consume el lector para rechazar la fila con su texto original.
+        consumed = []
+
+        def lines():
+            for line in input_file:
+                consumed.append(line)
+                yield line
+
+        reader = csv.reader(lines())
+        while True:
+            try:
+                fields = next(reader)
+                error = None
+            except StopIteration:
+                return
+            except csv.Error as csv_error:
+                fields, error = None, f"CSV inválido: {csv_error}"
+            line_number = reader.line_num
+            raw = "".join(consumed).rstrip("\r\n")
+            consumed.clear()
+            if error is not None:
+                yield RejectedRow(line_number, raw, error)
+                continue
+            if not fields or (line_number == 1 and fields[0].strip().lower() == "student_id"):
+                continue
+            try:
+                self._check_encoding(raw)
+                yield self._parse_csv_fields(line_number, raw, fields)
+            except ValueError as error:
+                yield RejectedRow(line_number, raw, str(error))
+
+    def read_jsonl(self, input_file: TextIO) -> Iterator:
+        for line_number, line in enumerate(input_file, 1):
+            raw = line.rstrip("\r\n")
+            if not raw.strip():
+                continue
+            try:
+                self._check_encoding(raw)
+                yield self._parse_json_record(line_number, raw)
+            except ValueError as error:
+                yield RejectedRow(line_number, raw, str(error))
+
+    def _check_encoding(self, raw: str) -> None:
+        # Los bytes inválidos llegan como sustitutos (surrogateescape), que no se pueden codificar.
+        try:
+            raw.encode("utf-8")
+        except UnicodeEncodeError:
+            raise ValueError("La línea no es UTF-8 válido")
+
+    def validate(self, rows: Iterable) -> Iterator:
+        for row in rows:
+            if isinstance(row, RejectedRow):
+                yield row
+                continue
+            try:
+                evaluations = EvaluationSet(row.names, row.grades, row.weights)
+            except ValueError as error:
+                yield RejectedRow(row.line_number, row.raw, str(error))
+                continue
+            yield ValidatedRow(row.line_number, row.raw, row.student_id, evaluations, row.hasReachedMinimumClasses)
+
+    def compute(self, rows: Iterable) -> Iterator:
+        for row in rows:
+            if isinstance(row, RejectedRow):
+                yield row
+                continue
+            try:
+                details = self.calculator.get_calculation_details(row.evaluations, row.hasReachedMinimumClasses)
+            except ValueError as error:
+                yield RejectedRow(row.line_number, row.raw, str(error))
+                continue
+            yield ComputedRow(row.line_number, row.student_id, details)
+
+    def write(self, results: Iterable, output_file: TextIO, output_format: str, rejects_file: TextIO) -> BatchSummary:
+        rejects_writer = csv.writer(rejects_file)
+        rejects_writer.writerow(self.REJECT_FIELDS)
+        if output_format == "csv":
+            output_writer = csv.writer(output_file)
+            output_writer.writerow(self.OUTPUT_FIELDS)
+
+        processed = 0
+        rejected = 0
+        for result in results:
+            if isinstance(result, RejectedRow):
+                rejects_writer.writerow((result.line_number, result.error, result.raw))
+                rejected += 1
+                continue
+            values = (
+                result.student_id,
+                result.details.weighted_average,
+                result.details.attendance_penalty,
+                result.details.extra_points,
+                result.details.final_grade
+            )
+            if output_format == "csv":
+                output_writer.writerow(values)
+            else:
+                output_file.write(json.dumps(dict(zip(self.OUTPUT_FIELDS, values)), ensure_ascii=False))
+                output_file.write("\n")
+            processed += 1
+
+        return BatchSummary(processed, rejected)
+
+    def _parse_csv_fields(self, line_number: int, raw: str, fields: list) -> ParsedRow:
+        if len(fields) < 4 or len(fields) % 2 != 0:
+            raise ValueError("La fila debe tener student_id, asistencia y pares nota,peso")
+
+        student_id = self._parse_student_id(fields[0])
+        hasReachedMinimumClasses = self._parse_attendance(fields[1])
+        values = fields[2:]
+        grades = [self._parse_number(value, "La nota debe ser un número") for value in values[0::2]]
+        weights = [self._parse_number(value, "El peso debe ser un número") for value in values[1::2]]
+        names = [f"Evaluación {i + 1}" for i in range(len(grades))]
+
+        return ParsedRow(line_number, raw, student_id, names, grades, weights, hasReachedMinimumClasses)
+
+    def _parse_json_record(self, line_number: int, raw: str) -> ParsedRow:
+        try:
+            record = json.loads(raw)
+        except json.JSONDecodeError as error:
+            raise ValueError(f"JSON inválido: {error.msg}")
+        if not isinstance(record, dict):
+            raise ValueError("Cada línea debe ser un objeto JSON")
+
+        student_id = self._parse_student_id(record.get("student_id"))
+        hasReachedMinimumClasses = self._parse_attendance(record.get("hasReachedMinimumClasses"))
+        evaluations = record.get("evaluations")
+        if not isinstance(evaluations, list):
+            raise ValueError("evaluations debe ser una lista")
+
+        names, grades, weights = [], [], []
+        for i, evaluation in enumerate(evaluations):
+            if not isinstance(evaluation, dict):
+                raise ValueError("Cada evaluación debe ser un objeto JSON")
+            names.append(evaluation.get("name") or f"Evaluación {i + 1}")
+            grades.append(self._parse_number(evaluation.get("grade"), "La nota debe ser un número"))
+            weights.append(self._parse_number(evaluation.get("weight"), "El peso debe ser un número"))
+
+        return ParsedRow(line_number, raw, student_id, names, grades, weights, hasReachedMinimumClasses)
+
+    def _parse_student_id(self, value) -> str:
+        if value is None or not str(value).strip():
+            raise ValueError("El codigo del estudiante no puede estar vacio")
+        return str(value).strip()
+
+    def _parse_attendance(self, value) -> bool:
+        if isinstance(value, bool):
+            return value
+        text = str(value).strip().lower()
+        if text in self.TRUE_VALUES:
+            return True
+        if text in self.FALSE_VALUES:
+            return False
+        raise ValueError("hasReachedMinimumClasses debe ser un valor booleano")
+
+    def _parse_number(self, value, message: str) -> float:
+        if isinstance(value, bool):
+            raise ValueError(message)
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            raise ValueError(message)
+
+    def _detect_format(self, path: str) -> str:
+        if path.lower().endswith(self.BINARY_EXTENSION):
+            return "binary"
+        return "jsonl" if path.lower().endswith((".jsonl", ".ndjson")) else "csv"
@@ -0,0 +1,78 @@
+"""
+Benchmark de throughput: cálculo por estudiante vs. cálculo vectorizado por cohorte.
+Compara calculate_final_grade en un bucle con calculate_final_grades_batch.
+"""
+
+import argparse
+import time
+import numpy as np
+from evaluation import Evaluation
+from attendance_policy import AttendancePolicy
+from extra_points_policy import ExtraPointsPolicy
+from grade_calculator import GradeCalculator
+
+
+def generate_cohort(num_students: int, num_evaluations: int, seed: int = 42):
+    """
+    Genera una cohorte sintética reproducible.
+
+    Returns:
+        tuple: (grades, weights, attendance) como arreglos NumPy
+    """
+    rng = np.random.default_rng(seed)
+    grades = np.round(rng.uniform(Evaluation.MIN_GRADE, Evaluation.MAX_GRADE, (num_students, num_evaluations)), 2)
+    weights = np.full(num_evaluations, round(1.0 / num_evaluations, 4))
+    attendance = rng.random(num_students) < 0.85
+    return grades, weights, attendance
+
+
+def run_scalar(calculator: GradeCalculator, grades, weights, attendance) -> list:
+    """Calcula la cohorte estudiante por estudiante con la ruta escalar."""
+    weight_list = weights.tolist()
+    results = []
+    for row, reached in zip(grades.tolist(), attendance.tolist()):
+        evaluations = [
+            Evaluation(f"Evaluación {i + 1}", grade, weight)
+            for i, (grade, weight) in enumerate(zip(row, weight_list))
+        ]
+        results.append(calculator.calculate_final_grade(evaluations, reached))
+    return results
+
+
+def run_benchmark(num_students: int, num_evaluations: int) -> bool:
+    """Ejecuta la comparación y verifica que ambas rutas coincidan."""
+    calculator = GradeCalculator(AttendancePolicy(3.0), ExtraPointsPolicy(True, 2.0))
+    grades, weights, attendance = generate_cohort(num_students, num_evaluations)
+
+    print("=" * 70)
+    print("BENCHMARK - CÁLCULO POR COHORTE")
+    print(f"Estudiantes: {num_students}  Evaluaciones: {num_evaluations}")
+    print("=" * 70)
+
+    start = time.perf_counter()
+    scalar_results = run_scalar(calculator, grades, weights, attendance)
+    scalar_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch_results = calculator.calculate_final_grades_batch(grades, weights, attendance)
+    batch_time = time.perf_counter() - start
+
+    identical = batch_results.tolist() == scalar_results
+
+    print(f"  Bucle por estudiante: {scalar_time:8.3f} s  ({num_students / scalar_time:12,.0f} estudiantes/s)")
+    print(f"  Lote vectorizado:     {batch_time:8.3f} s  ({num_students / batch_time:12,.0f} estudiantes/s)")
+    print(f"  Aceleración:          {scalar_time / batch_time:8.1f}x")
+    print(f"  Resultados idénticos: {'SI' if identical else 'NO'}")
+    print("=" * 70)
+
+    return identical
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compara el cálculo escalar y el cálculo por lote.")
+    parser.add_argument("--students", type=int, default=100_000)
+    parser.add_argument("--evaluations", type=int, default=GradeCalculator.MAX_EVALUATIONS)
+    args = parser.parse_args()
+
+    success = run_benchmark(args.students, args.evaluations)
+    exit(0 if success else 1)
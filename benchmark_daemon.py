@@ -0,0 +1,122 @@
+"""
+Benchmark del daemon: latencia por solicitud de invocaciones en frío de `python main.py --request`
+frente al cliente liviano y a una conexión persistente contra el daemon residente (socket Unix).
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List
+from grade_client import GradeClient
+from performance_test import summarize
+
+
+REQUEST = {
+    "hasReachedMinimumClasses": True,
+    "evaluations": [
+        {"name": "Parcial 1", "grade": 15.0, "weight": 0.3},
+        {"name": "Parcial 2", "grade": 16.5, "weight": 0.3},
+        {"name": "Final", "grade": 14.0, "weight": 0.4}
+    ]
+}
+REQUEST_LINE = json.dumps(REQUEST, separators=(",", ":"))
+
+
+def start_daemon(path: str) -> subprocess.Popen:
+    """Inicia `main.py --daemon` y espera a que responda un ping."""
+    process = subprocess.Popen([sys.executable, "main.py", "--daemon", path, "--teachers-agree"],
+                               stdout=subprocess.DEVNULL)
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        try:
+            with GradeClient(path) as client:
+                client.request({"op": "ping"})
+                return process
+        except OSError:
+            time.sleep(0.05)
+    process.terminate()
+    raise RuntimeError("El daemon no respondió a tiempo")
+
+
+def time_processes(command: List[str], runs: int) -> List[int]:
+    """Latencia de cada invocación completa de un proceso nuevo, en ns."""
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter_ns()
+        completed = subprocess.run(command, stdout=subprocess.PIPE, check=True)
+        samples.append(time.perf_counter_ns() - start)
+        if not json.loads(completed.stdout)["ok"]:
+            raise RuntimeError("Respuesta con error")
+    return samples
+
+
+def run_benchmark(cold_runs: int, warm_requests: int) -> bool:
+    """Compara las cuatro formas de pedir una nota y verifica que todas coincidan."""
+    expected = json.loads(subprocess.run([sys.executable, "main.py", "--request", REQUEST_LINE, "--teachers-agree"],
+                                         stdout=subprocess.PIPE, check=True).stdout)["final_grade"]
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "grades.sock")
+        process = start_daemon(path)
+        try:
+            start = time.perf_counter_ns()
+            cold = time_processes([sys.executable, "main.py", "--request", REQUEST_LINE, "--teachers-agree"], cold_runs)
+            cold_elapsed = time.perf_counter_ns() - start
+
+            start = time.perf_counter_ns()
+            thin = time_processes([sys.executable, "grade_client.py", "--socket", path, REQUEST_LINE], cold_runs)
+            thin_elapsed = time.perf_counter_ns() - start
+
+            with GradeClient(path) as client:
+                warm = []
+                results = set()
+                start = time.perf_counter_ns()
+                for _ in range(warm_requests):
+                    request_start = time.perf_counter_ns()
+                    results.add(client.request(REQUEST)["final_grade"])
+                    warm.append(time.perf_counter_ns() - request_start)
+                warm_elapsed = time.perf_counter_ns() - start
+
+                start = time.perf_counter_ns()
+                responses = client.request_many([REQUEST] * warm_requests)
+                pipelined_elapsed = time.perf_counter_ns() - start
+                results.update(response["final_grade"] for response in responses)
+        finally:
+            process.terminate()
+            process.wait()
+
+    rows = [
+        ("python main.py --request (frío)", summarize(cold, cold_elapsed)),
+        ("python grade_client.py", summarize(thin, thin_elapsed)),
+        ("Conexión persistente", summarize(warm, warm_elapsed)),
+    ]
+    identical = results == {expected}
+
+    print("=" * 78)
+    print("BENCHMARK - DAEMON DE CÁLCULO (SOCKET UNIX)")
+    print(f"Invocaciones en frío: {cold_runs}  Solicitudes en caliente: {warm_requests}")
+    print("=" * 78)
+    for label, summary in rows:
+        print(f"  {label:32} p50={summary['p50_ms']:9.3f} ms  p95={summary['p95_ms']:9.3f} ms  "
+              f"{summary['throughput_rps']:10,.0f} req/s")
+    print(f"  {'Pipelining (una conexión)':32} {pipelined_elapsed / warm_requests / 1e6:13.3f} ms/sol  "
+          f"{warm_requests / (pipelined_elapsed / 1e9):10,.0f} req/s")
+    print(f"  Aceleración en caliente vs. frío: {rows[0][1]['p50_ms'] / rows[2][1]['p50_ms']:,.0f}x (p50)")
+    print(f"  Resultados idénticos: {'SI' if identical else 'NO'}")
+    print("=" * 78)
+
+    return identical
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compara invocaciones en frío con el daemon residente.")
+    parser.add_argument("--cold-runs", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=10_000, help="Solicitudes contra el daemon en caliente")
+    args = parser.parse_args()
+
+    success = run_benchmark(args.cold_runs, args.requests)
+    exit(0 if success else 1)
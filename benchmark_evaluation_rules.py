@@ -0,0 +1,77 @@
+"""
+Benchmark de reglas de evaluaciones: costo del cálculo por cohorte según el número de evaluaciones,
+sin reglas, con "descartar las N más bajas" por selección parcial y con un orden completo por estudiante.
+"""
+
+import argparse
+import time
+import numpy as np
+from evaluation import Evaluation
+from attendance_policy import AttendancePolicy
+from extra_points_policy import ExtraPointsPolicy
+from grade_calculator import GradeCalculator
+from evaluation_rules import DropLowestRule, EvaluationRuleEngine
+
+
+def sorted_keep_mask(grades: np.ndarray, drop: int) -> np.ndarray:
+    """Referencia con orden completo por fila: conserva las mejores y, en empates, las primeras."""
+    order = np.argsort(-grades, axis=1, kind="stable")
+    mask = np.zeros(grades.shape, dtype=bool)
+    np.put_along_axis(mask, order[:, :grades.shape[1] - drop], True, axis=1)
+    return mask
+
+
+def run_benchmark(num_students: int, evaluation_counts, drop: int) -> bool:
+    """Mide cada configuración y verifica que la selección parcial coincida con el orden completo."""
+    rng = np.random.default_rng(21)
+    rule = DropLowestRule(drop)
+    all_match = True
+
+    print("=" * 78)
+    print("BENCHMARK - REGLAS DE EVALUACIONES (DESCARTAR LAS MÁS BAJAS)")
+    print(f"Estudiantes: {num_students}  Evaluaciones descartadas: {drop}")
+    print("=" * 78)
+    print(f"  {'Evaluaciones':>12}  {'Sin reglas':>12}  {'Con regla':>12}  {'Selección':>12}  {'Orden completo':>14}")
+
+    for num_evaluations in evaluation_counts:
+        calculator = GradeCalculator(AttendancePolicy(3.0), ExtraPointsPolicy(True, 2.0),
+                                     max_evaluations=num_evaluations)
+        engine = EvaluationRuleEngine(calculator, [rule])
+        grades = np.round(rng.uniform(Evaluation.MIN_GRADE, Evaluation.MAX_GRADE, (num_students, num_evaluations)))
+        weights = np.full(num_evaluations, 1.0 / num_evaluations)
+        attendance = rng.random(num_students) < 0.85
+
+        start = time.perf_counter()
+        calculator.calculate_final_grades_batch(grades, weights, attendance)
+        plain_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        engine.calculate_final_grades_batch(grades, weights, attendance)
+        rule_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        partial = rule.keep_mask_batch(grades)
+        selection_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        reference = sorted_keep_mask(grades, drop)
+        sort_time = time.perf_counter() - start
+
+        all_match = all_match and np.array_equal(partial, reference)
+        print(f"  {num_evaluations:>12}  {plain_time:>10.3f} s  {rule_time:>10.3f} s  {selection_time:>10.3f} s  "
+              f"{sort_time:>12.3f} s")
+
+    print(f"  Selección parcial idéntica al orden completo: {'SI' if all_match else 'NO'}")
+    print("=" * 78)
+    return all_match
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mide el costo de las reglas de evaluaciones según su número.")
+    parser.add_argument("--students", type=int, default=20_000)
+    parser.add_argument("--evaluations", type=int, nargs="+", default=[10, 30, 100, 200])
+    parser.add_argument("--drop", type=int, default=3)
+    args = parser.parse_args()
+
+    success = run_benchmark(args.students, args.evaluations, args.drop)
+    exit(0 if success else 1)
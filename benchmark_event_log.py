@@ -0,0 +1,132 @@
+"""
+Benchmark del log de eventos: reconstrucción de notas finales recorriendo todo el historial con
+GradeCalculator frente a la reproducción diferida del log, desde el inicio y desde la instantánea más cercana.
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from attendance_policy import AttendancePolicy
+from extra_points_policy import ExtraPointsPolicy
+from evaluation import Evaluation
+from grade_calculator import GradeCalculator
+from policy_engine import PenaltyRule
+from grade_event_log import EVALUATION_ADDED, GRADE_CORRECTED, POLICY_CHANGED, GradeEventLog
+
+
+def build_log(path: str, num_students: int, num_evaluations: int, num_events: int,
+              snapshot_interval: int) -> GradeEventLog:
+    """Registra la cohorte y luego correcciones, cambios de asistencia y algún cambio de política."""
+    calculator = GradeCalculator(AttendancePolicy(3.0), ExtraPointsPolicy(True, 2.0))
+    log = GradeEventLog(path, calculator, snapshot_interval)
+    rng = random.Random(42)
+    weight = round(1.0 / num_evaluations, 4)
+    for student in range(num_students):
+        for evaluation in range(num_evaluations):
+            log.add_evaluation(f"S{student:07d}", f"Evaluación {evaluation + 1}", round(rng.uniform(0, 20), 2), weight)
+    while len(log) < num_events:
+        student_id = f"S{rng.randrange(num_students):07d}"
+        choice = rng.random()
+        if choice < 0.8:
+            log.correct_grade(student_id, f"Evaluación {rng.randrange(num_evaluations) + 1}", round(rng.uniform(0, 20), 2))
+        elif choice < 0.99999:
+            log.set_attendance(student_id, rng.random() < 0.85)
+        else:
+            log.set_policy(ExtraPointsPolicy(rng.random() < 0.5, 2.0))
+    return log
+
+
+def rebuild_with_calculator(log: GradeEventLog, until_sequence: int) -> dict:
+    """Recorre todo el historial y recalcula con GradeCalculator al estudiante de cada evento."""
+    calculator = log.calculator
+    students, attendance, final_grades = {}, {}, {}
+    for event in log.iter_events():
+        if event.sequence > until_sequence:
+            break
+        if event.kind == POLICY_CHANGED:
+            policies = (event.value, calculator.extra_points_policy) if isinstance(event.value, PenaltyRule) \
+                else (calculator.attendance_policy, event.value)
+            calculator = GradeCalculator(*policies)
+            for student_id, evaluations in students.items():
+                final_grades[student_id] = calculator.calculate_final_grade(
+                    list(evaluations.values()), attendance.get(student_id, True))
+            continue
+        evaluations = students.setdefault(event.student_id, {})
+        if event.kind == EVALUATION_ADDED:
+            evaluations[event.name] = Evaluation(event.name, *event.value)
+        elif event.kind == GRADE_CORRECTED:
+            evaluations[event.name] = Evaluation(event.name, event.value, evaluations[event.name].weight)
+        else:
+            attendance[event.student_id] = event.value
+        if evaluations:
+            final_grades[event.student_id] = calculator.calculate_final_grade(
+                list(evaluations.values()), attendance.get(event.student_id, True))
+    return final_grades
+
+
+def time_replay(log: GradeEventLog, until_sequence: int, from_snapshot: bool):
+    """Reproduce el log hasta una secuencia y devuelve (estado, segundos)."""
+    start = time.perf_counter()
+    state = log.replay(until_sequence=until_sequence, from_snapshot=from_snapshot)
+    return state, time.perf_counter() - start
+
+
+def run_benchmark(num_students: int, num_evaluations: int, num_events: int, snapshot_interval: int) -> bool:
+    """Compara las tres formas de reconstruir el estado y verifica que coincidan."""
+    print("=" * 70)
+    print("BENCHMARK - LOG DE EVENTOS CON INSTANTÁNEAS")
+    print(f"Estudiantes: {num_students}  Evaluaciones: {num_evaluations}  Eventos: {num_events}  "
+          f"Instantánea cada: {snapshot_interval}")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "grades.log")
+        start = time.perf_counter()
+        log = build_log(path, num_students, num_evaluations, num_events, snapshot_interval)
+        append_rate = len(log) / (time.perf_counter() - start)
+        total_events = len(log)
+        log_size = os.path.getsize(path)
+
+        with log:
+            rows = []
+            consistent = True
+            # Un punto intermedio (lejos de una instantánea) y el final del log.
+            for until in (total_events - snapshot_interval // 2, total_events):
+                start = time.perf_counter()
+                expected = rebuild_with_calculator(log, until)
+                full_history = time.perf_counter() - start
+
+                from_start, from_start_time = time_replay(log, until, from_snapshot=False)
+                from_snapshot, from_snapshot_time = time_replay(log, until, from_snapshot=True)
+
+                consistent = consistent and from_start.final_grades() == expected == from_snapshot.final_grades()
+                rows.append((until, full_history, from_start, from_start_time, from_snapshot, from_snapshot_time))
+
+    print(f"  Escritura del log:      {append_rate:12,.0f} eventos/s  ({log_size / 1e6:.1f} MB)")
+    for until, full_history, from_start, from_start_time, from_snapshot, from_snapshot_time in rows:
+        snapshot_events = until - (until // snapshot_interval) * snapshot_interval
+        print(f"  Estado a la secuencia {until}:")
+        print(f"    {'GradeCalculator por evento':28} {full_history:8.3f} s  {until / full_history:12,.0f} eventos/s")
+        print(f"    {'Reproducción desde el inicio':28} {from_start_time:8.3f} s  {until / from_start_time:12,.0f} eventos/s  "
+              f"({from_start.recomputed:,} recalculados)")
+        rate = f"{snapshot_events / from_snapshot_time:12,.0f} eventos/s" if snapshot_events else f"{'-':>12} eventos/s"
+        print(f"    {'Desde la instantánea':28} {from_snapshot_time:8.3f} s  {rate}  "
+              f"({snapshot_events:,} eventos posteriores, {from_snapshot.recomputed:,} recalculados)")
+    print(f"  Resultados idénticos:   {'SI' if consistent else 'NO'}")
+    print("=" * 70)
+
+    return consistent
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mide la reproducción del log de eventos de notas.")
+    parser.add_argument("--students", type=int, default=20_000)
+    parser.add_argument("--evaluations", type=int, default=5)
+    parser.add_argument("--events", type=int, default=500_000)
+    parser.add_argument("--snapshot-interval", type=int, default=GradeEventLog.DEFAULT_SNAPSHOT_INTERVAL)
+    args = parser.parse_args()
+
+    success = run_benchmark(args.students, args.evaluations, args.events, args.snapshot_interval)
+    exit(0 if success else 1)
@@ -0,0 +1,80 @@
+"""
+Benchmark del modo de punto fijo: lote en float vs. lote entero (int64) en centésimos y puntos básicos.
+Verifica además que el resultado entero no cambie al repartir la cohorte en particiones.
+"""
+
+import argparse
+import time
+import numpy as np
+from attendance_policy import AttendancePolicy
+from extra_points_policy import ExtraPointsPolicy
+from grade_calculator import GradeCalculator
+from fixed_point_calculator import FixedPointGradeCalculator, to_basis_points, to_hundredths
+from benchmark_batch import generate_cohort
+
+
+def median_time(function, repeats: int) -> float:
+    """Mediana de varias ejecuciones de la función."""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings))
+
+
+def run_partitioned(calculator: FixedPointGradeCalculator, grades, weights, attendance, partitions: int) -> np.ndarray:
+    """Calcula la cohorte barajada y repartida en particiones, y la reordena al final."""
+    order = np.random.default_rng(7).permutation(grades.shape[0])
+    results = np.empty(grades.shape[0], dtype=np.int64)
+    for shard in np.array_split(order, partitions):
+        results[shard] = calculator.calculate_final_grades_fixed(grades[shard], weights, attendance[shard])
+    return results
+
+
+def run_benchmark(num_students: int, num_evaluations: int, partitions: int, repeats: int) -> bool:
+    """Compara ambas rutas y verifica la invariancia ante particiones."""
+    policies = (AttendancePolicy(3.0), ExtraPointsPolicy(True, 2.0))
+    float_calculator = GradeCalculator(*policies)
+    fixed_calculator = FixedPointGradeCalculator(*policies)
+    grades, weights, attendance = generate_cohort(num_students, num_evaluations)
+    grades_hundredths = to_hundredths(grades)
+    weights_basis_points = to_basis_points(weights)
+
+    print("=" * 70)
+    print("BENCHMARK - MODO DE PUNTO FIJO")
+    print(f"Estudiantes: {num_students}  Evaluaciones: {num_evaluations}  Particiones: {partitions}")
+    print("=" * 70)
+
+    float_time = median_time(
+        lambda: float_calculator.calculate_final_grades_batch(grades, weights, attendance), repeats)
+    fixed_time = median_time(
+        lambda: fixed_calculator.calculate_final_grades_fixed(grades_hundredths, weights_basis_points, attendance),
+        repeats)
+
+    full = fixed_calculator.calculate_final_grades_fixed(grades_hundredths, weights_basis_points, attendance)
+    partitioned = run_partitioned(fixed_calculator, grades_hundredths, weights_basis_points, attendance, partitions)
+    invariant = np.array_equal(full, partitioned)
+    float_differences = int(np.count_nonzero(
+        float_calculator.calculate_final_grades_batch(grades, weights, attendance) != full / 100))
+
+    print(f"  Lote float:                 {float_time:8.3f} s  ({num_students / float_time:12,.0f} estudiantes/s)")
+    print(f"  Lote entero (int64):        {fixed_time:8.3f} s  ({num_students / fixed_time:12,.0f} estudiantes/s)")
+    print(f"  Aceleración:                {float_time / fixed_time:8.2f}x")
+    print(f"  Difieren del modo float:    {float_differences:8d}  (empates redondeados hacia arriba)")
+    print(f"  Invariante a particiones:   {'SI' if invariant else 'NO'}")
+    print("=" * 70)
+
+    return invariant
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compara el lote en float con el lote entero de punto fijo.")
+    parser.add_argument("--students", type=int, default=1_000_000)
+    parser.add_argument("--evaluations", type=int, default=5)
+    parser.add_argument("--partitions", type=int, default=8)
+    parser.add_argument("--repeats", type=int, default=7)
+    args = parser.parse_args()
+
+    success = run_benchmark(args.students, args.evaluations, args.partitions, args.repeats)
+    exit(0 if success else 1)
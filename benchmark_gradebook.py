@@ -0,0 +1,82 @@
+"""
+Benchmark del formato binario: cierre de término desde CSV vs. desde el archivo mapeado en memoria.
+Compara el parseo de texto con las vistas sin copia de BinaryGradebook.
+"""
+
+import argparse
+import csv
+import os
+import tempfile
+import time
+from attendance_policy import AttendancePolicy
+from extra_points_policy import ExtraPointsPolicy
+from grade_calculator import GradeCalculator
+from batch_processor import BatchGradeProcessor
+from binary_gradebook import BinaryGradebook, BinaryGradebookWriter
+from benchmark_batch import generate_cohort
+
+
+def write_csv(path: str, grades, weights, attendance) -> None:
+    """Escribe la cohorte en el formato CSV del modo por lotes."""
+    weight_list = weights.tolist()
+    with open(path, "w", encoding="utf-8", newline="") as output:
+        writer = csv.writer(output)
+        for index, (row, reached) in enumerate(zip(grades.tolist(), attendance.tolist())):
+            values = [value for pair in zip(row, weight_list) for value in pair]
+            writer.writerow([f"S{index:07d}", "si" if reached else "no"] + values)
+
+
+def run_benchmark(num_students: int, num_evaluations: int) -> bool:
+    """Mide ambas rutas y verifica que produzcan las mismas notas."""
+    calculator = GradeCalculator(AttendancePolicy(3.0), ExtraPointsPolicy(True, 2.0))
+    grades, weights, attendance = generate_cohort(num_students, num_evaluations)
+    student_ids = [f"S{index:07d}" for index in range(num_students)]
+
+    print("=" * 70)
+    print("BENCHMARK - LIBRO DE NOTAS BINARIO (MMAP)")
+    print(f"Estudiantes: {num_students}  Evaluaciones: {num_evaluations}")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory() as directory:
+        csv_path = os.path.join(directory, "grades.csv")
+        binary_path = os.path.join(directory, "grades.grdb")
+        write_csv(csv_path, grades, weights, attendance)
+
+        processor = BatchGradeProcessor(calculator)
+        start = time.perf_counter()
+        with open(csv_path, "r", encoding="utf-8", newline="") as input_file:
+            parsed = list(processor.compute(processor.validate(processor.read_csv(input_file))))
+        csv_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        with BinaryGradebookWriter(binary_path, [f"Evaluación {i + 1}" for i in range(num_evaluations)]) as writer:
+            writer.write_batch(student_ids, grades, weights, attendance)
+        write_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        with BinaryGradebook(binary_path) as gradebook:
+            binary_results = gradebook.calculate_final_grades(calculator)
+        binary_time = time.perf_counter() - start
+        file_size = os.path.getsize(binary_path)
+
+    identical = binary_results.tolist() == [row.details.final_grade for row in parsed]
+
+    print(f"  Desde CSV (parseo + cálculo):   {csv_time:8.3f} s  ({num_students / csv_time:12,.0f} estudiantes/s)")
+    print(f"  Escritura binaria:              {write_time:8.3f} s")
+    print(f"  Desde binario (mmap + cálculo): {binary_time:8.3f} s  ({num_students / binary_time:12,.0f} estudiantes/s)")
+    print(f"  Lectura efectiva:               {file_size / binary_time / 1e9:8.2f} GB/s")
+    print(f"  Aceleración:                    {csv_time / binary_time:8.1f}x")
+    print(f"  Resultados idénticos:           {'SI' if identical else 'NO'}")
+    print("=" * 70)
+
+    return identical
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compara el cierre de término desde CSV y desde el formato binario.")
+    parser.add_argument("--students", type=int, default=100_000)
+    parser.add_argument("--evaluations", type=int, default=5)
+    args = parser.parse_args()
+
+    success = run_benchmark(args.students, args.evaluations)
+    exit(0 if success else 1)
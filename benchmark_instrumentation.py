@@ -0,0 +1,84 @@
+"""
+Benchmark del costo de la instrumentación en la ruta escalar.
+Compara calculate_final_grade sin instrumentar, con muestreo y con tiempos en cada llamada.
+"""
+
+import argparse
+import statistics
+import time
+from evaluation import Evaluation
+from attendance_policy import AttendancePolicy
+from extra_points_policy import ExtraPointsPolicy
+from grade_calculator import GradeCalculator
+from instrumentation import CalculatorInstrumentation
+from benchmark_batch import generate_cohort
+
+
+OVERHEAD_LIMIT = 0.02
+
+
+def build_workload(num_students: int, num_evaluations: int) -> list:
+    """Construye las evaluaciones de cada estudiante antes de medir."""
+    grades, weights, attendance = generate_cohort(num_students, num_evaluations)
+    weight_list = weights.tolist()
+    return [
+        ([Evaluation(f"Evaluación {i + 1}", grade, weight) for i, (grade, weight) in enumerate(zip(row, weight_list))],
+         reached)
+        for row, reached in zip(grades.tolist(), attendance.tolist())
+    ]
+
+
+def measure(calculator: GradeCalculator, workload: list) -> int:
+    """Tiempo en nanosegundos de calcular toda la carga una vez."""
+    calculate = calculator.calculate_final_grade
+    start = time.perf_counter_ns()
+    for evaluations, reached in workload:
+        calculate(evaluations, reached)
+    return time.perf_counter_ns() - start
+
+
+def run_benchmark(num_students: int, num_evaluations: int, rounds: int, sample_every: int) -> bool:
+    """Alterna rondas con y sin instrumentación y compara la mediana de los cocientes por ronda."""
+    calculator = GradeCalculator(AttendancePolicy(3.0), ExtraPointsPolicy(True, 2.0))
+    workload = build_workload(num_students, num_evaluations)
+    sampled = CalculatorInstrumentation(calculator, sample_every=sample_every)
+    full = CalculatorInstrumentation(calculator, sample_every=1, prefix="grade_calculator_full")
+
+    timings = {"base": [], "sampled": [], "full": []}
+    for _ in range(rounds):
+        # Rondas intercaladas y cocientes pareados: el ruido de la máquina afecta por igual a cada modo.
+        timings["base"].append(measure(calculator, workload))
+        with sampled:
+            timings["sampled"].append(measure(calculator, workload))
+        with full:
+            timings["full"].append(measure(calculator, workload))
+
+    sampled_overhead = statistics.median(s / b for s, b in zip(timings["sampled"], timings["base"])) - 1
+    full_overhead = statistics.median(f / b for f, b in zip(timings["full"], timings["base"])) - 1
+    base_ns = statistics.median(timings["base"]) / num_students
+
+    print("=" * 70)
+    print("BENCHMARK - COSTO DE LA INSTRUMENTACIÓN")
+    print(f"Estudiantes: {num_students}  Evaluaciones: {num_evaluations}  Rondas: {rounds}")
+    print("=" * 70)
+    print(f"  Sin instrumentar:          {base_ns:8.0f} ns/llamada")
+    print(f"  Muestreo 1/{sample_every:<6}          {base_ns * (1 + sampled_overhead):8.0f} ns/llamada  "
+          f"({sampled_overhead:+.2%})")
+    print(f"  Tiempos en cada llamada:   {base_ns * (1 + full_overhead):8.0f} ns/llamada  ({full_overhead:+.2%})")
+    print(f"  Llamadas contadas:         {sampled.registry.snapshot()['grade_calculator_calls_total']['value']}")
+    print(f"  Meta con muestreo:         < {OVERHEAD_LIMIT:.0%}  {'CUMPLE' if sampled_overhead < OVERHEAD_LIMIT else 'NO CUMPLE'}")
+    print("=" * 70)
+
+    return sampled_overhead < OVERHEAD_LIMIT
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mide el costo de instrumentar GradeCalculator.")
+    parser.add_argument("--students", type=int, default=5_000)
+    parser.add_argument("--evaluations", type=int, default=5)
+    parser.add_argument("--rounds", type=int, default=61)
+    parser.add_argument("--sample-every", type=int, default=1000)
+    args = parser.parse_args()
+
+    success = run_benchmark(args.students, args.evaluations, args.rounds, args.sample_every)
+    exit(0 if success else 1)
@@ -0,0 +1,71 @@
+"""
+Reporte de escalamiento: estudiantes por segundo según el número de workers.
+Compara ParallelGradeCalculator con calculate_final_grades_batch secuencial.
+"""
+
+import argparse
+import os
+import time
+from attendance_policy import AttendancePolicy
+from extra_points_policy import ExtraPointsPolicy
+from grade_calculator import GradeCalculator
+from parallel_calculator import ParallelGradeCalculator
+from benchmark_batch import generate_cohort
+
+
+def default_worker_counts() -> list:
+    """Potencias de dos hasta el número de CPUs disponibles."""
+    cpus = os.cpu_count() or 1
+    counts = []
+    workers = 1
+    while workers < cpus:
+        counts.append(workers)
+        workers *= 2
+    counts.append(cpus)
+    return counts
+
+
+def run_scaling_report(num_students: int, num_evaluations: int, worker_counts: list, chunk_size: int) -> bool:
+    """Mide el throughput por número de workers y verifica el orden de los resultados."""
+    calculator = GradeCalculator(AttendancePolicy(3.0), ExtraPointsPolicy(True, 2.0))
+    grades, _, attendance = generate_cohort(num_students, num_evaluations)
+    weights = generate_cohort(num_students, num_evaluations, seed=7)[0] / (20.0 * num_evaluations)
+
+    print("=" * 70)
+    print("REPORTE DE ESCALAMIENTO - EJECUCIÓN MULTINÚCLEO")
+    print(f"Estudiantes: {num_students}  Evaluaciones: {num_evaluations}  Chunk: {chunk_size}")
+    print(f"CPUs disponibles: {os.cpu_count()}")
+    print("=" * 70)
+
+    start = time.perf_counter()
+    expected = calculator.calculate_final_grades_batch(grades, weights, attendance)
+    sequential_time = time.perf_counter() - start
+    print(f"  {'Secuencial':>10}: {num_students / sequential_time:14,.0f} estudiantes/s")
+
+    all_identical = True
+    for workers in worker_counts:
+        parallel = ParallelGradeCalculator(calculator, max_workers=workers, chunk_size=chunk_size)
+        start = time.perf_counter()
+        results = parallel.calculate_final_grades(grades, weights, attendance)
+        elapsed = time.perf_counter() - start
+
+        identical = bool((results == expected).all())
+        all_identical = all_identical and identical
+        print(f"  {workers:>4} workers: {num_students / elapsed:14,.0f} estudiantes/s  "
+              f"(x{sequential_time / elapsed:5.2f})  {'[OK]' if identical else '[DIFERENTE]'}")
+
+    print("=" * 70)
+    return all_identical
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reporte de escalamiento por número de workers.")
+    parser.add_argument("--students", type=int, default=2_000_000)
+    parser.add_argument("--evaluations", type=int, default=GradeCalculator.MAX_EVALUATIONS)
+    parser.add_argument("--workers", type=int, nargs="+", default=None)
+    parser.add_argument("--chunk-size", type=int, default=ParallelGradeCalculator.DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    success = run_scaling_report(args.students, args.evaluations, args.workers or default_worker_counts(),
+                                 args.chunk_size)
+    exit(0 if success else 1)
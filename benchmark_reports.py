@@ -0,0 +1,99 @@
+"""
+Benchmark de reportes masivos: hojas por estudiante con un print() por línea frente a ReportGenerator
+(plantillas compiladas y escritura con buffer grande) en texto, CSV y HTML, a un archivo o a un zip.
+"""
+
+import argparse
+import contextlib
+import os
+import tempfile
+import time
+import zipfile
+from attendance_policy import AttendancePolicy
+from extra_points_policy import ExtraPointsPolicy
+from grade_calculator import GradeCalculator
+from evaluation import Evaluation
+from example_usage import display_calculation
+from report_generator import ReportGenerator, render_report
+from benchmark_batch import generate_cohort
+
+
+# Meta: hojas de texto por segundo en un solo worker, concatenadas en un archivo.
+PAGES_TARGET = 50_000
+
+
+def run_print_baseline(calculator: GradeCalculator, path: str, names, grades, weights, attendance) -> float:
+    """Hojas por segundo con get_calculation_details y un print() por línea (stdout a un archivo)."""
+    weight_list = weights.tolist()
+    start = time.perf_counter()
+    with open(path, "w", encoding="utf-8") as output, contextlib.redirect_stdout(output):
+        for index, (row, reached) in enumerate(zip(grades.tolist(), attendance.tolist())):
+            evaluations = [Evaluation(name, grade, weight) for name, grade, weight in zip(names, row, weight_list)]
+            display_calculation(f"S{index:07d}", calculator.get_calculation_details(evaluations, reached))
+    return grades.shape[0] / (time.perf_counter() - start)
+
+
+def run_benchmark(num_students: int, num_evaluations: int, baseline_students: int, max_workers: int) -> bool:
+    """Mide cada formato y destino y verifica el contenido contra la ruta escalar."""
+    calculator = GradeCalculator(AttendancePolicy(3.0), ExtraPointsPolicy(True, 2.0))
+    grades, weights, attendance = generate_cohort(num_students, num_evaluations)
+    names = [f"Evaluación {i + 1}" for i in range(num_evaluations)]
+    student_ids = [f"S{index:07d}" for index in range(num_students)]
+
+    evaluations = [Evaluation(name, grade, weight) for name, grade, weight in zip(names, grades[0].tolist(), weights.tolist())]
+    first_page = render_report(student_ids[0], calculator.get_calculation_details(evaluations, bool(attendance[0])))
+
+    print("=" * 70)
+    print("BENCHMARK - REPORTES MASIVOS")
+    print(f"Estudiantes: {num_students}  Evaluaciones: {num_evaluations}  Workers: {max_workers}")
+    print("=" * 70)
+
+    rows = []
+    consistent = True
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "reportes")
+        baseline = run_print_baseline(calculator, path, names, grades[:baseline_students], weights,
+                                      attendance[:baseline_students])
+
+        for report_format in ("txt", "csv", "html"):
+            generator = ReportGenerator(calculator, report_format, max_workers=max_workers)
+            for archive in (False, True):
+                start = time.perf_counter()
+                pages = generator.write(path, student_ids, names, grades, weights, attendance, archive=archive)
+                rate = pages / (time.perf_counter() - start)
+                size = os.path.getsize(path)
+                rows.append((report_format, archive, rate, size))
+
+                consistent = consistent and pages == num_students
+                if report_format == "txt":
+                    if archive:
+                        with zipfile.ZipFile(path) as archive_file:
+                            consistent = consistent and len(archive_file.namelist()) == num_students and \
+                                archive_file.read(f"{student_ids[0]}.txt").decode("utf-8") == first_page
+                    else:
+                        with open(path, encoding="utf-8") as report_file:
+                            consistent = consistent and report_file.read(len(first_page)) == first_page
+
+    print(f"  {'print() por línea (txt)':24} {baseline:12,.0f} hojas/s")
+    for report_format, archive, rate, size in rows:
+        label = f"{report_format} -> {'zip' if archive else 'archivo'}"
+        print(f"  {label:24} {rate:12,.0f} hojas/s  {size / 1e6:8.1f} MB  {rate / baseline:6.1f}x")
+    text_rate = rows[0][2]
+    print(f"  Meta texto a archivo:    {PAGES_TARGET:12,} hojas/s  ({'CUMPLIDA' if text_rate >= PAGES_TARGET else 'NO CUMPLIDA'})")
+    print(f"  Contenido consistente:   {'SI' if consistent else 'NO'}")
+    print("=" * 70)
+
+    return consistent and text_rate >= PAGES_TARGET
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mide el throughput de los reportes masivos por estudiante.")
+    parser.add_argument("--students", type=int, default=100_000)
+    parser.add_argument("--evaluations", type=int, default=5)
+    parser.add_argument("--baseline-students", type=int, default=10_000,
+                        help="Estudiantes para la línea base con print() por línea")
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+
+    success = run_benchmark(args.students, args.evaluations, args.baseline_students, args.workers)
+    exit(0 if success else 1)
@@ -0,0 +1,118 @@
+"""
+Prueba de carga del servicio HTTP/JSON (grade_service.py).
+Levanta el servicio en un proceso aparte y mide throughput y latencia de cola
+con 50, 500 y 5000 clientes concurrentes usando conexiones keep-alive.
+"""
+
+import argparse
+import asyncio
+import json
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from typing import List, Tuple
+from performance_test import summarize
+
+
+REQUEST_BODY = json.dumps({
+    "hasReachedMinimumClasses": True,
+    "evaluations": [
+        {"name": "Parcial 1", "grade": 15.0, "weight": 0.3},
+        {"name": "Parcial 2", "grade": 16.5, "weight": 0.3},
+        {"name": "Final", "grade": 14.0, "weight": 0.4}
+    ]
+}).encode("utf-8")
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_service(port: int) -> subprocess.Popen:
+    """Inicia grade_service.py y espera a que /health responda."""
+    process = subprocess.Popen(
+        [sys.executable, "grade_service.py", "--port", str(port), "--teachers-agree"],
+        stdout=subprocess.DEVNULL
+    )
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=0.5):
+                return process
+        except OSError:
+            time.sleep(0.05)
+    process.terminate()
+    raise RuntimeError("El servicio no respondió a tiempo")
+
+
+async def _client(port: int, num_requests: int, samples: List[int], statuses: List[int]) -> None:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    request = (
+        f"POST /grades HTTP/1.1\r\nHost: 127.0.0.1\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(REQUEST_BODY)}\r\n\r\n"
+    ).encode("latin-1") + REQUEST_BODY
+    try:
+        for _ in range(num_requests):
+            start = time.perf_counter_ns()
+            writer.write(request)
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = 0
+            for line in head.split(b"\r\n"):
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":", 1)[1])
+            await reader.readexactly(length)
+            samples.append(time.perf_counter_ns() - start)
+            statuses.append(int(head.split(b" ", 2)[1]))
+    finally:
+        writer.close()
+
+
+async def run_level(port: int, clients: int, requests_per_client: int) -> Tuple[List[int], List[int], int]:
+    """Ejecuta `clients` clientes concurrentes y devuelve latencias, códigos y tiempo total."""
+    samples: List[int] = []
+    statuses: List[int] = []
+    start = time.perf_counter_ns()
+    await asyncio.gather(*(_client(port, requests_per_client, samples, statuses) for _ in range(clients)))
+    return samples, statuses, time.perf_counter_ns() - start
+
+
+def run_load_test(levels: List[int], requests_per_client: int) -> bool:
+    """Levanta el servicio, ejecuta cada nivel de concurrencia y muestra el reporte."""
+    port = _free_port()
+    process = start_service(port)
+    all_ok = True
+    try:
+        print("=" * 78)
+        print("PRUEBA DE CARGA - SERVICIO HTTP/JSON CON MICRO-BATCHING")
+        print(f"Solicitudes por cliente: {requests_per_client}")
+        print("=" * 78)
+        for clients in levels:
+            samples, statuses, elapsed = asyncio.run(run_level(port, clients, requests_per_client))
+            summary = summarize(samples, elapsed)
+            # 503 es la contrapresión esperada cuando la cola acotada se llena.
+            shed = statuses.count(503)
+            errors = sum(1 for status in statuses if status not in (200, 503))
+            all_ok = all_ok and errors == 0
+            print(f"  {clients:>5} clientes: {summary['throughput_rps']:10,.0f} req/s  "
+                  f"p50={summary['p50_ms']:.2f} p95={summary['p95_ms']:.2f} "
+                  f"p99={summary['p99_ms']:.2f} max={summary['max_ms']:.2f} ms  "
+                  f"rechazadas(503)={shed} errores={errors}")
+        print("=" * 78)
+    finally:
+        process.terminate()
+        process.wait()
+    return all_ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Prueba de carga del servicio de notas.")
+    parser.add_argument("--clients", type=int, nargs="+", default=[50, 500, 5000])
+    parser.add_argument("--requests", type=int, default=20, help="Solicitudes por cliente")
+    args = parser.parse_args()
+
+    success = run_load_test(args.clients, args.requests)
+    exit(0 if success else 1)
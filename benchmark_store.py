@@ -0,0 +1,94 @@
+"""
+Benchmark del almacenamiento persistente: inserciones masivas y consultas puntuales.
+Mide GradeStore sobre SQLite en modo WAL contra las metas de throughput y latencia.
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from attendance_policy import AttendancePolicy
+from extra_points_policy import ExtraPointsPolicy
+from grade_calculator import GradeCalculator
+from grade_store import GradeStore
+from validated_evaluations import ValidatedEvaluations
+from benchmark_batch import generate_cohort
+
+
+INSERT_TARGET = 100_000
+LOOKUP_TARGET_MS = 1.0
+
+
+def build_results(num_students: int, num_evaluations: int) -> list:
+    """Calcula el detalle de cada estudiante de una cohorte sintética."""
+    calculator = GradeCalculator(AttendancePolicy(3.0), ExtraPointsPolicy(True, 2.0))
+    grades, weights, attendance = generate_cohort(num_students, num_evaluations)
+    names = [f"Evaluación {i + 1}" for i in range(num_evaluations)]
+    weight_list = weights.tolist()
+    return [
+        (f"S{index:07d}", calculator.get_calculation_details(
+            ValidatedEvaluations.from_arrays(names, row, weight_list), reached
+        ))
+        for index, (row, reached) in enumerate(zip(grades.tolist(), attendance.tolist()))
+    ]
+
+
+def run_benchmark(num_students: int, num_evaluations: int, num_lookups: int) -> bool:
+    """Mide inserción, actualización y consultas, y verifica las metas."""
+    results = build_results(num_students, num_evaluations)
+    student_ids = [student_id for student_id, _ in results]
+    sample = random.Random(42).choices(student_ids, k=num_lookups)
+
+    print("=" * 70)
+    print("BENCHMARK - ALMACENAMIENTO SQLITE (WAL)")
+    print(f"Estudiantes: {num_students}  Evaluaciones: {num_evaluations}  Consultas: {num_lookups}")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory() as directory:
+        with GradeStore(os.path.join(directory, "grades.db")) as store:
+            start = time.perf_counter()
+            store.save_many("2025-2", "CS1111", results)
+            insert_rate = num_students / (time.perf_counter() - start)
+
+            start = time.perf_counter()
+            store.save_many("2025-2", "CS1111", results)
+            upsert_rate = num_students / (time.perf_counter() - start)
+
+            start = time.perf_counter()
+            for student_id in sample:
+                store.get("2025-2", "CS1111", student_id)
+            lookup_ms = (time.perf_counter() - start) / num_lookups * 1000
+
+            start = time.perf_counter()
+            for student_id in sample:
+                store.get_final_grade("2025-2", "CS1111", student_id)
+            final_lookup_ms = (time.perf_counter() - start) / num_lookups * 1000
+
+            start = time.perf_counter()
+            course = store.get_course("2025-2", "CS1111")
+            course_time = time.perf_counter() - start
+
+            stored = store.get("2025-2", "CS1111", student_ids[0])
+            consistent = len(course) == num_students and stored.final_grade == results[0][1].final_grade
+
+    print(f"  Inserción:              {insert_rate:12,.0f} estudiantes/s  (meta {INSERT_TARGET:,})")
+    print(f"  Upsert sobre existentes: {upsert_rate:11,.0f} estudiantes/s")
+    print(f"  Consulta puntual:       {lookup_ms:12.4f} ms  (meta < {LOOKUP_TARGET_MS} ms)")
+    print(f"  Consulta nota final:    {final_lookup_ms:12.4f} ms")
+    print(f"  Curso completo:         {course_time:12.3f} s")
+    print(f"  Datos consistentes:     {'SI' if consistent else 'NO'}")
+    print("=" * 70)
+
+    return consistent and insert_rate >= INSERT_TARGET and lookup_ms < LOOKUP_TARGET_MS
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mide inserciones y consultas del almacenamiento SQLite.")
+    parser.add_argument("--students", type=int, default=100_000)
+    parser.add_argument("--evaluations", type=int, default=5)
+    parser.add_argument("--lookups", type=int, default=10_000)
+    args = parser.parse_args()
+
+    success = run_benchmark(args.students, args.evaluations, args.lookups)
+    exit(0 if success else 1)
@@ -0,0 +1,99 @@
+"""
+Benchmark de la simulación Monte Carlo de incertidumbre de notas: un ensayo a la vez con
+calculate_final_grades_batch sobre la matriz perturbada frente a GradeUncertaintySimulator
+(todos los ensayos de un tramo como operaciones NumPy y solo las columnas perturbadas sorteadas).
+"""
+
+import argparse
+import time
+import numpy as np
+from attendance_policy import AttendancePolicy
+from extra_points_policy import ExtraPointsPolicy
+from evaluation import Evaluation
+from grade_calculator import GradeCalculator
+from grade_uncertainty import GradeUncertaintySimulator
+from benchmark_batch import generate_cohort
+
+
+# Meta: pares ensayo x estudiante por segundo con la simulación vectorizada.
+STUDENT_TRIALS_TARGET = 15_000_000
+
+
+def run_per_trial(simulator: GradeUncertaintySimulator, grades, weights, attendance, trials: int,
+                  grade_spread, attendance_flip: float, seed: int):
+    """Recalcula la cohorte ensayo por ensayo con los mismos sorteos que el simulador."""
+    calculator = simulator.calculator
+    spread = np.broadcast_to(np.asarray(grade_spread, dtype=np.float64), grades.shape)
+    perturbed = np.flatnonzero(np.any(spread != 0, axis=0))
+    grade_rng, attendance_rng = (np.random.default_rng(child) for child in np.random.SeedSequence(seed).spawn(2))
+
+    passes = np.zeros(grades.shape[0], dtype=np.int64)
+    pass_rates = np.empty(trials)
+    for trial in range(trials):
+        draws = grade_rng.standard_normal((grades.shape[0], perturbed.size))
+        trial_grades = grades.copy()
+        trial_grades[:, perturbed] = np.clip(np.round(grades[:, perturbed] + spread[:, perturbed] * draws, 2),
+                                             Evaluation.MIN_GRADE, Evaluation.MAX_GRADE)
+        trial_attendance = attendance ^ (attendance_rng.random(attendance.size) < attendance_flip)
+        passed = calculator.calculate_final_grades_batch(trial_grades, weights, trial_attendance) >= simulator.pass_grade
+        passes += passed
+        pass_rates[trial] = passed.mean()
+    return passes / trials, pass_rates
+
+
+def run_benchmark(num_students: int, num_evaluations: int, trials: int, chunk_size: int) -> bool:
+    """Compara ambas rutas con los mismos sorteos y verifica que coincidan."""
+    calculator = GradeCalculator(AttendancePolicy(3.0), ExtraPointsPolicy(True, 2.0))
+    simulator = GradeUncertaintySimulator(calculator, chunk_size=chunk_size)
+    grades, weights, attendance = generate_cohort(num_students, num_evaluations)
+    # Apelaciones pendientes sobre la última evaluación y alguna corrección de asistencia.
+    grade_spread = np.zeros(num_evaluations)
+    grade_spread[-1] = 1.5
+    attendance_flip = 0.05
+
+    print("=" * 70)
+    print("BENCHMARK - SIMULACIÓN MONTE CARLO DE APROBACIÓN")
+    print(f"Estudiantes: {num_students}  Evaluaciones: {num_evaluations}  Ensayos: {trials}  Tramo: {chunk_size}")
+    print("=" * 70)
+
+    start = time.perf_counter()
+    expected_probability, expected_rates = run_per_trial(simulator, grades, weights, attendance, trials,
+                                                         grade_spread, attendance_flip, seed=7)
+    per_trial_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = simulator.simulate(grades, weights, attendance, trials, grade_spread=grade_spread,
+                                attendance_flip=attendance_flip, seed=7)
+    simulation_time = time.perf_counter() - start
+
+    identical = np.array_equal(result.pass_probability, expected_probability) and \
+        np.array_equal(result.pass_rates, expected_rates)
+    pairs = num_students * trials
+    rate = pairs / simulation_time
+    low, median, high = np.quantile(result.pass_rates, [0.05, 0.5, 0.95])
+    crossing = ~result.baseline_passed & (result.pass_probability >= 0.5)
+
+    print(f"  {'Ensayo por ensayo':24} {per_trial_time:8.3f} s  {pairs / per_trial_time:14,.0f} pares/s")
+    print(f"  {'Simulación vectorizada':24} {simulation_time:8.3f} s  {rate:14,.0f} pares/s  "
+          f"{per_trial_time / simulation_time:6.1f}x")
+    print(f"  Tasa de aprobación base: {result.baseline_passed.mean():.4f}  "
+          f"simulada (p5/p50/p95): {low:.4f} / {median:.4f} / {high:.4f}")
+    print(f"  Desaprobados con probabilidad de aprobar >= 0.5: {int(crossing.sum())}")
+    print(f"  Meta:                    {STUDENT_TRIALS_TARGET:14,} pares/s  "
+          f"({'CUMPLIDA' if rate >= STUDENT_TRIALS_TARGET else 'NO CUMPLIDA'})")
+    print(f"  Resultados idénticos:    {'SI' if identical else 'NO'}")
+    print("=" * 70)
+
+    return identical and rate >= STUDENT_TRIALS_TARGET
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mide la simulación Monte Carlo de probabilidad de aprobación.")
+    parser.add_argument("--students", type=int, default=20_000)
+    parser.add_argument("--evaluations", type=int, default=5)
+    parser.add_argument("--trials", type=int, default=2_000)
+    parser.add_argument("--chunk-size", type=int, default=GradeUncertaintySimulator.DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    success = run_benchmark(args.students, args.evaluations, args.trials, args.chunk_size)
+    exit(0 if success else 1)
@@ -0,0 +1,242 @@
+import mmap
+import struct
+from typing import BinaryIO, Iterable, Iterator, List, Sequence, Tuple
+import numpy as np
+from evaluation import Evaluation
+from grade_calculator import BatchDetails, GradeCalculator
+
+
+MAGIC = b"GRDB"
+VERSION = 1
+# magic, versión, evaluaciones, ancho del código, reservado, registros, tamaño de registro, tamaño de cabecera
+_HEADER = struct.Struct("<4sHHHHQII")
+_COUNT_OFFSET = 12
+_ALIGNMENT = 64
+# El número de evaluaciones se guarda como uint16 en la cabecera.
+_MAX_FORMAT_EVALUATIONS = 0xFFFF
+
+
+def record_dtype(num_evaluations: int, id_width: int) -> np.dtype:
+    # Campos alineados a 8 bytes para que las vistas de notas y pesos sean float64 alineados.
+    grades_offset = _align(id_width, 8)
+    weights_offset = grades_offset + 8 * num_evaluations
+    attendance_offset = weights_offset + 8 * num_evaluations
+    return np.dtype({
+        "names": ["student_id", "grades", "weights", "attendance"],
+        "formats": [f"S{id_width}", ("<f8", (num_evaluations,)), ("<f8", (num_evaluations,)), "?"],
+        "offsets": [0, grades_offset, weights_offset, attendance_offset],
+        "itemsize": _align(attendance_offset + 1, 8)
+    })
+
+
+class BinaryGradebookWriter:
+    DEFAULT_ID_WIDTH = 16
+
+    def __init__(self, path: str, evaluation_names: Sequence[str], course: str = "",
+                 id_width: int = DEFAULT_ID_WIDTH, max_evaluations: int = GradeCalculator.MAX_EVALUATIONS):
+        evaluation_names = list(evaluation_names)
+        if not evaluation_names:
+            raise ValueError("Debe haber al menos una evaluación")
+        if len(evaluation_names) > min(max_evaluations, _MAX_FORMAT_EVALUATIONS):
+            raise ValueError(f"El número máximo de evaluaciones es {min(max_evaluations, _MAX_FORMAT_EVALUATIONS)}")
+        if not isinstance(id_width, int) or id_width <= 0:
+            raise ValueError("id_width debe ser un entero positivo")
+
+        self.path = path
+        self.evaluation_names = evaluation_names
+        self.course = course
+        self.id_width = id_width
+        self.dtype = record_dtype(len(evaluation_names), id_width)
+        self.record_count = 0
+        self._file: BinaryIO = open(path, "wb")
+        self._file.write(self._encode_header())
+
+    def write(self, student_id: str, grades: Sequence[float], weights: Sequence[float],
+              hasReachedMinimumClasses: bool) -> None:
+        self.write_batch([student_id], [grades], [weights], [hasReachedMinimumClasses])
+
+    def write_batch(self, student_ids: Iterable[str], grades, weights, hasReachedMinimumClasses) -> None:
+        student_ids = [self._encode_id(student_id) for student_id in student_ids]
+        num_evaluations = len(self.evaluation_names)
+        grades = np.asarray(grades, dtype=np.float64).reshape(-1, num_evaluations)
+        weights = np.broadcast_to(np.asarray(weights, dtype=np.float64), grades.shape)
+        attendance = np.asarray(hasReachedMinimumClasses)
+
+        if attendance.dtype != np.bool_:
+            raise ValueError("hasReachedMinimumClasses debe ser un arreglo booleano")
+        if not len(student_ids) == grades.shape[0] == attendance.shape[0]:
+            raise ValueError("student_ids, grades y hasReachedMinimumClasses deben tener un valor por estudiante")
+        if not np.all((grades >= Evaluation.MIN_GRADE) & (grades <= Evaluation.MAX_GRADE)):
+            raise ValueError(f"La nota debe estar entre {Evaluation.MIN_GRADE} y {Evaluation.MAX_GRADE}")
+        if not np.all((weights >= 0) & (weights <= 1)):
+            raise ValueError("El peso debe estar entre 0 y 1")
+
+        records = np.zeros(len(student_ids), dtype=self.dtype)
+        records["student_id"] = student_ids
+        records["grades"] = grades
+        records["weights"] = weights
+        records["attendance"] = attendance
+        self._file.write(records.tobytes())
+        self.record_count += len(records)
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        # El número de registros se conoce al final: se escribe sobre la cabecera ya emitida.
+        self._file.seek(_COUNT_OFFSET)
+        self._file.write(struct.pack("<Q", self.record_count))
+        self._file.close()
+
+    def __enter__(self) -> "BinaryGradebookWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def _encode_id(self, student_id: str) -> bytes:
+        encoded = str(student_id).encode("utf-8")
+        if not encoded or len(encoded) > self.id_width:
+            raise ValueError(f"El codigo del estudiante debe tener entre 1 y {self.id_width} bytes")
+        return encoded
+
+    def _encode_header(self) -> bytes:
+        schema = b"".join(_encode_text(text) for text in [self.course] + self.evaluation_names)
+        header_size = _align(_HEADER.size + len(schema), _ALIGNMENT)
+        fixed = _HEADER.pack(MAGIC, VERSION, len(self.evaluation_names), self.id_width, 0,
+                             0, self.dtype.itemsize, header_size)
+        return (fixed + schema).ljust(header_size, b"\0")
+
+
+class BinaryGradebook:
+    CHUNK_SIZE = 65536
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"{path} no es un archivo de notas binario")
+
+        try:
+            self._read_header()
+        except ValueError:
+            self.close()
+            raise
+
+        # Vista sin copia sobre el archivo mapeado: los datos se leen de disco solo al tocarlos.
+        self._records = np.frombuffer(self._mmap, dtype=self.dtype, count=self.record_count,
+                                      offset=self.header_size)
+
+    @property
+    def student_ids(self) -> np.ndarray:
+        return self._records["student_id"]
+
+    @property
+    def grades(self) -> np.ndarray:
+        return self._records["grades"]
+
+    @property
+    def weights(self) -> np.ndarray:
+        return self._records["weights"]
+
+    @property
+    def attendance(self) -> np.ndarray:
+        return self._records["attendance"]
+
+    def student_id(self, index: int) -> str:
+        return self._records["student_id"][index].decode("utf-8")
+
+    def calculate_final_grades(self, calculator: GradeCalculator) -> np.ndarray:
+        return calculator.calculate_final_grades_batch(self.grades, self.weights, self.attendance)
+
+    def iter_final_grades(self, calculator: GradeCalculator, chunk_size: int = CHUNK_SIZE) -> Iterator[np.ndarray]:
+        # Por tramos del mmap: la memoria usada depende del tramo, no del tamaño de la cohorte.
+        if not isinstance(chunk_size, int) or chunk_size < 1:
+            raise ValueError("chunk_size debe ser un entero positivo")
+        grades, weights, attendance = self.grades, self.weights, self.attendance
+        for start in range(0, self.record_count, chunk_size):
+            stop = start + chunk_size
+            yield calculator.calculate_final_grades_batch(grades[start:stop], weights[start:stop], attendance[start:stop])
+
+    def iter_details(self, calculator: GradeCalculator,
+                     chunk_size: int = CHUNK_SIZE) -> Iterator[Tuple[List[str], BatchDetails]]:
+        # Como iter_final_grades, con los códigos decodificados y el detalle de cada tramo. Entre tramos no
+        # se guarda ninguna vista del mmap, así que cerrar el libro a mitad de la iteración no falla.
+        if not isinstance(chunk_size, int) or chunk_size < 1:
+            raise ValueError("chunk_size debe ser un entero positivo")
+        for start in range(0, self.record_count, chunk_size):
+            yield self._details_chunk(calculator, start, start + chunk_size)
+
+    def _details_chunk(self, calculator: GradeCalculator, start: int, stop: int) -> Tuple[List[str], BatchDetails]:
+        records = self._records[start:stop]
+        student_ids = [student_id.decode("utf-8") for student_id in records["student_id"].tolist()]
+        return student_ids, calculator.calculate_details_batch(records["grades"], records["weights"],
+                                                               records["attendance"])
+
+    def close(self) -> None:
+        # Las vistas NumPy exportan el buffer del mmap: las propias se sueltan aquí, pero si el llamador aún
+        # guarda alguna (g = gradebook.grades) el mmap no puede cerrarse. El archivo se cierra igual y el
+        # mmap se libera cuando desaparece la última vista.
+        self._records = None
+        try:
+            if not self._mmap.closed:
+                self._mmap.close()
+        except BufferError as error:
+            raise BufferError("Aún hay vistas del libro de notas en uso (grades, weights, ...); "
+                              "libérelas o cópielas antes de cerrarlo") from error
+        finally:
+            self._file.close()
+
+    def __len__(self) -> int:
+        return self.record_count
+
+    def __enter__(self) -> "BinaryGradebook":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def _read_header(self) -> None:
+        if len(self._mmap) < _HEADER.size:
+            raise ValueError(f"{self.path} no es un archivo de notas binario")
+        magic, version, num_evaluations, id_width, _, record_count, record_size, header_size = \
+            _HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{self.path} no es un archivo de notas binario")
+        if version != VERSION:
+            raise ValueError(f"Versión de formato no soportada: {version}")
+
+        self.dtype = record_dtype(num_evaluations, id_width)
+        if record_size != self.dtype.itemsize:
+            raise ValueError("El tamaño de registro no coincide con el esquema")
+        if len(self._mmap) < header_size + record_count * record_size:
+            raise ValueError("El archivo está truncado")
+
+        offset = _HEADER.size
+        self.course, offset = _decode_text(self._mmap, offset)
+        names: List[str] = []
+        for _ in range(num_evaluations):
+            name, offset = _decode_text(self._mmap, offset)
+            names.append(name)
+
+        self.evaluation_names = names
+        self.id_width = id_width
+        self.record_count = record_count
+        self.header_size = header_size
+
+
+def _align(value: int, alignment: int) -> int:
+    return (value + alignment - 1) // alignment * alignment
+
+
+def _encode_text(text: str) -> bytes:
+    encoded = text.encode("utf-8")
+    return struct.pack("<H", len(encoded)) + encoded
+
+
+def _decode_text(buffer, offset: int):
+    (length,) = struct.unpack_from("<H", buffer, offset)
+    start = offset + 2
+    return bytes(buffer[start:start + length]).decode("utf-8"), start + length
@@ -0,0 +1,143 @@
+from collections import namedtuple
+from typing import Any, List, Sequence
+import numpy as np
+from evaluation import Evaluation
+from grade_calculator import GradeCalculator
+
+
+Violation = namedtuple("Violation", ["row", "column", "field", "value", "message"])
+_cell_types = np.frompyfunc(type, 1, 1)
+
+
+class ValidationReport:
+    def __init__(self, violations: List[Violation], num_rows: int):
+        self.violations = violations
+        self.num_rows = num_rows
+        self.valid_rows = np.ones(num_rows, dtype=bool)
+        for violation in violations:
+            if violation.row is None:
+                self.valid_rows[:] = False
+            else:
+                self.valid_rows[violation.row] = False
+
+    @property
+    def is_valid(self) -> bool:
+        return not self.violations
+
+    def raise_if_invalid(self) -> None:
+        if self.violations:
+            lines = [
+                f"fila {'*' if violation.row is None else violation.row}, "
+                f"columna {'-' if violation.column is None else violation.column}: {violation.message}"
+                for violation in self.violations
+            ]
+            raise ValueError(f"{len(self.violations)} errores de validación:\n" + "\n".join(lines))
+
+
+class BulkValidator:
+    def __init__(self, max_evaluations: int = GradeCalculator.MAX_EVALUATIONS):
+        if not isinstance(max_evaluations, int) or max_evaluations < 1:
+            raise ValueError("max_evaluations debe ser un entero positivo")
+        self.max_evaluations = max_evaluations
+
+    def validate(self, grades: Sequence[Sequence[Any]], weights: Sequence[Any],
+                 hasReachedMinimumClasses: Sequence[Any]) -> ValidationReport:
+        violations: List[Violation] = []
+        grade_matrix = self._to_matrix(grades, "grade", "La nota debe ser un número", violations)
+        num_rows, num_columns = grade_matrix.shape
+
+        # Un vector de pesos compartido se reporta con row=None: afecta a todas las filas.
+        shared_weights = self._is_vector(weights)
+        weight_matrix = self._to_matrix([weights] if shared_weights else weights, "weight",
+                                        "El peso debe ser un número", violations, num_columns, shared_weights)
+        if not shared_weights and weight_matrix.shape[0] != num_rows:
+            raise ValueError("weights debe tener una fila por estudiante")
+
+        if num_columns > self.max_evaluations or num_columns == 0:
+            message = ("Debe haber al menos una evaluación" if num_columns == 0
+                       else f"El número máximo de evaluaciones es {self.max_evaluations}")
+            violations.extend(Violation(row, None, "evaluations", num_columns, message) for row in range(num_rows))
+
+        # Chequeos de rango vectorizados sobre todo el lote; NaN marca celdas no numéricas ya reportadas.
+        grade_out_of_range = (grade_matrix < Evaluation.MIN_GRADE) | (grade_matrix > Evaluation.MAX_GRADE)
+        for row, column in zip(*np.nonzero(grade_out_of_range)):
+            violations.append(Violation(
+                int(row), int(column), "grade", float(grade_matrix[row, column]),
+                f"La nota debe estar entre {Evaluation.MIN_GRADE} y {Evaluation.MAX_GRADE}"
+            ))
+
+        weight_out_of_range = (weight_matrix < 0) | (weight_matrix > 1)
+        for row, column in zip(*np.nonzero(weight_out_of_range)):
+            violations.append(Violation(
+                None if shared_weights else int(row), int(column), "weight", float(weight_matrix[row, column]),
+                "El peso debe estar entre 0 y 1"
+            ))
+
+        attendance = list(hasReachedMinimumClasses)
+        if len(attendance) != num_rows:
+            raise ValueError("hasReachedMinimumClasses debe tener un valor por estudiante")
+        for row, value in enumerate(attendance):
+            if not isinstance(value, (bool, np.bool_)):
+                violations.append(Violation(row, None, "hasReachedMinimumClasses", value,
+                                            "hasReachedMinimumClasses debe ser un valor booleano"))
+
+        violations.sort(key=lambda violation: (
+            -1 if violation.row is None else violation.row,
+            -1 if violation.column is None else violation.column
+        ))
+        return ValidationReport(violations, num_rows)
+
+    def _is_vector(self, values: Sequence[Any]) -> bool:
+        if isinstance(values, np.ndarray):
+            return values.ndim == 1
+        return len(values) > 0 and not isinstance(values[0], (list, tuple, np.ndarray))
+
+    def _to_matrix(self, rows: Sequence[Sequence[Any]], field: str, message: str, violations: List[Violation],
+                   num_columns: int = None, shared: bool = False) -> np.ndarray:
+        if isinstance(rows, np.ndarray) and rows.dtype.kind in "fiu" and rows.ndim == 2:
+            matrix = rows.astype(np.float64, copy=False)
+        else:
+            # Solo se convierte en bloque si todas las celdas ya son números: np.array aceptaría cadenas
+            # numéricas y booleanos, que Evaluation rechaza.
+            try:
+                cells = np.array(rows, dtype=object)
+            except ValueError:
+                cells = None
+            matrix = None
+            if cells is not None and cells.ndim == 2 and all(
+                    self._is_number_type(cell_type) for cell_type in set(_cell_types(cells).ravel())):
+                matrix = cells.astype(np.float64)
+            if matrix is None:
+                matrix = self._convert_cells(rows, field, message, violations, num_columns, shared)
+                if num_columns is not None and matrix.shape[1] != num_columns:
+                    raise ValueError(f"{field} debe tener {num_columns} columnas")
+                return matrix
+
+        for row, column in zip(*np.nonzero(np.isnan(matrix))):
+            violations.append(Violation(None if shared else int(row), int(column), field, float("nan"), message))
+
+        if num_columns is not None and matrix.shape[1] != num_columns:
+            raise ValueError(f"{field} debe tener {num_columns} columnas")
+        return matrix
+
+    def _is_number_type(self, cell_type: type) -> bool:
+        return (issubclass(cell_type, (int, float, np.integer, np.floating))
+                and not issubclass(cell_type, (bool, np.bool_)))
+
+    def _convert_cells(self, rows: Sequence[Sequence[Any]], field: str, message: str, violations: List[Violation],
+                       num_columns: int, shared: bool) -> np.ndarray:
+        # Ruta lenta solo para lotes con celdas no numéricas o filas de distinto largo.
+        rows = [list(row) for row in rows]
+        width = num_columns if num_columns is not None else max((len(row) for row in rows), default=0)
+        matrix = np.full((len(rows), width), np.nan)
+        for row_index, row in enumerate(rows):
+            report_row = None if shared else row_index
+            if len(row) != width:
+                violations.append(Violation(report_row, None, field, len(row),
+                                            f"La fila debe tener {width} valores de {field}"))
+            for column, value in enumerate(row[:width]):
+                if not self._is_number_type(type(value)) or value != value:
+                    violations.append(Violation(report_row, column, field, value, message))
+                else:
+                    matrix[row_index, column] = value
+        return matrix
@@ -0,0 +1,86 @@
+import threading
+from collections import OrderedDict, namedtuple
+from typing import List, Tuple
+from evaluation import Evaluation
+from evaluation_set import EvaluationSet
+from validated_evaluations import ValidatedEvaluations
+from grade_calculator import GradeCalculator
+
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "evictions", "maxsize", "currsize"])
+
+
+class CachedGradeCalculator:
+    DEFAULT_MAXSIZE = 65536
+
+    def __init__(self, calculator: GradeCalculator, maxsize: int = DEFAULT_MAXSIZE):
+        if not isinstance(calculator, GradeCalculator):
+            raise ValueError("calculator debe ser una instancia de GradeCalculator")
+        if not isinstance(maxsize, int) or maxsize < 1:
+            raise ValueError("maxsize debe ser un entero positivo")
+
+        self.calculator = calculator
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def calculate_final_grade(self, examsStudents: List[Evaluation], hasReachedMinimumClasses: bool) -> float:
+        key = self._make_key(examsStudents, hasReachedMinimumClasses)
+        if key is None:
+            return self.calculator.calculate_final_grade(examsStudents, hasReachedMinimumClasses)
+
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        # El cálculo se hace fuera del lock; los errores de validación no se guardan.
+        final_grade = self.calculator.calculate_final_grade(examsStudents, hasReachedMinimumClasses)
+
+        with self._lock:
+            self._entries[key] = final_grade
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+        return final_grade
+
+    def cache_info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.evictions, self.maxsize, len(self._entries))
+
+    def cache_clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def _make_key(self, examsStudents: List[Evaluation], hasReachedMinimumClasses: bool) -> Tuple:
+        # Clave canónica: las políticas (inmutables y con hash) y las tuplas (nota, peso).
+        # Entradas que no cumplen los tipos esperados no se cachean y se validan normalmente.
+        if type(hasReachedMinimumClasses) not in (bool, float):
+            return None
+        if isinstance(examsStudents, EvaluationSet):
+            evaluations_key = tuple(zip(examsStudents.grades, examsStudents.weights))
+        elif isinstance(examsStudents, ValidatedEvaluations):
+            evaluations_key = tuple((evaluation.grade, evaluation.weight) for evaluation in examsStudents)
+        elif isinstance(examsStudents, list) and all(type(evaluation) is Evaluation for evaluation in examsStudents):
+            evaluations_key = tuple((evaluation.grade, evaluation.weight) for evaluation in examsStudents)
+        else:
+            return None
+
+        # El tipo de la asistencia va en la clave: True == 1.0, pero una política booleana rechaza 1.0.
+        return (
+            self.calculator.attendance_policy,
+            self.calculator.extra_points_policy,
+            type(hasReachedMinimumClasses),
+            hasReachedMinimumClasses,
+            evaluations_key
+        )
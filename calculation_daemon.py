@@ -0,0 +1,119 @@
+import asyncio
+import json
+import os
+import socket
+import stat
+from typing import Any, Dict, Optional
+from grade_calculator import GradeCalculator
+from grade_client import DEFAULT_SOCKET_PATH
+from grade_service import parse_payload
+
+
+class CalculationDaemon:
+    READ_SIZE = 64 * 1024
+    MAX_LINE_SIZE = 64 * 1024
+
+    def __init__(self, calculator: GradeCalculator, path: str = DEFAULT_SOCKET_PATH):
+        if not isinstance(calculator, GradeCalculator):
+            raise ValueError("calculator debe ser una instancia de GradeCalculator")
+
+        self.calculator = calculator
+        self.path = path
+        self.requests_processed = 0
+        self.requests_failed = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> None:
+        self._remove_stale_socket()
+        self._server = await asyncio.start_unix_server(self._handle_connection, path=self.path)
+
+    async def stop(self) -> None:
+        if self._server is None:
+            return
+        self._server.close()
+        await self._server.wait_closed()
+        self._server = None
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+    async def serve_forever(self) -> None:
+        await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.stop()
+
+    def handle_line(self, line: bytes) -> Dict[str, Any]:
+        # Protocolo: un objeto JSON por línea, con el mismo cuerpo que el servicio HTTP más "id"
+        # (se devuelve tal cual) y "details" (detalle completo en lugar de solo la nota final).
+        request_id = None
+        if not line.strip():
+            # Una línea en blanco también se responde: el cliente espera una respuesta por línea enviada.
+            self.requests_failed += 1
+            return {"id": None, "ok": False, "error": "Solicitud vacía"}
+        try:
+            payload = json.loads(line)
+            if isinstance(payload, dict):
+                request_id = payload.get("id")
+                if payload.get("op") == "ping":
+                    return {"id": request_id, "ok": True}
+            evaluations, hasReachedMinimumClasses = parse_payload(payload)
+            if payload.get("details"):
+                response = self.calculator.get_calculation_details(evaluations, hasReachedMinimumClasses).to_dict()
+            else:
+                response = {"final_grade": self.calculator.calculate_final_grade(evaluations, hasReachedMinimumClasses)}
+        except json.JSONDecodeError as error:
+            self.requests_failed += 1
+            return {"id": request_id, "ok": False, "error": f"JSON inválido: {error.msg}"}
+        except ValueError as error:
+            self.requests_failed += 1
+            return {"id": request_id, "ok": False, "error": str(error)}
+
+        self.requests_processed += 1
+        return {"id": request_id, "ok": True, **response}
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        # Pipelining: se responden juntas todas las líneas completas de cada lectura, en orden.
+        pending = b""
+        try:
+            while True:
+                chunk = await reader.read(self.READ_SIZE)
+                if not chunk:
+                    break
+                lines = (pending + chunk).split(b"\n")
+                pending = lines.pop()
+                responses = [_encode(self.handle_line(line)) for line in lines]
+                if len(pending) > self.MAX_LINE_SIZE:
+                    responses.append(_encode({"id": None, "ok": False, "error": "Solicitud demasiado grande"}))
+                    writer.write(b"".join(responses))
+                    await writer.drain()
+                    break
+                if responses:
+                    writer.write(b"".join(responses))
+                    await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    def _remove_stale_socket(self) -> None:
+        # Un socket huérfano de una ejecución anterior se reemplaza; uno con un daemon vivo, no.
+        try:
+            mode = os.stat(self.path).st_mode
+        except FileNotFoundError:
+            return
+        if not stat.S_ISSOCK(mode):
+            raise ValueError(f"{self.path} existe y no es un socket")
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            try:
+                probe.connect(self.path)
+            except ConnectionRefusedError:
+                os.unlink(self.path)
+                return
+        raise ValueError(f"Ya hay un daemon escuchando en {self.path}")
+
+
+def _encode(response: Dict[str, Any]) -> bytes:
+    return json.dumps(response, separators=(",", ":"), ensure_ascii=False).encode("utf-8") + b"\n"
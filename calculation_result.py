@@ -0,0 +1,77 @@
+from collections.abc import Mapping
+from typing import List, Dict, Any
+from evaluation import Evaluation
+
+
+class CalculationResult(Mapping):
+    FIELDS = (
+        "weighted_average",
+        "attendance_penalty",
+        "extra_points",
+        "final_grade",
+        "hasReachedMinimumClasses",
+        "evaluations_detail",
+        "total_evaluations"
+    )
+
+    __slots__ = (
+        "weighted_average",
+        "attendance_penalty",
+        "extra_points",
+        "final_grade",
+        "hasReachedMinimumClasses",
+        "_evaluations",
+        "_evaluations_detail"
+    )
+
+    def __init__(self, weighted_average: float, attendance_penalty: float, extra_points: float,
+                 final_grade: float, hasReachedMinimumClasses: bool, examsStudents: List[Evaluation]):
+        self.weighted_average = weighted_average
+        self.attendance_penalty = attendance_penalty
+        self.extra_points = extra_points
+        self.final_grade = final_grade
+        self.hasReachedMinimumClasses = hasReachedMinimumClasses
+        self._evaluations = examsStudents
+        self._evaluations_detail = None
+
+    @property
+    def evaluations(self) -> List[Evaluation]:
+        return self._evaluations
+
+    @property
+    def total_evaluations(self) -> int:
+        return len(self._evaluations)
+
+    @property
+    def evaluations_detail(self) -> List[Dict[str, Any]]:
+        # El detalle por evaluación solo se construye la primera vez que se consulta.
+        if self._evaluations_detail is None:
+            self._evaluations_detail = [
+                {
+                    "name": evaluation.name,
+                    "grade": evaluation.grade,
+                    "weight": evaluation.weight,
+                    "weighted_grade": evaluation.get_weighted_grade()
+                }
+                for evaluation in self._evaluations
+            ]
+        return self._evaluations_detail
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(self.FIELDS)
+
+    def __len__(self) -> int:
+        return len(self.FIELDS)
+
+    def __repr__(self) -> str:
+        return (f"CalculationResult(final_grade={self.final_grade}, weighted_average={self.weighted_average}, "
+                f"attendance_penalty={self.attendance_penalty}, extra_points={self.extra_points}, "
+                f"total_evaluations={self.total_evaluations})")
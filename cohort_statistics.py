@@ -0,0 +1,180 @@
+import math
+from typing import Dict, Hashable, Iterable, Optional, Sequence, Tuple
+import numpy as np
+from grade_calculator import GradeCalculator
+
+
+class CohortStatistics:
+    DEFAULT_PASS_GRADE = 11.0
+    # Las notas finales se redondean a centésimos: con bins de 0.01 el histograma fino guarda la
+    # distribución completa en 2001 contadores y los cuantiles son exactos para notas redondeadas.
+    RESOLUTION = 0.01
+
+    def __init__(self, pass_grade: float = DEFAULT_PASS_GRADE):
+        if not GradeCalculator.MIN_FINAL_GRADE <= pass_grade <= GradeCalculator.MAX_FINAL_GRADE:
+            raise ValueError(f"La nota aprobatoria debe estar entre {GradeCalculator.MIN_FINAL_GRADE} "
+                             f"y {GradeCalculator.MAX_FINAL_GRADE}")
+
+        self.pass_grade = float(pass_grade)
+        self.count = 0
+        self.mean = 0.0
+        self.passed = 0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        self._m2 = 0.0
+        self._bins = np.zeros(self._num_bins(), dtype=np.int64)
+
+    def update(self, final_grades) -> "CohortStatistics":
+        grades = np.asarray(final_grades, dtype=np.float64).ravel()
+        if grades.size == 0:
+            return self
+        if not np.all((grades >= GradeCalculator.MIN_FINAL_GRADE) & (grades <= GradeCalculator.MAX_FINAL_GRADE)):
+            raise ValueError(f"La nota final debe estar entre {GradeCalculator.MIN_FINAL_GRADE} "
+                             f"y {GradeCalculator.MAX_FINAL_GRADE}")
+
+        # Cada lote se resume (n, media, M2) y se combina con el acumulado (Welford por lotes, Chan et al.).
+        batch_mean = float(grades.mean())
+        batch_m2 = float(np.square(grades - batch_mean).sum())
+        self._combine(grades.size, batch_mean, batch_m2)
+
+        self.passed += int(np.count_nonzero(grades >= self.pass_grade))
+        self.minimum = min(self.minimum, float(grades.min()))
+        self.maximum = max(self.maximum, float(grades.max()))
+        self._bins += np.bincount(self._bin_index(grades), minlength=self._bins.size)
+        return self
+
+    def merge(self, other: "CohortStatistics") -> "CohortStatistics":
+        if not isinstance(other, CohortStatistics):
+            raise ValueError("other debe ser una instancia de CohortStatistics")
+        if other.pass_grade != self.pass_grade:
+            raise ValueError("Solo se pueden combinar estadísticas con la misma nota aprobatoria")
+        if other.count == 0:
+            return self
+
+        self._combine(other.count, other.mean, other._m2)
+        self.passed += other.passed
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        self._bins += other._bins
+        return self
+
+    @property
+    def variance(self) -> float:
+        return self._m2 / self.count if self.count else math.nan
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance) if self.count else math.nan
+
+    @property
+    def pass_rate(self) -> float:
+        return self.passed / self.count if self.count else math.nan
+
+    def quantile(self, q: float) -> float:
+        return float(self.quantiles([q])[0])
+
+    def quantiles(self, qs: Sequence[float]) -> np.ndarray:
+        # Primer bin cuya frecuencia acumulada alcanza q * n (equivale a numpy method="inverted_cdf").
+        qs = np.asarray(qs, dtype=np.float64)
+        if np.any((qs < 0) | (qs > 1)):
+            raise ValueError("Los cuantiles deben estar entre 0 y 1")
+        if self.count == 0:
+            return np.full(qs.shape, math.nan)
+        cumulative = np.cumsum(self._bins)
+        targets = np.maximum(np.ceil(qs * self.count), 1)
+        indices = np.searchsorted(cumulative, targets, side="left")
+        return np.round(indices * self.RESOLUTION, 2)
+
+    def histogram(self, bin_width: float = 1.0) -> Tuple[np.ndarray, np.ndarray]:
+        bins_per_group = round(bin_width / self.RESOLUTION)
+        if bins_per_group < 1 or not math.isclose(bins_per_group * self.RESOLUTION, bin_width):
+            raise ValueError(f"El ancho de bin debe ser un múltiplo de {self.RESOLUTION}")
+
+        # Bins [a, b) sobre la escala 0-20; el último incluye la nota máxima.
+        num_groups = math.ceil((self._bins.size - 1) / bins_per_group)
+        padded = np.zeros(num_groups * bins_per_group, dtype=np.int64)
+        padded[:self._bins.size - 1] = self._bins[:-1]
+        counts = padded.reshape(num_groups, bins_per_group).sum(axis=1)
+        counts[-1] += self._bins[-1]
+        edges = np.round(np.minimum(np.arange(num_groups + 1) * bin_width, GradeCalculator.MAX_FINAL_GRADE), 2)
+        return edges, counts
+
+    def summary(self, percentiles: Iterable[float] = (10, 25, 50, 75, 90)) -> Dict[str, object]:
+        percentiles = list(percentiles)
+        values = self.quantiles([p / 100 for p in percentiles]).tolist()
+        return {
+            "count": self.count,
+            "mean": self.mean if self.count else math.nan,
+            "std": self.std,
+            "min": self.minimum if self.count else math.nan,
+            "max": self.maximum if self.count else math.nan,
+            "pass_rate": self.pass_rate,
+            "percentiles": dict(zip(percentiles, values))
+        }
+
+    def _combine(self, count: int, mean: float, m2: float) -> None:
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self._m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+
+    def _num_bins(self) -> int:
+        return round((GradeCalculator.MAX_FINAL_GRADE - GradeCalculator.MIN_FINAL_GRADE) / self.RESOLUTION) + 1
+
+    def _bin_index(self, grades: np.ndarray) -> np.ndarray:
+        return np.rint((grades - GradeCalculator.MIN_FINAL_GRADE) / self.RESOLUTION).astype(np.intp)
+
+
+class SectionStatistics:
+    def __init__(self, pass_grade: float = CohortStatistics.DEFAULT_PASS_GRADE):
+        self.pass_grade = pass_grade
+        self.overall = CohortStatistics(pass_grade)
+        self.sections: Dict[Hashable, CohortStatistics] = {}
+
+    def update(self, final_grades, sections: Optional[Sequence[Hashable]] = None) -> "SectionStatistics":
+        grades = np.asarray(final_grades, dtype=np.float64).ravel()
+        if sections is None:
+            self.overall.update(grades)
+            return self
+
+        labels = np.asarray(sections)
+        if labels.shape != grades.shape:
+            raise ValueError("sections debe tener una sección por nota")
+        self.overall.update(grades)
+        # Un solo ordenamiento de las etiquetas por lote; cada sección recibe su tramo de notas.
+        keys, inverse = np.unique(labels, return_inverse=True)
+        order = np.argsort(inverse, kind="stable")
+        bounds = np.cumsum(np.bincount(inverse, minlength=keys.size))
+        start = 0
+        for key, stop in zip(keys.tolist(), bounds.tolist()):
+            self._section(key).update(grades[order[start:stop]])
+            start = stop
+        return self
+
+    def update_from_batch(self, calculator: GradeCalculator, grades, weights, hasReachedMinimumClasses,
+                          sections: Optional[Sequence[Hashable]] = None) -> np.ndarray:
+        final_grades = calculator.calculate_final_grades_batch(grades, weights, hasReachedMinimumClasses)
+        self.update(final_grades, sections)
+        return final_grades
+
+    def merge(self, other: "SectionStatistics") -> "SectionStatistics":
+        if not isinstance(other, SectionStatistics):
+            raise ValueError("other debe ser una instancia de SectionStatistics")
+        self.overall.merge(other.overall)
+        for key, statistics in other.sections.items():
+            self._section(key).merge(statistics)
+        return self
+
+    def summary(self, percentiles: Iterable[float] = (10, 25, 50, 75, 90)) -> Dict[str, object]:
+        percentiles = list(percentiles)
+        return {
+            "overall": self.overall.summary(percentiles),
+            "sections": {key: statistics.summary(percentiles) for key, statistics in sorted(self.sections.items())}
+        }
+
+    def _section(self, key: Hashable) -> CohortStatistics:
+        statistics = self.sections.get(key)
+        if statistics is None:
+            statistics = self.sections[key] = CohortStatistics(self.pass_grade)
+        return statistics
@@ -2,6 +2,8 @@ class Evaluation:
     MAX_GRADE = 20.0
     MIN_GRADE = 0.0
 
+    __slots__ = ("name", "grade", "weight")
+
     def __init__(self, name: str, grade: float, weight: float):
         if not name or not isinstance(name, str):
             raise ValueError("El nombre de la evaluación debe ser una cadena no vacía")
@@ -18,5 +20,14 @@ class Evaluation:
         self.grade = float(grade)
         self.weight = float(weight)
 
+    @classmethod
+    def from_validated(cls, name: str, grade: float, weight: float) -> "Evaluation":
+        # Para datos ya validados aguas arriba (EvaluationSet, BulkValidator): omite los chequeos.
+        evaluation = cls.__new__(cls)
+        evaluation.name = name
+        evaluation.grade = float(grade)
+        evaluation.weight = float(weight)
+        return evaluation
+
     def get_weighted_grade(self) -> float:
         return self.grade * self.weight
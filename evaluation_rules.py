@@ -0,0 +1,154 @@
+import heapq
+from abc import ABC, abstractmethod
+from typing import List, Optional, Sequence
+import numpy as np
+from evaluation import Evaluation
+from grade_calculator import BatchDetails, GradeCalculator
+
+
+class EvaluationRule(ABC):
+    # Una regla elige qué evaluaciones de su grupo de columnas cuentan. Las descartadas pasan a peso 0 y
+    # las que quedan se reescalan para conservar el peso total del grupo. En empates de nota se
+    # conserva la evaluación que aparece primero.
+    def __init__(self, count: int, columns: Optional[Sequence[int]] = None):
+        if isinstance(count, bool) or not isinstance(count, int) or count < 1:
+            raise ValueError("count debe ser un entero positivo")
+        if columns is not None:
+            columns = tuple(columns)
+            if not columns or any(isinstance(column, bool) or not isinstance(column, int) or column < 0
+                                  for column in columns):
+                raise ValueError("columns debe ser una lista no vacía de índices de evaluación")
+            if len(set(columns)) != len(columns):
+                raise ValueError("columns no puede repetir evaluaciones")
+
+        self.count = count
+        self.columns = columns
+
+    @abstractmethod
+    def keep_count(self, group_size: int) -> int:
+        ...
+
+    def keep_mask_batch(self, grades: np.ndarray) -> np.ndarray:
+        # Selección parcial por fila (np.partition, O(m)) en lugar de ordenar cada estudiante.
+        keep = self.keep_count(grades.shape[1])
+        if keep >= grades.shape[1]:
+            return np.ones(grades.shape, dtype=bool)
+        threshold = np.partition(grades, grades.shape[1] - keep, axis=1)[:, grades.shape[1] - keep, None]
+        mask = grades > threshold
+        ties = grades == threshold
+        remaining = keep - np.count_nonzero(mask, axis=1)
+        # Solo las filas con más empates que cupos necesitan elegir entre ellos (por posición).
+        contested = np.count_nonzero(ties, axis=1) > remaining
+        mask[~contested] |= ties[~contested]
+        rows = np.flatnonzero(contested)
+        if rows.size:
+            ties = ties[rows]
+            mask[rows] |= ties & (np.cumsum(ties, axis=1, dtype=np.int32) <= remaining[rows, None])
+        return mask
+
+    def keep_mask(self, grades: Sequence[float]) -> List[bool]:
+        keep = self.keep_count(len(grades))
+        kept = set(heapq.nlargest(keep, range(len(grades)), key=lambda index: (grades[index], -index)))
+        return [index in kept for index in range(len(grades))]
+
+
+class DropLowestRule(EvaluationRule):
+    def keep_count(self, group_size: int) -> int:
+        if self.count >= group_size:
+            raise ValueError(f"No se pueden descartar {self.count} de {group_size} evaluaciones")
+        return group_size - self.count
+
+
+class KeepBestRule(EvaluationRule):
+    def keep_count(self, group_size: int) -> int:
+        return min(self.count, group_size)
+
+
+class EvaluationRuleEngine:
+    def __init__(self, calculator: GradeCalculator, rules: Sequence[EvaluationRule]):
+        if not isinstance(calculator, GradeCalculator):
+            raise ValueError("calculator debe ser una instancia de GradeCalculator")
+        rules = list(rules)
+        if not all(isinstance(rule, EvaluationRule) for rule in rules):
+            raise ValueError("Todas las reglas deben ser instancias de EvaluationRule")
+        if len(rules) > 1 and any(rule.columns is None for rule in rules):
+            raise ValueError("Una regla sobre todas las evaluaciones no se puede combinar con otras")
+        claimed = [column for rule in rules for column in (rule.columns or ())]
+        if len(set(claimed)) != len(claimed):
+            raise ValueError("Las reglas no pueden compartir evaluaciones")
+
+        self.calculator = calculator
+        self.rules = rules
+
+    def effective_weights(self, grades, weights) -> np.ndarray:
+        grades = np.asarray(grades, dtype=np.float64)
+        if grades.ndim != 2:
+            raise ValueError("grades debe ser una matriz (estudiantes x evaluaciones)")
+        weights = np.asarray(weights, dtype=np.float64)
+        if weights.shape not in (grades.shape[1:], (1,) + grades.shape[1:], grades.shape):
+            raise ValueError("weights debe ser un vector compartido o una matriz con la misma forma que grades")
+        weights = np.array(np.broadcast_to(weights, grades.shape))
+
+        for rule in self.rules:
+            columns = self._column_index(rule, grades.shape[1])
+            group_weights = weights[:, columns]
+            kept = np.where(rule.keep_mask_batch(grades[:, columns]), group_weights, 0.0)
+            # Reducción sobre el eje externo (filas contiguas): suma secuencial, en el mismo orden que sum()
+            # en la ruta escalar, sin la suma por pares que NumPy usa sobre el eje contiguo.
+            total = np.ascontiguousarray(group_weights.T).sum(axis=0)
+            kept_total = np.ascontiguousarray(kept.T).sum(axis=0)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                scale = np.where(kept_total > 0, total / kept_total, 0.0)
+            # El reescalado puede pasar de 1 por redondeo cuando queda una sola evaluación con todo el peso.
+            kept *= scale[:, None]
+            weights[:, columns] = np.minimum(kept, 1.0, out=kept)
+        return weights
+
+    def apply(self, examsStudents: Sequence[Evaluation]) -> List[Evaluation]:
+        evaluations = list(examsStudents)
+        if not all(isinstance(evaluation, Evaluation) for evaluation in evaluations):
+            raise ValueError("Todos los elementos deben ser instancias de Evaluation")
+        grades = [evaluation.grade for evaluation in evaluations]
+        weights = [evaluation.weight for evaluation in evaluations]
+
+        for rule in self.rules:
+            columns = self._columns(rule, len(evaluations))
+            group_weights = [weights[column] for column in columns]
+            mask = rule.keep_mask([grades[column] for column in columns])
+            kept = [weight if keep else 0.0 for weight, keep in zip(group_weights, mask)]
+            total = sum(group_weights)
+            kept_total = sum(kept)
+            scale = total / kept_total if kept_total > 0 else 0.0
+            for column, weight in zip(columns, kept):
+                weights[column] = min(weight * scale, 1.0)
+
+        return [Evaluation(evaluation.name, evaluation.grade, weight) for evaluation, weight in zip(evaluations, weights)]
+
+    def calculate_final_grade(self, examsStudents: Sequence[Evaluation], hasReachedMinimumClasses: bool) -> float:
+        return self.calculator.calculate_final_grade(self.apply(examsStudents), hasReachedMinimumClasses)
+
+    def calculate_final_grades_batch(self, grades, weights, hasReachedMinimumClasses) -> np.ndarray:
+        return self.calculator.calculate_final_grades_batch(
+            grades, self.effective_weights(grades, weights), hasReachedMinimumClasses
+        )
+
+    def calculate_details_batch(self, grades, weights, hasReachedMinimumClasses) -> BatchDetails:
+        return self.calculator.calculate_details_batch(
+            grades, self.effective_weights(grades, weights), hasReachedMinimumClasses
+        )
+
+    def _column_index(self, rule: EvaluationRule, num_evaluations: int):
+        # Un grupo contiguo se indexa con un slice: vistas en lugar de copias por indexado avanzado.
+        columns = self._columns(rule, num_evaluations)
+        if isinstance(columns, range):
+            return slice(columns.start, columns.stop)
+        if list(columns) == list(range(columns[0], columns[0] + len(columns))):
+            return slice(columns[0], columns[0] + len(columns))
+        return list(columns)
+
+    def _columns(self, rule: EvaluationRule, num_evaluations: int) -> Sequence[int]:
+        if rule.columns is None:
+            return range(num_evaluations)
+        if max(rule.columns) >= num_evaluations:
+            raise ValueError(f"La regla usa la evaluación {max(rule.columns)} pero solo hay {num_evaluations}")
+        return rule.columns
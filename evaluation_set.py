@@ -0,0 +1,64 @@
+from array import array
+from typing import Iterable, Iterator, List, Tuple
+import numpy as np
+from evaluation import Evaluation
+
+
+class EvaluationSet:
+    __slots__ = ("names", "grades", "weights")
+
+    def __init__(self, names: Iterable[str], grades: Iterable[float], weights: Iterable[float]):
+        names = tuple(names)
+        try:
+            grades = array("d", grades)
+        except TypeError:
+            raise ValueError("La nota debe ser un número")
+        try:
+            weights = array("d", weights)
+        except TypeError:
+            raise ValueError("El peso debe ser un número")
+
+        if not len(names) == len(grades) == len(weights):
+            raise ValueError("names, grades y weights deben tener la misma longitud")
+        for name in names:
+            if not name or not isinstance(name, str):
+                raise ValueError("El nombre de la evaluación debe ser una cadena no vacía")
+
+        grade_view = np.frombuffer(grades, dtype=np.float64)
+        weight_view = np.frombuffer(weights, dtype=np.float64)
+        if not np.all((grade_view >= Evaluation.MIN_GRADE) & (grade_view <= Evaluation.MAX_GRADE)):
+            raise ValueError(f"La nota debe estar entre {Evaluation.MIN_GRADE} y {Evaluation.MAX_GRADE}")
+        if not np.all((weight_view >= 0) & (weight_view <= 1)):
+            raise ValueError("El peso debe estar entre 0 y 1")
+
+        self.names = names
+        self.grades = grades
+        self.weights = weights
+
+    @classmethod
+    def from_evaluations(cls, evaluations: List[Evaluation]) -> "EvaluationSet":
+        return cls(
+            (evaluation.name for evaluation in evaluations),
+            (evaluation.grade for evaluation in evaluations),
+            (evaluation.weight for evaluation in evaluations)
+        )
+
+    def as_arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        # Vistas sin copia sobre los buffers contiguos.
+        return np.frombuffer(self.grades, dtype=np.float64), np.frombuffer(self.weights, dtype=np.float64)
+
+    def get_total_weighted_grade(self) -> float:
+        return sum(grade * weight for grade, weight in zip(self.grades, self.weights))
+
+    def get_total_weight(self) -> float:
+        return sum(self.weights)
+
+    def __len__(self) -> int:
+        return len(self.grades)
+
+    def __getitem__(self, index: int) -> Evaluation:
+        return Evaluation.from_validated(self.names[index], self.grades[index], self.weights[index])
+
+    def __iter__(self) -> Iterator[Evaluation]:
+        for name, grade, weight in zip(self.names, self.grades, self.weights):
+            yield Evaluation.from_validated(name, grade, weight)
@@ -1,6 +1,11 @@
-class ExtraPointsPolicy:
+from policy_engine import BonusRule, CompiledCurve
+
+
+class ExtraPointsPolicy(BonusRule):
     DEFAULT_EXTRA_POINTS = 2.0
 
+    __slots__ = ("allYearsTeachers", "extra_points")
+
     def __init__(self, allYearsTeachers: bool, extra_points: float = DEFAULT_EXTRA_POINTS):
         if not isinstance(allYearsTeachers, bool):
             raise ValueError("allYearsTeachers debe ser un valor booleano")
@@ -9,8 +14,14 @@ class ExtraPointsPolicy:
         if extra_points < 0:
             raise ValueError("Los puntos extra no pueden ser negativos")
 
-        self.allYearsTeachers = allYearsTeachers
-        self.extra_points = float(extra_points)
+        object.__setattr__(self, "allYearsTeachers", allYearsTeachers)
+        object.__setattr__(self, "extra_points", float(extra_points))
+
+    def _params(self) -> tuple:
+        return self.allYearsTeachers, self.extra_points
+
+    def compile(self) -> CompiledCurve:
+        return CompiledCurve.constant(self.calculate_extra_points())
 
-    def calculate_extra_points(self) -> float:
+    def calculate_extra_points(self, weighted_average: float = 0.0) -> float:
         return self.extra_points if self.allYearsTeachers else 0.0
@@ -0,0 +1,171 @@
+import math
+from typing import List, Tuple
+import numpy as np
+from evaluation import Evaluation
+from evaluation_set import EvaluationSet
+from grade_calculator import GradeCalculator
+from policy_engine import CompiledCurve
+
+
+HUNDREDTHS = 100
+BASIS_POINTS = 10_000
+
+
+class FixedPointGradeCalculator(GradeCalculator):
+    # Notas en centésimos y pesos en puntos básicos (enteros). El promedio es el cociente exacto S / D,
+    # con S = suma de nota * peso y D = max(peso total, 10000), redondeado a centésimos con la regla
+    # "mitad hacia arriba"; penalización y puntos extra son centésimos enteros y se suman sin error.
+    # Cada fila depende solo de sus enteros: el resultado no cambia al particionar la cohorte.
+    MIN_FINAL_HUNDREDTHS = round(GradeCalculator.MIN_FINAL_GRADE * HUNDREDTHS)
+    MAX_FINAL_HUNDREDTHS = round(GradeCalculator.MAX_FINAL_GRADE * HUNDREDTHS)
+
+    def calculate_final_grade_from_totals(self, total_weighted: float, total_weight: float,
+                                          hasReachedMinimumClasses: bool) -> float:
+        # Los totales en float se recuperan como enteros exactos: su error es muy inferior a una unidad.
+        attendance_penalty = to_hundredths(self.attendance_policy.calculate_penalty(hasReachedMinimumClasses))
+        weighted_total = round(total_weighted * HUNDREDTHS * BASIS_POINTS)
+        weight_total = round(total_weight * BASIS_POINTS)
+        return self._finish(weighted_total, weight_total, attendance_penalty)[3]
+
+    def calculate_final_grades_from_totals_batch(self, total_weighted, total_weight, hasReachedMinimumClasses) -> np.ndarray:
+        total_weighted = np.asarray(total_weighted, dtype=np.float64)
+        if total_weighted.ndim != 1:
+            raise ValueError("total_weighted debe tener un valor por estudiante")
+        total_weight = np.broadcast_to(np.asarray(total_weight, dtype=np.float64), total_weighted.shape)
+        attendance = self.attendance_policy.validate_attendance_batch(np.asarray(hasReachedMinimumClasses))
+        if attendance.shape != total_weighted.shape:
+            raise ValueError("hasReachedMinimumClasses debe tener un valor por estudiante")
+
+        weighted_total = np.rint(total_weighted * HUNDREDTHS * BASIS_POINTS).astype(np.int64)
+        weight_total = np.rint(total_weight * BASIS_POINTS).astype(np.int64)
+        return self._finish_batch(weighted_total, weight_total, attendance)[3] / HUNDREDTHS
+
+    def calculate_final_grades_fixed(self, grades, weights, hasReachedMinimumClasses) -> np.ndarray:
+        grades, weights, attendance = self._validate_fixed_batch(grades, weights, hasReachedMinimumClasses)
+        return self._compute_fixed_batch(grades, weights, attendance)[3]
+
+    def _compute(self, examsStudents: List[Evaluation], hasReachedMinimumClasses: bool) -> Tuple[float, float, float, float]:
+        self._validate_evaluations(examsStudents)
+        attendance_penalty = to_hundredths(self.attendance_policy.calculate_penalty(hasReachedMinimumClasses))
+
+        if isinstance(examsStudents, EvaluationSet):
+            pairs = zip(examsStudents.grades, examsStudents.weights)
+        else:
+            pairs = ((evaluation.grade, evaluation.weight) for evaluation in examsStudents)
+        weighted_total = 0
+        weight_total = 0
+        for grade, weight in pairs:
+            weight_points = to_basis_points(weight)
+            weighted_total += to_hundredths(grade) * weight_points
+            weight_total += weight_points
+
+        return self._finish(weighted_total, weight_total, attendance_penalty)
+
+    def _finish(self, weighted_total: int, weight_total: int, attendance_penalty: int) -> Tuple[float, float, float, float]:
+        divisor = max(weight_total, BASIS_POINTS)
+        extra_points = to_hundredths(self.extra_points_policy.calculate_extra_points(
+            weighted_total / (divisor * HUNDREDTHS)
+        ))
+        weighted_average = divide_half_up(weighted_total, divisor)
+        final_grade = weighted_average - attendance_penalty + extra_points
+        final_grade = max(self.MIN_FINAL_HUNDREDTHS, min(self.MAX_FINAL_HUNDREDTHS, final_grade))
+        return (
+            weighted_average / HUNDREDTHS,
+            attendance_penalty / HUNDREDTHS,
+            extra_points / HUNDREDTHS,
+            final_grade / HUNDREDTHS
+        )
+
+    def _compute_batch(self, grades, weights, hasReachedMinimumClasses) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        grades, weights, attendance = self._validate_batch(grades, weights, hasReachedMinimumClasses)
+        return tuple(
+            values / HUNDREDTHS
+            for values in self._compute_fixed_batch(to_hundredths(grades), to_basis_points(weights), attendance)
+        )
+
+    def _compute_fixed_batch(self, grades: np.ndarray, weights: np.ndarray,
+                             attendance: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        # La suma entera es exacta en cualquier orden: se puede reducir con einsum en lugar de columna a columna.
+        if weights.shape[0] == 1:
+            weighted_total = np.einsum("ij,j->i", grades, weights[0])
+        else:
+            weighted_total = np.einsum("ij,ij->i", grades, weights)
+        weight_total = np.einsum("ij->i", weights)
+        return self._finish_batch(weighted_total, weight_total, attendance)
+
+    def _finish_batch(self, weighted_total: np.ndarray, weight_total: np.ndarray,
+                      attendance: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        # Con divisor común (pesos compartidos o que no superan 1) la división usa un escalar.
+        if not np.any(weight_total > BASIS_POINTS):
+            divisor = BASIS_POINTS
+        elif weight_total.shape[0] == 1:
+            divisor = int(weight_total[0])
+        else:
+            divisor = np.maximum(weight_total, BASIS_POINTS)
+
+        attendance_penalty = _curve_to_hundredths(self.attendance_policy.compile(), attendance)
+        bonus_curve = self.extra_points_policy.compile()
+        if bonus_curve.is_constant:
+            extra_points = np.full(weighted_total.shape[0], to_hundredths(bonus_curve.fp[0]), dtype=np.int64)
+        else:
+            extra_points = _curve_to_hundredths(bonus_curve, weighted_total / (divisor * HUNDREDTHS))
+
+        weighted_average = divide_half_up(weighted_total, divisor)
+        final_grades = weighted_average - attendance_penalty
+        final_grades += extra_points
+        np.clip(final_grades, self.MIN_FINAL_HUNDREDTHS, self.MAX_FINAL_HUNDREDTHS, out=final_grades)
+        return weighted_average, attendance_penalty, extra_points, final_grades
+
+    def _validate_fixed_batch(self, grades, weights, hasReachedMinimumClasses):
+        grades = np.asarray(grades)
+        weights = np.asarray(weights)
+        if grades.dtype.kind not in "iu" or weights.dtype.kind not in "iu":
+            raise ValueError("grades y weights deben ser enteros (centésimos y puntos básicos)")
+        grades = grades.astype(np.int64, copy=False)
+        weights = weights.astype(np.int64, copy=False)
+
+        if grades.ndim != 2:
+            raise ValueError("grades debe ser una matriz (estudiantes x evaluaciones)")
+        if grades.shape[1] > self.max_evaluations:
+            raise ValueError(f"El número máximo de evaluaciones es {self.max_evaluations}")
+        if grades.shape[1] == 0:
+            raise ValueError("Debe haber al menos una evaluación")
+        if weights.ndim == 1:
+            weights = weights.reshape(1, -1)
+        if weights.ndim != 2 or weights.shape[1] != grades.shape[1] or weights.shape[0] not in (1, grades.shape[0]):
+            raise ValueError("weights debe ser un vector compartido o una matriz con la misma forma que grades")
+        attendance = self.attendance_policy.validate_attendance_batch(np.asarray(hasReachedMinimumClasses))
+        if attendance.shape != (grades.shape[0],):
+            raise ValueError("hasReachedMinimumClasses debe tener un valor por estudiante")
+        if not np.all((grades >= to_hundredths(Evaluation.MIN_GRADE)) & (grades <= to_hundredths(Evaluation.MAX_GRADE))):
+            raise ValueError(f"La nota debe estar entre {Evaluation.MIN_GRADE} y {Evaluation.MAX_GRADE}")
+        if not np.all((weights >= 0) & (weights <= BASIS_POINTS)):
+            raise ValueError("El peso debe estar entre 0 y 1")
+
+        return grades, weights, attendance
+
+
+def to_hundredths(value):
+    # Conversión con "mitad hacia arriba" también para los valores de entrada.
+    if isinstance(value, np.ndarray):
+        return np.floor(value * HUNDREDTHS + 0.5).astype(np.int64)
+    return math.floor(value * HUNDREDTHS + 0.5)
+
+
+def to_basis_points(value):
+    if isinstance(value, np.ndarray):
+        return np.floor(value * BASIS_POINTS + 0.5).astype(np.int64)
+    return math.floor(value * BASIS_POINTS + 0.5)
+
+
+def _curve_to_hundredths(curve: CompiledCurve, values: np.ndarray) -> np.ndarray:
+    # Las curvas escalonadas se consultan sobre una tabla ya convertida a centésimos.
+    if curve.kind == CompiledCurve.STEP:
+        table = np.array([to_hundredths(value) for value in curve.fp], dtype=np.int64)
+        return table[np.searchsorted(np.array(curve.xp), values, side="right")]
+    return to_hundredths(curve.apply(values))
+
+
+def divide_half_up(numerator, denominator):
+    # floor(n / d + 1/2) en aritmética entera, para d > 0 y cualquier signo de n.
+    return (2 * numerator + denominator) // (2 * denominator)
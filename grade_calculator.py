@@ -1,7 +1,14 @@
-from typing import List, Dict, Any
+from collections import namedtuple
+from typing import List, Tuple
+import numpy as np
 from evaluation import Evaluation
-from attendance_policy import AttendancePolicy
-from extra_points_policy import ExtraPointsPolicy
+from evaluation_set import EvaluationSet
+from validated_evaluations import ValidatedEvaluations
+from policy_engine import PenaltyRule, BonusRule
+from calculation_result import CalculationResult
+
+
+BatchDetails = namedtuple("BatchDetails", ["weighted_average", "attendance_penalty", "extra_points", "final_grade"])
 
 
 class GradeCalculator:
@@ -9,77 +16,177 @@ class GradeCalculator:
     MAX_FINAL_GRADE = 20.0
     MIN_FINAL_GRADE = 0.0
 
-    def __init__(self, attendance_policy: AttendancePolicy, extra_points_policy: ExtraPointsPolicy):
-        if not isinstance(attendance_policy, AttendancePolicy):
-            raise ValueError("attendance_policy debe ser una instancia de AttendancePolicy")
-        if not isinstance(extra_points_policy, ExtraPointsPolicy):
-            raise ValueError("extra_points_policy debe ser una instancia de ExtraPointsPolicy")
+    def __init__(self, attendance_policy: PenaltyRule, extra_points_policy: BonusRule,
+                 max_evaluations: int = MAX_EVALUATIONS):
+        # AttendancePolicy y ExtraPointsPolicy son los casos básicos de PenaltyRule y BonusRule.
+        if not isinstance(attendance_policy, PenaltyRule):
+            raise ValueError("attendance_policy debe ser una instancia de AttendancePolicy o PenaltyRule")
+        if not isinstance(extra_points_policy, BonusRule):
+            raise ValueError("extra_points_policy debe ser una instancia de ExtraPointsPolicy o BonusRule")
+        if isinstance(max_evaluations, bool) or not isinstance(max_evaluations, int) or max_evaluations < 1:
+            raise ValueError("max_evaluations debe ser un entero positivo")
 
         self.attendance_policy = attendance_policy
         self.extra_points_policy = extra_points_policy
+        # MAX_EVALUATIONS es el límite por defecto; cada calculador puede usar el suyo.
+        self.max_evaluations = max_evaluations
 
     def calculate_final_grade(self, examsStudents: List[Evaluation], hasReachedMinimumClasses: bool) -> float:
-        self._validate_evaluations(examsStudents)
+        return self._compute(examsStudents, hasReachedMinimumClasses)[3]
+
+    def get_calculation_details(self, examsStudents: List[Evaluation], hasReachedMinimumClasses: bool) -> CalculationResult:
+        weighted_average, attendance_penalty, extra_points, final_grade = self._compute(
+            examsStudents, hasReachedMinimumClasses
+        )
+
+        return CalculationResult(
+            weighted_average=round(weighted_average, 2),
+            attendance_penalty=round(attendance_penalty, 2),
+            extra_points=round(extra_points, 2),
+            final_grade=final_grade,
+            hasReachedMinimumClasses=hasReachedMinimumClasses,
+            examsStudents=examsStudents
+        )
+
+    def calculate_final_grade_from_totals(self, total_weighted: float, total_weight: float,
+                                          hasReachedMinimumClasses: bool) -> float:
+        attendance_penalty = self.attendance_policy.calculate_penalty(hasReachedMinimumClasses)
+        weighted_average = self._weighted_average_from_totals(total_weighted, total_weight)
+        return self._apply_policies(weighted_average, attendance_penalty)[1]
 
-        if not isinstance(hasReachedMinimumClasses, bool):
-            raise ValueError("hasReachedMinimumClasses debe ser un valor booleano")
+    def _compute(self, examsStudents: List[Evaluation], hasReachedMinimumClasses: bool) -> Tuple[float, float, float, float]:
+        self._validate_evaluations(examsStudents)
+        attendance_penalty = self.attendance_policy.calculate_penalty(hasReachedMinimumClasses)
 
         weighted_average = self._calculate_weighted_average(examsStudents)
-        attendance_penalty = self.attendance_policy.calculate_penalty(hasReachedMinimumClasses)
-        extra_points = self.extra_points_policy.calculate_extra_points()
+        extra_points, final_grade = self._apply_policies(weighted_average, attendance_penalty)
 
-        final_grade = weighted_average - attendance_penalty + extra_points
-        final_grade = max(self.MIN_FINAL_GRADE, min(self.MAX_FINAL_GRADE, final_grade))
+        return weighted_average, attendance_penalty, extra_points, final_grade
 
-        return round(final_grade, 2)
+    def _apply_policies(self, weighted_average: float, attendance_penalty: float) -> Tuple[float, float]:
+        extra_points = self.extra_points_policy.calculate_extra_points(weighted_average)
+        return extra_points, self._clamp_and_round(weighted_average - attendance_penalty + extra_points)
 
-    def get_calculation_details(self, examsStudents: List[Evaluation], hasReachedMinimumClasses: bool) -> Dict[str, Any]:
-        self._validate_evaluations(examsStudents)
+    def _clamp_and_round(self, final_grade: float) -> float:
+        return round(max(self.MIN_FINAL_GRADE, min(self.MAX_FINAL_GRADE, final_grade)), 2)
 
-        weighted_average = self._calculate_weighted_average(examsStudents)
-        attendance_penalty = self.attendance_policy.calculate_penalty(hasReachedMinimumClasses)
-        extra_points = self.extra_points_policy.calculate_extra_points()
-        final_grade = self.calculate_final_grade(examsStudents, hasReachedMinimumClasses)
-
-        evaluations_detail = [
-            {
-                "name": evaluation.name,
-                "grade": evaluation.grade,
-                "weight": evaluation.weight,
-                "weighted_grade": evaluation.get_weighted_grade()
-            }
-            for evaluation in examsStudents
-        ]
-
-        return {
-            "weighted_average": round(weighted_average, 2),
-            "attendance_penalty": round(attendance_penalty, 2),
-            "extra_points": round(extra_points, 2),
-            "final_grade": final_grade,
-            "hasReachedMinimumClasses": hasReachedMinimumClasses,
-            "evaluations_detail": evaluations_detail,
-            "total_evaluations": len(examsStudents)
-        }
+    def calculate_final_grades_batch(self, grades, weights, hasReachedMinimumClasses) -> np.ndarray:
+        return self._compute_batch(grades, weights, hasReachedMinimumClasses)[3]
+
+    def calculate_details_batch(self, grades, weights, hasReachedMinimumClasses) -> BatchDetails:
+        weighted_average, attendance_penalty, extra_points, final_grades = self._compute_batch(
+            grades, weights, hasReachedMinimumClasses
+        )
+        return BatchDetails(
+            _round_grades(weighted_average), _round_grades(attendance_penalty), _round_grades(extra_points), final_grades
+        )
+
+    def calculate_final_grades_from_totals_batch(self, total_weighted, total_weight, hasReachedMinimumClasses) -> np.ndarray:
+        total_weighted = np.asarray(total_weighted, dtype=np.float64)
+        if total_weighted.ndim != 1:
+            raise ValueError("total_weighted debe tener un valor por estudiante")
+        total_weight = np.broadcast_to(np.asarray(total_weight, dtype=np.float64), total_weighted.shape)
+        attendance = self.attendance_policy.validate_attendance_batch(np.asarray(hasReachedMinimumClasses))
+        if attendance.shape != total_weighted.shape:
+            raise ValueError("hasReachedMinimumClasses debe tener un valor por estudiante")
+
+        weighted_average = self._weighted_average_from_totals_batch(total_weighted, total_weight)
+        return self._apply_policies_batch(weighted_average, attendance)[2]
+
+    def _compute_batch(self, grades, weights, hasReachedMinimumClasses) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        grades, weights, attendance = self._validate_batch(grades, weights, hasReachedMinimumClasses)
+        weighted_average = self._calculate_weighted_average_batch(grades, weights)
+        return (weighted_average,) + self._apply_policies_batch(weighted_average, attendance)
+
+    def _apply_policies_batch(self, weighted_average: np.ndarray, attendance: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        attendance_penalty = self.attendance_policy.compile().apply(attendance)
+        extra_points = self.extra_points_policy.compile().apply(weighted_average)
+
+        final_grades = weighted_average - attendance_penalty + extra_points
+        final_grades = np.maximum(self.MIN_FINAL_GRADE, np.minimum(self.MAX_FINAL_GRADE, final_grades))
+
+        return attendance_penalty, extra_points, _round_grades(final_grades)
 
     def _calculate_weighted_average(self, examsStudents: List[Evaluation]) -> float:
         if not examsStudents:
             return 0.0
 
-        total_weighted = sum(evaluation.get_weighted_grade() for evaluation in examsStudents)
-        total_weight = sum(evaluation.weight for evaluation in examsStudents)
+        if isinstance(examsStudents, EvaluationSet):
+            total_weighted = examsStudents.get_total_weighted_grade()
+            total_weight = examsStudents.get_total_weight()
+        else:
+            total_weighted = sum(evaluation.get_weighted_grade() for evaluation in examsStudents)
+            total_weight = sum(evaluation.weight for evaluation in examsStudents)
+
+        return self._weighted_average_from_totals(total_weighted, total_weight)
 
+    def _weighted_average_from_totals(self, total_weighted: float, total_weight: float) -> float:
         if total_weight > 0:
             return total_weighted / total_weight * (total_weight if total_weight <= 1 else 1)
 
         return 0.0
 
+    def _calculate_weighted_average_batch(self, grades: np.ndarray, weights: np.ndarray) -> np.ndarray:
+        # Se acumula columna por columna para sumar en el mismo orden que sum() en la ruta escalar.
+        total_weighted = np.zeros(grades.shape[0])
+        total_weight = np.zeros(weights.shape[0])
+        for column in range(grades.shape[1]):
+            total_weighted += grades[:, column] * weights[:, column]
+            total_weight += weights[:, column]
+        return self._weighted_average_from_totals_batch(total_weighted, total_weight)
+
+    def _weighted_average_from_totals_batch(self, total_weighted: np.ndarray, total_weight: np.ndarray) -> np.ndarray:
+        scale = np.where(total_weight <= 1, total_weight, 1.0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            weighted_average = total_weighted / total_weight * scale
+        return np.where(total_weight > 0, weighted_average, 0.0)
+
     def _validate_evaluations(self, examsStudents: List[Evaluation]) -> None:
-        if not isinstance(examsStudents, list):
-            raise ValueError("examsStudents debe ser una lista")
-        if len(examsStudents) > self.MAX_EVALUATIONS:
-            raise ValueError(f"El número máximo de evaluaciones es {self.MAX_EVALUATIONS}")
+        if not isinstance(examsStudents, (list, EvaluationSet, ValidatedEvaluations)):
+            raise ValueError("examsStudents debe ser una lista, un EvaluationSet o un ValidatedEvaluations")
+        if len(examsStudents) > self.max_evaluations:
+            raise ValueError(f"El número máximo de evaluaciones es {self.max_evaluations}")
         if len(examsStudents) == 0:
             raise ValueError("Debe haber al menos una evaluación")
+        if not isinstance(examsStudents, list):
+            # EvaluationSet y ValidatedEvaluations ya validaron sus elementos al construirse.
+            return
         for evaluation in examsStudents:
             if not isinstance(evaluation, Evaluation):
                 raise ValueError("Todos los elementos deben ser instancias de Evaluation")
+
+    def _validate_batch(self, grades, weights, hasReachedMinimumClasses):
+        grades = np.asarray(grades, dtype=np.float64)
+        weights = np.asarray(weights, dtype=np.float64)
+        attendance = np.asarray(hasReachedMinimumClasses)
+
+        if grades.ndim != 2:
+            raise ValueError("grades debe ser una matriz (estudiantes x evaluaciones)")
+        if grades.shape[1] > self.max_evaluations:
+            raise ValueError(f"El número máximo de evaluaciones es {self.max_evaluations}")
+        if grades.shape[1] == 0:
+            raise ValueError("Debe haber al menos una evaluación")
+        if weights.ndim == 1:
+            weights = weights.reshape(1, -1)
+        if weights.ndim != 2 or weights.shape[1] != grades.shape[1] or weights.shape[0] not in (1, grades.shape[0]):
+            raise ValueError("weights debe ser un vector compartido o una matriz con la misma forma que grades")
+        attendance = self.attendance_policy.validate_attendance_batch(attendance)
+        if attendance.shape != (grades.shape[0],):
+            raise ValueError("hasReachedMinimumClasses debe tener un valor por estudiante")
+        if not np.all((grades >= Evaluation.MIN_GRADE) & (grades <= Evaluation.MAX_GRADE)):
+            raise ValueError(f"La nota debe estar entre {Evaluation.MIN_GRADE} y {Evaluation.MAX_GRADE}")
+        if not np.all((weights >= 0) & (weights <= 1)):
+            raise ValueError("El peso debe estar entre 0 y 1")
+
+        return grades, weights, attendance
+
+
+def _round_grades(values: np.ndarray) -> np.ndarray:
+    # np.round escala por 100 y puede diferir de round() cuando el valor queda cerca de
+    # un empate (x.xx5); esos casos se resuelven con round() para igualar la ruta escalar.
+    rounded = np.round(values, 2)
+    scaled = values * 100
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    for index in np.flatnonzero(near_tie):
+        rounded[index] = round(float(values[index]), 2)
+    return rounded
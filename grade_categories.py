@@ -0,0 +1,210 @@
+from typing import Dict, List, Mapping, Sequence
+import numpy as np
+from evaluation import Evaluation
+from grade_calculator import GradeCalculator
+
+
+class GradeCategory:
+    # Nodo del temario: una categoría con hijos (Laboratorios, Exámenes) o, sin hijos, una evaluación.
+    # El peso es relativo a los hermanos y sigue la misma regla que las evaluaciones planas.
+    __slots__ = ("name", "weight", "children")
+
+    def __init__(self, name: str, weight: float = 1.0, children: Sequence["GradeCategory"] = ()):
+        if not name or not isinstance(name, str):
+            raise ValueError("El nombre de la categoría debe ser una cadena no vacía")
+        if isinstance(weight, bool) or not isinstance(weight, (int, float)):
+            raise ValueError("El peso debe ser un número")
+        if weight < 0 or weight > 1:
+            raise ValueError("El peso debe estar entre 0 y 1")
+        children = tuple(children)
+        if not all(isinstance(child, GradeCategory) for child in children):
+            raise ValueError("Los hijos deben ser instancias de GradeCategory")
+
+        self.name = name
+        self.weight = float(weight)
+        self.children = children
+
+    @property
+    def is_evaluation(self) -> bool:
+        return not self.children
+
+
+class Syllabus:
+    # Temario compilado a arreglos planos (preorden): padre, hijos y peso total de cada nodo. En preorden
+    # los hijos tienen índices mayores que su padre, así que recorrer los índices al revés reduce de
+    # las hojas hacia la raíz.
+    def __init__(self, root: GradeCategory):
+        if not isinstance(root, GradeCategory):
+            raise ValueError("root debe ser una instancia de GradeCategory")
+        if root.is_evaluation:
+            raise ValueError("El temario debe tener al menos una evaluación")
+
+        self.root = root
+        self.names: List[str] = []
+        self.weights: List[float] = []
+        self.parents: List[int] = []
+        self.children: List[List[int]] = []
+        self._add(root, -1)
+
+        self.index: Dict[str, int] = {}
+        for node, name in enumerate(self.names):
+            if name in self.index:
+                raise ValueError(f"El nombre {name} está repetido en el temario")
+            self.index[name] = node
+
+        self.total_weights = [sum(self.weights[child] for child in children) for children in self.children]
+        self.evaluation_nodes = [node for node, children in enumerate(self.children) if not children]
+        self.evaluation_names = [self.names[node] for node in self.evaluation_nodes]
+        self.category_nodes = [node for node, children in enumerate(self.children) if children]
+
+    @property
+    def num_evaluations(self) -> int:
+        return len(self.evaluation_nodes)
+
+    def path_to_root(self, name: str) -> List[int]:
+        node = self._node(name)
+        path = []
+        while self.parents[node] >= 0:
+            node = self.parents[node]
+            path.append(node)
+        return path
+
+    def _node(self, name: str) -> int:
+        if name not in self.index:
+            raise ValueError(f"La categoría {name} no existe en el temario")
+        return self.index[name]
+
+    def _add(self, category: GradeCategory, parent: int) -> None:
+        node = len(self.names)
+        self.names.append(category.name)
+        self.weights.append(category.weight if parent >= 0 else 1.0)
+        self.parents.append(parent)
+        self.children.append([])
+        if parent >= 0:
+            self.children[parent].append(node)
+        for child in category.children:
+            self._add(child, node)
+
+
+class CategoryGrades:
+    # Notas de un estudiante sobre el temario. Cada categoría guarda en caché su suma ponderada y su
+    # promedio: al cambiar una nota solo se recalcula el camino hasta la raíz, con la suma completa
+    # de los hijos de cada ancestro (sin deltas que acumulen error).
+    def __init__(self, calculator: "CategoryGradeCalculator", grades: Mapping[str, float],
+                 hasReachedMinimumClasses: bool):
+        syllabus = calculator.syllabus
+        unknown = set(grades) - set(syllabus.evaluation_names)
+        if unknown:
+            raise ValueError(f"Evaluaciones fuera del temario: {', '.join(sorted(map(str, unknown)))}")
+        missing = [name for name in syllabus.evaluation_names if name not in grades]
+        if missing:
+            raise ValueError(f"Falta la nota de {', '.join(missing)}")
+
+        self.calculator = calculator
+        self.syllabus = syllabus
+        self.scores = [0.0] * len(syllabus.names)
+        self.weighted_totals = [0.0] * len(syllabus.names)
+        self.recomputations = 0
+        for name in syllabus.evaluation_names:
+            self.scores[syllabus.index[name]] = _validate_grade(grades[name])
+        for node in reversed(syllabus.category_nodes):
+            self._recompute(node)
+        self.set_attendance(hasReachedMinimumClasses)
+
+    def set_grade(self, name: str, grade: float) -> float:
+        node = self.syllabus._node(name)
+        if self.syllabus.children[node]:
+            raise ValueError(f"{name} es una categoría, no una evaluación")
+        self.scores[node] = _validate_grade(grade)
+        for ancestor in self.syllabus.path_to_root(name):
+            self._recompute(ancestor)
+        return self.final_grade()
+
+    def set_attendance(self, hasReachedMinimumClasses: bool) -> float:
+        self.calculator.calculator.attendance_policy.calculate_penalty(hasReachedMinimumClasses)
+        self.hasReachedMinimumClasses = hasReachedMinimumClasses
+        return self.final_grade()
+
+    def score(self, name: str) -> float:
+        return self.scores[self.syllabus._node(name)]
+
+    def category_scores(self) -> Dict[str, float]:
+        return {self.syllabus.names[node]: round(self.scores[node], 2) for node in self.syllabus.category_nodes}
+
+    def final_grade(self) -> float:
+        return self.calculator.calculator.calculate_final_grade_from_totals(
+            self.weighted_totals[0], self.syllabus.total_weights[0], self.hasReachedMinimumClasses
+        )
+
+    def _recompute(self, node: int) -> None:
+        weights = self.syllabus.weights
+        total_weighted = sum(weights[child] * self.scores[child] for child in self.syllabus.children[node])
+        self.weighted_totals[node] = total_weighted
+        self.scores[node] = self.calculator.calculator._weighted_average_from_totals(
+            total_weighted, self.syllabus.total_weights[node]
+        )
+        self.recomputations += 1
+
+
+class CategoryGradeCalculator:
+    # Conecta el temario con GradeCalculator: cada categoría es un promedio ponderado de sus hijos y la
+    # raíz pasa por las mismas reglas de penalidad, puntos extra, recorte y redondeo. La ruta por lotes
+    # reduce columna por columna en el mismo orden que la ruta escalar, así que ambas coinciden.
+    def __init__(self, calculator: GradeCalculator, syllabus: Syllabus):
+        if not isinstance(calculator, GradeCalculator):
+            raise ValueError("calculator debe ser una instancia de GradeCalculator")
+        if not isinstance(syllabus, Syllabus):
+            raise ValueError("syllabus debe ser una instancia de Syllabus")
+        if syllabus.num_evaluations > calculator.max_evaluations:
+            raise ValueError(f"El temario tiene {syllabus.num_evaluations} evaluaciones; "
+                             f"el máximo es {calculator.max_evaluations}")
+
+        self.calculator = calculator
+        self.syllabus = syllabus
+
+    def student(self, grades: Mapping[str, float], hasReachedMinimumClasses: bool) -> CategoryGrades:
+        return CategoryGrades(self, grades, hasReachedMinimumClasses)
+
+    def calculate_final_grade(self, grades: Mapping[str, float], hasReachedMinimumClasses: bool) -> float:
+        return self.student(grades, hasReachedMinimumClasses).final_grade()
+
+    def calculate_final_grades_batch(self, grades, hasReachedMinimumClasses) -> np.ndarray:
+        # grades: matriz (estudiantes x evaluaciones) en el orden de syllabus.evaluation_names.
+        weighted_totals, _ = self._reduce_batch(grades)
+        return self.calculator.calculate_final_grades_from_totals_batch(
+            weighted_totals[0], self.syllabus.total_weights[0], hasReachedMinimumClasses
+        )
+
+    def category_scores_batch(self, grades) -> Dict[str, np.ndarray]:
+        _, scores = self._reduce_batch(grades)
+        return {self.syllabus.names[node]: np.round(scores[node], 2) for node in self.syllabus.category_nodes}
+
+    def _reduce_batch(self, grades):
+        grades = np.asarray(grades, dtype=np.float64)
+        if grades.ndim != 2 or grades.shape[1] != self.syllabus.num_evaluations:
+            raise ValueError(f"grades debe ser una matriz con {self.syllabus.num_evaluations} columnas "
+                             f"(una por evaluación del temario)")
+        if not np.all((grades >= Evaluation.MIN_GRADE) & (grades <= Evaluation.MAX_GRADE)):
+            raise ValueError(f"La nota debe estar entre {Evaluation.MIN_GRADE} y {Evaluation.MAX_GRADE}")
+
+        # Traspuesta contigua: cada evaluación es una fila y las columnas de la cohorte se leen sin saltos.
+        columns = np.ascontiguousarray(grades.T)
+        scores: Dict[int, np.ndarray] = dict(zip(self.syllabus.evaluation_nodes, columns))
+        weighted_totals: Dict[int, np.ndarray] = {}
+        for node in reversed(self.syllabus.category_nodes):
+            total_weighted = np.zeros(grades.shape[0])
+            for child in self.syllabus.children[node]:
+                total_weighted += self.syllabus.weights[child] * scores[child]
+            weighted_totals[node] = total_weighted
+            scores[node] = self.calculator._weighted_average_from_totals_batch(
+                total_weighted, self.syllabus.total_weights[node]
+            )
+        return weighted_totals, scores
+
+
+def _validate_grade(grade: float) -> float:
+    if isinstance(grade, bool) or not isinstance(grade, (int, float)):
+        raise ValueError("La nota debe ser un número")
+    if grade < Evaluation.MIN_GRADE or grade > Evaluation.MAX_GRADE:
+        raise ValueError(f"La nota debe estar entre {Evaluation.MIN_GRADE} y {Evaluation.MAX_GRADE}")
+    return float(grade)
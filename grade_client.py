@@ -0,0 +1,104 @@
+import argparse
+import json
+import socket
+import sys
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+# Solo biblioteca estándar: el cliente arranca sin importar NumPy ni el calculador.
+DEFAULT_SOCKET_PATH = "/tmp/grade_calculator.sock"
+
+
+class GradeClient:
+    # Ventana de pipelining: se envían hasta N solicitudes antes de leer sus respuestas, para que
+    # ninguno de los dos extremos se bloquee con el buffer del socket lleno.
+    PIPELINE_WINDOW = 512
+
+    def __init__(self, path: str = DEFAULT_SOCKET_PATH, timeout: Optional[float] = None):
+        self.path = path
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._socket.settimeout(timeout)
+        try:
+            self._socket.connect(path)
+        except OSError:
+            self._socket.close()
+            raise
+        self._reader = self._socket.makefile("rb")
+
+    def request(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        return self.request_many([payload])[0]
+
+    def request_many(self, payloads: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return [json.loads(line) for line in self.send_lines(_encode(payload) for payload in payloads)]
+
+    def send_lines(self, lines: Iterable[bytes]) -> List[bytes]:
+        lines = [line if line.endswith(b"\n") else line + b"\n" for line in lines]
+        if any(b"\n" in line[:-1] for line in lines):
+            raise ValueError("Cada solicitud debe ocupar una sola línea")
+        responses = []
+        for start in range(0, len(lines), self.PIPELINE_WINDOW):
+            window = lines[start:start + self.PIPELINE_WINDOW]
+            self._socket.sendall(b"".join(window))
+            for _ in window:
+                responses.append(self._read_line())
+        return responses
+
+    def calculate(self, evaluations: Sequence[Dict[str, Any]], hasReachedMinimumClasses,
+                  details: bool = False):
+        response = self.request({
+            "hasReachedMinimumClasses": hasReachedMinimumClasses,
+            "evaluations": list(evaluations),
+            "details": details
+        })
+        if not response["ok"]:
+            raise ValueError(response["error"])
+        return response if details else response["final_grade"]
+
+    def close(self) -> None:
+        self._reader.close()
+        self._socket.close()
+
+    def __enter__(self) -> "GradeClient":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def _read_line(self) -> bytes:
+        line = self._reader.readline()
+        if not line:
+            raise ConnectionError("El daemon cerró la conexión")
+        return line
+
+
+def _encode(payload: Dict[str, Any]) -> bytes:
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8") + b"\n"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Cliente del daemon de CS-GradeCalculator")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET_PATH, help=f"Socket del daemon [default: {DEFAULT_SOCKET_PATH}]")
+    parser.add_argument("requests", nargs="*", metavar="JSON",
+                        help="Solicitudes JSON; sin argumentos se lee una por línea de la entrada estándar")
+    args = parser.parse_args(argv)
+
+    # Las líneas viajan tal cual: el daemon valida y responde los errores en la misma posición.
+    if args.requests:
+        lines = [request.encode("utf-8") for request in args.requests]
+    else:
+        lines = [line.rstrip(b"\r\n") for line in sys.stdin.buffer if line.strip()]
+    try:
+        with GradeClient(args.socket) as client:
+            responses = client.send_lines(lines)
+    except ValueError as error:
+        print(f"Error: {error}", file=sys.stderr)
+        return 1
+    except OSError as error:
+        print(f"Error: no se pudo contactar al daemon en {args.socket}: {error}", file=sys.stderr)
+        return 1
+
+    sys.stdout.buffer.write(b"".join(responses))
+    return 0 if all(json.loads(response)["ok"] for response in responses) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+from collections import namedtuple
+from typing import Callable, Dict, Hashable, Iterable, Iterator, Optional, Sequence
+import numpy as np
+from grade_calculator import GradeCalculator, _round_grades
+from cohort_statistics import CohortStatistics, SectionStatistics
+
+
+CurveParameters = namedtuple("CurveParameters", ["count", "mean", "std", "scale", "offset"])
+
+
+class GradeCurve:
+    # Curva lineal a media y desviación objetivo: nota' = offset + scale * nota, recortada a 0-20 y
+    # redondeada a centésimos. Primera pasada: estadísticas suficientes (n, media, M2) por tramos;
+    # segunda pasada: se transforma cada tramo al vuelo. La memoria no depende del tamaño de la cohorte.
+    def __init__(self, target_mean: float, target_std: float):
+        if not GradeCalculator.MIN_FINAL_GRADE <= target_mean <= GradeCalculator.MAX_FINAL_GRADE:
+            raise ValueError(f"La media objetivo debe estar entre {GradeCalculator.MIN_FINAL_GRADE} "
+                             f"y {GradeCalculator.MAX_FINAL_GRADE}")
+        if target_std < 0:
+            raise ValueError("La desviación objetivo no puede ser negativa")
+
+        self.target_mean = float(target_mean)
+        self.target_std = float(target_std)
+        self.statistics = SectionStatistics()
+        self.parameters: Optional[CurveParameters] = None
+        self.section_parameters: Dict[Hashable, CurveParameters] = {}
+
+    @property
+    def fitted(self) -> bool:
+        return self.parameters is not None
+
+    def observe(self, final_grades, sections: Optional[Sequence[Hashable]] = None) -> "GradeCurve":
+        if self.fitted:
+            raise ValueError("La curva ya fue ajustada; no se pueden agregar más notas")
+        self.statistics.update(final_grades, sections)
+        return self
+
+    def fit(self) -> "GradeCurve":
+        if self.statistics.overall.count == 0:
+            raise ValueError("No hay notas para ajustar la curva")
+        self.parameters = self._fit(self.statistics.overall)
+        self.section_parameters = {key: self._fit(statistics) for key, statistics in self.statistics.sections.items()}
+        return self
+
+    def apply(self, final_grades, sections: Optional[Sequence[Hashable]] = None) -> np.ndarray:
+        # Con secciones, cada nota usa la curva de su sección; sin ellas, la curva de toda la cohorte.
+        if not self.fitted:
+            raise ValueError("La curva no ha sido ajustada: llame a fit() antes de apply()")
+        grades = np.asarray(final_grades, dtype=np.float64).ravel()
+        if not np.all((grades >= GradeCalculator.MIN_FINAL_GRADE) & (grades <= GradeCalculator.MAX_FINAL_GRADE)):
+            raise ValueError(f"La nota final debe estar entre {GradeCalculator.MIN_FINAL_GRADE} "
+                             f"y {GradeCalculator.MAX_FINAL_GRADE}")
+
+        if sections is None:
+            curved = self.parameters.offset + self.parameters.scale * grades
+        else:
+            labels = np.asarray(sections)
+            if labels.shape != grades.shape:
+                raise ValueError("sections debe tener una sección por nota")
+            keys, inverse = np.unique(labels, return_inverse=True)
+            parameters = []
+            for key in keys.tolist():
+                if key not in self.section_parameters:
+                    raise ValueError(f"La sección {key} no tiene curva ajustada")
+                parameters.append(self.section_parameters[key])
+            scales = np.array([parameter.scale for parameter in parameters])
+            offsets = np.array([parameter.offset for parameter in parameters])
+            curved = offsets[inverse] + scales[inverse] * grades
+
+        np.clip(curved, GradeCalculator.MIN_FINAL_GRADE, GradeCalculator.MAX_FINAL_GRADE, out=curved)
+        return _round_grades(curved)
+
+    def curve_stream(self, chunks: Callable[[], Iterable]) -> Iterator[np.ndarray]:
+        # chunks() debe poder recorrerse dos veces (p. ej. lambda: gradebook.iter_final_grades(calculator));
+        # cada tramo es un arreglo de notas finales o un par (notas, secciones).
+        for chunk in chunks():
+            self.observe(*_unpack(chunk))
+        self.fit()
+        for chunk in chunks():
+            yield self.apply(*_unpack(chunk))
+
+    def to_dict(self) -> Dict[str, object]:
+        if not self.fitted:
+            raise ValueError("La curva no ha sido ajustada: llame a fit() antes de to_dict()")
+        return {
+            "target_mean": self.target_mean,
+            "target_std": self.target_std,
+            "overall": self.parameters._asdict(),
+            "sections": {key: parameters._asdict() for key, parameters in sorted(self.section_parameters.items())}
+        }
+
+    def _fit(self, statistics: CohortStatistics) -> CurveParameters:
+        # Sin dispersión no hay escala definida: toda la cohorte pasa a la media objetivo.
+        scale = self.target_std / statistics.std if statistics.std > 0 else 0.0
+        return CurveParameters(statistics.count, statistics.mean, statistics.std, scale,
+                               self.target_mean - scale * statistics.mean)
+
+
+def _unpack(chunk):
+    return chunk if isinstance(chunk, tuple) else (chunk,)
@@ -0,0 +1,499 @@
+import json
+import math
+import os
+import struct
+import time
+import zlib
+from collections import namedtuple
+from itertools import islice
+from typing import BinaryIO, Dict, Iterator, List, Optional, Set, Tuple
+import numpy as np
+from attendance_policy import AttendancePolicy
+from evaluation import Evaluation
+from extra_points_policy import ExtraPointsPolicy
+from grade_calculator import GradeCalculator
+from policy_engine import AttendanceCurvePolicy, BonusRule, PenaltyRule, TieredExtraPointsPolicy
+
+
+GradeEvent = namedtuple("GradeEvent", ["sequence", "timestamp", "kind", "student_id", "name", "value"])
+
+EVALUATION_ADDED = 1
+GRADE_CORRECTED = 2
+ATTENDANCE_CHANGED = 3
+POLICY_CHANGED = 4
+
+LOG_MAGIC = b"GRLG"
+SNAPSHOT_MAGIC = b"GRSN"
+VERSION = 1
+SNAPSHOT_EXTENSION = ".snap"
+# Cabecera del log: magic y versión. Cada evento va enmarcado con la longitud y el CRC32 de su cuerpo;
+# un registro que se corta en el fin del archivo (escritura interrumpida) se descarta, pero un registro
+# completo con CRC inválido es corrupción y se rechaza sin tocar el archivo.
+_LOG_HEADER = struct.Struct("<4sH")
+_FRAME = struct.Struct("<II")
+# Cuerpo más largo posible: cabecera, dos textos de hasta 65535 bytes y los campos numéricos.
+_MAX_BODY = 1 + 8 + 8 + 2 + 65535 + 2 + 65535 + 16
+# Cuerpo: tipo, secuencia, marca de tiempo y longitud del primer texto (código o política), seguidos
+# de ese texto y de los campos propios del tipo.
+_EVENT = struct.Struct("<BQdH")
+_EVENT_KINDS = (EVALUATION_ADDED, GRADE_CORRECTED, ATTENDANCE_CHANGED, POLICY_CHANGED)
+_TEXT_LENGTH = struct.Struct("<H")
+_GRADE_WEIGHT = struct.Struct("<dd")
+_GRADE = struct.Struct("<d")
+_ATTENDANCE = struct.Struct("<?d")
+# magic, versión, secuencia, offset en el log, marca de tiempo, estudiantes, evaluaciones
+_SNAPSHOT_HEADER = struct.Struct("<4sHQQdQQ")
+_POLICY_TYPES = {
+    policy.__name__: policy
+    for policy in (AttendancePolicy, ExtraPointsPolicy, AttendanceCurvePolicy, TieredExtraPointsPolicy)
+}
+
+
+class _StudentState:
+    __slots__ = ("evaluations", "hasReachedMinimumClasses", "final_grade")
+
+    def __init__(self):
+        # Nombre -> (nota, peso), en orden de registro: la suma sigue el mismo orden que la ruta escalar.
+        self.evaluations: Dict[str, Tuple[float, float]] = {}
+        # Hasta el primer cambio de asistencia se asume la asistencia mínima cumplida.
+        self.hasReachedMinimumClasses = True
+        self.final_grade: Optional[float] = None
+
+
+class GradebookState:
+    # Estado por estudiante a una secuencia dada del log. Aplicar un evento solo marca al estudiante como
+    # pendiente; refresh() recalcula de una vez, vectorizado, únicamente las notas pendientes. Un cambio
+    # de política deja pendiente a toda la cohorte.
+    def __init__(self, calculator: GradeCalculator):
+        self.calculator = calculator
+        self.sequence = 0
+        self.timestamp = 0.0
+        self.students: Dict[str, _StudentState] = {}
+        self.recomputed = 0
+        self._dirty: Set[str] = set()
+        self._all_dirty = False
+
+    def validate(self, event: GradeEvent) -> None:
+        if event.kind == POLICY_CHANGED:
+            if isinstance(event.value, PenaltyRule):
+                for state in self.students.values():
+                    event.value.calculate_penalty(state.hasReachedMinimumClasses)
+            elif not isinstance(event.value, BonusRule):
+                raise ValueError("La política debe ser una PenaltyRule o una BonusRule")
+            return
+
+        if not event.student_id or not isinstance(event.student_id, str):
+            raise ValueError("El codigo del estudiante debe ser una cadena no vacía")
+        state = self.students.get(event.student_id)
+        if event.kind == EVALUATION_ADDED:
+            Evaluation(event.name, *event.value)
+            if state is not None and event.name in state.evaluations:
+                raise ValueError(f"La evaluación {event.name} ya existe")
+            if state is not None and len(state.evaluations) >= self.calculator.max_evaluations:
+                raise ValueError(f"El número máximo de evaluaciones es {self.calculator.max_evaluations}")
+        elif event.kind == GRADE_CORRECTED:
+            if state is None:
+                raise ValueError(f"El estudiante {event.student_id} no está registrado")
+            if event.name not in state.evaluations:
+                raise ValueError(f"La evaluación {event.name} no existe")
+            Evaluation(event.name, event.value, state.evaluations[event.name][1])
+        elif event.kind == ATTENDANCE_CHANGED:
+            self.calculator.attendance_policy.calculate_penalty(event.value)
+        else:
+            raise ValueError(f"Tipo de evento desconocido: {event.kind}")
+
+    def apply(self, event: GradeEvent) -> None:
+        # Los eventos del log ya fueron validados al escribirse: aquí no se revalidan.
+        sequence, timestamp, kind, student_id, name, value = event
+        if kind == POLICY_CHANGED:
+            calculator = self.calculator
+            attendance_policy = value if isinstance(value, PenaltyRule) else calculator.attendance_policy
+            extra_points_policy = value if isinstance(value, BonusRule) else calculator.extra_points_policy
+            self.calculator = type(calculator)(attendance_policy, extra_points_policy,
+                                               max_evaluations=calculator.max_evaluations)
+            self._all_dirty = True
+        else:
+            state = self.students.get(student_id)
+            if state is None:
+                state = self.students[student_id] = _StudentState()
+            if kind == GRADE_CORRECTED:
+                state.evaluations[name] = (value, state.evaluations[name][1])
+            elif kind == EVALUATION_ADDED:
+                state.evaluations[name] = value
+            else:
+                state.hasReachedMinimumClasses = value
+            self._dirty.add(student_id)
+        self.sequence = sequence
+        self.timestamp = timestamp
+
+    def refresh(self) -> int:
+        student_ids = list(self.students) if self._all_dirty else list(self._dirty)
+        states = []
+        for student_id in student_ids:
+            state = self.students[student_id]
+            if state.evaluations:
+                states.append(state)
+            else:
+                state.final_grade = None
+
+        if states:
+            total_weighted = np.array([sum(grade * weight for grade, weight in state.evaluations.values())
+                                       for state in states])
+            total_weight = np.array([sum(weight for _, weight in state.evaluations.values()) for state in states])
+            attendance = np.array([state.hasReachedMinimumClasses for state in states])
+            final_grades = self.calculator.calculate_final_grades_from_totals_batch(
+                total_weighted, total_weight, attendance
+            )
+            for state, final_grade in zip(states, final_grades.tolist()):
+                state.final_grade = final_grade
+
+        self.recomputed += len(states)
+        self._dirty.clear()
+        self._all_dirty = False
+        return len(states)
+
+    def final_grade(self, student_id: str) -> float:
+        state = self.students.get(student_id)
+        if state is None:
+            raise ValueError(f"El estudiante {student_id} no está registrado")
+        if self._all_dirty or student_id in self._dirty:
+            self.refresh()
+        if state.final_grade is None:
+            raise ValueError("Debe haber al menos una evaluación")
+        return state.final_grade
+
+    def final_grades(self) -> Dict[str, float]:
+        self.refresh()
+        return {student_id: state.final_grade for student_id, state in self.students.items()
+                if state.final_grade is not None}
+
+    def get_evaluations(self, student_id: str) -> List[Evaluation]:
+        state = self.students.get(student_id)
+        if state is None:
+            raise ValueError(f"El estudiante {student_id} no está registrado")
+        return [Evaluation.from_validated(name, grade, weight) for name, (grade, weight) in state.evaluations.items()]
+
+
+class GradeEventLog:
+    DEFAULT_SNAPSHOT_INTERVAL = 100_000
+
+    # Log binario de solo anexado con instantáneas periódicas (archivos <log>.snapshots/<secuencia>.snap).
+    # Al abrir un log existente, sus eventos de política mandan sobre las del calculador recibido, que solo
+    # aporta la clase y el límite de evaluaciones; un log nuevo registra primero las políticas del calculador.
+    def __init__(self, path: str, calculator: GradeCalculator, snapshot_interval: int = DEFAULT_SNAPSHOT_INTERVAL):
+        if not isinstance(calculator, GradeCalculator):
+            raise ValueError("calculator debe ser una instancia de GradeCalculator")
+        if isinstance(snapshot_interval, bool) or not isinstance(snapshot_interval, int) or snapshot_interval < 1:
+            raise ValueError("snapshot_interval debe ser un entero positivo")
+
+        self.path = path
+        self.snapshot_directory = path + ".snapshots"
+        self.calculator = calculator
+        self.snapshot_interval = snapshot_interval
+
+        is_new = not os.path.exists(path) or os.path.getsize(path) == 0
+        if is_new:
+            with open(path, "wb") as log_file:
+                log_file.write(_LOG_HEADER.pack(LOG_MAGIC, VERSION))
+        self.state, end = self._replay(None, None)
+        self._snapshot_sequence = self._latest_snapshot_sequence()
+
+        self._file: BinaryIO = open(path, "r+b")
+        # Descarta un registro final incompleto antes de seguir anexando.
+        self._file.truncate(end)
+        self._file.seek(end)
+        if is_new:
+            self.set_policy(calculator.attendance_policy)
+            self.set_policy(calculator.extra_points_policy)
+
+    def add_evaluation(self, student_id: str, name: str, grade: float, weight: float) -> int:
+        return self._append(EVALUATION_ADDED, student_id, name, (grade, weight))
+
+    def correct_grade(self, student_id: str, name: str, grade: float) -> int:
+        return self._append(GRADE_CORRECTED, student_id, name, grade)
+
+    def set_attendance(self, student_id: str, hasReachedMinimumClasses) -> int:
+        return self._append(ATTENDANCE_CHANGED, student_id, "", hasReachedMinimumClasses)
+
+    def set_policy(self, policy) -> int:
+        return self._append(POLICY_CHANGED, "", "", policy)
+
+    def final_grade(self, student_id: str) -> float:
+        return self.state.final_grade(student_id)
+
+    def final_grades(self) -> Dict[str, float]:
+        return self.state.final_grades()
+
+    def replay(self, until_sequence: Optional[int] = None, until_timestamp: Optional[float] = None,
+               from_snapshot: bool = True) -> GradebookState:
+        # Estado a una secuencia o marca de tiempo: se parte de la instantánea más cercana anterior y solo se
+        # recalculan los estudiantes tocados por los eventos posteriores. Con from_snapshot=False se recorre
+        # el log completo (auditoría de las instantáneas).
+        self._file.flush()
+        return self._replay(until_sequence, until_timestamp, from_snapshot)[0]
+
+    def iter_events(self, start_sequence: int = 1) -> Iterator[GradeEvent]:
+        self._file.flush()
+        with open(self.path, "rb") as log_file:
+            buffer = log_file.read()
+        for event, _ in _decode_events(buffer, _LOG_HEADER.size):
+            if event.sequence >= start_sequence:
+                yield event
+
+    def snapshot(self) -> str:
+        self._file.flush()
+        self.state.refresh()
+        os.makedirs(self.snapshot_directory, exist_ok=True)
+        path = self._snapshot_path(self.state.sequence)
+        # Se escribe aparte y se renombra: una instantánea nunca queda a medias.
+        temporary_path = path + ".tmp"
+        with open(temporary_path, "wb") as snapshot_file:
+            snapshot_file.write(_encode_snapshot(self.state, self._file.tell()))
+        os.replace(temporary_path, path)
+        self._snapshot_sequence = self.state.sequence
+        return path
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self) -> "GradeEventLog":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.state.sequence
+
+    def _append(self, kind: int, student_id: str, name: str, value) -> int:
+        # La marca de tiempo nunca retrocede, para que las consultas por tiempo sean monótonas.
+        event = GradeEvent(self.state.sequence + 1, max(time.time(), self.state.timestamp), kind,
+                           student_id, name, value)
+        self.state.validate(event)
+        event = _normalize(event)
+        self._file.write(_encode_event(event))
+        self._file.flush()
+        self.state.apply(event)
+        if self.state.sequence - self._snapshot_sequence >= self.snapshot_interval:
+            self.snapshot()
+        return event.sequence
+
+    def _replay(self, until_sequence: Optional[int], until_timestamp: Optional[float],
+                from_snapshot: bool = True) -> Tuple[GradebookState, int]:
+        if from_snapshot:
+            state, offset = self._load_snapshot(until_sequence, until_timestamp)
+        else:
+            state, offset = GradebookState(self.calculator), _LOG_HEADER.size
+        with open(self.path, "rb") as log_file:
+            header = log_file.read(_LOG_HEADER.size)
+            if len(header) != _LOG_HEADER.size or _LOG_HEADER.unpack(header)[0] != LOG_MAGIC:
+                raise ValueError(f"{self.path} no es un log de eventos de notas")
+            if _LOG_HEADER.unpack(header)[1] != VERSION:
+                raise ValueError(f"Versión de formato no soportada: {_LOG_HEADER.unpack(header)[1]}")
+            log_file.seek(offset)
+            buffer = log_file.read()
+
+        end = offset
+        for event, event_end in _decode_events(buffer, 0):
+            if ((until_sequence is not None and event.sequence > until_sequence) or
+                    (until_timestamp is not None and event.timestamp > until_timestamp)):
+                break
+            state.apply(event)
+            end = offset + event_end
+        state.refresh()
+        return state, end
+
+    def _load_snapshot(self, until_sequence: Optional[int], until_timestamp: Optional[float]) -> Tuple[GradebookState, int]:
+        for sequence in sorted(self._snapshot_sequences(), reverse=True):
+            if until_sequence is not None and sequence > until_sequence:
+                continue
+            with open(self._snapshot_path(sequence), "rb") as snapshot_file:
+                buffer = snapshot_file.read()
+            if until_timestamp is not None and _SNAPSHOT_HEADER.unpack_from(buffer, 0)[4] > until_timestamp:
+                continue
+            return _decode_snapshot(buffer, self.calculator)
+        return GradebookState(self.calculator), _LOG_HEADER.size
+
+    def _latest_snapshot_sequence(self) -> int:
+        return max(self._snapshot_sequences(), default=0)
+
+    def _snapshot_sequences(self) -> List[int]:
+        if not os.path.isdir(self.snapshot_directory):
+            return []
+        return [int(name[:-len(SNAPSHOT_EXTENSION)]) for name in os.listdir(self.snapshot_directory)
+                if name.endswith(SNAPSHOT_EXTENSION) and name[:-len(SNAPSHOT_EXTENSION)].isdigit()]
+
+    def _snapshot_path(self, sequence: int) -> str:
+        return os.path.join(self.snapshot_directory, f"{sequence:016d}{SNAPSHOT_EXTENSION}")
+
+
+def _normalize(event: GradeEvent) -> GradeEvent:
+    if event.kind == EVALUATION_ADDED:
+        return event._replace(value=(float(event.value[0]), float(event.value[1])))
+    if event.kind == GRADE_CORRECTED:
+        return event._replace(value=float(event.value))
+    return event
+
+
+def _encode_event(event: GradeEvent) -> bytes:
+    first_text = _encode_text(_encode_policy(event.value) if event.kind == POLICY_CHANGED else event.student_id)
+    parts = [_EVENT.pack(event.kind, event.sequence, event.timestamp, len(first_text) - _TEXT_LENGTH.size),
+             first_text[_TEXT_LENGTH.size:]]
+    if event.kind != POLICY_CHANGED:
+        if event.kind == EVALUATION_ADDED:
+            parts += [_encode_text(event.name), _GRADE_WEIGHT.pack(*event.value)]
+        elif event.kind == GRADE_CORRECTED:
+            parts += [_encode_text(event.name), _GRADE.pack(event.value)]
+        else:
+            parts.append(_ATTENDANCE.pack(isinstance(event.value, bool), float(event.value)))
+    body = b"".join(parts)
+    return _FRAME.pack(len(body), zlib.crc32(body)) + body
+
+
+def _decode_events(buffer: bytes, offset: int) -> Iterator[Tuple[GradeEvent, int]]:
+    view = memoryview(buffer)
+    end = len(buffer)
+    while offset + _FRAME.size <= end:
+        length, checksum = _FRAME.unpack_from(buffer, offset)
+        start = offset + _FRAME.size
+        stop = start + length
+        # Solo es una escritura interrumpida si lo que queda cabe en un único registro y no contiene
+        # ningún registro válido: un largo dañado a mitad del log deja registros completos detrás.
+        if stop > end and length <= _MAX_BODY and not _contains_frame(view, start):
+            return
+        if stop > end or zlib.crc32(view[start:stop]) != checksum:
+            raise ValueError(f"Registro corrupto en el log ({end - offset} bytes antes del final); "
+                             f"el archivo no se modifica")
+
+        kind, sequence, timestamp, length = _EVENT.unpack_from(buffer, start)
+        position = start + _EVENT.size + length
+        text = str(buffer[position - length:position], "utf-8")
+        if kind == POLICY_CHANGED:
+            event = GradeEvent(sequence, timestamp, kind, "", "", _decode_policy(text))
+        else:
+            student_id = text
+            if kind == ATTENDANCE_CHANGED:
+                is_boolean, attendance = _ATTENDANCE.unpack_from(buffer, position)
+                event = GradeEvent(sequence, timestamp, kind, student_id, "",
+                                   attendance == 1.0 if is_boolean else attendance)
+            else:
+                (length,) = _TEXT_LENGTH.unpack_from(buffer, position)
+                position += _TEXT_LENGTH.size + length
+                name = str(buffer[position - length:position], "utf-8")
+                value = (_GRADE_WEIGHT.unpack_from(buffer, position) if kind == EVALUATION_ADDED
+                         else _GRADE.unpack_from(buffer, position)[0])
+                event = GradeEvent(sequence, timestamp, kind, student_id, name, value)
+        offset = stop
+        yield event, offset
+
+
+def _contains_frame(view: memoryview, offset: int) -> bool:
+    end = len(view)
+    if end - offset > _FRAME.size + _MAX_BODY:
+        return True
+    for position in range(offset, end - _FRAME.size - _EVENT.size + 1):
+        length, checksum = _FRAME.unpack_from(view, position)
+        start = position + _FRAME.size
+        if (_EVENT.size <= length <= end - start and view[start] in _EVENT_KINDS
+                and zlib.crc32(view[start:start + length]) == checksum):
+            return True
+    return False
+
+
+def _encode_policy(policy) -> str:
+    if type(policy).__name__ not in _POLICY_TYPES:
+        raise ValueError(f"La política {type(policy).__name__} no se puede registrar en el log")
+    return json.dumps({"type": type(policy).__name__, "params": policy._params()}, separators=(",", ":"))
+
+
+def _decode_policy(text: str):
+    data = json.loads(text)
+    if data.get("type") not in _POLICY_TYPES:
+        raise ValueError(f"Política desconocida en el log: {data.get('type')}")
+    return _POLICY_TYPES[data["type"]](*data["params"])
+
+
+def _encode_snapshot(state: GradebookState, log_offset: int) -> bytes:
+    # Columnar: códigos, tabla de nombres de evaluación y arreglos NumPy contiguos por campo.
+    states = list(state.students.values())
+    names = [name for student in states for name in student.evaluations]
+    name_table = list(dict.fromkeys(names))
+    name_positions = {name: position for position, name in enumerate(name_table)}
+    values = [value for student in states for value in student.evaluations.values()]
+    policies = [_encode_policy(state.calculator.attendance_policy), _encode_policy(state.calculator.extra_points_policy)]
+
+    arrays = [
+        np.array([len(student.evaluations) for student in states], dtype="<u4"),
+        np.array([float(student.hasReachedMinimumClasses) for student in states], dtype="<f8"),
+        np.array([isinstance(student.hasReachedMinimumClasses, bool) for student in states], dtype="?"),
+        np.array([math.nan if student.final_grade is None else student.final_grade for student in states], dtype="<f8"),
+        np.array([name_positions[name] for name in names], dtype="<u4"),
+        np.array([grade for grade, _ in values], dtype="<f8"),
+        np.array([weight for _, weight in values], dtype="<f8")
+    ]
+    header = _SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, VERSION, state.sequence, log_offset, state.timestamp,
+                                   len(states), len(names))
+    return b"".join([header, _pack_strings(policies), _pack_strings(list(state.students)), _pack_strings(name_table)] +
+                    [array.tobytes() for array in arrays])
+
+
+def _decode_snapshot(buffer: bytes, calculator: GradeCalculator) -> Tuple[GradebookState, int]:
+    magic, version, sequence, log_offset, timestamp, num_students, num_evaluations = \
+        _SNAPSHOT_HEADER.unpack_from(buffer, 0)
+    if magic != SNAPSHOT_MAGIC:
+        raise ValueError("La instantánea no es válida")
+    if version != VERSION:
+        raise ValueError(f"Versión de formato no soportada: {version}")
+
+    offset = _SNAPSHOT_HEADER.size
+    policies, offset = _unpack_strings(buffer, offset)
+    student_ids, offset = _unpack_strings(buffer, offset)
+    name_table, offset = _unpack_strings(buffer, offset)
+    arrays = []
+    for dtype, count in (("<u4", num_students), ("<f8", num_students), ("?", num_students), ("<f8", num_students),
+                         ("<u4", num_evaluations), ("<f8", num_evaluations), ("<f8", num_evaluations)):
+        array = np.frombuffer(buffer, dtype=dtype, count=count, offset=offset)
+        arrays.append(array.tolist())
+        offset += array.nbytes
+    counts, attendance, is_boolean, final_grades, name_positions, grades, weights = arrays
+
+    state = GradebookState(type(calculator)(_decode_policy(policies[0]), _decode_policy(policies[1]),
+                                            max_evaluations=calculator.max_evaluations))
+    state.sequence = sequence
+    state.timestamp = timestamp
+    # Un solo iterador compartido: cada estudiante consume sus `count` evaluaciones sin copiar sublistas.
+    evaluations = zip([name_table[position] for position in name_positions], zip(grades, weights))
+    for student_id, count, reached, boolean, final_grade in zip(student_ids, counts, attendance, is_boolean,
+                                                                final_grades):
+        student = _StudentState()
+        student.evaluations = dict(islice(evaluations, count))
+        student.hasReachedMinimumClasses = reached == 1.0 if boolean else reached
+        student.final_grade = None if math.isnan(final_grade) else final_grade
+        state.students[student_id] = student
+    return state, log_offset
+
+
+def _encode_text(text: str) -> bytes:
+    encoded = text.encode("utf-8")
+    if len(encoded) > 0xFFFF:
+        raise ValueError("El texto es demasiado largo para el log")
+    return _TEXT_LENGTH.pack(len(encoded)) + encoded
+
+
+def _pack_strings(strings: List[str]) -> bytes:
+    encoded = [text.encode("utf-8") for text in strings]
+    lengths = np.array([len(text) for text in encoded], dtype="<u4")
+    return struct.pack("<Q", len(encoded)) + lengths.tobytes() + b"".join(encoded)
+
+
+def _unpack_strings(buffer: bytes, offset: int) -> Tuple[List[str], int]:
+    (count,) = struct.unpack_from("<Q", buffer, offset)
+    offset += 8
+    lengths = np.frombuffer(buffer, dtype="<u4", count=count, offset=offset).tolist()
+    offset += 4 * count
+    strings = []
+    for length in lengths:
+        strings.append(str(buffer[offset:offset + length], "utf-8"))
+        offset += length
+    return strings, offset
@@ -0,0 +1,155 @@
+import heapq
+from collections import namedtuple
+from typing import Dict, Hashable, List, Optional, Tuple
+import numpy as np
+from grade_calculator import GradeCalculator
+
+
+RankedGrades = namedtuple("RankedGrades", ["student_ids", "final_grades", "ranks"])
+
+
+class TopKSelector:
+    # Selección por montículo en O(n log k) y memoria O(k). Cada tramo se prefiltra con argpartition
+    # (O(n)) conservando los empates del umbral; el desempate es por código, así que el resultado
+    # no depende del orden ni del tamaño de los tramos.
+    def __init__(self, k: int, largest: bool = True):
+        if not isinstance(k, int) or k < 1:
+            raise ValueError("k debe ser un entero positivo")
+
+        self.k = k
+        self.largest = largest
+        self._items: List[Tuple[Hashable, float]] = []
+
+    def update(self, student_ids, final_grades) -> "TopKSelector":
+        ids = np.asarray(student_ids)
+        grades = np.asarray(final_grades, dtype=np.float64)
+        if ids.ndim != 1 or ids.shape != grades.shape:
+            raise ValueError("student_ids y final_grades deben tener la misma longitud")
+
+        if grades.size > self.k:
+            if self.largest:
+                threshold = grades[np.argpartition(grades, grades.size - self.k)[grades.size - self.k]]
+                mask = grades >= threshold
+            else:
+                threshold = grades[np.argpartition(grades, self.k - 1)[self.k - 1]]
+                mask = grades <= threshold
+            ids, grades = ids[mask], grades[mask]
+
+        candidates = self._items + list(zip(ids.tolist(), grades.tolist()))
+        self._items = heapq.nsmallest(self.k, candidates, key=self._key)
+        return self
+
+    def result(self) -> List[Tuple[Hashable, float]]:
+        return list(self._items)
+
+    def _key(self, item: Tuple[Hashable, float]):
+        student_id, grade = item
+        return (-grade, student_id) if self.largest else (grade, student_id)
+
+
+class GradeRanking:
+    METHODS = ("competition", "dense")
+    # Las notas finales están redondeadas a centésimos: un contador por centésimo (2001) resuelve
+    # rangos y percentiles en O(1) por consulta, sin ordenar la cohorte.
+    RESOLUTION = 0.01
+
+    def __init__(self):
+        self._counts = np.zeros(round(GradeCalculator.MAX_FINAL_GRADE / self.RESOLUTION) + 1, dtype=np.int64)
+        self._bins: Dict[Hashable, int] = {}
+        self._tables: Optional[Dict[str, np.ndarray]] = None
+
+    @property
+    def count(self) -> int:
+        return len(self._bins)
+
+    def update(self, student_ids, final_grades) -> "GradeRanking":
+        ids = np.asarray(student_ids)
+        grades = np.asarray(final_grades, dtype=np.float64)
+        if ids.ndim != 1 or ids.shape != grades.shape:
+            raise ValueError("student_ids y final_grades deben tener la misma longitud")
+        if not np.all((grades >= GradeCalculator.MIN_FINAL_GRADE) & (grades <= GradeCalculator.MAX_FINAL_GRADE)):
+            raise ValueError(f"La nota final debe estar entre {GradeCalculator.MIN_FINAL_GRADE} "
+                             f"y {GradeCalculator.MAX_FINAL_GRADE}")
+
+        bins = np.rint(grades / self.RESOLUTION).astype(np.intp)
+        entries = dict(zip(ids.tolist(), bins.tolist()))
+        if len(entries) != ids.size or not self._bins.keys().isdisjoint(entries):
+            raise ValueError("Cada estudiante debe aparecer una sola vez en el ranking")
+        self._bins.update(entries)
+        self._counts += np.bincount(bins, minlength=self._counts.size)
+        self._tables = None
+        return self
+
+    def rank(self, student_id: Hashable, method: str = "competition") -> int:
+        return self.rank_of_grade(self._grade_of(student_id), method)
+
+    def rank_of_grade(self, final_grade: float, method: str = "competition") -> int:
+        if method not in self.METHODS:
+            raise ValueError(f"Método de ranking desconocido: {method}")
+        return int(self._rank_tables()[method][self._bin_of(final_grade)])
+
+    def percentile_rank(self, student_id: Hashable) -> float:
+        return self.percentile_rank_of_grade(self._grade_of(student_id))
+
+    def percentile_rank_of_grade(self, final_grade: float) -> float:
+        # Porcentaje de la cohorte por debajo, contando la mitad de los empates.
+        if self.count == 0:
+            raise ValueError("El ranking está vacío")
+        index = self._bin_of(final_grade)
+        below = int(self._rank_tables()["below"][index])
+        return 100.0 * (below + 0.5 * int(self._counts[index])) / self.count
+
+    def ranked(self, method: str = "competition") -> RankedGrades:
+        # Orden de salida: nota descendente y, en empates, código ascendente.
+        if method not in self.METHODS:
+            raise ValueError(f"Método de ranking desconocido: {method}")
+        ids = np.array(list(self._bins.keys()))
+        bins = np.fromiter(self._bins.values(), dtype=np.intp, count=len(self._bins))
+        order = np.lexsort((ids, -bins))
+        ordered_bins = bins[order]
+        return RankedGrades(ids[order], np.round(ordered_bins * self.RESOLUTION, 2),
+                            self._rank_tables()[method][ordered_bins])
+
+    def top(self, k: int) -> List[Tuple[Hashable, float]]:
+        return self._select(k, largest=True)
+
+    def bottom(self, k: int) -> List[Tuple[Hashable, float]]:
+        return self._select(k, largest=False)
+
+    def _select(self, k: int, largest: bool) -> List[Tuple[Hashable, float]]:
+        selector = TopKSelector(k, largest)
+        if self._bins:
+            bins = np.fromiter(self._bins.values(), dtype=np.intp, count=len(self._bins))
+            selector.update(np.array(list(self._bins.keys())), np.round(bins * self.RESOLUTION, 2))
+        return selector.result()
+
+    def _rank_tables(self) -> Dict[str, np.ndarray]:
+        # Tablas por centésimo, recalculadas solo después de una actualización.
+        if self._tables is None:
+            above = np.cumsum(self._counts[::-1])[::-1] - self._counts
+            distinct_above = np.cumsum((self._counts > 0)[::-1])[::-1] - (self._counts > 0)
+            self._tables = {
+                "competition": above + 1,
+                "dense": distinct_above + 1,
+                "below": np.cumsum(self._counts) - self._counts
+            }
+        return self._tables
+
+    def _grade_of(self, student_id: Hashable) -> float:
+        if student_id not in self._bins:
+            raise ValueError(f"El estudiante {student_id} no está en el ranking")
+        return self._bins[student_id] * self.RESOLUTION
+
+    def _bin_of(self, final_grade: float) -> int:
+        if not GradeCalculator.MIN_FINAL_GRADE <= final_grade <= GradeCalculator.MAX_FINAL_GRADE:
+            raise ValueError(f"La nota final debe estar entre {GradeCalculator.MIN_FINAL_GRADE} "
+                             f"y {GradeCalculator.MAX_FINAL_GRADE}")
+        return int(round(final_grade / self.RESOLUTION))
+
+
+def top_k(student_ids, final_grades, k: int) -> List[Tuple[Hashable, float]]:
+    return TopKSelector(k).update(student_ids, final_grades).result()
+
+
+def bottom_k(student_ids, final_grades, k: int) -> List[Tuple[Hashable, float]]:
+    return TopKSelector(k, largest=False).update(student_ids, final_grades).result()
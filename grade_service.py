@@ -0,0 +1,333 @@
+import argparse
+import asyncio
+import json
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from calculation_result import CalculationResult
+from evaluation_set import EvaluationSet
+from attendance_policy import AttendancePolicy
+from extra_points_policy import ExtraPointsPolicy
+from grade_calculator import GradeCalculator
+
+
+class GradeService:
+    DEFAULT_HOST = "127.0.0.1"
+    DEFAULT_PORT = 8080
+    DEFAULT_MAX_BATCH_SIZE = 64
+    DEFAULT_MAX_BATCH_DELAY = 0.002
+    DEFAULT_QUEUE_SIZE = 4096
+    MAX_BODY_SIZE = 64 * 1024
+    MAX_HEADER_SIZE = 8 * 1024
+
+    REASONS = {
+        200: "OK",
+        400: "Bad Request",
+        404: "Not Found",
+        405: "Method Not Allowed",
+        413: "Payload Too Large",
+        503: "Service Unavailable"
+    }
+
+    def __init__(self, calculator: GradeCalculator, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                 max_batch_size: int = DEFAULT_MAX_BATCH_SIZE, max_batch_delay: float = DEFAULT_MAX_BATCH_DELAY,
+                 queue_size: int = DEFAULT_QUEUE_SIZE):
+        if not isinstance(calculator, GradeCalculator):
+            raise ValueError("calculator debe ser una instancia de GradeCalculator")
+        if not isinstance(max_batch_size, int) or max_batch_size < 1:
+            raise ValueError("max_batch_size debe ser un entero positivo")
+        if max_batch_delay < 0:
+            raise ValueError("max_batch_delay no puede ser negativo")
+        if not isinstance(queue_size, int) or queue_size < 1:
+            raise ValueError("queue_size debe ser un entero positivo")
+
+        self.calculator = calculator
+        self.host = host
+        self.port = port
+        self.max_batch_size = max_batch_size
+        self.max_batch_delay = max_batch_delay
+        self.queue_size = queue_size
+
+        self.requests_processed = 0
+        self.requests_rejected = 0
+        self.batches_processed = 0
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._batch_task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._batch_task = asyncio.ensure_future(self._batch_worker())
+        self._server = await asyncio.start_server(
+            self._handle_connection, self.host, self.port, limit=self.MAX_HEADER_SIZE, backlog=8192
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._batch_task is not None:
+            self._batch_task.cancel()
+            try:
+                await self._batch_task
+            except asyncio.CancelledError:
+                pass
+        # Las solicitudes que quedaron en la cola no se van a procesar: se les avisa en lugar de dejarlas colgadas.
+        if self._queue is not None:
+            pending = []
+            while not self._queue.empty():
+                pending.append(self._queue.get_nowait())
+            self._fail_requests(pending, "El servicio se detuvo antes de procesar la solicitud")
+
+    async def serve_forever(self) -> None:
+        await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.stop()
+
+    async def calculate(self, payload: Any) -> Dict[str, Any]:
+        evaluations, hasReachedMinimumClasses = self._parse_payload(payload)
+        if self._batch_task is None or self._batch_task.done():
+            raise ServiceBusyError("El servicio no está en ejecución")
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait((evaluations, hasReachedMinimumClasses, future))
+        except asyncio.QueueFull:
+            self.requests_rejected += 1
+            raise ServiceBusyError("El servicio está saturado, intente nuevamente")
+        return await future
+
+    async def _batch_worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_batch_delay
+            try:
+                while len(batch) < self.max_batch_size:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                        continue
+                    except asyncio.QueueEmpty:
+                        pass
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                    except asyncio.TimeoutError:
+                        break
+            except asyncio.CancelledError:
+                # Detenido mientras se armaba el lote: las solicitudes ya retiradas de la cola también fallan.
+                self._fail_requests(batch, "El servicio se detuvo antes de procesar la solicitud")
+                raise
+            self._process_batch(batch)
+
+    def _fail_requests(self, requests: List[Tuple[EvaluationSet, bool, asyncio.Future]], message: str) -> None:
+        for _, _, future in requests:
+            if not future.done():
+                future.set_exception(ServiceBusyError(message))
+
+    def _process_batch(self, batch: List[Tuple[EvaluationSet, bool, asyncio.Future]]) -> None:
+        # Cada solicitud se valida por separado (un error solo afecta a la suya); las válidas se agrupan por
+        # número de evaluaciones y tipo de asistencia y cada grupo se calcula junto con calculate_details_batch.
+        # Un grupo de una sola solicitud va por la ruta escalar.
+        groups: Dict[Tuple[int, bool], List[Tuple[EvaluationSet, bool, asyncio.Future]]] = {}
+        for evaluations, hasReachedMinimumClasses, future in batch:
+            if future.done():
+                continue
+            try:
+                self.calculator._validate_evaluations(evaluations)
+                self.calculator.attendance_policy.calculate_penalty(hasReachedMinimumClasses)
+            except ValueError as error:
+                future.set_exception(error)
+                continue
+            key = (len(evaluations), isinstance(hasReachedMinimumClasses, bool))
+            groups.setdefault(key, []).append((evaluations, hasReachedMinimumClasses, future))
+
+        for group in groups.values():
+            if len(group) == 1:
+                self._process_scalar(*group[0])
+            else:
+                self._process_group(group)
+        self.requests_processed += len(batch)
+        self.batches_processed += 1
+
+    def _process_group(self, group: List[Tuple[EvaluationSet, bool, asyncio.Future]]) -> None:
+        grades = np.stack([evaluations.as_arrays()[0] for evaluations, _, _ in group])
+        weights = np.stack([evaluations.as_arrays()[1] for evaluations, _, _ in group])
+        attendance = np.array([hasReachedMinimumClasses for _, hasReachedMinimumClasses, _ in group])
+        try:
+            details = self.calculator.calculate_details_batch(grades, weights, attendance)
+        except ValueError:
+            for request in group:
+                self._process_scalar(*request)
+            return
+
+        rows = zip(details.weighted_average.tolist(), details.attendance_penalty.tolist(),
+                   details.extra_points.tolist(), details.final_grade.tolist(), group)
+        for weighted_average, attendance_penalty, extra_points, final_grade, request in rows:
+            evaluations, hasReachedMinimumClasses, future = request
+            result = CalculationResult(weighted_average, attendance_penalty, extra_points, final_grade,
+                                       hasReachedMinimumClasses, evaluations)
+            future.set_result(result.to_dict())
+
+    def _process_scalar(self, evaluations: EvaluationSet, hasReachedMinimumClasses: bool,
+                        future: asyncio.Future) -> None:
+        try:
+            details = self.calculator.get_calculation_details(evaluations, hasReachedMinimumClasses)
+        except ValueError as error:
+            future.set_exception(error)
+            return
+        future.set_result(details.to_dict())
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except HttpRequestError as error:
+                    self._write_response(writer, error.status, {"error": str(error)}, False)
+                    await writer.drain()
+                    break
+                if request is None:
+                    break
+                method, path, body, keep_alive = request
+                status, response = await self._route(method, path, body)
+                self._write_response(writer, status, response, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            pass
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> Optional[Tuple[str, str, bytes, bool]]:
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.IncompleteReadError:
+            return None
+
+        lines = head.decode("latin-1").split("\r\n")
+        parts = lines[0].split(" ")
+        if len(parts) != 3:
+            raise HttpRequestError(400, "Línea de solicitud HTTP inválida")
+        method, path, version = parts
+
+        headers = {}
+        for line in lines[1:]:
+            if line:
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get("content-length", "0"))
+        except ValueError:
+            raise HttpRequestError(400, "Content-Length inválido")
+        if length < 0:
+            raise HttpRequestError(400, "Content-Length inválido")
+        if length > self.MAX_BODY_SIZE:
+            raise HttpRequestError(413, "Cuerpo de la solicitud demasiado grande")
+        body = await reader.readexactly(length) if length else b""
+
+        connection = headers.get("connection", "").lower()
+        keep_alive = connection == "keep-alive" if version == "HTTP/1.0" else connection != "close"
+        return method, path, body, keep_alive
+
+    async def _route(self, method: str, path: str, body: bytes) -> Tuple[int, Dict[str, Any]]:
+        if path == "/health":
+            return 200, {"status": "ok", "queued": self._queue.qsize()}
+        if path != "/grades":
+            return 404, {"error": "Ruta no encontrada"}
+        if method != "POST":
+            return 405, {"error": "Use POST"}
+
+        try:
+            payload = json.loads(body)
+            return 200, await self.calculate(payload)
+        except json.JSONDecodeError as error:
+            return 400, {"error": f"JSON inválido: {error.msg}"}
+        except ServiceBusyError as error:
+            return 503, {"error": str(error)}
+        except ValueError as error:
+            return 400, {"error": str(error)}
+
+    def _write_response(self, writer: asyncio.StreamWriter, status: int, payload: Dict[str, Any],
+                        keep_alive: bool) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        head = (
+            f"HTTP/1.1 {status} {self.REASONS[status]}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+
+    def _parse_payload(self, payload: Any) -> Tuple[EvaluationSet, bool]:
+        return parse_payload(payload)
+
+
+class ServiceBusyError(Exception):
+    pass
+
+
+class HttpRequestError(ValueError):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def parse_payload(payload: Any) -> Tuple[EvaluationSet, bool]:
+    if not isinstance(payload, dict):
+        raise ValueError("El cuerpo debe ser un objeto JSON")
+    hasReachedMinimumClasses = payload.get("hasReachedMinimumClasses")
+    # Booleano o proporción de asistencia según la política; la política hace la validación final.
+    if not isinstance(hasReachedMinimumClasses, (bool, int, float)):
+        raise ValueError("hasReachedMinimumClasses debe ser un valor booleano o una proporción")
+    evaluations = payload.get("evaluations")
+    if not isinstance(evaluations, list):
+        raise ValueError("evaluations debe ser una lista")
+
+    names, grades, weights = [], [], []
+    for i, evaluation in enumerate(evaluations):
+        if not isinstance(evaluation, dict):
+            raise ValueError("Cada evaluación debe ser un objeto JSON")
+        grade = evaluation.get("grade")
+        weight = evaluation.get("weight")
+        if isinstance(grade, bool) or not isinstance(grade, (int, float)):
+            raise ValueError("La nota debe ser un número")
+        if isinstance(weight, bool) or not isinstance(weight, (int, float)):
+            raise ValueError("El peso debe ser un número")
+        names.append(evaluation.get("name") or f"Evaluación {i + 1}")
+        grades.append(grade)
+        weights.append(weight)
+
+    return EvaluationSet(names, grades, weights), hasReachedMinimumClasses
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Servicio HTTP/JSON de CS-GradeCalculator")
+    parser.add_argument("--host", default=GradeService.DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=GradeService.DEFAULT_PORT)
+    parser.add_argument("--penalty", type=float, default=AttendancePolicy.DEFAULT_PENALTY)
+    parser.add_argument("--extra-points", type=float, default=ExtraPointsPolicy.DEFAULT_EXTRA_POINTS)
+    parser.add_argument("--teachers-agree", action="store_true")
+    parser.add_argument("--max-batch-size", type=int, default=GradeService.DEFAULT_MAX_BATCH_SIZE)
+    parser.add_argument("--max-batch-delay", type=float, default=GradeService.DEFAULT_MAX_BATCH_DELAY)
+    parser.add_argument("--queue-size", type=int, default=GradeService.DEFAULT_QUEUE_SIZE)
+    args = parser.parse_args(argv)
+
+    calculator = GradeCalculator(AttendancePolicy(args.penalty), ExtraPointsPolicy(args.teachers_agree, args.extra_points))
+    service = GradeService(calculator, args.host, args.port, args.max_batch_size, args.max_batch_delay,
+                           args.queue_size)
+    print(f"Sirviendo en http://{args.host}:{args.port}/grades")
+    try:
+        asyncio.run(service.serve_forever())
+    except KeyboardInterrupt:
+        print("\nServicio detenido.")
+
+
+if __name__ == "__main__":
+    main()
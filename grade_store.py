@@ -0,0 +1,190 @@
+import sqlite3
+from array import array
+from collections import namedtuple
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional, Tuple
+from calculation_result import CalculationResult
+from evaluation_set import EvaluationSet
+from grade_calculator import BatchDetails
+
+
+StoredGrade = namedtuple("StoredGrade", [
+    "term", "course", "student_id", "weighted_average", "attendance_penalty", "extra_points",
+    "final_grade", "attendance", "evaluations"
+])
+
+
+class GradeStore:
+    DEFAULT_BATCH_SIZE = 10_000
+    NAME_SEPARATOR = "\x1f"
+
+    _SCHEMA = (
+        """
+        CREATE TABLE IF NOT EXISTS grades (
+            term TEXT NOT NULL,
+            course TEXT NOT NULL,
+            student_id TEXT NOT NULL,
+            weighted_average REAL NOT NULL,
+            attendance_penalty REAL NOT NULL,
+            extra_points REAL NOT NULL,
+            final_grade REAL NOT NULL,
+            attendance REAL NOT NULL,
+            evaluation_names TEXT,
+            evaluation_grades BLOB,
+            evaluation_weights BLOB,
+            PRIMARY KEY (term, course, student_id)
+        ) WITHOUT ROWID
+        """,
+        # La clave primaria (term, course, student_id) ya sirve las consultas por curso y término.
+        "CREATE INDEX IF NOT EXISTS grades_by_student ON grades (student_id, term)"
+    )
+
+    _UPSERT = (
+        "INSERT INTO grades (term, course, student_id, weighted_average, attendance_penalty, extra_points, "
+        "final_grade, attendance, evaluation_names, evaluation_grades, evaluation_weights) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+        "ON CONFLICT (term, course, student_id) DO UPDATE SET "
+        "weighted_average = excluded.weighted_average, attendance_penalty = excluded.attendance_penalty, "
+        "extra_points = excluded.extra_points, final_grade = excluded.final_grade, "
+        "attendance = excluded.attendance, evaluation_names = excluded.evaluation_names, "
+        "evaluation_grades = excluded.evaluation_grades, evaluation_weights = excluded.evaluation_weights"
+    )
+
+    _SELECT = "SELECT term, course, student_id, weighted_average, attendance_penalty, extra_points, " \
+              "final_grade, attendance, evaluation_names, evaluation_grades, evaluation_weights FROM grades"
+
+    def __init__(self, path: str = ":memory:", batch_size: int = DEFAULT_BATCH_SIZE,
+                 include_evaluations: bool = True):
+        if not isinstance(batch_size, int) or batch_size <= 0:
+            raise ValueError("batch_size debe ser un entero positivo")
+
+        self.path = path
+        self.batch_size = batch_size
+        self.include_evaluations = include_evaluations
+        self._connection = sqlite3.connect(path)
+        # WAL permite lectores concurrentes mientras se escribe; NORMAL basta con WAL para no perder datos confirmados.
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        for statement in self._SCHEMA:
+            self._connection.execute(statement)
+
+    def save(self, term: str, course: str, student_id: str, details: CalculationResult) -> None:
+        self.save_many(term, course, [(student_id, details)])
+
+    def save_many(self, term: str, course: str, results: Iterable[Tuple[str, CalculationResult]]) -> int:
+        rows = (self._to_row(term, course, student_id, details) for student_id, details in results)
+        return self._write(rows)
+
+    def save_batch_details(self, term: str, course: str, student_ids: Iterable[str], details: BatchDetails,
+                           hasReachedMinimumClasses: Iterable) -> int:
+        # Para resultados de calculate_details_batch: se guardan el promedio, la penalización y los puntos
+        # extra reales de cada estudiante, no solo la nota final.
+        if not isinstance(details, BatchDetails):
+            raise ValueError("details debe ser el BatchDetails de calculate_details_batch")
+        rows = (
+            (term, course, str(student_id), weighted_average, attendance_penalty, extra_points, final_grade,
+             float(attendance), None, None, None)
+            for student_id, weighted_average, attendance_penalty, extra_points, final_grade, attendance in zip(
+                student_ids, details.weighted_average.tolist(), details.attendance_penalty.tolist(),
+                details.extra_points.tolist(), details.final_grade.tolist(), hasReachedMinimumClasses
+            )
+        )
+        return self._write(rows)
+
+    def get(self, term: str, course: str, student_id: str) -> Optional[StoredGrade]:
+        row = self._connection.execute(
+            self._SELECT + " WHERE term = ? AND course = ? AND student_id = ?", (term, course, student_id)
+        ).fetchone()
+        return None if row is None else self._from_row(row)
+
+    def get_final_grade(self, term: str, course: str, student_id: str) -> Optional[float]:
+        row = self._connection.execute(
+            "SELECT final_grade FROM grades WHERE term = ? AND course = ? AND student_id = ?",
+            (term, course, student_id)
+        ).fetchone()
+        return None if row is None else row[0]
+
+    def get_student(self, student_id: str, term: Optional[str] = None) -> List[StoredGrade]:
+        if term is None:
+            rows = self._connection.execute(
+                self._SELECT + " WHERE student_id = ? ORDER BY term, course", (student_id,)
+            )
+        else:
+            rows = self._connection.execute(
+                self._SELECT + " WHERE student_id = ? AND term = ? ORDER BY course", (student_id, term)
+            )
+        return [self._from_row(row) for row in rows]
+
+    def get_course(self, term: str, course: str) -> List[StoredGrade]:
+        rows = self._connection.execute(
+            self._SELECT + " WHERE course = ? AND term = ? ORDER BY student_id", (course, term)
+        )
+        return [self._from_row(row) for row in rows]
+
+    def iter_course(self, term: str, course: str) -> Iterator[StoredGrade]:
+        rows = self._connection.execute(self._SELECT + " WHERE course = ? AND term = ?", (course, term))
+        return (self._from_row(row) for row in rows)
+
+    def delete(self, term: str, course: str, student_id: str) -> bool:
+        with self._connection:
+            cursor = self._connection.execute(
+                "DELETE FROM grades WHERE term = ? AND course = ? AND student_id = ?", (term, course, student_id)
+            )
+        return cursor.rowcount > 0
+
+    def count(self) -> int:
+        return self._connection.execute("SELECT COUNT(*) FROM grades").fetchone()[0]
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def __enter__(self) -> "GradeStore":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def _write(self, rows: Iterator[Tuple]) -> int:
+        # Una transacción por lote de batch_size filas: executemany amortiza el costo por fila.
+        written = 0
+        while True:
+            chunk = list(islice(rows, self.batch_size))
+            if not chunk:
+                return written
+            with self._connection:
+                self._connection.executemany(self._UPSERT, chunk)
+            written += len(chunk)
+
+    def _to_row(self, term: str, course: str, student_id: str, details: CalculationResult) -> Tuple:
+        names = grades = weights = None
+        if self.include_evaluations:
+            names, grades, weights = self._encode_evaluations(details.evaluations)
+        return (
+            term, course, str(student_id), details.weighted_average, details.attendance_penalty,
+            details.extra_points, details.final_grade, float(details.hasReachedMinimumClasses),
+            names, grades, weights
+        )
+
+    def _encode_evaluations(self, examsStudents) -> Tuple[str, bytes, bytes]:
+        # Notas y pesos como bytes de array('d'): evita formatear floats como texto en cada fila.
+        if isinstance(examsStudents, EvaluationSet):
+            names, grades, weights = examsStudents.names, examsStudents.grades, examsStudents.weights
+        else:
+            names = [evaluation.name for evaluation in examsStudents]
+            grades = array("d", [evaluation.grade for evaluation in examsStudents])
+            weights = array("d", [evaluation.weight for evaluation in examsStudents])
+        return self.NAME_SEPARATOR.join(names), grades.tobytes(), weights.tobytes()
+
+    def _from_row(self, row: Tuple) -> StoredGrade:
+        evaluations = None
+        if row[8] is not None:
+            grades = array("d")
+            grades.frombytes(row[9])
+            weights = array("d")
+            weights.frombytes(row[10])
+            evaluations = [
+                {"name": name, "grade": grade, "weight": weight}
+                for name, grade, weight in zip(row[8].split(self.NAME_SEPARATOR), grades, weights)
+            ]
+        return StoredGrade(*row[:8], evaluations)
+
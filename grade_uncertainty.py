@@ -0,0 +1,189 @@
+from collections import namedtuple
+from typing import Optional
+import numpy as np
+from evaluation import Evaluation
+from grade_calculator import GradeCalculator
+from cohort_statistics import CohortStatistics
+
+
+PassSimulation = namedtuple("PassSimulation", ["baseline_passed", "pass_probability", "pass_rates"])
+
+
+class GradeUncertaintySimulator:
+    # Monte Carlo sobre toda la cohorte: cada ensayo desplaza las notas (shift + spread * ruido, redondeadas
+    # a centésimos y recortadas a 0-20) y la asistencia. Solo las columnas con perturbación se sortean; las
+    # columnas fijas anteriores a la primera perturbada se suman una vez y el resto se acumula en el mismo
+    # orden que la ruta escalar, así que cada ensayo obtiene exactamente la nota final del calculador.
+    DISTRIBUTIONS = ("normal", "uniform")
+    # Tope de pares ensayo x estudiante por tramo (cada arreglo intermedio ocupa 8 bytes por par).
+    DEFAULT_CHUNK_SIZE = 1_000_000
+    # La búsqueda de umbrales cuesta unas 64 evaluaciones por combinación distinta de peso total y asistencia;
+    # con menos ensayos que eso conviene pasar cada ensayo por el calculador.
+    THRESHOLD_MIN_TRIALS = 64
+
+    def __init__(self, calculator: GradeCalculator, pass_grade: float = CohortStatistics.DEFAULT_PASS_GRADE,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE):
+        if not isinstance(calculator, GradeCalculator):
+            raise ValueError("calculator debe ser una instancia de GradeCalculator")
+        if not GradeCalculator.MIN_FINAL_GRADE <= pass_grade <= GradeCalculator.MAX_FINAL_GRADE:
+            raise ValueError(f"La nota aprobatoria debe estar entre {GradeCalculator.MIN_FINAL_GRADE} "
+                             f"y {GradeCalculator.MAX_FINAL_GRADE}")
+        if isinstance(chunk_size, bool) or not isinstance(chunk_size, int) or chunk_size < 1:
+            raise ValueError("chunk_size debe ser un entero positivo")
+
+        self.calculator = calculator
+        self.pass_grade = float(pass_grade)
+        self.chunk_size = chunk_size
+
+    def simulate(self, grades, weights, hasReachedMinimumClasses, trials: int, grade_shift=0.0, grade_spread=0.0,
+                 distribution: str = "normal", attendance_flip=0.0, attendance_spread=0.0,
+                 seed: Optional[int] = None) -> PassSimulation:
+        # grade_shift y grade_spread: escalar, vector por evaluación o matriz por estudiante y evaluación.
+        # attendance_flip: probabilidad de invertir la asistencia booleana; attendance_spread: desviación
+        # del ruido sobre proporciones de asistencia. Con la misma semilla el resultado no depende de chunk_size.
+        if isinstance(trials, bool) or not isinstance(trials, int) or trials < 1:
+            raise ValueError("trials debe ser un entero positivo")
+        if distribution not in self.DISTRIBUTIONS:
+            raise ValueError(f"distribution debe ser una de: {', '.join(self.DISTRIBUTIONS)}")
+        grades, weights, _ = self.calculator._validate_batch(grades, weights, hasReachedMinimumClasses)
+        num_students, num_evaluations = grades.shape
+        weights = np.broadcast_to(weights, grades.shape)
+        attendance = np.asarray(hasReachedMinimumClasses)
+
+        shift = self._as_matrix(grade_shift, grades.shape, "grade_shift")
+        spread = self._as_matrix(grade_spread, grades.shape, "grade_spread")
+        if np.any(spread < 0):
+            raise ValueError("grade_spread no puede ser negativo")
+        flip, noise = self._attendance_perturbation(attendance, attendance_flip, attendance_spread)
+
+        perturbed = np.flatnonzero(np.any((shift != 0) | (spread != 0), axis=0)).tolist()
+        first_perturbed = perturbed[0] if perturbed else num_evaluations
+        prefix = np.zeros(num_students)
+        total_weight = np.zeros(num_students)
+        for column in range(num_evaluations):
+            if column < first_perturbed:
+                prefix += grades[:, column] * weights[:, column]
+            total_weight += weights[:, column]
+
+        baseline_totals = self._weighted_totals(prefix, first_perturbed, grades, weights, {}, 1)[0]
+        baseline = self.calculator.calculate_final_grades_from_totals_batch(
+            baseline_totals, total_weight, attendance
+        ) >= self.pass_grade
+
+        limits = None
+        if trials >= self.THRESHOLD_MIN_TRIALS and not np.any(noise > 0):
+            limits = self._pass_limits(total_weight, attendance, flip)
+
+        # Un generador para las notas y otro para la asistencia: cada uno se consume en orden de ensayo,
+        # así que partir los ensayos en tramos no cambia los valores sorteados.
+        grade_rng, attendance_rng = (np.random.default_rng(child) for child in np.random.SeedSequence(seed).spawn(2))
+        passes = np.zeros(num_students, dtype=np.int64)
+        pass_rates = np.empty(trials)
+        chunk_trials = max(1, self.chunk_size // num_students)
+        for start in range(0, trials, chunk_trials):
+            count = min(chunk_trials, trials - start)
+            draws = self._draw(grade_rng, distribution, (count, num_students, len(perturbed)))
+            perturbed_grades = {}
+            for position, column in enumerate(perturbed):
+                values = grades[:, column] + shift[:, column] + spread[:, column] * draws[:, :, position]
+                perturbed_grades[column] = np.clip(np.round(values, 2), Evaluation.MIN_GRADE, Evaluation.MAX_GRADE)
+
+            weighted_totals = self._weighted_totals(prefix, first_perturbed, grades, weights, perturbed_grades, count)
+            trial_attendance = self._perturb_attendance(attendance_rng, attendance, flip, noise, count)
+            if limits is None:
+                passed = self.calculator.calculate_final_grades_from_totals_batch(
+                    weighted_totals.ravel(), np.tile(total_weight, count), trial_attendance.ravel()
+                ).reshape(count, num_students) >= self.pass_grade
+            elif isinstance(limits, tuple):
+                passed = weighted_totals >= np.where(trial_attendance, limits[1], limits[0])
+            else:
+                passed = weighted_totals >= limits
+
+            passes += passed.sum(axis=0)
+            pass_rates[start:start + count] = passed.mean(axis=1)
+
+        return PassSimulation(baseline, passes / trials, pass_rates)
+
+    def _pass_limits(self, total_weight: np.ndarray, attendance: np.ndarray, flip: np.ndarray):
+        # Con asistencia y peso total fijos la nota final es monótona en la suma ponderada (el mismo supuesto
+        # de RequiredGradeSolver), así que aprobar equivale a alcanzar un umbral por estudiante. Con asistencia
+        # booleana que puede invertirse se devuelve el par (sin asistencia mínima, con asistencia mínima).
+        if attendance.dtype == np.bool_ and np.any(flip > 0):
+            return (self._pass_threshold(total_weight, np.zeros(attendance.size, dtype=np.bool_)),
+                    self._pass_threshold(total_weight, np.ones(attendance.size, dtype=np.bool_)))
+        return self._pass_threshold(total_weight, attendance)
+
+    def _pass_threshold(self, total_weight: np.ndarray, attendance: np.ndarray) -> np.ndarray:
+        # Menor suma ponderada con la que el calculador aprueba, buscada por bisección sobre la representación
+        # binaria de los doubles (para valores positivos conserva el orden): comparar contra ella da
+        # exactamente el mismo resultado que la ruta completa. Sin solución el umbral es infinito. El umbral
+        # solo depende del peso total y la asistencia, así que se busca una vez por combinación distinta.
+        keys, inverse = np.unique(np.column_stack((total_weight, attendance.astype(np.float64))), axis=0,
+                                  return_inverse=True)
+        total_weight = keys[:, 0]
+        attendance = keys[:, 1].astype(attendance.dtype)
+
+        upper = total_weight * Evaluation.MAX_GRADE + 1.0
+        low = np.zeros(total_weight.size, dtype=np.int64)
+        high = upper.view(np.int64).copy()
+        reachable = self._passes(upper, total_weight, attendance)
+
+        while np.any(low < high):
+            middle = low + (high - low) // 2
+            meets = self._passes(middle.view(np.float64), total_weight, attendance)
+            high = np.where(meets, middle, high)
+            low = np.where(meets, low, middle + 1)
+
+        return np.where(reachable, high.view(np.float64), np.inf)[inverse.ravel()]
+
+    def _passes(self, weighted_totals: np.ndarray, total_weight: np.ndarray, attendance: np.ndarray) -> np.ndarray:
+        return self.calculator.calculate_final_grades_from_totals_batch(
+            weighted_totals, total_weight, attendance
+        ) >= self.pass_grade
+
+    def _weighted_totals(self, prefix: np.ndarray, first_perturbed: int, grades: np.ndarray, weights: np.ndarray,
+                         perturbed_grades, count: int) -> np.ndarray:
+        # Desde la primera columna perturbada se suma columna por columna (mismo orden que sum() en la ruta
+        # escalar); las columnas fijas se difunden sobre los ensayos.
+        weighted_totals = np.broadcast_to(prefix, (count, prefix.size))
+        for column in range(first_perturbed, grades.shape[1]):
+            values = perturbed_grades[column] if column in perturbed_grades else grades[:, column]
+            weighted_totals = weighted_totals + values * weights[:, column]
+        return weighted_totals
+
+    def _attendance_perturbation(self, attendance: np.ndarray, attendance_flip, attendance_spread):
+        flip = np.broadcast_to(np.asarray(attendance_flip, dtype=np.float64), attendance.shape)
+        noise = np.broadcast_to(np.asarray(attendance_spread, dtype=np.float64), attendance.shape)
+        if not np.all((flip >= 0) & (flip <= 1)):
+            raise ValueError("attendance_flip debe ser una probabilidad entre 0 y 1")
+        if np.any(noise < 0):
+            raise ValueError("attendance_spread no puede ser negativo")
+        is_boolean = attendance.dtype == np.bool_
+        if is_boolean and np.any(noise > 0):
+            raise ValueError("attendance_spread solo aplica a proporciones de asistencia; use attendance_flip")
+        if not is_boolean and np.any(flip > 0):
+            raise ValueError("attendance_flip solo aplica a asistencia booleana; use attendance_spread")
+        return flip, noise
+
+    def _perturb_attendance(self, rng: np.random.Generator, attendance: np.ndarray, flip: np.ndarray,
+                            noise: np.ndarray, count: int) -> np.ndarray:
+        if attendance.dtype == np.bool_:
+            if not np.any(flip > 0):
+                return np.broadcast_to(attendance, (count, attendance.size))
+            return attendance ^ (rng.random((count, attendance.size)) < flip)
+        rates = attendance.astype(np.float64)
+        if not np.any(noise > 0):
+            return np.broadcast_to(rates, (count, rates.size))
+        return np.clip(rates + noise * rng.standard_normal((count, rates.size)), 0.0, 1.0)
+
+    def _draw(self, rng: np.random.Generator, distribution: str, shape) -> np.ndarray:
+        if distribution == "normal":
+            return rng.standard_normal(shape)
+        return rng.uniform(-1.0, 1.0, shape)
+
+    def _as_matrix(self, values, shape, label: str) -> np.ndarray:
+        values = np.asarray(values, dtype=np.float64)
+        try:
+            return np.broadcast_to(values, shape)
+        except ValueError:
+            raise ValueError(f"{label} debe ser un escalar, un vector por evaluación o una matriz por estudiante")
@@ -0,0 +1,170 @@
+from time import perf_counter_ns
+from typing import List, Optional, Tuple
+from evaluation import Evaluation
+from grade_calculator import GradeCalculator
+from metrics_registry import MetricsRegistry
+
+
+class CalculatorInstrumentation:
+    STAGES = ("validation", "weighted_average", "policies", "clamp_round")
+    FLUSH_EVERY = 256
+
+    def __init__(self, calculator: GradeCalculator, registry: Optional[MetricsRegistry] = None,
+                 sample_every: int = 1, prefix: str = "grade_calculator"):
+        if not isinstance(calculator, GradeCalculator):
+            raise ValueError("calculator debe ser una instancia de GradeCalculator")
+        if not isinstance(sample_every, int) or sample_every < 1:
+            raise ValueError("sample_every debe ser un entero positivo")
+
+        self.calculator = calculator
+        self.registry = registry if registry is not None else MetricsRegistry()
+        self.sample_every = sample_every
+        self.installed = False
+
+        self.calls = self.registry.counter(f"{prefix}_calls_total", "Llamadas a la ruta escalar")
+        self.sampled_calls = self.registry.counter(f"{prefix}_sampled_calls_total",
+                                                   "Llamadas escalares muestreadas con tiempos por etapa")
+        self.validation_failures = self.registry.counter(f"{prefix}_validation_failures_total",
+                                                         "Cálculos rechazados por validación")
+        self.clamped_results = self.registry.counter(f"{prefix}_clamped_results_total",
+                                                     "Notas finales recortadas al rango (llamadas muestreadas)")
+        self.batch_calls = self.registry.counter(f"{prefix}_batch_calls_total", "Llamadas a la ruta por lote")
+        self.batch_rows = self.registry.counter(f"{prefix}_batch_rows_total", "Estudiantes calculados por lote")
+        self.stage_seconds = self.registry.histogram(f"{prefix}_stage_seconds", "Duración de cada etapa del cálculo",
+                                                     labelnames=("stage",))
+        self.batch_seconds = self.registry.histogram(f"{prefix}_batch_seconds", "Duración de cada cálculo por lote",
+                                                     buckets=(1e-4, 1e-3, 1e-2, 0.1, 1.0, 10.0))
+        self.registry.register_collector(self._collect)
+        self._pending_calls = None
+        self._calls_at_install = 0
+        self._samples_at_install = 0
+        self._stage_samples = []
+
+    def install(self) -> "CalculatorInstrumentation":
+        # Los ganchos se instalan como atributos de la instancia: sin instalar, el calculador no paga nada.
+        if self.installed:
+            return self
+        calculate_final_grade, compute, pending_calls = self._build_hooks()
+        self.calculator.calculate_final_grade = calculate_final_grade
+        self.calculator._compute = compute
+        self.calculator._compute_batch = self._compute_batch
+        self._pending_calls = pending_calls
+        self._calls_at_install = self.calls.value
+        self._samples_at_install = self.sampled_calls.value
+        self.installed = True
+        return self
+
+    def uninstall(self) -> None:
+        if not self.installed:
+            return
+        self._collect()
+        del self.calculator.calculate_final_grade
+        del self.calculator._compute
+        del self.calculator._compute_batch
+        self._pending_calls = None
+        self.installed = False
+
+    def __enter__(self) -> "CalculatorInstrumentation":
+        return self.install()
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.uninstall()
+
+    def _build_hooks(self):
+        # La ruta no muestreada usa solo variables de la clausura: un decremento y una comparación por llamada.
+        # calculate_final_grade reemplaza al método público para no sumar un marco extra sobre _compute.
+        calculator = self.calculator
+        base_compute = type(calculator)._compute
+        sampled_compute = self._sampled_compute
+        validation_failures = self.validation_failures
+        sample_every = self.sample_every
+        countdown = sample_every
+
+        def calculate_final_grade(examsStudents: List[Evaluation], hasReachedMinimumClasses: bool) -> float:
+            nonlocal countdown
+            countdown -= 1
+            if countdown:
+                try:
+                    return base_compute(calculator, examsStudents, hasReachedMinimumClasses)[3]
+                except ValueError:
+                    validation_failures.value += 1
+                    raise
+            countdown = sample_every
+            return sampled_compute(examsStudents, hasReachedMinimumClasses)[3]
+
+        def compute(examsStudents: List[Evaluation], hasReachedMinimumClasses: bool) -> Tuple[float, float, float, float]:
+            nonlocal countdown
+            countdown -= 1
+            if countdown:
+                try:
+                    return base_compute(calculator, examsStudents, hasReachedMinimumClasses)
+                except ValueError:
+                    validation_failures.value += 1
+                    raise
+            countdown = sample_every
+            return sampled_compute(examsStudents, hasReachedMinimumClasses)
+
+        def pending_calls() -> int:
+            return sample_every - countdown
+
+        return calculate_final_grade, compute, pending_calls
+
+    def _sampled_compute(self, examsStudents: List[Evaluation], hasReachedMinimumClasses: bool) -> Tuple[float, float, float, float]:
+        self.sampled_calls.value += 1
+        calculator = self.calculator
+
+        start = perf_counter_ns()
+        try:
+            calculator._validate_evaluations(examsStudents)
+            validated = perf_counter_ns()
+            weighted_average = calculator._calculate_weighted_average(examsStudents)
+            averaged = perf_counter_ns()
+            attendance_penalty = calculator.attendance_policy.calculate_penalty(hasReachedMinimumClasses)
+            extra_points = calculator.extra_points_policy.calculate_extra_points(weighted_average)
+        except ValueError:
+            self.validation_failures.value += 1
+            raise
+        evaluated = perf_counter_ns()
+        unclamped = weighted_average - attendance_penalty + extra_points
+        final_grade = calculator._clamp_and_round(unclamped)
+        finished = perf_counter_ns()
+
+        if not calculator.MIN_FINAL_GRADE <= unclamped <= calculator.MAX_FINAL_GRADE:
+            self.clamped_results.value += 1
+        # Los tiempos crudos se acumulan y se vuelcan al histograma por tandas (append es atómico con el GIL).
+        self._stage_samples.append((validated - start, averaged - validated, evaluated - averaged, finished - evaluated))
+        if len(self._stage_samples) >= self.FLUSH_EVERY:
+            self._flush_stage_samples()
+
+        return weighted_average, attendance_penalty, extra_points, final_grade
+
+    def _compute_batch(self, grades, weights, hasReachedMinimumClasses):
+        start = perf_counter_ns()
+        try:
+            result = type(self.calculator)._compute_batch(self.calculator, grades, weights, hasReachedMinimumClasses)
+        except ValueError:
+            self.validation_failures.value += 1
+            raise
+        self.batch_seconds.observe((perf_counter_ns() - start) / 1e9)
+        self.batch_calls.value += 1
+        self.batch_rows.value += len(result[3])
+        return result
+
+    def _flush_stage_samples(self) -> None:
+        samples, self._stage_samples = self._stage_samples, []
+        if not samples:
+            return
+        for stage, durations in zip(self.STAGES, zip(*samples)):
+            self.stage_seconds.observe_many([elapsed / 1e9 for elapsed in durations], stage)
+
+    def _collect(self) -> None:
+        self._flush_stage_samples()
+        # Llamadas = ventanas completas (una muestra cada sample_every) más las de la ventana en curso.
+        if self.installed:
+            windows = self.sampled_calls.value - self._samples_at_install
+            self.calls.value = self._calls_at_install + windows * self.sample_every + self._pending_calls()
+
+
+def instrument(calculator: GradeCalculator, registry: Optional[MetricsRegistry] = None,
+               sample_every: int = 1) -> CalculatorInstrumentation:
+    return CalculatorInstrumentation(calculator, registry, sample_every).install()
@@ -1,13 +1,23 @@
-from typing import List
+import argparse
+import asyncio
+import json
+import sys
+from typing import List, Optional
 from evaluation import Evaluation
 from attendance_policy import AttendancePolicy
 from extra_points_policy import ExtraPointsPolicy
 from grade_calculator import GradeCalculator
+from calculation_result import CalculationResult
+from batch_processor import BatchGradeProcessor
+from calculation_daemon import CalculationDaemon
+from grade_client import DEFAULT_SOCKET_PATH
+from report_generator import render_report
 
 
 class GradeCalculatorApp:
-    def __init__(self):
+    def __init__(self, max_evaluations: int = GradeCalculator.MAX_EVALUATIONS):
         self.calculator = None
+        self.max_evaluations = max_evaluations
 
     def run(self) -> None:
         print("=" * 60)
@@ -24,7 +34,7 @@ class GradeCalculatorApp:
             attendance_policy = self._configure_attendance_policy()
             extra_points_policy = self._configure_extra_points_policy()
 
-            self.calculator = GradeCalculator(attendance_policy, extra_points_policy)
+            self.calculator = GradeCalculator(attendance_policy, extra_points_policy, self.max_evaluations)
 
             examsStudents = self._register_evaluations()
             hasReachedMinimumClasses = self._register_attendance()
@@ -86,7 +96,7 @@ class GradeCalculatorApp:
 
     def _register_evaluations(self) -> List[Evaluation]:
         print("\n--- Registro de Evaluaciones ---")
-        print(f"Maximo {GradeCalculator.MAX_EVALUATIONS} evaluaciones permitidas")
+        print(f"Maximo {self.max_evaluations} evaluaciones permitidas")
 
         evaluations = []
 
@@ -96,8 +106,8 @@ class GradeCalculatorApp:
                 if count < 1:
                     print("Error: Debe registrar al menos una evaluacion.")
                     continue
-                if count > GradeCalculator.MAX_EVALUATIONS:
-                    print(f"Error: Maximo {GradeCalculator.MAX_EVALUATIONS} evaluaciones permitidas.")
+                if count > self.max_evaluations:
+                    print(f"Error: Maximo {self.max_evaluations} evaluaciones permitidas.")
                     continue
                 break
             except ValueError:
@@ -137,48 +147,113 @@ class GradeCalculatorApp:
                 return response == 's'
             print("Error: Responda 's' para si o 'n' para no.\n")
 
-    def _display_results(self, student_id: str, details: dict) -> None:
-        print("\n" + "=" * 60)
-        print(f"RESULTADOS - ESTUDIANTE: {student_id}")
-        print("=" * 60)
-
-        print("\nDETALLE DE EVALUACIONES:")
-        print("-" * 60)
-        for i, eval_detail in enumerate(details['evaluations_detail'], 1):
-            print(f"{i}. {eval_detail['name']}")
-            print(f"   Nota: {eval_detail['grade']:.2f}")
-            print(f"   Peso: {eval_detail['weight'] * 100:.1f}%")
-            print(f"   Aporte: {eval_detail['weighted_grade']:.2f}")
-            print()
-
-        print("CALCULO DE NOTA FINAL:")
-        print("-" * 60)
-        print(f"Promedio Ponderado:        {details['weighted_average']:>6.2f}")
-
-        if details['attendance_penalty'] > 0:
-            print(f"Penalizacion (Asistencia): {details['attendance_penalty']:>6.2f} (-)")
-        else:
-            print(f"Penalizacion (Asistencia): {details['attendance_penalty']:>6.2f}")
-
-        if details['extra_points'] > 0:
-            print(f"Puntos Extra:              {details['extra_points']:>6.2f} (+)")
-        else:
-            print(f"Puntos Extra:              {details['extra_points']:>6.2f}")
-
-        print("-" * 60)
-        print(f"NOTA FINAL:                {details['final_grade']:>6.2f}")
-        print("=" * 60)
-
-        print("\nINFORMACION ADICIONAL:")
-        print(f"- Total de evaluaciones: {details['total_evaluations']}")
-        print(f"- Asistencia minima cumplida: {'Si' if details['hasReachedMinimumClasses'] else 'No'}")
-        print()
-
-
-def main():
-    app = GradeCalculatorApp()
+    def _display_results(self, student_id: str, details: CalculationResult) -> None:
+        # La misma plantilla que los reportes masivos, impresa de una vez en lugar de línea por línea.
+        print(render_report(student_id, details), end="")
+
+
+def _parse_arguments(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Sistema CS-GradeCalculator - UTEC")
+    parser.add_argument("--batch", metavar="ENTRADA",
+                        help="Archivo CSV o JSONL con las evaluaciones de cada estudiante (modo no interactivo)")
+    parser.add_argument("--out", metavar="SALIDA",
+                        help="Archivo CSV o JSONL donde se escriben las notas finales")
+    parser.add_argument("--rejects", metavar="RECHAZOS",
+                        help="Archivo CSV para las filas rechazadas [default: SALIDA.rejects.csv]")
+    parser.add_argument("--daemon", metavar="SOCKET", nargs="?", const=DEFAULT_SOCKET_PATH,
+                        help=f"Mantiene el calculador residente y atiende solicitudes JSON por un socket Unix "
+                             f"[default: {DEFAULT_SOCKET_PATH}]")
+    parser.add_argument("--request", metavar="JSON",
+                        help="Calcula una sola solicitud JSON (mismo formato que el daemon) y la imprime")
+    parser.add_argument("--penalty", type=float, default=AttendancePolicy.DEFAULT_PENALTY,
+                        help=f"Penalizacion por inasistencia [default: {AttendancePolicy.DEFAULT_PENALTY}]")
+    parser.add_argument("--extra-points", type=float, default=ExtraPointsPolicy.DEFAULT_EXTRA_POINTS,
+                        help=f"Cantidad de puntos extra [default: {ExtraPointsPolicy.DEFAULT_EXTRA_POINTS}]")
+    parser.add_argument("--teachers-agree", action="store_true",
+                        help="Los docentes estan de acuerdo en otorgar puntos extra")
+    parser.add_argument("--max-evaluations", type=int, default=GradeCalculator.MAX_EVALUATIONS,
+                        help=f"Maximo de evaluaciones por estudiante [default: {GradeCalculator.MAX_EVALUATIONS}]")
+
+    args = parser.parse_args(argv)
+    if args.batch and not args.out:
+        parser.error("--batch requiere --out")
+    if args.out and not args.batch:
+        parser.error("--out requiere --batch")
+    if sum(option is not None for option in (args.batch, args.daemon, args.request)) > 1:
+        parser.error("--batch, --daemon y --request son excluyentes")
+    if args.max_evaluations < 1:
+        parser.error("--max-evaluations debe ser un entero positivo")
+    return args
+
+
+def _build_calculator(args: argparse.Namespace) -> GradeCalculator:
+    return GradeCalculator(
+        AttendancePolicy(args.penalty),
+        ExtraPointsPolicy(args.teachers_agree, args.extra_points),
+        args.max_evaluations
+    )
+
+
+def run_batch(args: argparse.Namespace) -> int:
+    try:
+        calculator = _build_calculator(args)
+        processor = BatchGradeProcessor(calculator)
+        rejects_path = args.rejects or f"{args.out}.rejects.csv"
+        summary = processor.process_file(args.batch, args.out, rejects_path)
+    except (OSError, ValueError) as error:
+        print(f"Error: {error}")
+        return 1
+
+    print(f"Estudiantes procesados: {summary.processed}")
+    print(f"Filas rechazadas: {summary.rejected}")
+    if summary.rejected:
+        print(f"Detalle de rechazos: {rejects_path}")
+    return 0
+
+
+def run_daemon(args: argparse.Namespace) -> int:
+    try:
+        daemon = CalculationDaemon(_build_calculator(args), args.daemon)
+    except ValueError as error:
+        print(f"Error: {error}")
+        return 1
+
+    print(f"Daemon escuchando en {args.daemon}")
+    try:
+        asyncio.run(daemon.serve_forever())
+    except KeyboardInterrupt:
+        print("\nDaemon detenido.")
+    except (OSError, ValueError) as error:
+        print(f"Error: {error}")
+        return 1
+    return 0
+
+
+def run_request(args: argparse.Namespace) -> int:
+    try:
+        daemon = CalculationDaemon(_build_calculator(args))
+    except ValueError as error:
+        print(f"Error: {error}")
+        return 1
+
+    response = daemon.handle_line(args.request.encode("utf-8"))
+    print(json.dumps(response, separators=(",", ":"), ensure_ascii=False))
+    return 0 if response["ok"] else 1
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _parse_arguments(argv)
+    if args.batch:
+        return run_batch(args)
+    if args.daemon:
+        return run_daemon(args)
+    if args.request is not None:
+        return run_request(args)
+
+    app = GradeCalculatorApp(args.max_evaluations)
     app.run()
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,156 @@
+import json
+import threading
+from bisect import bisect_left
+from typing import Callable, Dict, List, Sequence, Tuple
+
+
+class Counter:
+    __slots__ = ("name", "help", "value")
+
+    def __init__(self, name: str, help: str):
+        self.name = name
+        self.help = help
+        self.value = 0
+
+    def inc(self, amount: int = 1) -> None:
+        self.value += amount
+
+
+class Histogram:
+    DEFAULT_BUCKETS = (1e-7, 2.5e-7, 5e-7, 1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 1e-4, 1e-3, 1e-2)
+
+    def __init__(self, name: str, help: str, buckets: Sequence[float] = DEFAULT_BUCKETS,
+                 labelnames: Sequence[str] = ()):
+        buckets = tuple(float(bucket) for bucket in buckets)
+        if not buckets or any(later <= earlier for earlier, later in zip(buckets, buckets[1:])):
+            raise ValueError("Los límites del histograma deben ser estrictamente crecientes")
+
+        self.name = name
+        self.help = help
+        self.buckets = buckets
+        self.labelnames = tuple(labelnames)
+        # Por combinación de etiquetas: conteos por bucket (no acumulados, el último es +Inf), suma y total.
+        self._series: Dict[Tuple[str, ...], List] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, amount: float, *labelvalues: str) -> None:
+        self.observe_many((amount,), *labelvalues)
+
+    def observe_many(self, amounts: Sequence[float], *labelvalues: str) -> None:
+        # Una sola toma del lock para toda la tanda de observaciones.
+        if len(labelvalues) != len(self.labelnames):
+            raise ValueError(f"{self.name} espera las etiquetas {self.labelnames}")
+        buckets = self.buckets
+        with self._lock:
+            series = self._series.get(labelvalues)
+            if series is None:
+                series = self._series[labelvalues] = [[0] * (len(buckets) + 1), 0.0, 0]
+            counts = series[0]
+            for amount in amounts:
+                counts[bisect_left(buckets, amount)] += 1
+            series[1] += sum(amounts)
+            series[2] += len(amounts)
+
+    def samples(self) -> List[Tuple[Dict[str, str], List[int], float, int]]:
+        with self._lock:
+            return [
+                (dict(zip(self.labelnames, labelvalues)), _cumulative(counts), total, count)
+                for labelvalues, (counts, total, count) in sorted(self._series.items())
+            ]
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._collectors: List[Callable[[], None]] = []
+
+    def counter(self, name: str, help: str) -> Counter:
+        return self._register(Counter(name, help))
+
+    def histogram(self, name: str, help: str, buckets: Sequence[float] = Histogram.DEFAULT_BUCKETS,
+                  labelnames: Sequence[str] = ()) -> Histogram:
+        return self._register(Histogram(name, help, buckets, labelnames))
+
+    def register_collector(self, collector: Callable[[], None]) -> None:
+        # Se ejecuta antes de cada exportación para volcar valores que se llevan fuera del registro.
+        self._collectors.append(collector)
+
+    def get(self, name: str):
+        return self._metrics[name]
+
+    def snapshot(self) -> Dict[str, Dict]:
+        self._collect()
+        snapshot = {}
+        for name, metric in self._metrics.items():
+            if isinstance(metric, Counter):
+                snapshot[name] = {"type": "counter", "help": metric.help, "value": metric.value}
+            else:
+                snapshot[name] = {
+                    "type": "histogram",
+                    "help": metric.help,
+                    "buckets": list(metric.buckets),
+                    "series": [
+                        {"labels": labels, "cumulative_counts": counts, "sum": total, "count": count}
+                        for labels, counts, total, count in metric.samples()
+                    ]
+                }
+        return snapshot
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot(), ensure_ascii=False)
+
+    def to_prometheus(self) -> str:
+        self._collect()
+        lines = []
+        for name, metric in self._metrics.items():
+            lines.append(f"# HELP {name} {_escape_help(metric.help)}")
+            if isinstance(metric, Counter):
+                lines.append(f"# TYPE {name} counter")
+                lines.append(f"{name} {metric.value}")
+                continue
+            lines.append(f"# TYPE {name} histogram")
+            for labels, counts, total, count in metric.samples():
+                bounds = [_format_value(bucket) for bucket in metric.buckets] + ["+Inf"]
+                for bound, cumulative in zip(bounds, counts):
+                    lines.append(f"{name}_bucket{_format_labels(labels, le=bound)} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(total)}")
+                lines.append(f"{name}_count{_format_labels(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def _register(self, metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"La métrica {metric.name} ya está registrada")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def _collect(self) -> None:
+        for collector in self._collectors:
+            collector()
+
+
+def _cumulative(counts: List[int]) -> List[int]:
+    cumulative = []
+    running = 0
+    for count in counts:
+        running += count
+        cumulative.append(running)
+    return cumulative
+
+
+def _format_labels(labels: Dict[str, str], **extra: str) -> str:
+    pairs = list(labels.items()) + list(extra.items())
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape_label(str(value))}"' for key, value in pairs) + "}"
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _escape_help(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value))
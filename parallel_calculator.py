@@ -0,0 +1,92 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, Optional, Tuple
+import numpy as np
+from grade_calculator import GradeCalculator
+
+
+class ParallelGradeCalculator:
+    DEFAULT_CHUNK_SIZE = 50_000
+
+    def __init__(self, calculator: GradeCalculator, max_workers: Optional[int] = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE):
+        if not isinstance(calculator, GradeCalculator):
+            raise ValueError("calculator debe ser una instancia de GradeCalculator")
+        if max_workers is not None and (not isinstance(max_workers, int) or max_workers < 1):
+            raise ValueError("max_workers debe ser un entero positivo")
+        if not isinstance(chunk_size, int) or chunk_size < 1:
+            raise ValueError("chunk_size debe ser un entero positivo")
+
+        self.calculator = calculator
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+
+    def calculate_final_grades(self, grades, weights, hasReachedMinimumClasses) -> np.ndarray:
+        grades = np.ascontiguousarray(grades, dtype=np.float64)
+        weights = np.ascontiguousarray(weights, dtype=np.float64)
+        attendance = np.ascontiguousarray(hasReachedMinimumClasses)
+
+        if grades.ndim != 2:
+            raise ValueError("grades debe ser una matriz (estudiantes x evaluaciones)")
+        if attendance.shape != (grades.shape[0],):
+            raise ValueError("hasReachedMinimumClasses debe tener un valor por estudiante")
+
+        num_students = grades.shape[0]
+        if self.max_workers == 1 or num_students <= self.chunk_size:
+            return self.calculator.calculate_final_grades_batch(grades, weights, attendance)
+
+        # Una matriz de pesos por estudiante se reparte igual que las notas;
+        # un vector compartido es pequeño y viaja con cada tarea.
+        per_student_weights = weights.ndim == 2 and weights.shape[0] == num_students
+        arrays = {"grades": grades, "attendance": attendance, "output": np.empty(num_students)}
+        if per_student_weights:
+            arrays["weights"] = weights
+
+        blocks = {}
+        try:
+            layout = {}
+            for key, array in arrays.items():
+                block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+                blocks[key] = block
+                np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+                layout[key] = (block.name, array.shape, array.dtype.str)
+
+            shared_weights = None if per_student_weights else weights
+            bounds = [
+                (start, min(start + self.chunk_size, num_students))
+                for start in range(0, num_students, self.chunk_size)
+            ]
+            with ProcessPoolExecutor(max_workers=min(self.max_workers, len(bounds))) as executor:
+                futures = [
+                    executor.submit(_compute_chunk, self.calculator, layout, shared_weights, start, stop)
+                    for start, stop in bounds
+                ]
+                for future in futures:
+                    future.result()
+
+            _, output_shape, output_dtype = layout["output"]
+            return np.ndarray(output_shape, dtype=output_dtype, buffer=blocks["output"].buf).copy()
+        finally:
+            for block in blocks.values():
+                block.close()
+                block.unlink()
+
+
+def _compute_chunk(calculator: GradeCalculator, layout: Dict[str, Tuple[str, tuple, str]],
+                   shared_weights: Optional[np.ndarray], start: int, stop: int) -> None:
+    blocks = {key: shared_memory.SharedMemory(name=name) for key, (name, _, _) in layout.items()}
+    try:
+        views = {
+            key: np.ndarray(shape, dtype=dtype, buffer=blocks[key].buf)
+            for key, (_, shape, dtype) in layout.items()
+        }
+        weights = views["weights"][start:stop] if shared_weights is None else shared_weights
+        views["output"][start:stop] = calculator.calculate_final_grades_batch(
+            views["grades"][start:stop], weights, views["attendance"][start:stop]
+        )
+        del views
+    finally:
+        for block in blocks.values():
+            block.close()
+
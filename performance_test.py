@@ -1,143 +1,291 @@
 """
-Test de rendimiento para validar RNF04:
-El tiempo de cálculo debe ser menor a 300 ms por solicitud.
+Suite de rendimiento para validar RNF04 y RNF02:
+- RNF04: El tiempo de cálculo debe ser menor a 300 ms por solicitud.
+- RNF02: El sistema debe soportar 50 usuarios concurrentes.
+
+Cada usuario concurrente ejecuta un bucle cerrado de solicitudes contra
+calculate_final_grade y get_calculation_details desde hilos, procesos o
+tareas asyncio. Las latencias se miden con perf_counter_ns después de
+una fase de calentamiento y se reportan como p50/p95/p99/máximo.
 """
 
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import threading
 import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Tuple
 from evaluation import Evaluation
 from attendance_policy import AttendancePolicy
 from extra_points_policy import ExtraPointsPolicy
 from grade_calculator import GradeCalculator
 
 
-def measure_calculation_time(num_evaluations: int, iterations: int = 100) -> float:
+RNF04_LIMIT_MS = 300.0
+RNF02_CONCURRENT_USERS = 50
+MODES = ("threads", "processes", "asyncio")
+OPERATIONS = ("calculate_final_grade", "get_calculation_details")
+DEFAULT_BASELINE_PATH = "performance_baseline.json"
+DEFAULT_TOLERANCE = 0.25
+COMPARED_METRICS = ("p50_ms", "p95_ms", "p99_ms")
+
+
+def build_workload(num_evaluations: int) -> Tuple[GradeCalculator, List[Evaluation]]:
     """
-    Mide el tiempo promedio de cálculo.
+    Prepara un calculador y una lista de evaluaciones representativa.
 
     Args:
         num_evaluations: Número de evaluaciones a incluir
-        iterations: Número de iteraciones para promediar
 
     Returns:
-        float: Tiempo promedio en milisegundos
+        tuple: (calculador, evaluaciones)
     """
-    # Preparar datos
-    attendance_policy = AttendancePolicy(3.0)
-    extra_points_policy = ExtraPointsPolicy(True, 2.0)
-    calculator = GradeCalculator(attendance_policy, extra_points_policy)
-
+    calculator = GradeCalculator(AttendancePolicy(3.0), ExtraPointsPolicy(True, 2.0))
     weight_per_eval = 1.0 / num_evaluations
     evaluations = [
-        Evaluation(f"Evaluación {i+1}", 15.0 + i * 0.5, weight_per_eval)
+        Evaluation(f"Evaluación {i + 1}", 15.0 + i * 0.5, weight_per_eval)
         for i in range(num_evaluations)
     ]
+    return calculator, evaluations
+
+
+def percentile(sorted_samples: List[int], q: float) -> int:
+    """Percentil por rango más cercano sobre muestras ya ordenadas."""
+    if not sorted_samples:
+        return 0
+    rank = max(1, math.ceil(q / 100.0 * len(sorted_samples)))
+    return sorted_samples[rank - 1]
+
+
+def summarize(samples_ns: List[int], elapsed_ns: int) -> Dict[str, float]:
+    """Resume las latencias (en ns) a milisegundos y calcula el throughput."""
+    ordered = sorted(samples_ns)
+    count = len(ordered)
+    return {
+        "count": count,
+        "mean_ms": sum(ordered) / count / 1e6 if count else 0.0,
+        "p50_ms": percentile(ordered, 50) / 1e6,
+        "p95_ms": percentile(ordered, 95) / 1e6,
+        "p99_ms": percentile(ordered, 99) / 1e6,
+        "max_ms": (ordered[-1] if ordered else 0) / 1e6,
+        "throughput_rps": count / (elapsed_ns / 1e9) if elapsed_ns else 0.0
+    }
+
+
+def _closed_loop(operation: str, num_evaluations: int, num_requests: int, warmup: int,
+                 start_barrier=None) -> List[int]:
+    """Bucle cerrado de un usuario: calienta y luego mide cada solicitud."""
+    calculator, evaluations = build_workload(num_evaluations)
+    call = getattr(calculator, operation)
+
+    for i in range(warmup):
+        call(evaluations, i % 2 == 0)
+
+    if start_barrier is not None:
+        start_barrier.wait()
+
+    samples = []
+    clock = time.perf_counter_ns
+    for i in range(num_requests):
+        start = clock()
+        call(evaluations, i % 2 == 0)
+        samples.append(clock() - start)
+    return samples
+
+
+def run_threads(operation: str, concurrency: int, num_requests: int, warmup: int,
+                num_evaluations: int) -> Tuple[List[int], int]:
+    """Ejecuta `concurrency` usuarios en hilos que arrancan a la vez."""
+    barrier = threading.Barrier(concurrency)
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        start = time.perf_counter_ns()
+        futures = [
+            executor.submit(_closed_loop, operation, num_evaluations, num_requests, warmup, barrier)
+            for _ in range(concurrency)
+        ]
+        samples = [sample for future in futures for sample in future.result()]
+        elapsed = time.perf_counter_ns() - start
+    return samples, elapsed
+
+
+def run_processes(operation: str, concurrency: int, num_requests: int, warmup: int,
+                  num_evaluations: int) -> Tuple[List[int], int]:
+    """Ejecuta `concurrency` usuarios en procesos independientes."""
+    with ProcessPoolExecutor(max_workers=concurrency) as executor:
+        # Se arrancan los procesos antes de medir para no contar su creación.
+        list(executor.map(int, range(concurrency)))
+        start = time.perf_counter_ns()
+        futures = [
+            executor.submit(_closed_loop, operation, num_evaluations, num_requests, warmup)
+            for _ in range(concurrency)
+        ]
+        samples = [sample for future in futures for sample in future.result()]
+        elapsed = time.perf_counter_ns() - start
+    return samples, elapsed
+
+
+def run_asyncio(operation: str, concurrency: int, num_requests: int, warmup: int,
+                num_evaluations: int) -> Tuple[List[int], int]:
+    """Ejecuta `concurrency` tareas asyncio que se intercalan entre solicitudes."""
+    calculator, evaluations = build_workload(num_evaluations)
+    call = getattr(calculator, operation)
+    for i in range(warmup):
+        call(evaluations, i % 2 == 0)
+
+    async def user(samples: List[int]) -> None:
+        clock = time.perf_counter_ns
+        for i in range(num_requests):
+            start = clock()
+            call(evaluations, i % 2 == 0)
+            samples.append(clock() - start)
+            await asyncio.sleep(0)
+
+    async def main() -> List[int]:
+        samples: List[int] = []
+        await asyncio.gather(*(user(samples) for _ in range(concurrency)))
+        return samples
+
+    start = time.perf_counter_ns()
+    samples = asyncio.run(main())
+    return samples, time.perf_counter_ns() - start
+
+
+RUNNERS = {"threads": run_threads, "processes": run_processes, "asyncio": run_asyncio}
+
+
+def run_suite(modes: List[str], operations: List[str], concurrency_levels: List[int], num_requests: int,
+              warmup: int, num_evaluations: int) -> Dict:
+    """Ejecuta todas las combinaciones y devuelve el reporte en formato JSON serializable."""
+    results = []
+    for mode in modes:
+        for operation in operations:
+            for concurrency in concurrency_levels:
+                samples, elapsed = RUNNERS[mode](operation, concurrency, num_requests, warmup, num_evaluations)
+                entry = {"mode": mode, "operation": operation, "concurrency": concurrency}
+                entry.update(summarize(samples, elapsed))
+                results.append(entry)
+                print(f"  {mode:<9} {operation:<24} c={concurrency:<5} "
+                      f"p50={entry['p50_ms']:.4f} p95={entry['p95_ms']:.4f} "
+                      f"p99={entry['p99_ms']:.4f} max={entry['max_ms']:.4f} ms  "
+                      f"{entry['throughput_rps']:,.0f} req/s")
+
+    return {
+        "metadata": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "requests_per_user": num_requests,
+            "warmup": warmup,
+            "evaluations": num_evaluations
+        },
+        "results": results
+    }
+
+
+def _result_key(entry: Dict) -> Tuple[str, str, int]:
+    return entry["mode"], entry["operation"], entry["concurrency"]
+
+
+def compare_with_baseline(report: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """
+    Compara cada resultado con la línea base.
 
-    # Medir tiempo
-    start_time = time.time()
-
-    for _ in range(iterations):
-        calculator.calculate_final_grade(evaluations, True)
-
-    end_time = time.time()
-
-    # Calcular promedio en milisegundos
-    total_time_ms = (end_time - start_time) * 1000
-    average_time_ms = total_time_ms / iterations
-
-    return average_time_ms
-
-
-def run_performance_tests():
-    """Ejecuta tests de rendimiento completos."""
-    print("=" * 70)
-    print("TEST DE RENDIMIENTO - RNF04")
-    print("Requisito: Tiempo de cálculo < 300 ms por solicitud")
-    print("=" * 70)
-    print()
-
-    test_cases = [
-        (1, "Caso mínimo (1 evaluación)"),
-        (5, "Caso promedio (5 evaluaciones)"),
-        (10, "Caso máximo (10 evaluaciones)")
-    ]
-
-    all_passed = True
-
-    for num_evals, description in test_cases:
-        print(f"Probando: {description}")
-        print(f"  Evaluaciones: {num_evals}")
-
-        avg_time = measure_calculation_time(num_evals, iterations=1000)
-
-        print(f"  Tiempo promedio: {avg_time:.4f} ms")
-
-        if avg_time < 300:
-            print(f"  Estado: [OK] PASO (< 300 ms)")
-        else:
-            print(f"  Estado: [FALLO] (>= 300 ms)")
-            all_passed = False
-
-        print()
+    Returns:
+        list: Descripción de cada métrica que empeoró más allá de la tolerancia
+    """
+    baseline_results = {_result_key(entry): entry for entry in baseline.get("results", [])}
+    regressions = []
+    for entry in report["results"]:
+        reference = baseline_results.get(_result_key(entry))
+        if reference is None:
+            continue
+        for metric in COMPARED_METRICS:
+            limit = reference[metric] * (1.0 + tolerance)
+            if entry[metric] > limit:
+                regressions.append(
+                    f"{entry['mode']}/{entry['operation']}/c={entry['concurrency']} {metric}: "
+                    f"{entry[metric]:.4f} ms > {limit:.4f} ms (base {reference[metric]:.4f} ms)"
+                )
+    return regressions
+
+
+def check_requirements(report: Dict) -> List[str]:
+    """Verifica RNF04 (p99 < 300 ms) y que RNF02 se haya ejercitado con 50 usuarios."""
+    failures = []
+    for entry in report["results"]:
+        if entry["p99_ms"] >= RNF04_LIMIT_MS:
+            failures.append(f"RNF04 {entry['mode']}/{entry['operation']}/c={entry['concurrency']}: "
+                            f"p99 {entry['p99_ms']:.4f} ms >= {RNF04_LIMIT_MS} ms")
+    if not any(entry["concurrency"] >= RNF02_CONCURRENT_USERS for entry in report["results"]):
+        failures.append(f"RNF02: no se ejecutó ningún nivel con {RNF02_CONCURRENT_USERS} usuarios concurrentes")
+    return failures
+
+
+def run_performance_tests(argv=None) -> bool:
+    """Ejecuta la suite, escribe el JSON y compara con la línea base."""
+    parser = argparse.ArgumentParser(description="Suite de rendimiento de CS-GradeCalculator.")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--operations", nargs="+", choices=OPERATIONS, default=list(OPERATIONS))
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, RNF02_CONCURRENT_USERS])
+    parser.add_argument("--requests", type=int, default=200, help="Solicitudes medidas por usuario")
+    parser.add_argument("--warmup", type=int, default=50, help="Solicitudes de calentamiento por usuario")
+    parser.add_argument("--evaluations", type=int, default=GradeCalculator.MAX_EVALUATIONS)
+    parser.add_argument("--output", default="performance_results.json")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Empeoramiento relativo permitido frente a la línea base")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Guarda esta ejecución como nueva línea base")
+    parser.add_argument("--require-baseline", action="store_true",
+                        help="Falla si no existe la línea base (para CI)")
+    args = parser.parse_args(argv)
 
-    # Test de concurrencia simulada (RNF02)
     print("=" * 70)
-    print("TEST DE CONCURRENCIA SIMULADA - RNF02")
-    print("Requisito: Soportar 50 usuarios concurrentes")
+    print("SUITE DE RENDIMIENTO - RNF04 / RNF02")
+    print(f"Requisito: p99 < {RNF04_LIMIT_MS:.0f} ms con hasta {max(args.concurrency)} usuarios concurrentes")
     print("=" * 70)
-    print()
-
-    num_concurrent_requests = 50
-    evaluations_per_request = 10
-
-    print(f"Simulando {num_concurrent_requests} solicitudes concurrentes...")
-
-    attendance_policy = AttendancePolicy(3.0)
-    extra_points_policy = ExtraPointsPolicy(True, 2.0)
-    calculator = GradeCalculator(attendance_policy, extra_points_policy)
-
-    weight_per_eval = 1.0 / evaluations_per_request
-    evaluations = [
-        Evaluation(f"Eval {i+1}", 15.0, weight_per_eval)
-        for i in range(evaluations_per_request)
-    ]
-
-    start_time = time.time()
-
-    for i in range(num_concurrent_requests):
-        calculator.calculate_final_grade(evaluations, True)
 
-    end_time = time.time()
-
-    total_time = (end_time - start_time) * 1000
-    avg_per_request = total_time / num_concurrent_requests
-
-    print(f"  Solicitudes procesadas: {num_concurrent_requests}")
-    print(f"  Tiempo total: {total_time:.2f} ms")
-    print(f"  Tiempo promedio por solicitud: {avg_per_request:.4f} ms")
-
-    if avg_per_request < 300:
-        print(f"  Estado: [OK] PASO (< 300 ms por solicitud)")
+    report = run_suite(args.modes, args.operations, args.concurrency, args.requests, args.warmup,
+                       args.evaluations)
+
+    with open(args.output, "w", encoding="utf-8") as output_file:
+        json.dump(report, output_file, indent=2)
+    print(f"\nResultados escritos en {args.output}")
+
+    failures = check_requirements(report)
+
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as baseline_file:
+            json.dump(report, baseline_file, indent=2)
+        print(f"Línea base actualizada en {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions = compare_with_baseline(report, baseline, args.tolerance)
+        print(f"Comparado con {args.baseline} (tolerancia {args.tolerance:.0%}): "
+              f"{len(regressions)} regresiones")
+        failures.extend(f"Regresión {regression}" for regression in regressions)
+    elif args.require_baseline:
+        failures.append(f"Sin línea base en {args.baseline}; no se pudieron verificar regresiones")
     else:
-        print(f"  Estado: [FALLO] (>= 300 ms por solicitud)")
-        all_passed = False
+        print(f"[ADVERTENCIA] Sin línea base en {args.baseline}: no se verificaron regresiones; "
+              f"use --update-baseline para crearla")
 
-    print()
-
-    # Resumen final
-    print("=" * 70)
-    print("RESUMEN DE RENDIMIENTO")
     print("=" * 70)
-
-    if all_passed:
-        print("[OK] TODOS LOS TESTS DE RENDIMIENTO PASARON")
-        print("  - RNF04: Tiempo < 300 ms [OK]")
-        print("  - RNF02: Soporte concurrencia [OK]")
+    if failures:
+        print("[FALLO] ALGUNOS TESTS DE RENDIMIENTO FALLARON")
+        for failure in failures:
+            print(f"  - {failure}")
     else:
-        print("[FALLO] ALGUNOS TESTS FALLARON")
-
+        print("[OK] TODOS LOS TESTS DE RENDIMIENTO PASARON")
     print("=" * 70)
 
-    return all_passed
+    return not failures
 
 
 if __name__ == "__main__":
@@ -0,0 +1,179 @@
+from abc import ABC, abstractmethod
+from bisect import bisect_right
+from typing import Sequence, Tuple
+import numpy as np
+
+
+class CompiledCurve:
+    LINEAR = "linear"
+    STEP = "step"
+
+    __slots__ = ("kind", "xp", "fp", "_xp_array", "_fp_array")
+
+    def __init__(self, kind: str, xp: Sequence[float], fp: Sequence[float]):
+        xp = tuple(float(x) for x in xp)
+        fp = tuple(float(f) for f in fp)
+        if kind == self.LINEAR:
+            if not xp or len(xp) != len(fp):
+                raise ValueError("Una curva lineal necesita tantos valores como puntos de quiebre")
+        elif kind == self.STEP:
+            if len(fp) != len(xp) + 1:
+                raise ValueError("Una curva escalonada necesita un valor más que umbrales")
+        else:
+            raise ValueError(f"Tipo de curva desconocido: {kind}")
+        if any(later <= earlier for earlier, later in zip(xp, xp[1:])):
+            raise ValueError("Los puntos de quiebre deben ser estrictamente crecientes")
+
+        self.kind = kind
+        self.xp = xp
+        self.fp = fp
+        self._xp_array = np.array(xp)
+        self._fp_array = np.array(fp)
+
+    @classmethod
+    def constant(cls, value: float) -> "CompiledCurve":
+        return cls(cls.STEP, (), (value,))
+
+    @property
+    def is_constant(self) -> bool:
+        return self.kind == self.STEP and not self.xp
+
+    def __call__(self, value: float) -> float:
+        if self.kind == self.STEP:
+            return self.fp[bisect_right(self.xp, value)]
+        return float(np.interp(value, self._xp_array, self._fp_array))
+
+    def apply(self, values: np.ndarray) -> np.ndarray:
+        # Una sola pasada sobre todo el arreglo: tabla escalonada o interpolación lineal por tramos.
+        if self.kind == self.STEP:
+            if self.is_constant:
+                return np.full(np.shape(values), self.fp[0])
+            return self._fp_array[np.searchsorted(self._xp_array, values, side="right")]
+        return np.interp(values, self._xp_array, self._fp_array)
+
+
+class _ImmutablePolicy(ABC):
+    __slots__ = ()
+
+    @abstractmethod
+    def _params(self) -> tuple:
+        ...
+
+    def __setattr__(self, name, value):
+        # Inmutable: los cachés usan sus parámetros como parte de la clave.
+        raise AttributeError(f"{type(self).__name__} es inmutable")
+
+    def __reduce__(self):
+        return type(self), self._params()
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return self._params() == other._params()
+
+    def __hash__(self):
+        return hash((type(self), self._params()))
+
+
+class PenaltyRule(_ImmutablePolicy):
+    BOOLEAN_INPUT = False
+
+    __slots__ = ()
+
+    @abstractmethod
+    def compile(self) -> CompiledCurve:
+        ...
+
+    @abstractmethod
+    def calculate_penalty(self, attendance) -> float:
+        ...
+
+    def validate_attendance_batch(self, attendance: np.ndarray) -> np.ndarray:
+        if self.BOOLEAN_INPUT:
+            if attendance.dtype != np.bool_:
+                raise ValueError("hasReachedMinimumClasses debe ser un arreglo booleano")
+            return attendance.astype(np.float64)
+        if attendance.dtype.kind not in "biuf":
+            raise ValueError("La asistencia debe ser booleana o una proporción entre 0 y 1")
+        rates = attendance.astype(np.float64)
+        if not np.all((rates >= 0) & (rates <= 1)):
+            raise ValueError("La asistencia debe ser booleana o una proporción entre 0 y 1")
+        return rates
+
+
+class BonusRule(_ImmutablePolicy):
+    __slots__ = ()
+
+    @abstractmethod
+    def compile(self) -> CompiledCurve:
+        ...
+
+    @abstractmethod
+    def calculate_extra_points(self, weighted_average: float = 0.0) -> float:
+        ...
+
+
+class AttendanceCurvePolicy(PenaltyRule):
+    __slots__ = ("breakpoints", "kind", "_curve")
+
+    def __init__(self, breakpoints: Sequence[Tuple[float, float]], kind: str = CompiledCurve.LINEAR):
+        breakpoints = tuple((float(rate), float(penalty)) for rate, penalty in breakpoints)
+        if not breakpoints:
+            raise ValueError("Debe haber al menos un punto de quiebre")
+        for rate, penalty in breakpoints:
+            if rate < 0 or rate > 1:
+                raise ValueError("La proporción de asistencia debe estar entre 0 y 1")
+            if penalty < 0:
+                raise ValueError("Los puntos de penalización no pueden ser negativos")
+
+        rates = [rate for rate, _ in breakpoints]
+        penalties = [penalty for _, penalty in breakpoints]
+        # En modo escalonado cada punto vale desde su proporción; por debajo del primero se aplica la
+        # penalización del primer escalón, igual que la curva lineal se mantiene constante fuera del rango.
+        curve = (CompiledCurve(kind, rates, penalties) if kind == CompiledCurve.LINEAR
+                 else CompiledCurve(kind, rates, penalties[:1] + penalties))
+
+        object.__setattr__(self, "breakpoints", breakpoints)
+        object.__setattr__(self, "kind", kind)
+        object.__setattr__(self, "_curve", curve)
+
+    def _params(self) -> tuple:
+        return self.breakpoints, self.kind
+
+    def compile(self) -> CompiledCurve:
+        return self._curve
+
+    def calculate_penalty(self, attendance) -> float:
+        if isinstance(attendance, bool):
+            attendance = 1.0 if attendance else 0.0
+        elif not isinstance(attendance, (int, float)) or attendance < 0 or attendance > 1:
+            raise ValueError("La asistencia debe ser booleana o una proporción entre 0 y 1")
+        return self._curve(float(attendance))
+
+
+class TieredExtraPointsPolicy(BonusRule):
+    __slots__ = ("tiers", "_curve")
+
+    def __init__(self, tiers: Sequence[Tuple[float, float]]):
+        tiers = tuple((float(minimum), float(points)) for minimum, points in tiers)
+        if not tiers:
+            raise ValueError("Debe haber al menos un tramo de puntos extra")
+        for _, points in tiers:
+            if points < 0:
+                raise ValueError("Los puntos extra no pueden ser negativos")
+
+        # Cada tramo otorga sus puntos desde su promedio mínimo; por debajo del primero no hay puntos.
+        curve = CompiledCurve(CompiledCurve.STEP, [minimum for minimum, _ in tiers],
+                              [0.0] + [points for _, points in tiers])
+
+        object.__setattr__(self, "tiers", tiers)
+        object.__setattr__(self, "_curve", curve)
+
+    def _params(self) -> tuple:
+        return (self.tiers,)
+
+    def compile(self) -> CompiledCurve:
+        return self._curve
+
+    def calculate_extra_points(self, weighted_average: float = 0.0) -> float:
+        return self._curve(weighted_average)
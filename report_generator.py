@@ -0,0 +1,280 @@
+import html
+import re
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Iterable, Iterator, List, Sequence
+import numpy as np
+from binary_gradebook import BinaryGradebook
+from calculation_result import CalculationResult
+from grade_calculator import BatchDetails, GradeCalculator
+
+
+class ReportTemplate:
+    FORMATS = ("txt", "csv", "html")
+    EXTENSIONS = {"txt": ".txt", "csv": ".csv", "html": ".html"}
+
+    # Se compila una vez por cohorte: los nombres de las evaluaciones (y los pesos, si son compartidos)
+    # quedan fijos en una sola cadena de formato por página, y cada estudiante se renderiza con una
+    # única llamada a format(). Los argumentos van por índice, así que todos los formatos comparten
+    # la misma tupla: código, (nota, peso %, aporte) por evaluación y el resumen.
+    def __init__(self, report_format: str, evaluation_names: Sequence[str], weights=None):
+        if report_format not in self.FORMATS:
+            raise ValueError(f"Formato de reporte desconocido: {report_format}")
+        names = list(evaluation_names)
+        if not names or not all(isinstance(name, str) and name for name in names):
+            raise ValueError("evaluation_names debe ser una lista no vacía de nombres")
+        if weights is not None:
+            weights = np.asarray(weights, dtype=np.float64)
+            if weights.shape != (len(names),):
+                raise ValueError("weights debe tener un peso por evaluación")
+
+        self.report_format = report_format
+        self.evaluation_names = names
+        self.weights = weights
+        self.extension = self.EXTENSIONS[report_format]
+        self.header, self.page_format, self.footer = getattr(self, f"_compile_{report_format}")()
+        self._format = self.page_format.format
+
+    def render_pages(self, student_ids: Sequence[str], grades: np.ndarray, weights: np.ndarray,
+                     details: BatchDetails, hasReachedMinimumClasses) -> List[str]:
+        grades = np.asarray(grades, dtype=np.float64)
+        weights = np.broadcast_to(np.asarray(weights, dtype=np.float64), grades.shape)
+        if grades.shape[1] != len(self.evaluation_names):
+            raise ValueError("grades debe tener una columna por evaluación de la plantilla")
+
+        # Columnas como listas de Python (una conversión por tramo): format() es mucho más rápido
+        # con float nativos que con escalares NumPy.
+        grade_columns = grades.T.tolist()
+        weighted_columns = (grades * weights).T.tolist()
+        if self.weights is None:
+            weight_columns = (weights * 100).T.tolist()
+        else:
+            weight_columns = [repeat(None)] * grades.shape[1]
+        evaluation_columns = [column for triple in zip(grade_columns, weight_columns, weighted_columns)
+                              for column in triple]
+
+        penalty = np.asarray(details.attendance_penalty)
+        extra = np.asarray(details.extra_points)
+        summary_columns = [
+            details.weighted_average.tolist(),
+            penalty.tolist(),
+            np.where(penalty > 0, " (-)", "").tolist(),
+            extra.tolist(),
+            np.where(extra > 0, " (+)", "").tolist(),
+            details.final_grade.tolist(),
+            np.where(np.asarray(hasReachedMinimumClasses, dtype=bool), "Si", "No").tolist()
+        ]
+
+        page = self._format
+        return [page(*values) for values in zip(self._escape_ids(student_ids), *evaluation_columns, *summary_columns)]
+
+    def member_name(self, student_id: str) -> str:
+        return re.sub(r"[^\w.-]", "_", student_id) + self.extension
+
+    def _escape_ids(self, student_ids: Sequence[str]) -> List[str]:
+        if self.report_format == "html":
+            return [html.escape(student_id) for student_id in student_ids]
+        if self.report_format == "csv":
+            return [_csv_field(student_id) for student_id in student_ids]
+        return list(student_ids)
+
+    def _weight_field(self, column: int, spec: str) -> str:
+        if self.weights is None:
+            return f"{{{2 + 3 * column}:{spec}}}"
+        return format(self.weights[column] * 100, spec)
+
+    def _summary_index(self) -> int:
+        return 1 + 3 * len(self.evaluation_names)
+
+    def _compile_txt(self):
+        summary = self._summary_index()
+        lines = ["\n" + "=" * 60, "RESULTADOS - ESTUDIANTE: {0}", "=" * 60, "", "DETALLE DE EVALUACIONES:", "-" * 60]
+        for column, name in enumerate(self.evaluation_names):
+            lines += [
+                f"{column + 1}. {_escape_braces(name)}",
+                f"   Nota: {{{1 + 3 * column}:.2f}}",
+                f"   Peso: {self._weight_field(column, '.1f')}%",
+                f"   Aporte: {{{3 + 3 * column}:.2f}}",
+                ""
+            ]
+        lines += [
+            "CALCULO DE NOTA FINAL:",
+            "-" * 60,
+            f"Promedio Ponderado:        {{{summary}:>6.2f}}",
+            f"Penalizacion (Asistencia): {{{summary + 1}:>6.2f}}{{{summary + 2}}}",
+            f"Puntos Extra:              {{{summary + 3}:>6.2f}}{{{summary + 4}}}",
+            "-" * 60,
+            f"NOTA FINAL:                {{{summary + 5}:>6.2f}}",
+            "=" * 60,
+            "",
+            "INFORMACION ADICIONAL:",
+            f"- Total de evaluaciones: {len(self.evaluation_names)}",
+            f"- Asistencia minima cumplida: {{{summary + 6}}}",
+            ""
+        ]
+        return "", "\n".join(lines) + "\n", ""
+
+    def _compile_csv(self):
+        summary = self._summary_index()
+        header = ",".join(["student_id"] + [_csv_field(name) for name in self.evaluation_names] +
+                          ["weighted_average", "attendance_penalty", "extra_points", "final_grade",
+                           "hasReachedMinimumClasses"]) + "\n"
+        fields = ["{0}"] + [f"{{{1 + 3 * column}:.2f}}" for column in range(len(self.evaluation_names))]
+        fields += [f"{{{summary}:.2f}}", f"{{{summary + 1}:.2f}}", f"{{{summary + 3}:.2f}}",
+                   f"{{{summary + 5}:.2f}}", f"{{{summary + 6}}}"]
+        return header, ",".join(fields) + "\n", ""
+
+    def _compile_html(self):
+        summary = self._summary_index()
+        header = ('<!DOCTYPE html>\n<html lang="es">\n<head><meta charset="utf-8"><title>Reporte de notas</title>'
+                  '</head>\n<body>\n')
+        rows = [
+            f"<tr><td>{column + 1}</td><td>{_escape_braces(html.escape(name))}</td>"
+            f"<td>{{{1 + 3 * column}:.2f}}</td><td>{self._weight_field(column, '.1f')}%</td>"
+            f"<td>{{{3 + 3 * column}:.2f}}</td></tr>\n"
+            for column, name in enumerate(self.evaluation_names)
+        ]
+        page = (
+            '<section class="reporte">\n<h2>Estudiante: {0}</h2>\n<table>\n'
+            "<tr><th>#</th><th>Evaluación</th><th>Nota</th><th>Peso</th><th>Aporte</th></tr>\n"
+            + "".join(rows) +
+            "</table>\n<dl>\n"
+            f"<dt>Promedio ponderado</dt><dd>{{{summary}:.2f}}</dd>\n"
+            f"<dt>Penalización (asistencia)</dt><dd>{{{summary + 1}:.2f}}</dd>\n"
+            f"<dt>Puntos extra</dt><dd>{{{summary + 3}:.2f}}</dd>\n"
+            f"<dt>Nota final</dt><dd><strong>{{{summary + 5}:.2f}}</strong></dd>\n"
+            f"<dt>Asistencia mínima cumplida</dt><dd>{{{summary + 6}}}</dd>\n"
+            "</dl>\n</section>\n"
+        )
+        return header, page, "</body>\n</html>\n"
+
+
+class ReportGenerator:
+    DEFAULT_CHUNK_SIZE = 5_000
+    DEFAULT_BUFFER_SIZE = 1 << 20
+    # Nivel 1 de deflate: las hojas son texto muy repetitivo y comprimen casi igual que con el nivel 6,
+    # en bastante menos tiempo.
+    ZIP_COMPRESS_LEVEL = 1
+
+    # Cada tarea calcula y renderiza un tramo de estudiantes y devuelve bytes ya codificados; el
+    # proceso principal solo los escribe, en orden, con un buffer grande. Como mucho hay 2 tramos por
+    # worker en vuelo, así que la memoria no depende del tamaño de la cohorte.
+    def __init__(self, calculator: GradeCalculator, report_format: str = "txt", max_workers: int = 1,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE, buffer_size: int = DEFAULT_BUFFER_SIZE):
+        if not isinstance(calculator, GradeCalculator):
+            raise ValueError("calculator debe ser una instancia de GradeCalculator")
+        if report_format not in ReportTemplate.FORMATS:
+            raise ValueError(f"Formato de reporte desconocido: {report_format}")
+        for value, label in ((max_workers, "max_workers"), (chunk_size, "chunk_size"), (buffer_size, "buffer_size")):
+            if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+                raise ValueError(f"{label} debe ser un entero positivo")
+
+        self.calculator = calculator
+        self.report_format = report_format
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self.buffer_size = buffer_size
+
+    def write(self, output_path: str, student_ids: Sequence[str], evaluation_names: Sequence[str],
+              grades, weights, hasReachedMinimumClasses, archive: bool = False,
+              compression: int = zipfile.ZIP_DEFLATED) -> int:
+        grades = np.asarray(grades, dtype=np.float64)
+        weights = np.asarray(weights, dtype=np.float64)
+        attendance = np.asarray(hasReachedMinimumClasses)
+        if grades.ndim != 2:
+            raise ValueError("grades debe ser una matriz (estudiantes x evaluaciones)")
+        if len(student_ids) != grades.shape[0] or attendance.shape != (grades.shape[0],):
+            raise ValueError("student_ids y hasReachedMinimumClasses deben tener un valor por estudiante")
+        if weights.shape not in (grades.shape[1:], grades.shape):
+            raise ValueError("weights debe ser un vector compartido o una matriz con la misma forma que grades")
+
+        template = ReportTemplate(self.report_format, evaluation_names, weights if weights.ndim == 1 else None)
+        tasks = (
+            (template, self.calculator, _decode_ids(student_ids[start:start + self.chunk_size]),
+             grades[start:start + self.chunk_size],
+             weights if weights.ndim == 1 else weights[start:start + self.chunk_size],
+             attendance[start:start + self.chunk_size], archive)
+            for start in range(0, grades.shape[0], self.chunk_size)
+        )
+        return self._write_chunks(output_path, template, self._rendered_chunks(tasks), archive, compression)
+
+    def write_gradebook(self, gradebook: BinaryGradebook, output_path: str, archive: bool = False,
+                        compression: int = zipfile.ZIP_DEFLATED) -> int:
+        # Los pesos del archivo binario son por estudiante; las filas se leen del mmap tramo a tramo.
+        return self.write(output_path, gradebook.student_ids, gradebook.evaluation_names, gradebook.grades,
+                          gradebook.weights, gradebook.attendance, archive, compression)
+
+    def _write_chunks(self, output_path: str, template: ReportTemplate, chunks: Iterable,
+                      archive: bool, compression: int) -> int:
+        pages = 0
+        with open(output_path, "wb", buffering=self.buffer_size) as output_file:
+            if archive:
+                with zipfile.ZipFile(output_file, "w", compression=compression,
+                                     compresslevel=self.ZIP_COMPRESS_LEVEL) as archive_file:
+                    for members in chunks:
+                        for name, content in members:
+                            archive_file.writestr(name, content)
+                        pages += len(members)
+            else:
+                output_file.write(template.header.encode("utf-8"))
+                for content, count in chunks:
+                    output_file.write(content)
+                    pages += count
+                output_file.write(template.footer.encode("utf-8"))
+        return pages
+
+    def _rendered_chunks(self, tasks: Iterable[tuple]) -> Iterator:
+        if self.max_workers == 1:
+            for task in tasks:
+                yield _render_chunk(*task)
+            return
+
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = deque()
+            for task in tasks:
+                pending.append(executor.submit(_render_chunk, *task))
+                if len(pending) >= 2 * self.max_workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+
+def render_report(student_id: str, details: CalculationResult, report_format: str = "txt") -> str:
+    # Una sola hoja, completa (encabezado y pie incluidos), a partir del detalle de get_calculation_details.
+    evaluations = details.evaluations
+    template = ReportTemplate(report_format, [evaluation.name for evaluation in evaluations],
+                              [evaluation.weight for evaluation in evaluations])
+    grades = np.array([[evaluation.grade for evaluation in evaluations]])
+    batch = BatchDetails(*(np.array([details[field]]) for field in BatchDetails._fields))
+    page = template.render_pages([student_id], grades, template.weights, batch,
+                                 [details.hasReachedMinimumClasses])[0]
+    return template.header + page + template.footer
+
+
+def _render_chunk(template: ReportTemplate, calculator: GradeCalculator, student_ids: List[str],
+                  grades: np.ndarray, weights: np.ndarray, attendance: np.ndarray, archive: bool):
+    details = calculator.calculate_details_batch(grades, weights, attendance)
+    pages = template.render_pages(student_ids, grades, weights, details, attendance)
+    if archive:
+        return [
+            (template.member_name(student_id), (template.header + page + template.footer).encode("utf-8"))
+            for student_id, page in zip(student_ids, pages)
+        ]
+    return "".join(pages).encode("utf-8"), len(pages)
+
+
+def _decode_ids(student_ids) -> List[str]:
+    ids = student_ids.tolist() if isinstance(student_ids, np.ndarray) else list(student_ids)
+    return [student_id.decode("utf-8") if isinstance(student_id, bytes) else str(student_id) for student_id in ids]
+
+
+def _csv_field(value: str) -> str:
+    if any(character in value for character in ',"\r\n'):
+        return '"' + value.replace('"', '""') + '"'
+    return value
+
+
+def _escape_braces(text: str) -> str:
+    return text.replace("{", "{{").replace("}", "}}")
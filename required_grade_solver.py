@@ -0,0 +1,124 @@
+import math
+from collections import namedtuple
+from typing import List, Optional
+import numpy as np
+from evaluation import Evaluation
+from grade_calculator import GradeCalculator
+
+
+RequiredGrades = namedtuple("RequiredGrades", ["required_grade", "feasible"])
+
+
+class RequiredGradeSolver:
+    GRADE_STEP = 0.01
+    MAX_ADJUSTMENTS = 4
+
+    def __init__(self, calculator: GradeCalculator):
+        if not isinstance(calculator, GradeCalculator):
+            raise ValueError("calculator debe ser una instancia de GradeCalculator")
+        self.calculator = calculator
+
+    def solve(self, grades, weights, remaining_weights, hasReachedMinimumClasses, target) -> RequiredGrades:
+        grades = np.asarray(grades, dtype=np.float64)
+        if grades.ndim != 2:
+            raise ValueError("grades debe ser una matriz (estudiantes x evaluaciones)")
+        num_students = grades.shape[0]
+        weights = self._as_matrix(weights, num_students, grades.shape[1], "weights")
+        remaining = self._as_matrix(remaining_weights, num_students, None, "remaining_weights")
+        if remaining.shape[1] == 0:
+            raise ValueError("Debe haber al menos una evaluación pendiente")
+        attendance = np.asarray(hasReachedMinimumClasses)
+        rates = self.calculator.attendance_policy.validate_attendance_batch(attendance)
+        target = np.broadcast_to(np.asarray(target, dtype=np.float64), (num_students,))
+
+        # Inversión analítica: la nota final es s * (C + g * R) - penalización + extra,
+        # con s = 1 si el peso total no supera 1 y s = 1 / W en otro caso.
+        completed_weighted = np.zeros(num_students)
+        completed_weight = np.zeros(num_students)
+        for column in range(grades.shape[1]):
+            completed_weighted += grades[:, column] * weights[:, column]
+            completed_weight += weights[:, column]
+        remaining_total = remaining.sum(axis=1)
+        total_weight = completed_weight + remaining_total
+
+        bonus_curve = self.calculator.extra_points_policy.compile()
+        if not bonus_curve.is_constant:
+            # Con puntos extra por tramos la inversión no es cerrada; la nota final sigue siendo
+            # monótona en la nota pendiente, así que se busca por bisección sobre la grilla de 0.01.
+            return self._bisect(grades, weights, remaining, attendance, target)
+
+        penalty = self.calculator.attendance_policy.compile().apply(rates)
+        extra = bonus_curve.fp[0]
+        needed_average = target - 0.005 + penalty - extra
+        needed_total = np.where(total_weight <= 1, needed_average, needed_average * total_weight)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            raw = (needed_total - completed_weighted) / remaining_total
+        raw = np.where(remaining_total > 0, raw, Evaluation.MIN_GRADE)
+
+        candidate = np.ceil(np.clip(raw, Evaluation.MIN_GRADE, Evaluation.MAX_GRADE) / self.GRADE_STEP) * self.GRADE_STEP
+        candidate = np.round(np.clip(candidate, Evaluation.MIN_GRADE, Evaluation.MAX_GRADE), 2)
+
+        # La ruta directa del calculador decide: se corrige el redondeo del candidato
+        # subiendo o bajando un paso hasta que sea la mínima nota que alcanza el objetivo.
+        meets = self._forward(grades, weights, remaining, attendance, candidate) >= target
+        for _ in range(self.MAX_ADJUSTMENTS):
+            raise_step = ~meets & (candidate < Evaluation.MAX_GRADE)
+            if not raise_step.any():
+                break
+            candidate = np.where(raise_step, np.round(candidate + self.GRADE_STEP, 2), candidate)
+            meets = self._forward(grades, weights, remaining, attendance, candidate) >= target
+
+        for _ in range(self.MAX_ADJUSTMENTS):
+            lower = np.round(np.maximum(candidate - self.GRADE_STEP, Evaluation.MIN_GRADE), 2)
+            lower_meets = self._forward(grades, weights, remaining, attendance, lower) >= target
+            lower_step = meets & lower_meets & (lower < candidate)
+            if not lower_step.any():
+                break
+            candidate = np.where(lower_step, lower, candidate)
+
+        # Con objetivo <= 0 cualquier nota lo alcanza (la nota final se recorta en 0): el mínimo es 0, aunque
+        # la estimación lineal ignore el recorte y quede lejos.
+        trivial = target <= GradeCalculator.MIN_FINAL_GRADE
+        candidate = np.where(trivial, Evaluation.MIN_GRADE, candidate)
+        meets = meets | trivial
+        return RequiredGrades(np.where(meets, candidate, np.nan), meets)
+
+    def solve_student(self, examsStudents: List[Evaluation], remaining_weights: List[float],
+                      hasReachedMinimumClasses: bool, target: float) -> Optional[float]:
+        grades = [[evaluation.grade for evaluation in examsStudents]]
+        weights = [[evaluation.weight for evaluation in examsStudents]]
+        result = self.solve(grades, weights, [remaining_weights], np.array([hasReachedMinimumClasses]), target)
+        required = float(result.required_grade[0])
+        return None if math.isnan(required) else required
+
+    def _bisect(self, grades: np.ndarray, weights: np.ndarray, remaining: np.ndarray, attendance: np.ndarray,
+                target: np.ndarray) -> RequiredGrades:
+        steps = int(round(Evaluation.MAX_GRADE / self.GRADE_STEP))
+        low = np.zeros(grades.shape[0], dtype=np.int64)
+        high = np.full(grades.shape[0], steps, dtype=np.int64)
+        feasible = self._forward(grades, weights, remaining, attendance, high * self.GRADE_STEP) >= target
+
+        while np.any(low < high):
+            middle = (low + high) // 2
+            meets = self._forward(grades, weights, remaining, attendance, np.round(middle * self.GRADE_STEP, 2)) >= target
+            high = np.where(meets, middle, high)
+            low = np.where(meets, low, middle + 1)
+
+        return RequiredGrades(np.where(feasible, np.round(high * self.GRADE_STEP, 2), np.nan), feasible)
+
+    def _forward(self, grades: np.ndarray, weights: np.ndarray, remaining: np.ndarray, attendance: np.ndarray,
+                 candidate: np.ndarray) -> np.ndarray:
+        pending = np.repeat(candidate[:, None], remaining.shape[1], axis=1)
+        return self.calculator.calculate_final_grades_batch(
+            np.hstack([grades, pending]), np.hstack([weights, remaining]), attendance
+        )
+
+    def _as_matrix(self, values, num_students: int, num_columns: Optional[int], label: str) -> np.ndarray:
+        values = np.asarray(values, dtype=np.float64)
+        if values.ndim == 1:
+            values = values.reshape(1, -1)
+        if values.ndim != 2 or (num_columns is not None and values.shape[1] != num_columns):
+            raise ValueError(f"{label} debe ser un vector compartido o una matriz por estudiante")
+        if values.shape[0] not in (1, num_students):
+            raise ValueError(f"{label} debe tener una fila por estudiante")
+        return np.broadcast_to(values, (num_students, values.shape[1]))
@@ -0,0 +1,181 @@
+import math
+import sys
+from typing import Dict, List, Set
+from evaluation import Evaluation
+from grade_calculator import GradeCalculator
+from policy_engine import CompiledCurve
+
+
+class _StudentState:
+    __slots__ = ("evaluations", "total_weighted", "total_weight", "hasReachedMinimumClasses",
+                 "updates_since_resum", "final_grade")
+
+    def __init__(self, evaluations: Dict[str, Evaluation], hasReachedMinimumClasses: bool):
+        self.evaluations = evaluations
+        self.hasReachedMinimumClasses = hasReachedMinimumClasses
+        self.total_weighted = 0.0
+        self.total_weight = 0.0
+        self.updates_since_resum = 0
+        self.final_grade = None
+
+
+class StudentGradeLedger:
+    DEFAULT_RESUM_INTERVAL = 1000
+
+    def __init__(self, calculator: GradeCalculator, resum_interval: int = DEFAULT_RESUM_INTERVAL):
+        if not isinstance(calculator, GradeCalculator):
+            raise ValueError("calculator debe ser una instancia de GradeCalculator")
+        if not isinstance(resum_interval, int) or resum_interval < 1:
+            raise ValueError("resum_interval debe ser un entero positivo")
+
+        self.calculator = calculator
+        self.resum_interval = resum_interval
+        self._students: Dict[str, _StudentState] = {}
+        self._dirty: Set[str] = set()
+
+    def add_student(self, student_id: str, examsStudents: List[Evaluation], hasReachedMinimumClasses: bool) -> float:
+        if student_id in self._students:
+            raise ValueError(f"El estudiante {student_id} ya está registrado")
+        final_grade = self.calculator.calculate_final_grade(examsStudents, hasReachedMinimumClasses)
+
+        evaluations = {}
+        for evaluation in examsStudents:
+            if evaluation.name in evaluations:
+                raise ValueError(f"La evaluación {evaluation.name} está duplicada")
+            evaluations[evaluation.name] = evaluation
+
+        state = _StudentState(evaluations, hasReachedMinimumClasses)
+        self._resum(state)
+        state.final_grade = final_grade
+        self._students[student_id] = state
+        return final_grade
+
+    def add_evaluation(self, student_id: str, evaluation: Evaluation) -> None:
+        state = self._get_state(student_id)
+        if not isinstance(evaluation, Evaluation):
+            raise ValueError("Todos los elementos deben ser instancias de Evaluation")
+        if evaluation.name in state.evaluations:
+            raise ValueError(f"La evaluación {evaluation.name} ya existe")
+        if len(state.evaluations) >= self.calculator.max_evaluations:
+            raise ValueError(f"El número máximo de evaluaciones es {self.calculator.max_evaluations}")
+
+        state.evaluations[evaluation.name] = evaluation
+        self._apply_delta(student_id, state, evaluation.get_weighted_grade(), evaluation.weight)
+
+    def update_grade(self, student_id: str, name: str, grade: float) -> None:
+        state = self._get_state(student_id)
+        previous = self._get_evaluation(state, name)
+        updated = Evaluation(name, grade, previous.weight)
+        state.evaluations[name] = updated
+        self._apply_delta(student_id, state, updated.get_weighted_grade() - previous.get_weighted_grade(), 0.0)
+
+    def update_weight(self, student_id: str, name: str, weight: float) -> None:
+        state = self._get_state(student_id)
+        previous = self._get_evaluation(state, name)
+        updated = Evaluation(name, previous.grade, weight)
+        state.evaluations[name] = updated
+        self._apply_delta(
+            student_id, state,
+            updated.get_weighted_grade() - previous.get_weighted_grade(),
+            updated.weight - previous.weight
+        )
+
+    def set_attendance(self, student_id: str, hasReachedMinimumClasses: bool) -> None:
+        state = self._get_state(student_id)
+        # La política de asistencia valida el valor (booleano o proporción, según la política).
+        self.calculator.attendance_policy.calculate_penalty(hasReachedMinimumClasses)
+        if state.hasReachedMinimumClasses != hasReachedMinimumClasses:
+            state.hasReachedMinimumClasses = hasReachedMinimumClasses
+            state.final_grade = None
+            self._dirty.add(student_id)
+
+    def get_final_grade(self, student_id: str) -> float:
+        state = self._get_state(student_id)
+        if state.final_grade is None:
+            # Los totales incrementales bastan salvo que el error acumulado por los deltas pueda cambiar la
+            # nota (cerca de un empate de redondeo o de un umbral); ahí se re-suma en el orden de la ruta escalar.
+            if self._near_boundary(state):
+                self._resum(state)
+            state.final_grade = self.calculator.calculate_final_grade_from_totals(
+                state.total_weighted, state.total_weight, state.hasReachedMinimumClasses
+            )
+        self._dirty.discard(student_id)
+        return state.final_grade
+
+    def get_evaluations(self, student_id: str) -> List[Evaluation]:
+        return list(self._get_state(student_id).evaluations.values())
+
+    def dirty_students(self) -> Set[str]:
+        return set(self._dirty)
+
+    def flush(self) -> Dict[str, float]:
+        return {student_id: self.get_final_grade(student_id) for student_id in list(self._dirty)}
+
+    def resum(self, student_id: str) -> None:
+        state = self._get_state(student_id)
+        self._resum(state)
+        state.final_grade = None
+        self._dirty.add(student_id)
+
+    def resum_all(self) -> None:
+        for student_id in self._students:
+            self.resum(student_id)
+
+    def __contains__(self, student_id: str) -> bool:
+        return student_id in self._students
+
+    def __len__(self) -> int:
+        return len(self._students)
+
+    def _apply_delta(self, student_id: str, state: _StudentState, weighted_delta: float, weight_delta: float) -> None:
+        state.total_weighted += weighted_delta
+        state.total_weight += weight_delta
+        state.updates_since_resum += 1
+        # Re-sumar cada cierto número de deltas acota el error de los totales intermedios.
+        if state.updates_since_resum >= self.resum_interval:
+            self._resum(state)
+        state.final_grade = None
+        self._dirty.add(student_id)
+
+    def _near_boundary(self, state: _StudentState) -> bool:
+        if state.updates_since_resum == 0:
+            return False
+        # Cota holgada del error de los totales: cada suma parcial está acotada por max_evaluations (pesos)
+        # y por MAX_GRADE * max_evaluations (notas ponderadas), y cada delta o término suma un redondeo.
+        terms = state.updates_since_resum + len(state.evaluations) + 1
+        weight_error = terms * self.calculator.max_evaluations * sys.float_info.epsilon
+        weighted_error = Evaluation.MAX_GRADE * weight_error
+        average_error = 2 * (weighted_error + Evaluation.MAX_GRADE * weight_error)
+        total_weight = state.total_weight
+        if total_weight <= weight_error or abs(total_weight - 1) <= weight_error:
+            return True
+
+        weighted_average = self.calculator._weighted_average_from_totals(state.total_weighted, total_weight)
+        bonus_curve = self.calculator.extra_points_policy.compile()
+        if bonus_curve.kind == CompiledCurve.STEP and any(
+                abs(weighted_average - threshold) <= average_error for threshold in bonus_curve.xp):
+            return True
+
+        final_grade = (weighted_average
+                       - self.calculator.attendance_policy.calculate_penalty(state.hasReachedMinimumClasses)
+                       + self.calculator.extra_points_policy.calculate_extra_points(weighted_average))
+        scaled = final_grade * 100
+        return abs(scaled - math.floor(scaled) - 0.5) < 1e-6 + average_error * 100
+
+    def _resum(self, state: _StudentState) -> None:
+        evaluations = state.evaluations.values()
+        state.total_weighted = sum(evaluation.get_weighted_grade() for evaluation in evaluations)
+        state.total_weight = sum(evaluation.weight for evaluation in evaluations)
+        state.updates_since_resum = 0
+
+    def _get_state(self, student_id: str) -> _StudentState:
+        state = self._students.get(student_id)
+        if state is None:
+            raise ValueError(f"El estudiante {student_id} no está registrado")
+        return state
+
+    def _get_evaluation(self, state: _StudentState, name: str) -> Evaluation:
+        evaluation = state.evaluations.get(name)
+        if evaluation is None:
+            raise ValueError(f"La evaluación {name} no existe")
+        return evaluation
@@ -3,11 +3,52 @@ Tests unitarios para el sistema CS-GradeCalculator.
 Cumple con los requisitos de pruebas automatizadas del examen.
 """
 
+import asyncio
+import contextlib
+import csv
+import io
+import json
+import os
+import tempfile
+import threading
+import random
+import shutil
+import socket
 import unittest
+import zipfile
+import numpy as np
 from evaluation import Evaluation
 from attendance_policy import AttendancePolicy
 from extra_points_policy import ExtraPointsPolicy
 from grade_calculator import GradeCalculator
+from calculation_result import CalculationResult
+from evaluation_set import EvaluationSet
+from batch_processor import BatchGradeProcessor
+from parallel_calculator import ParallelGradeCalculator
+import performance_test
+from grade_service import GradeService, ServiceBusyError
+from cached_grade_calculator import CachedGradeCalculator
+from student_grade_ledger import StudentGradeLedger
+from required_grade_solver import RequiredGradeSolver
+from validated_evaluations import ValidatedEvaluations
+from bulk_validator import BulkValidator
+from policy_engine import AttendanceCurvePolicy, BonusRule, CompiledCurve, PenaltyRule, TieredExtraPointsPolicy
+from grade_store import GradeStore
+from binary_gradebook import BinaryGradebook, BinaryGradebookWriter
+from instrumentation import CalculatorInstrumentation
+from metrics_registry import MetricsRegistry
+from fixed_point_calculator import FixedPointGradeCalculator, to_basis_points, to_hundredths
+from calculation_daemon import CalculationDaemon
+from grade_client import GradeClient
+from grade_curving import GradeCurve
+from grade_ranking import GradeRanking, TopKSelector, bottom_k, top_k
+from evaluation_rules import DropLowestRule, EvaluationRule, EvaluationRuleEngine, KeepBestRule
+from grade_categories import CategoryGradeCalculator, GradeCategory, Syllabus
+from report_generator import ReportGenerator, ReportTemplate, render_report
+from grade_event_log import (ATTENDANCE_CHANGED, EVALUATION_ADDED, GRADE_CORRECTED, POLICY_CHANGED,
+                             GradeEventLog)
+from grade_uncertainty import GradeUncertaintySimulator
+from cohort_statistics import CohortStatistics, SectionStatistics
 
 
 class TestEvaluation(unittest.TestCase):
@@ -303,6 +344,2124 @@ class TestGradeCalculatorIntegration(unittest.TestCase):
         self.assertEqual(final_grade, 20.0)  # 20 + 5 = 25, capped at 20
 
 
+class TestGradeCalculatorBatch(unittest.TestCase):
+    """Tests para el cálculo vectorizado por cohorte."""
+
+    def setUp(self):
+        """Configuración inicial para cada test."""
+        self.calculator = GradeCalculator(AttendancePolicy(3.0), ExtraPointsPolicy(True, 2.0))
+
+    def _scalar_grades(self, grades, weights, attendance):
+        return [
+            self.calculator.calculate_final_grade(
+                [Evaluation(f"Eval {j}", float(g), float(w)) for j, (g, w) in enumerate(zip(row_grades, row_weights))],
+                bool(reached)
+            )
+            for row_grades, row_weights, reached in zip(grades, weights, attendance)
+        ]
+
+    def test_shouldMatchScalarPathForRandomCohort(self):
+        """Debe coincidir exactamente con la ruta escalar en una cohorte aleatoria."""
+        rng = random.Random(7)
+        grades = [[round(rng.uniform(0, 20), 2) for _ in range(6)] for _ in range(300)]
+        weights = [[round(rng.uniform(0, 0.3), 2) for _ in range(6)] for _ in range(300)]
+        attendance = [rng.random() < 0.8 for _ in range(300)]
+
+        batch = self.calculator.calculate_final_grades_batch(grades, weights, np.array(attendance))
+
+        self.assertEqual(batch.tolist(), self._scalar_grades(grades, weights, attendance))
+
+    def test_shouldAcceptSharedWeightVector(self):
+        """Debe aceptar un vector de pesos compartido por todos los estudiantes."""
+        grades = [[16.0, 14.0, 18.0], [10.0, 12.5, 9.0]]
+        weights = [0.3, 0.3, 0.4]
+        attendance = np.array([True, False])
+
+        batch = self.calculator.calculate_final_grades_batch(grades, weights, attendance)
+
+        self.assertEqual(batch.tolist(), self._scalar_grades(grades, [weights, weights], attendance))
+
+    def test_shouldClampBatchResults(self):
+        """Debe limitar los resultados al rango de nota final."""
+        calculator = GradeCalculator(AttendancePolicy(25.0), ExtraPointsPolicy(True, 10.0))
+        batch = calculator.calculate_final_grades_batch([[20.0], [5.0]], [1.0], np.array([True, False]))
+        self.assertEqual(batch.tolist(), [20.0, 0.0])
+
+    def test_shouldRaiseErrorWhenBatchGradeIsOutOfRange(self):
+        """Debe lanzar error cuando alguna nota del lote está fuera de rango."""
+        with self.assertRaises(ValueError):
+            self.calculator.calculate_final_grades_batch([[15.0], [21.0]], [1.0], np.array([True, True]))
+
+    def test_shouldRaiseErrorWhenBatchExceedsMaximumEvaluations(self):
+        """Debe lanzar error cuando el lote excede el máximo de evaluaciones."""
+        grades = np.full((2, GradeCalculator.MAX_EVALUATIONS + 1), 15.0)
+        with self.assertRaises(ValueError):
+            self.calculator.calculate_final_grades_batch(grades, np.full(grades.shape[1], 0.05), np.array([True, True]))
+
+    def test_shouldRaiseErrorWhenAttendanceIsNotBoolean(self):
+        """Debe lanzar error cuando la asistencia no es un arreglo booleano."""
+        with self.assertRaises(ValueError):
+            self.calculator.calculate_final_grades_batch([[15.0]], [1.0], np.array([1]))
+
+
+class TestCalculationResult(unittest.TestCase):
+    """Tests para el resultado de cálculo de un solo paso."""
+
+    def setUp(self):
+        """Configuración inicial para cada test."""
+        self.calculator = GradeCalculator(AttendancePolicy(3.0), ExtraPointsPolicy(True, 2.0))
+        self.evaluations = [
+            Evaluation("Parcial 1", 15.0, 0.4),
+            Evaluation("Final", 17.0, 0.6)
+        ]
+
+    def test_shouldExposeFieldsAsAttributes(self):
+        """Debe exponer los campos del cálculo como atributos."""
+        result = self.calculator.get_calculation_details(self.evaluations, False)
+        self.assertIsInstance(result, CalculationResult)
+        self.assertEqual(result.weighted_average, 16.2)
+        self.assertEqual(result.attendance_penalty, 3.0)
+        self.assertEqual(result.extra_points, 2.0)
+        self.assertEqual(result.final_grade, self.calculator.calculate_final_grade(self.evaluations, False))
+        self.assertEqual(result.total_evaluations, 2)
+
+    def test_shouldBuildEvaluationsDetailOnlyWhenRead(self):
+        """Debe construir el detalle por evaluación solo al consultarlo."""
+        result = self.calculator.get_calculation_details(self.evaluations, True)
+        self.assertIsNone(result._evaluations_detail)
+
+        detail = result.evaluations_detail
+        self.assertEqual(detail[0], {"name": "Parcial 1", "grade": 15.0, "weight": 0.4, "weighted_grade": 6.0})
+        self.assertIs(result.evaluations_detail, detail)
+
+    def test_shouldRemainCompatibleWithDictAccess(self):
+        """Debe seguir siendo compatible con el acceso tipo diccionario."""
+        result = self.calculator.get_calculation_details(self.evaluations, True)
+        self.assertEqual(result['final_grade'], result.final_grade)
+        self.assertEqual(set(result.to_dict()), set(CalculationResult.FIELDS))
+        self.assertEqual(dict(result), result.to_dict())
+        with self.assertRaises(KeyError):
+            result['unknown']
+
+    def test_shouldNotHaveInstanceDict(self):
+        """No debe reservar un __dict__ por instancia."""
+        result = self.calculator.get_calculation_details(self.evaluations, True)
+        self.assertFalse(hasattr(result, "__dict__"))
+
+
+class TestEvaluationSet(unittest.TestCase):
+    """Tests para el almacenamiento compacto de evaluaciones."""
+
+    def setUp(self):
+        """Configuración inicial para cada test."""
+        self.calculator = GradeCalculator(AttendancePolicy(3.0), ExtraPointsPolicy(True, 2.0))
+        self.evaluations = [
+            Evaluation("Parcial 1", 15.75, 0.3),
+            Evaluation("Parcial 2", 13.25, 0.3),
+            Evaluation("Final", 17.5, 0.4)
+        ]
+
+    def test_shouldUseSlotsInEvaluation(self):
+        """Evaluation no debe reservar un __dict__ por instancia."""
+        self.assertFalse(hasattr(self.evaluations[0], "__dict__"))
+
+    def test_shouldMatchListResultInCalculator(self):
+        """Debe producir el mismo resultado que la lista de evaluaciones."""
+        evaluation_set = EvaluationSet.from_evaluations(self.evaluations)
+        for reached in (True, False):
+            self.assertEqual(
+                self.calculator.calculate_final_grade(evaluation_set, reached),
+                self.calculator.calculate_final_grade(self.evaluations, reached)
+            )
+
+    def test_shouldProvideDetailsFromSet(self):
+        """Debe generar el detalle por evaluación desde los buffers."""
+        evaluation_set = EvaluationSet.from_evaluations(self.evaluations)
+        details = self.calculator.get_calculation_details(evaluation_set, True)
+        self.assertEqual(details.total_evaluations, 3)
+        self.assertEqual(details.evaluations_detail[2]["name"], "Final")
+        self.assertEqual(details.evaluations_detail[2]["grade"], 17.5)
+
+    def test_shouldExposeZeroCopyArrays(self):
+        """Debe exponer vistas NumPy sin copiar los buffers."""
+        evaluation_set = EvaluationSet(["A", "B"], [10.0, 12.0], [0.5, 0.5])
+        grades, weights = evaluation_set.as_arrays()
+        self.assertEqual(grades.tolist(), [10.0, 12.0])
+        self.assertEqual(weights.tolist(), [0.5, 0.5])
+        self.assertFalse(grades.flags.owndata)
+
+    def test_shouldRaiseErrorWhenAnyGradeIsOutOfRange(self):
+        """Debe lanzar error cuando alguna nota del buffer está fuera de rango."""
+        with self.assertRaises(ValueError):
+            EvaluationSet(["A", "B"], [10.0, 20.5], [0.5, 0.5])
+
+    def test_shouldRaiseErrorWhenAnyWeightIsOutOfRange(self):
+        """Debe lanzar error cuando algún peso del buffer está fuera de rango."""
+        with self.assertRaises(ValueError):
+            EvaluationSet(["A", "B"], [10.0, 12.0], [0.5, -0.1])
+
+    def test_shouldRaiseErrorWhenLengthsDiffer(self):
+        """Debe lanzar error cuando las longitudes no coinciden."""
+        with self.assertRaises(ValueError):
+            EvaluationSet(["A"], [10.0, 12.0], [0.5, 0.5])
+
+    def test_shouldRaiseErrorWhenGradeIsNotNumeric(self):
+        """Debe lanzar error cuando una nota no es numérica."""
+        with self.assertRaises(ValueError):
+            EvaluationSet(["A"], ["diez"], [1.0])
+
+
+class TestBatchGradeProcessor(unittest.TestCase):
+    """Tests para el procesamiento por lotes en streaming."""
+
+    def setUp(self):
+        """Configuración inicial para cada test."""
+        self.calculator = GradeCalculator(AttendancePolicy(3.0), ExtraPointsPolicy(True, 2.0))
+        self.processor = BatchGradeProcessor(self.calculator)
+
+    def _run(self, text, input_format="csv", output_format="csv"):
+        output_file = io.StringIO()
+        rejects_file = io.StringIO()
+        summary = self.processor.process(io.StringIO(text), input_format, output_file, output_format, rejects_file)
+        return summary, output_file.getvalue().splitlines(), rejects_file.getvalue().splitlines()
+
+    def test_shouldProcessValidCsvRows(self):
+        """Debe calcular la nota final de cada fila CSV válida."""
+        summary, output, rejects = self._run(
+            "student_id,attendance,grade,weight,grade,weight\n"
+            "A1,s,16,0.5,14,0.5\n"
+            "A2,n,10,0.4,15,0.6\n"
+        )
+        expected = self.calculator.calculate_final_grade(
+            [Evaluation("P1", 10.0, 0.4), Evaluation("P2", 15.0, 0.6)], False
+        )
+        self.assertEqual(summary.processed, 2)
+        self.assertEqual(summary.rejected, 0)
+        self.assertEqual(output[0], ",".join(BatchGradeProcessor.OUTPUT_FIELDS))
+        self.assertEqual(output[2].split(",")[-1], str(expected))
+        self.assertEqual(len(rejects), 1)
+
+    def test_shouldSendMalformedRowsToRejectsWithLineNumbers(self):
+        """Debe enviar filas mal formadas al archivo de rechazos con su número de línea."""
+        summary, output, rejects = self._run(
+            "student_id,attendance,grade,weight\n"
+            "A1,s,16,1\n"
+            "A2,talvez,16,1\n"
+            "A3,s,25,1\n"
+            "A4,s,abc,1\n"
+        )
+        self.assertEqual(summary, (1, 3))
+        self.assertEqual([line.split(",")[0] for line in rejects[1:]], ["3", "4", "5"])
+
+    def test_shouldRejectUndecodableLinesAndKeepRawText(self):
+        """Debe rechazar líneas que no son UTF-8 sin detener el lote y conservar el texto original."""
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        input_path = os.path.join(directory, "notas.csv")
+        output_path = os.path.join(directory, "resultados.csv")
+        rejects_path = os.path.join(directory, "rechazos.csv")
+        with open(input_path, "wb") as input_file:
+            input_file.write(b'student_id,attendance,grade,weight\n'
+                             b'A1,s,16,1\n'
+                             b'A2,s,1\xff,1\n'
+                             b'"A3","talvez",16,1\n'
+                             b'A4,n,12,1\n')
+
+        summary = self.processor.process_file(input_path, output_path, rejects_path)
+
+        self.assertEqual(summary, (2, 2))
+        with open(output_path, encoding="utf-8") as output_file:
+            self.assertEqual([row[0] for row in csv.reader(output_file)], ["student_id", "A1", "A4"])
+        with open(rejects_path, "rb") as rejects_file:
+            rejects = rejects_file.read()
+        self.assertIn(b"A2,s,1\xff,1", rejects)
+        with open(rejects_path, encoding="utf-8", errors="surrogateescape", newline="") as rejects_file:
+            rows = list(csv.reader(rejects_file))
+        self.assertEqual([(row[0], row[2]) for row in rows[1:]], [("3", "A2,s,1\udcff,1"), ("4", '"A3","talvez",16,1')])
+
+    def test_shouldProcessJsonLinesAndWriteJson(self):
+        """Debe procesar JSONL y escribir resultados en JSONL."""
+        summary, output, rejects = self._run(
+            '{"student_id": "B1", "hasReachedMinimumClasses": true, '
+            '"evaluations": [{"name": "Final", "grade": 15, "weight": 1}]}\n'
+            "{no es json}\n",
+            input_format="jsonl",
+            output_format="jsonl"
+        )
+        self.assertEqual(summary, (1, 1))
+        self.assertIn('"final_grade": 17.0', output[0])
+        self.assertTrue(rejects[1].startswith("2,"))
+
+    def test_shouldRejectRowsExceedingMaximumEvaluations(self):
+        """Debe rechazar filas que exceden el máximo de evaluaciones."""
+        pairs = ",".join(["10,0.05"] * (GradeCalculator.MAX_EVALUATIONS + 1))
+        summary, _, rejects = self._run(f"A1,s,{pairs}\n")
+        self.assertEqual(summary, (0, 1))
+        self.assertTrue(rejects[1].startswith("1,"))
+
+
+class TestParallelGradeCalculator(unittest.TestCase):
+    """Tests para la ejecución repartida en un pool de procesos."""
+
+    def setUp(self):
+        """Configuración inicial para cada test."""
+        self.calculator = GradeCalculator(AttendancePolicy(3.0), ExtraPointsPolicy(True, 2.0))
+        rng = np.random.default_rng(11)
+        self.grades = np.round(rng.uniform(0, 20, (1000, 5)), 2)
+        self.weights = np.round(rng.uniform(0, 0.2, (1000, 5)), 3)
+        self.attendance = rng.random(1000) < 0.8
+
+    def test_shouldMatchSequentialResultsInInputOrder(self):
+        """Debe coincidir con el cálculo secuencial y conservar el orden."""
+        parallel = ParallelGradeCalculator(self.calculator, max_workers=2, chunk_size=150)
+        expected = self.calculator.calculate_final_grades_batch(self.grades, self.weights, self.attendance)
+        results = parallel.calculate_final_grades(self.grades, self.weights, self.attendance)
+        self.assertEqual(results.tolist(), expected.tolist())
+
+    def test_shouldSupportSharedWeightVector(self):
+        """Debe aceptar un vector de pesos compartido."""
+        parallel = ParallelGradeCalculator(self.calculator, max_workers=2, chunk_size=300)
+        weights = [0.2, 0.2, 0.2, 0.2, 0.2]
+        expected = self.calculator.calculate_final_grades_batch(self.grades, weights, self.attendance)
+        results = parallel.calculate_final_grades(self.grades, weights, self.attendance)
+        self.assertEqual(results.tolist(), expected.tolist())
+
+    def test_shouldPropagateValidationErrorsFromWorkers(self):
+        """Debe propagar los errores de validación de los workers."""
+        self.grades[900, 0] = 25.0
+        parallel = ParallelGradeCalculator(self.calculator, max_workers=2, chunk_size=300)
+        with self.assertRaises(ValueError):
+            parallel.calculate_final_grades(self.grades, self.weights, self.attendance)
+
+    def test_shouldRaiseErrorWhenChunkSizeIsInvalid(self):
+        """Debe lanzar error cuando el tamaño de chunk no es positivo."""
+        with self.assertRaises(ValueError):
+            ParallelGradeCalculator(self.calculator, chunk_size=0)
+
+
+class TestPerformanceSuite(unittest.TestCase):
+    """Tests para las utilidades de la suite de rendimiento."""
+
+    def test_shouldComputeNearestRankPercentiles(self):
+        """Debe calcular percentiles por rango más cercano."""
+        samples = list(range(1, 101))
+        self.assertEqual(performance_test.percentile(samples, 50), 50)
+        self.assertEqual(performance_test.percentile(samples, 99), 99)
+        self.assertEqual(performance_test.percentile(samples, 100), 100)
+
+    def test_shouldSummarizeLatenciesInMilliseconds(self):
+        """Debe resumir las latencias en milisegundos."""
+        summary = performance_test.summarize([1_000_000, 2_000_000, 3_000_000, 4_000_000], 1_000_000_000)
+        self.assertEqual(summary["p50_ms"], 2.0)
+        self.assertEqual(summary["max_ms"], 4.0)
+        self.assertEqual(summary["throughput_rps"], 4.0)
+
+    def test_shouldReportRegressionsBeyondTolerance(self):
+        """Debe reportar regresiones que superan la tolerancia."""
+        entry = {"mode": "threads", "operation": "calculate_final_grade", "concurrency": 50,
+                 "p50_ms": 1.0, "p95_ms": 2.0, "p99_ms": 3.0}
+        baseline = {"results": [entry]}
+        slower = dict(entry, p99_ms=4.0)
+        self.assertEqual(performance_test.compare_with_baseline({"results": [slower]}, baseline, 0.5), [])
+        regressions = performance_test.compare_with_baseline({"results": [slower]}, baseline, 0.2)
+        self.assertEqual(len(regressions), 1)
+        self.assertIn("p99_ms", regressions[0])
+
+    def test_shouldFailWithoutBaselineWhenRequired(self):
+        """Debe fallar si se exige la línea base y no existe."""
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        argv = ["--modes", "threads", "--operations", "calculate_final_grade", "--concurrency", "50",
+                "--requests", "2", "--warmup", "1", "--evaluations", "3",
+                "--output", os.path.join(directory, "results.json"),
+                "--baseline", os.path.join(directory, "missing.json")]
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertTrue(performance_test.run_performance_tests(argv))
+            self.assertFalse(performance_test.run_performance_tests(argv + ["--require-baseline"]))
+
+    def test_shouldMeasureThreadedUsers(self):
+        """Debe medir una muestra por solicitud de cada usuario concurrente."""
+        samples, elapsed = performance_test.run_threads("calculate_final_grade", 4, 10, 2, 3)
+        self.assertEqual(len(samples), 40)
+        self.assertGreater(elapsed, 0)
+
+
+class TestGradeService(unittest.TestCase):
+    """Tests para el servicio HTTP/JSON con micro-batching."""
+
+    PAYLOAD = {
+        "hasReachedMinimumClasses": False,
+        "evaluations": [
+            {"name": "Parcial", "grade": 16.0, "weight": 0.5},
+            {"name": "Final", "grade": 14.0, "weight": 0.5}
+        ]
+    }
+
+    def setUp(self):
+        """Configuración inicial para cada test."""
+        self.calculator = GradeCalculator(AttendancePolicy(3.0), ExtraPointsPolicy(True, 2.0))
+
+    async def _post(self, port, body):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(
+            f"POST /grades HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(body)}\r\n"
+            f"Connection: close\r\n\r\n".encode("latin-1") + body
+        )
+        response = await reader.read()
+        writer.close()
+        head, _, payload = response.partition(b"\r\n\r\n")
+        return int(head.split(b" ")[1]), json.loads(payload)
+
+    def _with_service(self, scenario, **options):
+        async def run():
+            service = GradeService(self.calculator, port=0, **options)
+            await service.start()
+            try:
+                return await scenario(service)
+            finally:
+                await service.stop()
+        return asyncio.run(run())
+
+    def test_shouldFailPendingRequestsOnStop(self):
+        """Al detenerse debe hacer fallar las solicitudes pendientes en lugar de dejarlas colgadas."""
+        async def run():
+            service = GradeService(self.calculator, port=0, max_batch_delay=30.0)
+            await service.start()
+            # Las primeras esperan en el lote a medio armar; las últimas se encolan mientras se detiene.
+            waiting = [asyncio.ensure_future(service.calculate(self.PAYLOAD)) for _ in range(5)]
+            await asyncio.sleep(0.05)
+            waiting += [asyncio.ensure_future(service.calculate(self.PAYLOAD)) for _ in range(3)]
+            await service.stop()
+            results = await asyncio.wait_for(asyncio.gather(*waiting, return_exceptions=True), 5)
+            with self.assertRaises(ServiceBusyError):
+                await service.calculate(self.PAYLOAD)
+            return results
+
+        results = asyncio.run(run())
+        self.assertEqual(len(results), 8)
+        self.assertTrue(all(isinstance(result, ServiceBusyError) for result in results))
+
+    def test_shouldReturnCalculationDetailsOverHttp(self):
+        """Debe responder con el detalle del cálculo vía HTTP."""
+        async def scenario(service):
+            return await self._post(service.port, json.dumps(self.PAYLOAD).encode("utf-8"))
+
+        status, payload = self._with_service(scenario)
+        expected = self.calculator.get_calculation_details(
+            [Evaluation("Parcial", 16.0, 0.5), Evaluation("Final", 14.0, 0.5)], False
+        )
+        self.assertEqual(status, 200)
+        self.assertEqual(payload["final_grade"], expected.final_grade)
+        self.assertEqual(len(payload["evaluations_detail"]), 2)
+
+    def test_shouldReturnBadRequestForInvalidPayload(self):
+        """Debe responder 400 ante un cuerpo inválido."""
+        async def scenario(service):
+            invalid = dict(self.PAYLOAD, evaluations=[{"name": "X", "grade": 30, "weight": 1}])
+            return [
+                await self._post(service.port, b"{no es json"),
+                await self._post(service.port, json.dumps(invalid).encode("utf-8"))
+            ]
+
+        responses = self._with_service(scenario)
+        self.assertEqual([status for status, _ in responses], [400, 400])
+
+    def test_shouldGroupConcurrentRequestsIntoMicroBatches(self):
+        """Debe agrupar solicitudes concurrentes en micro-lotes."""
+        async def scenario(service):
+            results = await asyncio.gather(*(service.calculate(self.PAYLOAD) for _ in range(20)))
+            return results, service.batches_processed
+
+        results, batches = self._with_service(scenario, max_batch_size=8, max_batch_delay=0.01)
+        self.assertEqual(len({result["final_grade"] for result in results}), 1)
+        self.assertLess(batches, 20)
+
+    def test_shouldComputeMicroBatchTogetherWithScalarResults(self):
+        """Un micro-lote con formas mixtas debe dar el mismo detalle que la ruta escalar."""
+        rng = random.Random(7)
+        payloads = []
+        for index in range(30):
+            size = 2 if index % 3 else 3
+            payloads.append({
+                "hasReachedMinimumClasses": rng.random() < 0.7,
+                "evaluations": [{"name": f"E{i}", "grade": round(rng.uniform(0, 20), 2), "weight": round(1 / size, 4)}
+                                for i in range(size)]
+            })
+        payloads.append(dict(self.PAYLOAD, evaluations=[]))
+
+        async def scenario(service):
+            results = await asyncio.gather(*(service.calculate(payload) for payload in payloads),
+                                           return_exceptions=True)
+            return results, service.batches_processed
+
+        results, batches = self._with_service(scenario, max_batch_size=64, max_batch_delay=0.01)
+        self.assertEqual(batches, 1)
+        self.assertIsInstance(results[-1], ValueError)
+        for payload, result in zip(payloads[:-1], results[:-1]):
+            evaluations = [Evaluation(e["name"], e["grade"], e["weight"]) for e in payload["evaluations"]]
+            expected = self.calculator.get_calculation_details(evaluations, payload["hasReachedMinimumClasses"])
+            self.assertEqual(result, expected.to_dict())
+
+    def test_shouldRejectRequestsWhenQueueIsFull(self):
+        """Debe rechazar solicitudes cuando la cola acotada está llena."""
+        async def scenario(service):
+            return await asyncio.gather(
+                service.calculate(self.PAYLOAD), service.calculate(self.PAYLOAD), return_exceptions=True
+            )
+
+        results = self._with_service(scenario, queue_size=1)
+        self.assertIsInstance(results[1], ServiceBusyError)
+
+
+class TestCachedGradeCalculator(unittest.TestCase):
+    """Tests para el caché LRU de notas finales."""
+
+    def setUp(self):
+        """Configuración inicial para cada test."""
+        self.calculator = GradeCalculator(AttendancePolicy(3.0), ExtraPointsPolicy(True, 2.0))
+        self.cached = CachedGradeCalculator(self.calculator, maxsize=2)
+
+    def _evaluations(self, grade):
+        return [Evaluation("Parcial", grade, 0.5), Evaluation("Final", 14.0, 0.5)]
+
+    def test_shouldReturnSameResultAsCalculator(self):
+        """Debe retornar el mismo resultado que el calculador sin caché."""
+        evaluations = self._evaluations(16.0)
+        self.assertEqual(
+            self.cached.calculate_final_grade(evaluations, False),
+            self.calculator.calculate_final_grade(evaluations, False)
+        )
+
+    def test_shouldCountHitsForEquivalentEvaluations(self):
+        """Debe contar aciertos para evaluaciones equivalentes aunque cambien los nombres."""
+        self.cached.calculate_final_grade(self._evaluations(16.0), True)
+        renamed = [Evaluation("Otro", 16.0, 0.5), Evaluation("Examen", 14.0, 0.5)]
+        self.cached.calculate_final_grade(renamed, True)
+        self.cached.calculate_final_grade(EvaluationSet.from_evaluations(renamed), True)
+        self.cached.calculate_final_grade(renamed, False)
+        info = self.cached.cache_info()
+        self.assertEqual((info.hits, info.misses), (2, 2))
+
+    def test_shouldEvictLeastRecentlyUsedEntry(self):
+        """Debe desalojar la entrada usada menos recientemente."""
+        self.cached.calculate_final_grade(self._evaluations(10.0), True)
+        self.cached.calculate_final_grade(self._evaluations(11.0), True)
+        self.cached.calculate_final_grade(self._evaluations(10.0), True)
+        self.cached.calculate_final_grade(self._evaluations(12.0), True)
+        self.cached.calculate_final_grade(self._evaluations(10.0), True)
+        info = self.cached.cache_info()
+        self.assertEqual((info.hits, info.misses, info.evictions, info.currsize), (2, 3, 1, 2))
+
+    def test_shouldKeepValidationForUncachedInputs(self):
+        """Debe seguir validando entradas inválidas sin guardarlas."""
+        with self.assertRaises(ValueError):
+            self.cached.calculate_final_grade(self._evaluations(16.0), 1)
+        with self.assertRaises(ValueError):
+            self.cached.calculate_final_grade([Evaluation("E", 10.0, 0.1)] * 11, True)
+        self.assertEqual(self.cached.cache_info().currsize, 0)
+
+    def test_shouldTreatPoliciesAsImmutable(self):
+        """Las políticas deben ser inmutables para mantener válidas las claves."""
+        with self.assertRaises(AttributeError):
+            self.calculator.attendance_policy.penalty_points = 5.0
+        with self.assertRaises(AttributeError):
+            self.calculator.extra_points_policy.extra_points = 5.0
+
+    def test_shouldBeThreadSafe(self):
+        """Debe mantener contadores consistentes con acceso concurrente."""
+        cached = CachedGradeCalculator(self.calculator, maxsize=8)
+
+        def worker():
+            for i in range(200):
+                cached.calculate_final_grade(self._evaluations(float(i % 16)), True)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        info = cached.cache_info()
+        self.assertEqual(info.hits + info.misses, 1600)
+        self.assertEqual(info.currsize, 8)
+
+
+class TestStudentGradeLedger(unittest.TestCase):
+    """Tests para el libro de notas con actualizaciones incrementales."""
+
+    def setUp(self):
+        """Configuración inicial para cada test."""
+        self.calculator = GradeCalculator(AttendancePolicy(3.0), ExtraPointsPolicy(True, 2.0))
+        self.ledger = StudentGradeLedger(self.calculator)
+        self.ledger.add_student("A1", [
+            Evaluation("Parcial", 12.0, 0.3),
+            Evaluation("Proyecto", 15.0, 0.3),
+            Evaluation("Final", 10.0, 0.4)
+        ], True)
+
+    def _expected(self, student_id, hasReachedMinimumClasses):
+        return self.calculator.calculate_final_grade(self.ledger.get_evaluations(student_id), hasReachedMinimumClasses)
+
+    def _expected_for(self, ledger, student_id, hasReachedMinimumClasses):
+        return self.calculator.calculate_final_grade(ledger.get_evaluations(student_id), hasReachedMinimumClasses)
+
+    def test_shouldMatchCalculatorAfterGradeCorrection(self):
+        """Debe coincidir con el calculador después de corregir una nota."""
+        self.ledger.update_grade("A1", "Final", 16.5)
+        self.assertEqual(self.ledger.dirty_students(), {"A1"})
+        self.assertEqual(self.ledger.get_final_grade("A1"), self._expected("A1", True))
+        self.assertEqual(self.ledger.dirty_students(), set())
+
+    def test_shouldMatchCalculatorAfterWeightAndAttendanceChanges(self):
+        """Debe coincidir con el calculador tras cambiar pesos y asistencia."""
+        self.ledger.update_weight("A1", "Proyecto", 0.1)
+        self.ledger.set_attendance("A1", False)
+        self.assertEqual(self.ledger.flush(), {"A1": self._expected("A1", False)})
+
+    def test_shouldAddEvaluationsIncrementally(self):
+        """Debe agregar evaluaciones de forma incremental."""
+        ledger = StudentGradeLedger(self.calculator)
+        ledger.add_student("B1", [Evaluation("Parcial", 14.0, 0.5)], True)
+        ledger.add_evaluation("B1", Evaluation("Final", 18.0, 0.5))
+        expected = self.calculator.calculate_final_grade(ledger.get_evaluations("B1"), True)
+        self.assertEqual(ledger.get_final_grade("B1"), expected)
+
+    def test_shouldResumPeriodicallyToAvoidDrift(self):
+        """Debe re-sumar periódicamente para evitar acumulación de error."""
+        ledger = StudentGradeLedger(self.calculator, resum_interval=10)
+        ledger.add_student("C1", [Evaluation("Quiz", 0.1, 0.1), Evaluation("Final", 0.2, 0.9)], True)
+        for i in range(1000):
+            ledger.update_grade("C1", "Quiz", (i % 200) / 10.0 + 0.01)
+        ledger.update_grade("C1", "Quiz", 0.1)
+        state = ledger._students["C1"]
+        self.assertLess(state.updates_since_resum, 10)
+        self.assertAlmostEqual(state.total_weighted, 0.1 * 0.1 + 0.2 * 0.9, places=12)
+
+    def test_shouldMatchFullRecalculationAfterRandomCorrections(self):
+        """Tras correcciones aleatorias la nota debe coincidir exactamente con recalcular todo."""
+        ledger = StudentGradeLedger(self.calculator)
+        ledger.add_student("D1", [Evaluation("E0", 3.14, 0.11), Evaluation("E1", 6.41, 0.11),
+                                  Evaluation("E2", 10.04, 0.18)], True)
+        ledger.update_grade("D1", "E0", 11.57)
+        self.assertEqual(ledger.get_final_grade("D1"), self._expected_for(ledger, "D1", True))
+
+        rng = random.Random(9)
+        names = ["E0", "E1", "E2"]
+        for _ in range(3000):
+            choice = rng.random()
+            if choice < 0.8:
+                ledger.update_grade("D1", rng.choice(names), round(rng.uniform(0, 20), 2))
+            elif choice < 0.95:
+                ledger.update_weight("D1", rng.choice(names), round(rng.uniform(0, 0.33), 2))
+            else:
+                ledger.set_attendance("D1", rng.random() < 0.5)
+            attendance = ledger._students["D1"].hasReachedMinimumClasses
+            self.assertEqual(ledger.get_final_grade("D1"), self._expected_for(ledger, "D1", attendance))
+
+    def test_shouldReadFromRunningTotalsAwayFromRoundingBoundaries(self):
+        """Debe leer la nota de los totales incrementales y re-sumar solo cerca de un empate de redondeo."""
+        ledger = StudentGradeLedger(self.calculator)
+        ledger.add_student("E1", [Evaluation("E0", 3.14, 0.11), Evaluation("E1", 6.41, 0.11),
+                                  Evaluation("E2", 10.04, 0.18)], True)
+        ledger.update_grade("E1", "E1", 7.0)
+        self.assertEqual(ledger.get_final_grade("E1"), self._expected_for(ledger, "E1", True))
+        self.assertEqual(ledger._students["E1"].updates_since_resum, 1)
+
+        ledger.update_grade("E1", "E1", 6.41)
+        ledger.update_grade("E1", "E0", 11.57)
+        self.assertEqual(ledger.get_final_grade("E1"), 5.79)
+        self.assertEqual(ledger._students["E1"].updates_since_resum, 0)
+
+    def test_shouldRaiseErrorForUnknownStudentOrEvaluation(self):
+        """Debe lanzar error ante estudiantes o evaluaciones desconocidas."""
+        with self.assertRaises(ValueError):
+            self.ledger.update_grade("Z9", "Final", 10.0)
+        with self.assertRaises(ValueError):
+            self.ledger.update_grade("A1", "Quiz", 10.0)
+
+    def test_shouldRejectInvalidGradeWithoutChangingState(self):
+        """Debe rechazar notas inválidas sin modificar el estado."""
+        before = self.ledger.get_final_grade("A1")
+        with self.assertRaises(ValueError):
+            self.ledger.update_grade("A1", "Final", 25.0)
+        self.assertEqual(self.ledger.get_final_grade("A1"), before)
+
+
+class TestRequiredGradeSolver(unittest.TestCase):
+    """Tests para el cálculo de la nota mínima requerida."""
+
+    def setUp(self):
+        """Configuración inicial para cada test."""
+        self.calculator = GradeCalculator(AttendancePolicy(3.0), ExtraPointsPolicy(True, 1.5))
+        self.solver = RequiredGradeSolver(self.calculator)
+
+    def _brute_force(self, evaluations, remaining_weights, hasReachedMinimumClasses, target):
+        for hundredths in range(2001):
+            grade = hundredths / 100
+            pending = [Evaluation(f"Pendiente {i}", grade, weight) for i, weight in enumerate(remaining_weights)]
+            if self.calculator.calculate_final_grade(evaluations + pending, hasReachedMinimumClasses) >= target:
+                return grade
+        return None
+
+    def test_shouldReturnMinimumGradeForSingleStudent(self):
+        """Debe retornar la mínima nota que alcanza el objetivo."""
+        evaluations = [Evaluation("Parcial 1", 9.0, 0.3), Evaluation("Parcial 2", 11.5, 0.3)]
+        required = self.solver.solve_student(evaluations, [0.4], False, 11.0)
+        self.assertEqual(required, self._brute_force(evaluations, [0.4], False, 11.0))
+
+    def test_shouldReportInfeasibleTarget(self):
+        """Debe reportar cuando el objetivo es inalcanzable."""
+        evaluations = [Evaluation("Parcial", 2.0, 0.8)]
+        self.assertIsNone(self.solver.solve_student(evaluations, [0.2], False, 15.0))
+
+    def test_shouldReturnZeroWhenTargetIsAlreadySecured(self):
+        """Debe retornar cero cuando el objetivo ya está asegurado."""
+        evaluations = [Evaluation("Parcial", 20.0, 0.8)]
+        self.assertEqual(self.solver.solve_student(evaluations, [0.2], True, 11.0), 0.0)
+
+    def test_shouldReturnZeroForTargetsAtOrBelowMinimumFinalGrade(self):
+        """Con objetivo cero o negativo la nota mínima requerida debe ser cero, como en la búsqueda exhaustiva."""
+        evaluations = [Evaluation("Parcial 1", 0.25, 0.5)]
+        for hasReachedMinimumClasses in (False, True):
+            for target in (0.0, -1.0):
+                required = self.solver.solve_student(evaluations, [0.5], hasReachedMinimumClasses, target)
+                self.assertEqual(required, 0.0)
+                self.assertEqual(required, self._brute_force(evaluations, [0.5], hasReachedMinimumClasses, target))
+
+        result = self.solver.solve([[5.33], [2.0]], [0.5], [0.5], np.array([False, True]), [0.0, -1.0])
+        self.assertEqual(result.required_grade.tolist(), [0.0, 0.0])
+        self.assertTrue(result.feasible.all())
+
+    def test_shouldMatchBruteForceAcrossCohort(self):
+        """Debe coincidir con la búsqueda exhaustiva en toda la cohorte."""
+        rng = np.random.default_rng(5)
+        grades = np.round(rng.uniform(0, 20, (60, 3)), 2)
+        weights = np.round(rng.uniform(0, 0.25, (60, 3)), 2)
+        remaining = np.round(rng.uniform(0.05, 0.3, (60, 2)), 2)
+        attendance = rng.random(60) < 0.7
+
+        result = self.solver.solve(grades, weights, remaining, attendance, 11.0)
+
+        for i in range(60):
+            evaluations = [Evaluation(f"E{j}", float(grades[i, j]), float(weights[i, j])) for j in range(3)]
+            expected = self._brute_force(evaluations, remaining[i].tolist(), bool(attendance[i]), 11.0)
+            self.assertEqual(bool(result.feasible[i]), expected is not None)
+            if expected is not None:
+                self.assertEqual(result.required_grade[i], expected)
+
+
+class TestValidatedEvaluations(unittest.TestCase):
+    """Tests para la colección pre-validada."""
+
+    def setUp(self):
+        """Configuración inicial para cada test."""
+        self.calculator = GradeCalculator(AttendancePolicy(3.0), ExtraPointsPolicy(True, 2.0))
+        self.evaluations = [Evaluation("Parcial", 15.0, 0.4), Evaluation("Final", 12.5, 0.6)]
+
+    def test_shouldMatchListResult(self):
+        """Debe producir el mismo resultado que la lista original."""
+        validated = ValidatedEvaluations(self.evaluations)
+        self.assertEqual(
+            self.calculator.get_calculation_details(validated, False).to_dict(),
+            self.calculator.get_calculation_details(self.evaluations, False).to_dict()
+        )
+
+    def test_shouldValidateElementsOnlyOnce(self):
+        """Debe validar los elementos al construirse y no volver a hacerlo."""
+        with self.assertRaises(ValueError):
+            ValidatedEvaluations([self.evaluations[0], "no es evaluación"])
+        validated = ValidatedEvaluations(self.evaluations)
+        self.assertIs(ValidatedEvaluations(validated), validated)
+
+    def test_shouldStillEnforceMaximumEvaluations(self):
+        """Debe seguir aplicando el máximo de evaluaciones del calculador."""
+        validated = ValidatedEvaluations([Evaluation("E", 10.0, 0.05)] * (GradeCalculator.MAX_EVALUATIONS + 1))
+        with self.assertRaises(ValueError):
+            self.calculator.calculate_final_grade(validated, True)
+
+    def test_shouldBuildFromValidatedArrays(self):
+        """Debe construir evaluaciones desde arreglos ya validados."""
+        validated = ValidatedEvaluations.from_arrays(["A", "B"], [15.0, 12.5], [0.4, 0.6])
+        self.assertEqual(
+            self.calculator.calculate_final_grade(validated, True),
+            self.calculator.calculate_final_grade(self.evaluations, True)
+        )
+
+
+    def test_shouldValidateArraysOnConstruction(self):
+        """Debe rechazar notas, pesos o nombres inválidos al construir desde arreglos."""
+        with self.assertRaises(ValueError):
+            ValidatedEvaluations.from_arrays(["A", "B"], [15.0, 21.0], [0.4, 0.6])
+        with self.assertRaises(ValueError):
+            ValidatedEvaluations.from_arrays(["A", "B"], [15.0, 12.5], [0.4, -0.6])
+        with self.assertRaises(ValueError):
+            ValidatedEvaluations.from_arrays(["A", ""], [15.0, 12.5], [0.4, 0.6])
+        with self.assertRaises(ValueError):
+            ValidatedEvaluations.from_arrays(["A"], [15.0, 12.5], [0.4, 0.6])
+        with self.assertRaises(ValueError):
+            ValidatedEvaluations.from_arrays([], [], [])
+
+class TestBulkValidator(unittest.TestCase):
+    """Tests para la validación masiva con reporte completo."""
+
+    def setUp(self):
+        """Configuración inicial para cada test."""
+        self.validator = BulkValidator()
+
+    def test_shouldAcceptValidBatch(self):
+        """Debe aceptar un lote válido sin violaciones."""
+        report = self.validator.validate(np.full((4, 3), 12.0), [0.3, 0.3, 0.4], np.ones(4, dtype=bool))
+        self.assertTrue(report.is_valid)
+        self.assertTrue(report.valid_rows.all())
+
+    def test_shouldReportEveryViolationWithRowAndColumn(self):
+        """Debe reportar todas las violaciones con su fila y columna."""
+        grades = [[10, 25, "x"], [5, -1, 3], [12, 13, 14]]
+        weights = [[0.3, 0.3, 0.4], [0.3, 1.5, 0.4], [0.3, 0.3, 0.4]]
+        report = self.validator.validate(grades, weights, [True, False, "si"])
+        located = [(violation.row, violation.column, violation.field) for violation in report.violations]
+        self.assertEqual(located, [
+            (0, 1, "grade"),
+            (0, 2, "grade"),
+            (1, 1, "grade"),
+            (1, 1, "weight"),
+            (2, None, "hasReachedMinimumClasses")
+        ])
+        self.assertEqual(report.valid_rows.tolist(), [False, False, False])
+
+    def test_shouldFlagNanValues(self):
+        """Debe marcar valores NaN como no numéricos."""
+        grades = np.array([[10.0, np.nan], [11.0, 12.0]])
+        report = self.validator.validate(grades, [0.5, 0.5], [True, True])
+        self.assertEqual([(v.row, v.column) for v in report.violations], [(0, 1)])
+        self.assertEqual(report.valid_rows.tolist(), [False, True])
+
+    def test_shouldRejectNumericStringCells(self):
+        """Debe rechazar cadenas aunque representen números, como lo hace Evaluation."""
+        report = self.validator.validate([["15", "12"], [15, 12]], [0.5, "0.5"], [True, True])
+        located = [(violation.row, violation.column, violation.field) for violation in report.violations]
+        self.assertEqual(located, [(None, 1, "weight"), (0, 0, "grade"), (0, 1, "grade")])
+
+    def test_shouldRejectBooleanCellsRegardlessOfNeighbours(self):
+        """Debe rechazar booleanos como notas tanto en lotes numéricos como mixtos."""
+        for grades in ([[True, 12]], [[True, "x"]], np.array([[True, False]])):
+            report = self.validator.validate(grades, [0.5, 0.5], [True])
+            self.assertIn((0, 0), [(violation.row, violation.column) for violation in report.violations])
+        self.assertTrue(self.validator.validate([[np.int32(15), 12.5]], [0.5, 0.5], [True]).is_valid)
+
+    def test_shouldRaiseWithFullReport(self):
+        """Debe lanzar un único error con todas las violaciones."""
+        report = self.validator.validate([[21, 22]], [0.5, 0.5], [True])
+        with self.assertRaises(ValueError) as context:
+            report.raise_if_invalid()
+        self.assertIn("2 errores", str(context.exception))
+
+
+class TestPolicyEngine(unittest.TestCase):
+    """Tests para las políticas compiladas y extensibles."""
+
+    def setUp(self):
+        """Configuración inicial para cada test."""
+        self.curve = AttendanceCurvePolicy([(0.5, 6.0), (0.7, 3.0), (0.9, 0.0)])
+        self.tiers = TieredExtraPointsPolicy([(14.0, 0.5), (17.0, 1.0)])
+        self.calculator = GradeCalculator(self.curve, self.tiers)
+
+    def test_shouldInterpolateLinearAttendanceCurve(self):
+        """Debe interpolar linealmente la penalización por asistencia."""
+        self.assertEqual(self.curve.calculate_penalty(0.4), 6.0)
+        self.assertAlmostEqual(self.curve.calculate_penalty(0.8), 1.5)
+        self.assertEqual(self.curve.calculate_penalty(True), 0.0)
+        self.assertEqual(self.curve.calculate_penalty(False), 6.0)
+        with self.assertRaises(ValueError):
+            self.curve.calculate_penalty(1.2)
+
+    def test_shouldApplyStepAttendanceCurve(self):
+        """Debe aplicar la penalización escalonada desde cada umbral."""
+        step = AttendanceCurvePolicy([(0.0, 4.0), (0.6, 2.0), (0.8, 0.0)], kind=CompiledCurve.STEP)
+        self.assertEqual([step.calculate_penalty(rate) for rate in (0.1, 0.6, 0.79, 0.8)], [4.0, 2.0, 2.0, 0.0])
+
+    def test_shouldClampStepCurveBelowFirstBreakpoint(self):
+        """Debe aplicar la penalización del primer escalón por debajo de su umbral."""
+        step = AttendanceCurvePolicy([(0.5, 4.0), (0.8, 1.0)], kind=CompiledCurve.STEP)
+        rates = np.array([0.0, 0.49, 0.5, 0.79, 0.8, 1.0])
+        self.assertEqual([step.calculate_penalty(float(rate)) for rate in rates], [4.0, 4.0, 4.0, 4.0, 1.0, 1.0])
+        self.assertEqual(step.compile().apply(rates).tolist(), [4.0, 4.0, 4.0, 4.0, 1.0, 1.0])
+        calculator = GradeCalculator(step, ExtraPointsPolicy(False))
+        self.assertEqual(calculator.calculate_final_grade([Evaluation("Final", 12.0, 1.0)], 0.2), 8.0)
+        self.assertEqual(calculator.calculate_final_grades_batch([[12.0]], [1.0], [0.2]).tolist(), [8.0])
+
+    def test_shouldRejectIncompleteRuleSubclasses(self):
+        """Debe impedir instanciar reglas que no implementan todos sus métodos."""
+        class CompileOnlyPenalty(PenaltyRule):
+            __slots__ = ()
+
+            def _params(self):
+                return ()
+
+            def compile(self):
+                return CompiledCurve.constant(0.0)
+
+        class ParamsOnlyBonus(BonusRule):
+            __slots__ = ()
+
+            def _params(self):
+                return ()
+
+        with self.assertRaises(TypeError):
+            CompileOnlyPenalty()
+        with self.assertRaises(TypeError):
+            ParamsOnlyBonus()
+
+    def test_shouldAwardTieredExtraPoints(self):
+        """Debe otorgar puntos extra según el tramo del promedio ponderado."""
+        self.assertEqual(self.calculator.calculate_final_grade([Evaluation("Final", 13.0, 1.0)], 1.0), 13.0)
+        self.assertEqual(self.calculator.calculate_final_grade([Evaluation("Final", 15.0, 1.0)], 1.0), 15.5)
+        self.assertEqual(self.calculator.calculate_final_grade([Evaluation("Final", 19.5, 1.0)], 1.0), 20.0)
+
+    def test_shouldCompileExistingPoliciesAsSpecialCases(self):
+        """Debe compilar las políticas existentes a curvas equivalentes."""
+        attendance = AttendancePolicy(3.0).compile()
+        self.assertEqual(attendance.apply(np.array([0.0, 1.0])).tolist(), [3.0, 0.0])
+        self.assertTrue(ExtraPointsPolicy(True, 1.5).compile().is_constant)
+        self.assertEqual(ExtraPointsPolicy(False, 1.5).compile().fp, (0.0,))
+
+    def test_shouldMatchScalarPathInBatch(self):
+        """Debe producir en lote los mismos resultados que la ruta escalar."""
+        rng = np.random.default_rng(12)
+        grades = np.round(rng.uniform(0, 20, (300, 3)), 2)
+        weights = np.array([0.3, 0.3, 0.4])
+        rates = np.round(rng.uniform(0, 1, 300), 2)
+
+        batch = self.calculator.calculate_final_grades_batch(grades, weights, rates)
+
+        for i in range(300):
+            evaluations = [Evaluation(f"E{j}", float(grades[i, j]), float(weights[j])) for j in range(3)]
+            self.assertEqual(batch[i], self.calculator.calculate_final_grade(evaluations, float(rates[i])))
+
+    def test_shouldRejectBooleanPolicyRatesInBatch(self):
+        """Debe exigir asistencia booleana con la política básica."""
+        calculator = GradeCalculator(AttendancePolicy(), ExtraPointsPolicy(False))
+        with self.assertRaises(ValueError):
+            calculator.calculate_final_grades_batch([[12.0]], [1.0], [0.5])
+
+    def test_shouldBeImmutableAndHashable(self):
+        """Debe ser inmutable y comparable por sus parámetros."""
+        with self.assertRaises(AttributeError):
+            self.curve.breakpoints = ()
+        self.assertEqual(self.tiers, TieredExtraPointsPolicy([(14, 0.5), (17, 1)]))
+        self.assertEqual(hash(self.tiers), hash(TieredExtraPointsPolicy([(14, 0.5), (17, 1)])))
+
+    def test_shouldSolveRequiredGradeWithTieredBonus(self):
+        """Debe resolver la nota requerida también con puntos extra por tramos."""
+        solver = RequiredGradeSolver(self.calculator)
+        evaluations = [Evaluation("Parcial", 12.0, 0.5)]
+        required = solver.solve_student(evaluations, [0.5], 1.0, 15.0)
+        self.assertEqual(self.calculator.calculate_final_grade(evaluations + [Evaluation("Final", required, 0.5)], 1.0), 15.0)
+        lower = round(required - 0.01, 2)
+        self.assertLess(self.calculator.calculate_final_grade(evaluations + [Evaluation("Final", lower, 0.5)], 1.0), 15.0)
+
+
+class TestGradeStore(unittest.TestCase):
+    """Tests para el almacenamiento persistente de resultados."""
+
+    def setUp(self):
+        """Configuración inicial para cada test."""
+        self.calculator = GradeCalculator(AttendancePolicy(3.0), ExtraPointsPolicy(True, 2.0))
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = GradeStore(os.path.join(self.directory.name, "grades.db"), batch_size=2)
+        self.evaluations = [Evaluation("Parcial", 15.0, 0.4), Evaluation("Final", 12.5, 0.6)]
+
+    def tearDown(self):
+        """Cierra la base de datos y elimina el directorio temporal."""
+        self.store.close()
+        self.directory.cleanup()
+
+    def test_shouldRoundTripCalculationDetails(self):
+        """Debe guardar y recuperar el detalle del cálculo sin recalcular."""
+        details = self.calculator.get_calculation_details(self.evaluations, False)
+        self.store.save("2025-2", "CS1111", "A001", details)
+
+        stored = self.store.get("2025-2", "CS1111", "A001")
+        self.assertEqual(stored.final_grade, details.final_grade)
+        self.assertEqual(stored.attendance_penalty, 3.0)
+        self.assertEqual(stored.attendance, 0.0)
+        self.assertEqual(stored.evaluations, [
+            {"name": "Parcial", "grade": 15.0, "weight": 0.4},
+            {"name": "Final", "grade": 12.5, "weight": 0.6}
+        ])
+
+    def test_shouldUpsertByTermCourseAndStudent(self):
+        """Debe reemplazar el resultado existente con la misma clave."""
+        self.store.save("2025-2", "CS1111", "A001", self.calculator.get_calculation_details(self.evaluations, False))
+        self.store.save("2025-2", "CS1111", "A001", self.calculator.get_calculation_details(self.evaluations, True))
+        self.assertEqual(self.store.count(), 1)
+        self.assertEqual(self.store.get_final_grade("2025-2", "CS1111", "A001"),
+                         self.calculator.calculate_final_grade(self.evaluations, True))
+
+    def test_shouldQueryByStudentAndCourse(self):
+        """Debe consultar los resultados por estudiante y por curso."""
+        evaluations = EvaluationSet(["Parcial", "Final"], [15.0, 12.5], [0.4, 0.6])
+        details = self.calculator.get_calculation_details(evaluations, True)
+        written = self.store.save_many("2025-2", "CS1111", [(f"A00{i}", details) for i in range(5)])
+        self.store.save("2026-1", "CS2222", "A001", details)
+
+        self.assertEqual(written, 5)
+        self.assertEqual([r.student_id for r in self.store.get_course("2025-2", "CS1111")],
+                         ["A000", "A001", "A002", "A003", "A004"])
+        self.assertEqual([(r.term, r.course) for r in self.store.get_student("A001")],
+                         [("2025-2", "CS1111"), ("2026-1", "CS2222")])
+        self.assertEqual(len(self.store.get_student("A001", term="2026-1")), 1)
+
+    def test_shouldStoreBatchDetails(self):
+        """Debe guardar el desglose real producido por el cálculo por lote."""
+        grades = np.array([[15.0, 12.5], [8.0, 9.0]])
+        attendance = np.array([True, False])
+        details = self.calculator.calculate_details_batch(grades, [0.4, 0.6], attendance)
+        self.store.save_batch_details("2025-2", "CS1111", ["A001", "A002"], details, attendance)
+
+        stored = self.store.get("2025-2", "CS1111", "A002")
+        scalar = self.calculator.get_calculation_details([Evaluation("E1", 8.0, 0.4), Evaluation("E2", 9.0, 0.6)], False)
+        self.assertEqual((stored.weighted_average, stored.attendance_penalty, stored.extra_points, stored.final_grade),
+                         (scalar.weighted_average, scalar.attendance_penalty, scalar.extra_points, scalar.final_grade))
+        self.assertIsNone(stored.evaluations)
+        with self.assertRaises(ValueError):
+            self.store.save_batch_details("2025-2", "CS1111", ["A001"], details.final_grade, attendance)
+
+    def test_shouldReturnNoneForMissingAndDelete(self):
+        """Debe retornar None para claves inexistentes y permitir eliminar."""
+        self.assertIsNone(self.store.get("2025-2", "CS1111", "A999"))
+        self.store.save("2025-2", "CS1111", "A001", self.calculator.get_calculation_details(self.evaluations, True))
+        self.assertTrue(self.store.delete("2025-2", "CS1111", "A001"))
+        self.assertFalse(self.store.delete("2025-2", "CS1111", "A001"))
+
+    def test_shouldUseWriteAheadLog(self):
+        """Debe abrir la base de datos en modo WAL."""
+        mode = self.store._connection.execute("PRAGMA journal_mode").fetchone()[0]
+        self.assertEqual(mode, "wal")
+
+
+class TestBinaryGradebook(unittest.TestCase):
+    """Tests para el libro de notas binario mapeado en memoria."""
+
+    def setUp(self):
+        """Configuración inicial para cada test."""
+        self.calculator = GradeCalculator(AttendancePolicy(3.0), ExtraPointsPolicy(True, 2.0))
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "grades.grdb")
+        self.grades = np.array([[15.0, 12.5], [8.0, 9.5], [20.0, 19.0]])
+        self.weights = np.array([0.4, 0.6])
+        self.attendance = np.array([True, False, True])
+
+    def tearDown(self):
+        """Elimina el directorio temporal."""
+        self.directory.cleanup()
+
+    def _write(self):
+        with BinaryGradebookWriter(self.path, ["Parcial", "Final"], course="CS1111") as writer:
+            writer.write_batch(["A001", "A002"], self.grades[:2], self.weights, self.attendance[:2])
+            writer.write("A003", self.grades[2], self.weights, True)
+
+    def test_shouldRoundTripSchemaAndRecords(self):
+        """Debe recuperar el esquema del curso y los registros escritos."""
+        self._write()
+        with BinaryGradebook(self.path) as gradebook:
+            self.assertEqual(gradebook.course, "CS1111")
+            self.assertEqual(gradebook.evaluation_names, ["Parcial", "Final"])
+            self.assertEqual(len(gradebook), 3)
+            self.assertEqual(gradebook.student_id(2), "A003")
+            self.assertEqual(gradebook.grades.tolist(), self.grades.tolist())
+            self.assertEqual(gradebook.attendance.tolist(), [True, False, True])
+
+    def test_shouldExposeZeroCopyViews(self):
+        """Debe exponer vistas de solo lectura sobre el archivo mapeado."""
+        self._write()
+        with BinaryGradebook(self.path) as gradebook:
+            grades = gradebook.grades
+            self.assertFalse(grades.flags.owndata)
+            self.assertFalse(grades.flags.writeable)
+            del grades
+
+    def test_shouldCloseFileEvenWhenViewsAreStillHeld(self):
+        """Debe cerrar el archivo y avisar con un error claro si el llamador aún guarda una vista."""
+        self._write()
+        gradebook = BinaryGradebook(self.path)
+        grades = gradebook.grades
+
+        with self.assertRaises(BufferError):
+            gradebook.close()
+        self.assertTrue(gradebook._file.closed)
+        self.assertEqual(grades.tolist(), self.grades.tolist())
+        del grades
+        gradebook.close()
+        self.assertTrue(gradebook._mmap.closed)
+
+    def test_shouldMatchBatchComputation(self):
+        """Debe producir las mismas notas que el cálculo por lote en memoria."""
+        self._write()
+        with BinaryGradebook(self.path) as gradebook:
+            results = gradebook.calculate_final_grades(self.calculator)
+        expected = self.calculator.calculate_final_grades_batch(self.grades, self.weights, self.attendance)
+        self.assertEqual(results.tolist(), expected.tolist())
+
+    def test_shouldRejectInvalidFilesAndRecords(self):
+        """Debe rechazar archivos que no son del formato y registros inválidos."""
+        with open(self.path, "wb") as output:
+            output.write(b"student_id,attendance\n" * 4)
+        with self.assertRaises(ValueError):
+            BinaryGradebook(self.path)
+        with BinaryGradebookWriter(self.path, ["Parcial"]) as writer:
+            with self.assertRaises(ValueError):
+                writer.write("A001", [25.0], [1.0], True)
+            with self.assertRaises(ValueError):
+                writer.write("X" * 40, [15.0], [1.0], True)
+
+    def test_shouldConvertCsvAndCloseTermFromBinary(self):
+        """Debe convertir desde CSV y producir la misma salida que el modo por lotes."""
+        csv_path = os.path.join(self.directory.name, "grades.csv")
+        with open(csv_path, "w", encoding="utf-8") as output:
+            output.write("student_id,attendance,grade,weight,grade,weight\n"
+                         "A1,s,16,0.5,14,0.5\nA2,n,10,0.4,15,0.6\nA3,s,25,0.5,14,0.5\n")
+        processor = BatchGradeProcessor(self.calculator)
+        rejects_path = os.path.join(self.directory.name, "rejects.csv")
+
+        self.assertEqual(processor.process_file(csv_path, self.path, rejects_path), (2, 1))
+
+        text_output = os.path.join(self.directory.name, "from_csv.csv")
+        binary_output = os.path.join(self.directory.name, "from_binary.csv")
+        processor.process_file(csv_path, text_output, rejects_path)
+        processor.process_file(self.path, binary_output, rejects_path)
+        with open(text_output, encoding="utf-8") as text_file, open(binary_output, encoding="utf-8") as binary_file:
+            self.assertEqual(text_file.read(), binary_file.read())
+
+    def test_shouldProcessBinaryInChunks(self):
+        """Debe calcular el archivo binario por tramos con el mismo resultado que el lote completo."""
+        self._write()
+        with BinaryGradebook(self.path) as gradebook:
+            chunks = list(gradebook.iter_details(self.calculator, chunk_size=2))
+            gradebook.close()
+        self.assertEqual([student_ids for student_ids, _ in chunks], [["A001", "A002"], ["A003"]])
+        expected = self.calculator.calculate_details_batch(self.grades, self.weights, self.attendance)
+        self.assertEqual([grade for _, details in chunks for grade in details.final_grade.tolist()],
+                         expected.final_grade.tolist())
+
+        processor = BatchGradeProcessor(self.calculator)
+        processor.BINARY_CHUNK_SIZE = 2
+        output_path = os.path.join(self.directory.name, "chunked.jsonl")
+        summary = processor.process_file(self.path, output_path, os.path.join(self.directory.name, "rejects.csv"))
+        self.assertEqual(summary, (3, 0))
+        with open(output_path, encoding="utf-8") as output_file:
+            records = [json.loads(line) for line in output_file]
+        self.assertEqual([record["student_id"] for record in records], ["A001", "A002", "A003"])
+        self.assertEqual([record["final_grade"] for record in records], expected.final_grade.tolist())
+
+    def test_shouldRejectRowsThatDoNotMatchSchema(self):
+        """Debe rechazar filas con un número de evaluaciones distinto al esquema."""
+        csv_path = os.path.join(self.directory.name, "grades.csv")
+        with open(csv_path, "w", encoding="utf-8") as output:
+            output.write("A1,s,16,0.5,14,0.5\nA2,s,12,1\n")
+        processor = BatchGradeProcessor(self.calculator)
+        summary = processor.convert_to_binary(csv_path, self.path, os.path.join(self.directory.name, "rejects.csv"))
+        self.assertEqual(summary, (1, 1))
+
+class TestInstrumentation(unittest.TestCase):
+    """Tests para la instrumentación opcional del calculador."""
+
+    def setUp(self):
+        """Configuración inicial para cada test."""
+        self.calculator = GradeCalculator(AttendancePolicy(3.0), ExtraPointsPolicy(True, 2.0))
+        self.evaluations = [Evaluation("Parcial", 15.0, 0.4), Evaluation("Final", 12.5, 0.6)]
+
+    def _value(self, registry, name):
+        return registry.snapshot()[name]["value"]
+
+    def test_shouldCountCallsFailuresAndSamples(self):
+        """Debe contar llamadas, fallos de validación y llamadas muestreadas."""
+        instrumentation = CalculatorInstrumentation(self.calculator, sample_every=3)
+        with instrumentation:
+            for _ in range(7):
+                self.calculator.calculate_final_grade(self.evaluations, True)
+            with self.assertRaises(ValueError):
+                self.calculator.calculate_final_grade([], True)
+        registry = instrumentation.registry
+        self.assertEqual(self._value(registry, "grade_calculator_calls_total"), 8)
+        self.assertEqual(self._value(registry, "grade_calculator_sampled_calls_total"), 2)
+        self.assertEqual(self._value(registry, "grade_calculator_validation_failures_total"), 1)
+
+    def test_shouldTimeEveryStageAndCountClampedResults(self):
+        """Debe medir cada etapa y contar las notas recortadas."""
+        registry = MetricsRegistry()
+        with CalculatorInstrumentation(self.calculator, registry):
+            self.calculator.calculate_final_grade([Evaluation("Final", 19.5, 1.0)], True)
+            self.calculator.get_calculation_details(self.evaluations, False)
+        series = registry.snapshot()["grade_calculator_stage_seconds"]["series"]
+        self.assertEqual(sorted(entry["labels"]["stage"] for entry in series),
+                         sorted(CalculatorInstrumentation.STAGES))
+        self.assertTrue(all(entry["count"] == 2 for entry in series))
+        self.assertEqual(self._value(registry, "grade_calculator_clamped_results_total"), 1)
+
+    def test_shouldExportPrometheusTextFormat(self):
+        """Debe exportar las métricas en el formato de texto de Prometheus."""
+        instrumentation = CalculatorInstrumentation(self.calculator)
+        with instrumentation:
+            self.calculator.calculate_final_grades_batch([[15.0, 12.5]], [0.4, 0.6], [True])
+            self.calculator.calculate_final_grade(self.evaluations, True)
+        text = instrumentation.registry.to_prometheus()
+        self.assertIn("# TYPE grade_calculator_calls_total counter\ngrade_calculator_calls_total 1\n", text)
+        self.assertIn("grade_calculator_batch_rows_total 1\n", text)
+        self.assertIn('grade_calculator_stage_seconds_bucket{stage="validation",le="+Inf"} 1\n', text)
+        self.assertIn('grade_calculator_stage_seconds_count{stage="policies"} 1\n', text)
+        self.assertEqual(json.loads(instrumentation.registry.to_json())["grade_calculator_batch_calls_total"]["value"], 1)
+
+    def test_shouldLeaveCalculatorUntouchedWhenUninstalled(self):
+        """Debe restaurar el calculador y producir los mismos resultados."""
+        expected = self.calculator.calculate_final_grade(self.evaluations, False)
+        with CalculatorInstrumentation(self.calculator, sample_every=2):
+            self.assertEqual(self.calculator.calculate_final_grade(self.evaluations, False), expected)
+            self.assertEqual(self.calculator.calculate_final_grade(self.evaluations, False), expected)
+        self.assertNotIn("calculate_final_grade", vars(self.calculator))
+        self.assertNotIn("_compute", vars(self.calculator))
+
+
+class TestCohortStatistics(unittest.TestCase):
+    """Tests para las estadísticas de cohorte en streaming."""
+
+    def setUp(self):
+        """Configuración inicial para cada test."""
+        rng = np.random.default_rng(16)
+        self.grades = np.round(rng.uniform(0, 20, 5000), 2)
+
+    def test_shouldMatchFullSortInOnePass(self):
+        """Debe coincidir con el cálculo sobre todas las notas ordenadas."""
+        statistics = CohortStatistics()
+        for chunk in np.array_split(self.grades, 7):
+            statistics.update(chunk)
+
+        qs = [0.0, 0.1, 0.25, 0.5, 0.9, 1.0]
+        self.assertEqual(statistics.count, 5000)
+        self.assertAlmostEqual(statistics.mean, self.grades.mean(), places=10)
+        self.assertAlmostEqual(statistics.std, self.grades.std(), places=10)
+        self.assertEqual(statistics.pass_rate, np.mean(self.grades >= 11.0))
+        self.assertEqual(statistics.quantiles(qs).tolist(),
+                         np.quantile(self.grades, qs, method="inverted_cdf").tolist())
+
+    def test_shouldBuildFixedBinHistogram(self):
+        """Debe construir el histograma de bins fijos sobre la escala 0-20."""
+        statistics = CohortStatistics().update(np.append(self.grades, 20.0))
+        edges, counts = statistics.histogram(2.0)
+        expected, _ = np.histogram(np.append(self.grades, 20.0), bins=np.arange(0, 21, 2.0))
+        self.assertEqual(edges.tolist(), list(np.arange(0, 21, 2.0)))
+        self.assertEqual(counts.tolist(), expected.tolist())
+
+    def test_shouldMergePartialAggregates(self):
+        """Debe combinar agregados parciales como si fueran una sola pasada."""
+        single = CohortStatistics().update(self.grades)
+        left = CohortStatistics().update(self.grades[:1234])
+        right = CohortStatistics().update(self.grades[1234:])
+        merged = left.merge(right)
+
+        self.assertEqual(merged.count, single.count)
+        self.assertAlmostEqual(merged.mean, single.mean, places=10)
+        self.assertAlmostEqual(merged.variance, single.variance, places=8)
+        self.assertEqual(merged.summary()["percentiles"], single.summary()["percentiles"])
+        with self.assertRaises(ValueError):
+            merged.merge(CohortStatistics(pass_grade=10.5))
+
+    def test_shouldAggregatePerSectionFromBatchOutput(self):
+        """Debe agregar por sección a partir de la salida del cálculo por lote."""
+        calculator = GradeCalculator(AttendancePolicy(3.0), ExtraPointsPolicy(True, 2.0))
+        grades = np.array([[15.0, 12.5], [8.0, 9.0], [20.0, 19.0], [11.0, 11.0]])
+        statistics = SectionStatistics()
+        finals = statistics.update_from_batch(calculator, grades, [0.4, 0.6], np.array([True, False, True, True]),
+                                              ["A", "B", "A", "B"])
+
+        summary = statistics.summary(percentiles=[50])
+        self.assertEqual(summary["overall"]["count"], 4)
+        self.assertEqual(summary["sections"]["A"]["max"], max(finals[0], finals[2]))
+        self.assertEqual(summary["sections"]["B"]["pass_rate"], 0.5)
+
+    def test_shouldRejectOutOfRangeAndHandleEmpty(self):
+        """Debe rechazar notas fuera de rango y reportar NaN sin datos."""
+        statistics = CohortStatistics()
+        with self.assertRaises(ValueError):
+            statistics.update([21.0])
+        self.assertEqual(statistics.count, 0)
+        self.assertTrue(np.isnan(statistics.summary()["mean"]))
+        self.assertTrue(np.isnan(statistics.quantile(0.5)))
+
+
+class TestFixedPointGradeCalculator(unittest.TestCase):
+    """Tests para el modo de punto fijo en centésimos y puntos básicos."""
+
+    def setUp(self):
+        """Configuración inicial para cada test."""
+        self.calculator = FixedPointGradeCalculator(AttendancePolicy(3.0), ExtraPointsPolicy(True, 2.0))
+        rng = np.random.default_rng(17)
+        self.grades = np.round(rng.uniform(0, 20, (3000, 4)), 2)
+        self.weights = np.round(rng.uniform(0, 0.4, (3000, 4)), 4)
+        self.attendance = rng.random(3000) < 0.8
+
+    def test_shouldRoundHalfUpExactly(self):
+        """Debe redondear los empates exactos hacia arriba, a diferencia del modo float."""
+        evaluations = [Evaluation("Parcial", 10.01, 0.5), Evaluation("Final", 10.0, 0.5)]
+        float_calculator = GradeCalculator(AttendancePolicy(3.0), ExtraPointsPolicy(True, 2.0))
+
+        self.assertEqual(float_calculator.calculate_final_grade(evaluations, True), 12.0)
+        self.assertEqual(self.calculator.calculate_final_grade(evaluations, True), 12.01)
+        details = self.calculator.get_calculation_details(evaluations, False)
+        self.assertEqual(details.weighted_average, 10.01)
+        self.assertEqual(details.final_grade, 9.01)
+
+    def test_shouldMatchScalarBatchAndIntegerPaths(self):
+        """Debe producir los mismos resultados en la ruta escalar, por lote y entera."""
+        batch = self.calculator.calculate_final_grades_batch(self.grades, self.weights, self.attendance)
+        fixed = self.calculator.calculate_final_grades_fixed(to_hundredths(self.grades),
+                                                             to_basis_points(self.weights), self.attendance)
+        scalar = [
+            self.calculator.calculate_final_grade(
+                [Evaluation(f"E{j}", grade, weight) for j, (grade, weight) in enumerate(zip(row, weights))], reached)
+            for row, weights, reached in zip(self.grades.tolist(), self.weights.tolist(), self.attendance.tolist())
+        ]
+        self.assertEqual(fixed.dtype, np.int64)
+        self.assertEqual((fixed / 100).tolist(), batch.tolist())
+        self.assertEqual(batch.tolist(), scalar)
+
+    def test_shouldBeInvariantToPartitioning(self):
+        """Debe dar resultados idénticos sin importar cómo se particione la cohorte."""
+        full = self.calculator.calculate_final_grades_batch(self.grades, self.weights, self.attendance)
+        order = np.random.default_rng(5).permutation(len(self.grades))
+        partitioned = np.empty_like(full)
+        for shard in np.array_split(order, 9):
+            partitioned[shard] = self.calculator.calculate_final_grades_batch(
+                self.grades[shard], self.weights[shard], self.attendance[shard])
+        self.assertTrue(np.array_equal(full, partitioned))
+
+    def test_shouldApplyCurvePoliciesInHundredths(self):
+        """Debe aplicar políticas de curva y recortar la nota en la ruta entera."""
+        calculator = FixedPointGradeCalculator(AttendanceCurvePolicy([(0.5, 6.0), (0.9, 0.0)]),
+                                               TieredExtraPointsPolicy([(14.0, 0.5), (17.0, 1.0)]))
+        rates = np.random.default_rng(3).random(3000)
+        batch = calculator.calculate_final_grades_batch(self.grades, self.weights, rates)
+        for index in range(0, 3000, 150):
+            evaluations = [Evaluation(f"E{j}", float(grade), float(weight))
+                           for j, (grade, weight) in enumerate(zip(self.grades[index], self.weights[index]))]
+            self.assertEqual(calculator.calculate_final_grade(evaluations, float(rates[index])), batch[index])
+        self.assertEqual(calculator.calculate_final_grades_fixed([[2000, 2000]], [5000, 5000], [1.0]).tolist(), [2000])
+
+    def test_shouldRejectNonIntegerFixedInput(self):
+        """Debe rechazar entradas no enteras o fuera de rango en la ruta entera."""
+        with self.assertRaises(ValueError):
+            self.calculator.calculate_final_grades_fixed([[15.5]], [10000], [True])
+        with self.assertRaises(ValueError):
+            self.calculator.calculate_final_grades_fixed([[2001]], [10000], [True])
+        with self.assertRaises(ValueError):
+            self.calculator.calculate_final_grades_fixed([[1500]], [10001], [True])
+
+
+class TestCalculationDaemon(unittest.TestCase):
+    """Tests para el daemon de cálculo sobre socket Unix."""
+
+    PAYLOAD = {
+        "hasReachedMinimumClasses": False,
+        "evaluations": [
+            {"name": "Parcial", "grade": 16.0, "weight": 0.5},
+            {"name": "Final", "grade": 14.0, "weight": 0.5}
+        ]
+    }
+
+    def setUp(self):
+        """Configuración inicial para cada test."""
+        self.calculator = GradeCalculator(AttendancePolicy(3.0), ExtraPointsPolicy(True, 2.0))
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "grades.sock")
+        self.expected = self.calculator.calculate_final_grade(
+            [Evaluation("Parcial", 16.0, 0.5), Evaluation("Final", 14.0, 0.5)], False
+        )
+
+    def tearDown(self):
+        """Elimina el directorio temporal."""
+        self.directory.cleanup()
+
+    def _with_daemon(self, scenario):
+        async def run():
+            daemon = CalculationDaemon(self.calculator, self.path)
+            await daemon.start()
+            try:
+                return await scenario(daemon)
+            finally:
+                await daemon.stop()
+        return asyncio.run(run())
+
+    def test_shouldAnswerRequestLines(self):
+        """Debe responder cada línea con la nota final, el detalle o el error."""
+        daemon = CalculationDaemon(self.calculator, self.path)
+        line = json.dumps(dict(self.PAYLOAD, id=7)).encode("utf-8")
+
+        self.assertEqual(daemon.handle_line(line), {"id": 7, "ok": True, "final_grade": self.expected})
+        details = daemon.handle_line(json.dumps(dict(self.PAYLOAD, details=True)).encode("utf-8"))
+        self.assertEqual(details["weighted_average"], 15.0)
+        self.assertEqual(daemon.handle_line(b'{"op": "ping", "id": 1}'), {"id": 1, "ok": True})
+        self.assertFalse(daemon.handle_line(b"{no es json")["ok"])
+        invalid = dict(self.PAYLOAD, id=9, evaluations=[{"grade": 30, "weight": 1}])
+        self.assertEqual(daemon.handle_line(json.dumps(invalid).encode("utf-8"))["id"], 9)
+        self.assertEqual((daemon.requests_processed, daemon.requests_failed), (2, 2))
+
+    def test_shouldAnswerPipelinedRequestsInOrder(self):
+        """Debe responder en orden las solicitudes enviadas sin esperar respuesta."""
+        async def scenario(daemon):
+            reader, writer = await asyncio.open_unix_connection(self.path)
+            lines = [json.dumps(dict(self.PAYLOAD, id=i)) for i in range(50)]
+            lines[10] = '{"id": 10, "evaluations": []}'
+            writer.write(("\n".join(lines) + "\n").encode("utf-8"))
+            responses = [json.loads(await reader.readline()) for _ in lines]
+            writer.close()
+            return responses
+
+        responses = self._with_daemon(scenario)
+        self.assertEqual([response["id"] for response in responses], list(range(50)))
+        self.assertFalse(responses[10]["ok"])
+        self.assertEqual({response["final_grade"] for response in responses if response["ok"]}, {self.expected})
+
+    def test_shouldAnswerBlankLinesSoClientDoesNotHang(self):
+        """Debe responder con un error a las líneas en blanco para que el cliente no quede esperando."""
+        def client_calls():
+            with GradeClient(self.path, timeout=5) as client:
+                return [json.loads(line) for line in client.send_lines([b'{"op":"ping"}', b"   ", b""])]
+
+        async def scenario(daemon):
+            return await asyncio.get_running_loop().run_in_executor(None, client_calls)
+
+        responses = self._with_daemon(scenario)
+        self.assertEqual([response["ok"] for response in responses], [True, False, False])
+        self.assertEqual(CalculationDaemon(self.calculator, self.path).handle_line(b" \r")["ok"], False)
+
+    def test_shouldServeThinClient(self):
+        """Debe atender al cliente liviano con solicitudes sueltas y en pipeline."""
+        def client_calls():
+            with GradeClient(self.path) as client:
+                single = client.calculate(self.PAYLOAD["evaluations"], False)
+                many = client.request_many([self.PAYLOAD] * (GradeClient.PIPELINE_WINDOW + 5))
+                with self.assertRaises(ValueError):
+                    client.calculate([{"grade": 30, "weight": 1}], True)
+                return single, many
+
+        async def scenario(daemon):
+            return await asyncio.get_running_loop().run_in_executor(None, client_calls)
+
+        single, many = self._with_daemon(scenario)
+        self.assertEqual(single, self.expected)
+        self.assertEqual(len(many), GradeClient.PIPELINE_WINDOW + 5)
+        self.assertTrue(all(response["final_grade"] == self.expected for response in many))
+
+    def test_shouldReplaceStaleSocketButNotLiveDaemon(self):
+        """Debe reemplazar un socket huérfano y rechazar uno con un daemon activo."""
+        async def scenario(daemon):
+            with self.assertRaises(ValueError):
+                await CalculationDaemon(self.calculator, self.path).start()
+
+        self._with_daemon(scenario)
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as stale:
+            stale.bind(self.path)
+        self.assertEqual(self._with_daemon(lambda daemon: asyncio.sleep(0, "ok")), "ok")
+        self.assertFalse(os.path.exists(self.path))
+
+
+class TestGradeCurve(unittest.TestCase):
+    """Tests para el curvado de notas en dos pasadas."""
+
+    def setUp(self):
+        """Configuración inicial para cada test."""
+        rng = np.random.default_rng(19)
+        self.grades = np.round(np.clip(rng.normal(10.0, 2.0, 6000), 0, 20), 2)
+        self.sections = np.where(rng.random(6000) < 0.4, "A", "B")
+
+    def test_shouldCurveStreamedCohortToTarget(self):
+        """Debe curvar la cohorte por tramos a la media y desviación objetivo."""
+        stream = GradeCurve(12.0, 2.5).curve_stream(lambda: iter(np.array_split(self.grades, 9)))
+        curved = np.concatenate(list(stream))
+
+        scale = 2.5 / self.grades.std()
+        expected = np.round(np.clip(12.0 + scale * (self.grades - self.grades.mean()), 0, 20), 2)
+        np.testing.assert_allclose(curved, expected, atol=1e-9)
+        self.assertAlmostEqual(curved.mean(), 12.0, places=2)
+        self.assertAlmostEqual(curved.std(), 2.5, places=2)
+
+    def test_shouldRoundCurvedGradesLikeTheCalculator(self):
+        """Debe redondear las notas curvadas igual que round() en la ruta escalar, también cerca de empates."""
+        curve = GradeCurve(10.0, 1.0).observe([9.0, 11.0]).fit()
+        grades = [2.675, 1.005, 10.115, 0.125, 19.995]
+        self.assertEqual((curve.parameters.scale, curve.parameters.offset), (1.0, 0.0))
+        self.assertEqual(curve.apply(grades).tolist(), [round(grade, 2) for grade in grades])
+
+    def test_shouldCurveEachSectionInTheSamePass(self):
+        """Debe ajustar y aplicar una curva por sección en las mismas dos pasadas."""
+        curve = GradeCurve(13.0, 1.5)
+        for grades, sections in zip(np.array_split(self.grades, 4), np.array_split(self.sections, 4)):
+            curve.observe(grades, sections)
+        curve.fit()
+        curved = curve.apply(self.grades, self.sections)
+
+        for key in ("A", "B"):
+            self.assertAlmostEqual(curved[self.sections == key].mean(), 13.0, places=2)
+            self.assertAlmostEqual(curved[self.sections == key].std(), 1.5, places=2)
+        self.assertEqual(set(curve.to_dict()["sections"]), {"A", "B"})
+        with self.assertRaises(ValueError):
+            curve.apply([10.0], ["C"])
+
+    def test_shouldClampAndRecordParameters(self):
+        """Debe recortar al rango de notas y registrar los parámetros de la transformación."""
+        curve = GradeCurve(18.0, 6.0).observe(self.grades).fit()
+        curved = curve.apply(self.grades)
+        self.assertEqual((curved.min(), curved.max()), (GradeCalculator.MIN_FINAL_GRADE, GradeCalculator.MAX_FINAL_GRADE))
+
+        parameters = json.loads(json.dumps(curve.to_dict()))["overall"]
+        self.assertEqual(parameters["count"], 6000)
+        self.assertAlmostEqual(parameters["scale"], 6.0 / self.grades.std())
+        self.assertAlmostEqual(parameters["offset"], 18.0 - parameters["scale"] * self.grades.mean())
+        self.assertEqual(GradeCurve(12.0, 2.0).observe([14.0, 14.0]).fit().apply([14.0]).tolist(), [12.0])
+
+    def test_shouldCurveMemoryMappedGradebook(self):
+        """Debe curvar las notas calculadas por tramos desde el libro binario."""
+        calculator = GradeCalculator(AttendancePolicy(3.0), ExtraPointsPolicy(True, 2.0))
+        rng = np.random.default_rng(4)
+        grades = np.round(rng.uniform(0, 20, (1000, 3)), 2)
+        attendance = rng.random(1000) < 0.8
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "grades.grdb")
+            with BinaryGradebookWriter(path, ["P1", "P2", "F"]) as writer:
+                writer.write_batch([f"S{i}" for i in range(1000)], grades, [0.3, 0.3, 0.4], attendance)
+            with BinaryGradebook(path) as gradebook:
+                curved = list(GradeCurve(11.0, 3.0).curve_stream(lambda: gradebook.iter_final_grades(calculator, 300)))
+
+        finals = calculator.calculate_final_grades_batch(grades, [0.3, 0.3, 0.4], attendance)
+        expected = GradeCurve(11.0, 3.0).observe(finals).fit().apply(finals)
+        self.assertEqual([len(chunk) for chunk in curved], [300, 300, 300, 100])
+        np.testing.assert_allclose(np.concatenate(curved), expected, atol=1e-9)
+
+    def test_shouldEnforceTwoPassOrder(self):
+        """Debe exigir el ajuste antes de aplicar y no aceptar notas después."""
+        curve = GradeCurve(12.0, 2.0)
+        with self.assertRaises(ValueError):
+            curve.apply([10.0])
+        with self.assertRaises(ValueError):
+            curve.fit()
+        curve.observe([10.0, 12.0]).fit()
+        with self.assertRaises(ValueError):
+            curve.observe([11.0])
+        with self.assertRaises(ValueError):
+            GradeCurve(25.0, 2.0)
+
+
+class TestGradeRanking(unittest.TestCase):
+    """Tests para la selección top-k y las consultas de ranking."""
+
+    def setUp(self):
+        """Configuración inicial para cada test."""
+        rng = np.random.default_rng(20)
+        self.grades = np.round(rng.uniform(0, 20, 4000), 1)
+        self.ids = np.array([f"S{index:05d}" for index in rng.permutation(4000)])
+        self.ranking = GradeRanking()
+        for ids, grades in zip(np.array_split(self.ids, 3), np.array_split(self.grades, 3)):
+            self.ranking.update(ids, grades)
+
+    def test_shouldSelectTopAndBottomKWithDeterministicTies(self):
+        """Debe seleccionar los k mejores y peores desempatando por código, sin importar los tramos."""
+        by_rank = sorted(zip(self.ids.tolist(), self.grades.tolist()), key=lambda item: (-item[1], item[0]))
+        by_grade = sorted(zip(self.ids.tolist(), self.grades.tolist()), key=lambda item: (item[1], item[0]))
+        streamed = TopKSelector(25)
+        for ids, grades in zip(np.array_split(self.ids, 11), np.array_split(self.grades, 11)):
+            streamed.update(ids, grades)
+
+        self.assertEqual(streamed.result(), by_rank[:25])
+        self.assertEqual(top_k(self.ids, self.grades, 25), by_rank[:25])
+        self.assertEqual(bottom_k(self.ids, self.grades, 25), by_grade[:25])
+        self.assertEqual(self.ranking.top(25), by_rank[:25])
+        self.assertEqual(self.ranking.bottom(5), by_grade[:5])
+
+    def test_shouldLookUpRanksAndPercentileRanks(self):
+        """Debe calcular rango de competencia, rango denso y rango percentil de un estudiante."""
+        for index in range(0, 4000, 97):
+            grade = self.grades[index]
+            competition = 1 + np.count_nonzero(self.grades > grade)
+            dense = 1 + np.unique(self.grades[self.grades > grade]).size
+            percentile = 100 * (np.count_nonzero(self.grades < grade) + 0.5 * np.count_nonzero(self.grades == grade)) / 4000
+            self.assertEqual(self.ranking.rank(self.ids[index]), competition)
+            self.assertEqual(self.ranking.rank(self.ids[index], "dense"), dense)
+            self.assertAlmostEqual(self.ranking.percentile_rank(self.ids[index]), percentile)
+
+    def test_shouldOutputRankedListInDeterministicOrder(self):
+        """Debe listar por nota descendente y código ascendente con rangos compartidos en empates."""
+        ranking = GradeRanking().update(["C", "A", "D", "B"], [15.0, 18.0, 12.5, 15.0])
+        competition = ranking.ranked()
+        self.assertEqual(competition.student_ids.tolist(), ["A", "B", "C", "D"])
+        self.assertEqual(competition.final_grades.tolist(), [18.0, 15.0, 15.0, 12.5])
+        self.assertEqual(competition.ranks.tolist(), [1, 2, 2, 4])
+        self.assertEqual(ranking.ranked("dense").ranks.tolist(), [1, 2, 2, 3])
+
+    def test_shouldRejectInvalidRankingInput(self):
+        """Debe rechazar duplicados, estudiantes desconocidos y métodos inválidos."""
+        with self.assertRaises(ValueError):
+            self.ranking.update([self.ids[0]], [10.0])
+        with self.assertRaises(ValueError):
+            GradeRanking().update(["A", "A"], [10.0, 11.0])
+        with self.assertRaises(ValueError):
+            self.ranking.rank("NO-EXISTE")
+        with self.assertRaises(ValueError):
+            self.ranking.rank(self.ids[0], "ordinal")
+        with self.assertRaises(ValueError):
+            TopKSelector(0)
+
+
+class TestEvaluationRules(unittest.TestCase):
+    """Tests para el límite configurable de evaluaciones y las reglas de descarte."""
+
+    def setUp(self):
+        """Configuración inicial para cada test."""
+        self.calculator = GradeCalculator(AttendancePolicy(3.0), ExtraPointsPolicy(True, 2.0), max_evaluations=60)
+        rng = np.random.default_rng(21)
+        self.grades = np.round(rng.uniform(0, 20, (500, 40)))
+        self.weights = np.concatenate([np.full(30, 0.6 / 30), np.full(10, 0.04)])
+        self.attendance = rng.random(500) < 0.8
+
+    def test_shouldRejectRuleWithoutKeepCount(self):
+        """Debe impedir instanciar una regla que no define cuántas evaluaciones conserva."""
+        class IncompleteRule(EvaluationRule):
+            pass
+
+        with self.assertRaises(TypeError):
+            IncompleteRule(1)
+
+    def test_shouldUseConfigurableEvaluationLimit(self):
+        """Debe aplicar el límite de evaluaciones de cada calculador."""
+        evaluations = [Evaluation(f"Q{i}", 15.0, 0.02) for i in range(50)]
+        self.assertEqual(self.calculator.calculate_final_grade(evaluations, True), 17.0)
+        self.assertEqual(self.calculator.calculate_final_grades_batch(np.full((2, 50), 15.0), np.full(50, 0.02),
+                                                                      [True, False]).tolist(), [17.0, 14.0])
+        with self.assertRaises(ValueError):
+            GradeCalculator(AttendancePolicy(), ExtraPointsPolicy(False)).calculate_final_grade(evaluations, True)
+        with self.assertRaises(ValueError):
+            GradeCalculator(AttendancePolicy(), ExtraPointsPolicy(False), max_evaluations=0)
+
+        ledger = StudentGradeLedger(GradeCalculator(AttendancePolicy(), ExtraPointsPolicy(False), max_evaluations=2))
+        ledger.add_student("A1", evaluations[:2], True)
+        with self.assertRaises(ValueError):
+            ledger.add_evaluation("A1", Evaluation("Extra", 10.0, 0.1))
+
+    def test_shouldDropLowestPerGroupLikeAFullSort(self):
+        """Debe descartar las más bajas de cada grupo igual que ordenando a cada estudiante."""
+        engine = EvaluationRuleEngine(self.calculator, [DropLowestRule(3, range(30)), KeepBestRule(8, range(30, 40))])
+        weights = engine.effective_weights(self.grades, self.weights)
+
+        for row in range(0, 500, 50):
+            best = sorted(range(30), key=lambda column: (-self.grades[row, column], column))[:27]
+            self.assertEqual(np.flatnonzero(weights[row, :30]).tolist(), sorted(best))
+            self.assertEqual(np.count_nonzero(weights[row, 30:]), 8)
+        np.testing.assert_allclose(weights[:, :30].sum(axis=1), 0.6)
+        np.testing.assert_allclose(weights[:, 30:].sum(axis=1), 0.4)
+
+    def test_shouldMatchScalarRulePath(self):
+        """Debe producir las mismas notas en la ruta escalar y por lote."""
+        engine = EvaluationRuleEngine(self.calculator, [DropLowestRule(3, range(30)), KeepBestRule(8, range(30, 40))])
+        batch = engine.calculate_final_grades_batch(self.grades, self.weights, self.attendance)
+        scalar = [
+            engine.calculate_final_grade(
+                [Evaluation(f"E{column}", grade, weight) for column, (grade, weight) in enumerate(zip(row, self.weights))],
+                reached)
+            for row, reached in zip(self.grades.tolist(), self.attendance.tolist())
+        ]
+        self.assertEqual(batch.tolist(), scalar)
+
+    def test_shouldBreakTiesByEvaluationOrder(self):
+        """Debe conservar la evaluación que aparece primero cuando hay empate de nota."""
+        engine = EvaluationRuleEngine(self.calculator, [DropLowestRule(1)])
+        weights = engine.effective_weights([[12.0, 10.0, 10.0, 18.0]], [0.1, 0.2, 0.3, 0.4])
+        np.testing.assert_allclose(weights[0], [0.1 / 0.7, 0.2 / 0.7, 0.0, 0.4 / 0.7])
+        self.assertEqual(KeepBestRule(2).keep_mask([10.0, 10.0, 10.0]), [True, True, False])
+
+    def test_shouldRejectInvalidRules(self):
+        """Debe rechazar reglas superpuestas, descartes imposibles y columnas inexistentes."""
+        with self.assertRaises(ValueError):
+            EvaluationRuleEngine(self.calculator, [DropLowestRule(1, [0, 1]), KeepBestRule(1, [1, 2])])
+        with self.assertRaises(ValueError):
+            EvaluationRuleEngine(self.calculator, [DropLowestRule(3)]).effective_weights([[10.0, 12.0, 14.0]], [0.3, 0.3, 0.4])
+        with self.assertRaises(ValueError):
+            EvaluationRuleEngine(self.calculator, [DropLowestRule(1, [5])]).effective_weights([[10.0, 12.0]], [0.5, 0.5])
+        with self.assertRaises(ValueError):
+            DropLowestRule(0)
+
+
+class TestGradeCategories(unittest.TestCase):
+    """Tests para el temario jerárquico de categorías."""
+
+    def setUp(self):
+        """Configuración inicial para cada test."""
+        self.syllabus = Syllabus(GradeCategory("Curso", children=[
+            GradeCategory("Laboratorios", 0.3, [GradeCategory(f"Lab {i}", 1 / 12) for i in range(1, 13)]),
+            GradeCategory("Exámenes", 0.5, [GradeCategory("Parcial 1", 0.25), GradeCategory("Parcial 2", 0.25),
+                                            GradeCategory("Final", 0.5)]),
+            GradeCategory("Proyecto", 0.2)
+        ]))
+        self.calculator = GradeCalculator(AttendancePolicy(3.0), ExtraPointsPolicy(True, 2.0), max_evaluations=20)
+        self.categories = CategoryGradeCalculator(self.calculator, self.syllabus)
+        rng = np.random.default_rng(22)
+        self.grades = np.round(rng.uniform(0, 20, (400, 16)), 2)
+        self.attendance = rng.random(400) < 0.8
+
+    def test_shouldReduceNestedCategories(self):
+        """Debe calcular cada categoría como promedio ponderado de sus hijos."""
+        grades = {f"Lab {i}": 12.0 for i in range(1, 13)}
+        grades.update({"Parcial 1": 10.0, "Parcial 2": 14.0, "Final": 16.0, "Proyecto": 18.0})
+        student = self.categories.student(grades, True)
+
+        self.assertEqual(student.category_scores(), {"Curso": 14.2, "Laboratorios": 12.0, "Exámenes": 14.0})
+        self.assertEqual(student.final_grade(), 16.2)
+        self.assertEqual(student.set_attendance(False), 13.2)
+
+    def test_shouldMatchFlatCalculatorWithSingleLevel(self):
+        """Debe dar la misma nota que el calculador plano si el temario tiene un solo nivel."""
+        flat = CategoryGradeCalculator(self.calculator, Syllabus(GradeCategory("Curso", children=[
+            GradeCategory("Parcial", 0.3), GradeCategory("Práctica", 0.3), GradeCategory("Final", 0.4)
+        ])))
+        evaluations = [Evaluation("Parcial", 15.0, 0.3), Evaluation("Práctica", 16.5, 0.3), Evaluation("Final", 14.0, 0.4)]
+
+        self.assertEqual(flat.calculate_final_grade({"Parcial": 15.0, "Práctica": 16.5, "Final": 14.0}, False),
+                         self.calculator.calculate_final_grade(evaluations, False))
+
+    def test_shouldRecomputeOnlyThePathToTheRoot(self):
+        """Debe recalcular solo los ancestros de la evaluación modificada."""
+        student = self.categories.student(dict(zip(self.syllabus.evaluation_names, self.grades[0].tolist())), True)
+        exams_score = student.score("Exámenes")
+        recomputations = student.recomputations
+
+        final_grade = student.set_grade("Lab 3", 20.0)
+
+        self.assertEqual(student.recomputations - recomputations, 2)
+        self.assertEqual(student.score("Exámenes"), exams_score)
+        row = self.grades[:1].copy()
+        row[0, self.syllabus.evaluation_names.index("Lab 3")] = 20.0
+        self.assertEqual(final_grade, self.categories.calculate_final_grades_batch(row, [True])[0])
+
+    def test_shouldMatchScalarPathInBatch(self):
+        """Debe dar las mismas notas por lotes que estudiante por estudiante."""
+        for calculator in (self.calculator, FixedPointGradeCalculator(AttendancePolicy(3.0), ExtraPointsPolicy(True, 2.0),
+                                                                     max_evaluations=20)):
+            categories = CategoryGradeCalculator(calculator, self.syllabus)
+            batch = categories.calculate_final_grades_batch(self.grades, self.attendance)
+            scalar = [categories.calculate_final_grade(dict(zip(self.syllabus.evaluation_names, row)), bool(attendance))
+                      for row, attendance in zip(self.grades.tolist(), self.attendance)]
+            self.assertEqual(batch.tolist(), scalar)
+
+        scores = self.categories.category_scores_batch(self.grades)
+        self.assertEqual(scores["Laboratorios"][0],
+                         self.categories.student(dict(zip(self.syllabus.evaluation_names, self.grades[0].tolist())),
+                                                 True).category_scores()["Laboratorios"])
+
+    def test_shouldRejectInvalidSyllabusAndGrades(self):
+        """Debe rechazar temarios y notas inválidas."""
+        with self.assertRaises(ValueError):
+            Syllabus(GradeCategory("Curso", children=[GradeCategory("A", 0.5), GradeCategory("A", 0.5)]))
+        with self.assertRaises(ValueError):
+            Syllabus(GradeCategory("Curso"))
+        with self.assertRaises(ValueError):
+            GradeCategory("Lab", 1.5)
+        with self.assertRaises(ValueError):
+            CategoryGradeCalculator(GradeCalculator(AttendancePolicy(), ExtraPointsPolicy(False)), self.syllabus)
+        with self.assertRaises(ValueError):
+            self.categories.student({"Proyecto": 15.0}, True)
+
+        student = self.categories.student(dict(zip(self.syllabus.evaluation_names, self.grades[0].tolist())), True)
+        with self.assertRaises(ValueError):
+            student.set_grade("Exámenes", 15.0)
+        with self.assertRaises(ValueError):
+            student.set_grade("Final", 21.0)
+        with self.assertRaises(ValueError):
+            self.categories.calculate_final_grades_batch(self.grades[:, :15], self.attendance)
+
+
+class TestReportGenerator(unittest.TestCase):
+    """Tests para la generación masiva de reportes por estudiante."""
+
+    def setUp(self):
+        """Configuración inicial para cada test."""
+        self.calculator = GradeCalculator(AttendancePolicy(3.0), ExtraPointsPolicy(True, 2.0))
+        self.names = ["Parcial", "Práctica", "Final"]
+        self.weights = np.array([0.3, 0.3, 0.4])
+        rng = np.random.default_rng(23)
+        self.grades = np.round(rng.uniform(0, 20, (250, 3)), 2)
+        self.attendance = rng.random(250) < 0.8
+        self.student_ids = [f"S{index:04d}" for index in range(250)]
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Elimina el directorio temporal."""
+        for name in os.listdir(self.directory):
+            os.remove(os.path.join(self.directory, name))
+        os.rmdir(self.directory)
+
+    def _scalar_report(self, index: int, report_format: str = "txt") -> str:
+        evaluations = [Evaluation(name, grade, weight)
+                       for name, grade, weight in zip(self.names, self.grades[index].tolist(), self.weights.tolist())]
+        details = self.calculator.get_calculation_details(evaluations, bool(self.attendance[index]))
+        return render_report(self.student_ids[index], details, report_format)
+
+    def test_shouldRenderTheSameSheetAsTheInteractiveApp(self):
+        """Debe renderizar la misma hoja que imprime la aplicación interactiva."""
+        evaluations = [Evaluation("Parcial 1", 15.0, 0.3), Evaluation("Final", 14.0, 0.7)]
+        details = self.calculator.get_calculation_details(evaluations, False)
+        report = render_report("A001", details)
+
+        self.assertIn("RESULTADOS - ESTUDIANTE: A001\n", report)
+        self.assertIn("1. Parcial 1\n   Nota: 15.00\n   Peso: 30.0%\n   Aporte: 4.50\n", report)
+        self.assertIn("Penalizacion (Asistencia):   3.00 (-)\n", report)
+        self.assertIn("Puntos Extra:                2.00 (+)\n", report)
+        self.assertIn("NOTA FINAL:                 13.30\n", report)
+        self.assertIn("- Asistencia minima cumplida: No\n", report)
+
+    def test_shouldWriteConcatenatedReportsLikeTheScalarPath(self):
+        """Debe escribir en un solo archivo las mismas hojas que la ruta escalar."""
+        path = os.path.join(self.directory, "reportes.txt")
+        generator = ReportGenerator(self.calculator, "txt", chunk_size=64)
+
+        pages = generator.write(path, self.student_ids, self.names, self.grades, self.weights, self.attendance)
+
+        self.assertEqual(pages, 250)
+        with open(path, encoding="utf-8") as report_file:
+            self.assertEqual(report_file.read(), "".join(self._scalar_report(index) for index in range(250)))
+
+    def test_shouldWriteOneArchiveMemberPerStudent(self):
+        """Debe escribir un archivo por estudiante dentro del zip."""
+        path = os.path.join(self.directory, "reportes.zip")
+        generator = ReportGenerator(self.calculator, "html", chunk_size=100)
+
+        generator.write(path, self.student_ids, self.names, self.grades, self.weights, self.attendance, archive=True)
+
+        with zipfile.ZipFile(path) as archive:
+            self.assertEqual(archive.namelist(), [f"{student_id}.html" for student_id in self.student_ids])
+            self.assertEqual(archive.read("S0007.html").decode("utf-8"), self._scalar_report(7, "html"))
+
+    def test_shouldWriteCsvWithOneRowPerStudent(self):
+        """Debe escribir un CSV con encabezado y una fila por estudiante, escapando los campos."""
+        path = os.path.join(self.directory, "reportes.csv")
+        student_ids = ["A,1"] + self.student_ids[1:]
+        ReportGenerator(self.calculator, "csv").write(path, student_ids, self.names, self.grades, self.weights,
+                                                      self.attendance)
+
+        with open(path, encoding="utf-8", newline="") as report_file:
+            rows = list(csv.reader(report_file))
+        self.assertEqual(rows[0][:4], ["student_id", "Parcial", "Práctica", "Final"])
+        self.assertEqual(len(rows), 251)
+        self.assertEqual(rows[1][0], "A,1")
+        finals = self.calculator.calculate_final_grades_batch(self.grades, self.weights, self.attendance)
+        self.assertEqual([float(row[7]) for row in rows[1:]], finals.tolist())
+
+    def test_shouldRenderGradebookWithPerStudentWeights(self):
+        """Debe renderizar un libro de notas binario con pesos por estudiante."""
+        gradebook_path = os.path.join(self.directory, "notas.grdb")
+        weights = np.tile(self.weights, (250, 1))
+        weights[0] = [0.5, 0.25, 0.25]
+        with BinaryGradebookWriter(gradebook_path, self.names) as writer:
+            writer.write_batch(self.student_ids, self.grades, weights, self.attendance)
+
+        path = os.path.join(self.directory, "reportes.html")
+        with BinaryGradebook(gradebook_path) as gradebook:
+            pages = ReportGenerator(self.calculator, "html").write_gradebook(gradebook, path)
+
+        self.assertEqual(pages, 250)
+        with open(path, encoding="utf-8") as report_file:
+            content = report_file.read()
+        self.assertTrue(content.startswith("<!DOCTYPE html>"))
+        self.assertIn("<td>50.0%</td>", content)
+        self.assertEqual(content.count('<section class="reporte">'), 250)
+
+    def test_shouldEscapeNamesAndRejectInvalidOptions(self):
+        """Debe escapar nombres en la plantilla y rechazar opciones inválidas."""
+        template = ReportTemplate("html", ["<Lab {1}>"], [1.0])
+        self.assertIn("&lt;Lab {1}&gt;", template.page_format.format(*range(11)))
+        with self.assertRaises(ValueError):
+            ReportTemplate("pdf", self.names)
+        with self.assertRaises(ValueError):
+            ReportGenerator(self.calculator, "txt", max_workers=0)
+        with self.assertRaises(ValueError):
+            ReportGenerator(self.calculator).write(os.path.join(self.directory, "r.txt"), self.student_ids[:3],
+                                                   self.names, self.grades, self.weights, self.attendance)
+
+
+class TestGradeEventLog(unittest.TestCase):
+    """Tests para el log de eventos de notas con instantáneas."""
+
+    def setUp(self):
+        """Configuración inicial para cada test."""
+        self.calculator = GradeCalculator(AttendancePolicy(3.0), ExtraPointsPolicy(False))
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "grades.log")
+        self.log = GradeEventLog(self.path, self.calculator, snapshot_interval=50)
+
+    def tearDown(self):
+        """Elimina el directorio temporal."""
+        self.log.close()
+        shutil.rmtree(self.directory)
+
+    def _fill(self, students: int = 20, updates: int = 150) -> None:
+        rng = random.Random(24)
+        for student in range(students):
+            for name in ("Parcial", "Práctica", "Final"):
+                self.log.add_evaluation(f"S{student}", name, round(rng.uniform(0, 20), 2), 0.3 if name != "Final" else 0.4)
+        for index in range(updates):
+            student_id = f"S{rng.randrange(students)}"
+            if index == updates // 2:
+                self.log.set_policy(ExtraPointsPolicy(True, 1.5))
+            elif rng.random() < 0.7:
+                self.log.correct_grade(student_id, rng.choice(["Parcial", "Práctica", "Final"]),
+                                       round(rng.uniform(0, 20), 2))
+            else:
+                self.log.set_attendance(student_id, rng.random() < 0.7)
+
+    def _expected(self, until_sequence: int) -> dict:
+        calculator = self.calculator
+        evaluations, attendance = {}, {}
+        for event in self.log.iter_events():
+            if event.sequence > until_sequence:
+                break
+            if event.kind == POLICY_CHANGED:
+                calculator = GradeCalculator(calculator.attendance_policy, event.value) \
+                    if isinstance(event.value, ExtraPointsPolicy) else GradeCalculator(event.value, calculator.extra_points_policy)
+            elif event.kind == EVALUATION_ADDED:
+                evaluations.setdefault(event.student_id, {})[event.name] = Evaluation(event.name, *event.value)
+            elif event.kind == GRADE_CORRECTED:
+                previous = evaluations[event.student_id][event.name]
+                evaluations[event.student_id][event.name] = Evaluation(event.name, event.value, previous.weight)
+            else:
+                attendance[event.student_id] = event.value
+        return {student_id: calculator.calculate_final_grade(list(student.values()), attendance.get(student_id, True))
+                for student_id, student in evaluations.items()}
+
+    def test_shouldRebuildFinalGradesAtAnySequence(self):
+        """Debe reconstruir las notas finales en cualquier punto del historial."""
+        self._fill()
+
+        self.assertEqual(self.log.final_grades(), self._expected(len(self.log)))
+        for until in (2, 40, 100, 175, len(self.log)):
+            self.assertEqual(self.log.replay(until_sequence=until).final_grades(), self._expected(until))
+            self.assertEqual(self.log.replay(until_sequence=until, from_snapshot=False).final_grades(),
+                             self._expected(until))
+
+    def test_shouldRecomputeOnlyStudentsTouchedAfterTheSnapshot(self):
+        """Debe partir de la instantánea y recalcular solo los estudiantes tocados después."""
+        self._fill(students=20, updates=30)
+        self.log.snapshot()
+        snapshot_sequence = len(self.log)
+        self.log.correct_grade("S3", "Final", 20.0)
+        self.log.set_attendance("S7", False)
+
+        state = self.log.replay()
+
+        self.assertEqual(state.sequence, snapshot_sequence + 2)
+        self.assertEqual(state.recomputed, 2)
+        self.assertEqual(state.final_grades(), self._expected(len(self.log)))
+        self.assertEqual(len(self.log.replay(until_sequence=snapshot_sequence - 1, from_snapshot=False).students), 20)
+
+    def test_shouldRecoverStateAndDropTornTailOnReopen(self):
+        """Debe recuperar el estado al reabrir y descartar un registro final incompleto."""
+        self._fill()
+        final_grades = self.log.final_grades()
+        self.log.close()
+        with open(self.path, "ab") as log_file:
+            log_file.write(b"\x20\x00\x00\x00incompleto")
+
+        self.log = GradeEventLog(self.path, GradeCalculator(AttendancePolicy(), ExtraPointsPolicy(False)))
+
+        self.assertEqual(self.log.final_grades(), final_grades)
+        self.log.add_evaluation("S99", "Parcial", 12.0, 1.0)
+        # Las políticas vienen del log (penalización 3.0, puntos extra 1.5), no del calculador recibido.
+        self.log.set_attendance("S99", False)
+        self.assertEqual(self.log.final_grade("S99"), 10.5)
+        self.assertEqual([event.kind for event in self.log.iter_events(len(self.log) - 1)],
+                         [EVALUATION_ADDED, ATTENDANCE_CHANGED])
+
+    def test_shouldRefuseToTruncateCorruptionInTheMiddle(self):
+        """Un registro corrupto en medio del log debe rechazarse sin borrar los eventos posteriores."""
+        self._fill(students=5, updates=20)
+        self.log.close()
+        size = os.path.getsize(self.path)
+        with open(self.path, "r+b") as log_file:
+            log_file.seek(size // 2)
+            byte = log_file.read(1)
+            log_file.seek(size // 2)
+            log_file.write(bytes([byte[0] ^ 0xFF]))
+
+        with self.assertRaises(ValueError):
+            GradeEventLog(self.path, self.calculator)
+        self.assertEqual(os.path.getsize(self.path), size)
+
+    def test_shouldRefuseToTruncateWhenAMiddleLengthFieldIsCorrupt(self):
+        """Un largo dañado en medio del log no debe tomarse como escritura interrumpida."""
+        self._fill(students=5, updates=20)
+        self.log.close()
+        size = os.path.getsize(self.path)
+        with open(self.path, "r+b") as log_file:
+            # Cabecera de 6 bytes; cada registro lleva largo y CRC (4 + 4 bytes) antes de su cuerpo.
+            offset = 6
+            for _ in range(10):
+                log_file.seek(offset)
+                offset += 8 + int.from_bytes(log_file.read(4), "little")
+            log_file.seek(offset)
+            length = int.from_bytes(log_file.read(4), "little")
+            log_file.seek(offset)
+            log_file.write((length | 0x10000).to_bytes(4, "little"))
+
+        with self.assertRaises(ValueError):
+            GradeEventLog(self.path, self.calculator)
+        self.assertEqual(os.path.getsize(self.path), size)
+
+    def test_shouldKeepAnOrderedAuditTrail(self):
+        """Debe conservar todos los eventos en orden, con marcas de tiempo que no retroceden."""
+        self.log.add_evaluation("A1", "Parcial", 15.0, 0.5)
+        self.log.correct_grade("A1", "Parcial", 17.0)
+        self.log.set_attendance("A1", False)
+        events = list(self.log.iter_events())
+
+        self.assertEqual([event.sequence for event in events], [1, 2, 3, 4, 5])
+        self.assertEqual([event.kind for event in events],
+                         [POLICY_CHANGED, POLICY_CHANGED, EVALUATION_ADDED, GRADE_CORRECTED, ATTENDANCE_CHANGED])
+        self.assertEqual(events[0].value, AttendancePolicy(3.0))
+        self.assertEqual(events[3].value, 17.0)
+        self.assertTrue(all(a.timestamp <= b.timestamp for a, b in zip(events, events[1:])))
+        self.assertGreaterEqual(self.log.replay(until_timestamp=events[2].timestamp).sequence, 3)
+
+    def test_shouldRejectInvalidEvents(self):
+        """Debe rechazar eventos inválidos sin escribirlos en el log."""
+        self.log.add_evaluation("A1", "Parcial", 15.0, 0.5)
+        size = os.path.getsize(self.path)
+
+        with self.assertRaises(ValueError):
+            self.log.add_evaluation("A1", "Parcial", 12.0, 0.5)
+        with self.assertRaises(ValueError):
+            self.log.add_evaluation("A1", "Final", 25.0, 0.5)
+        with self.assertRaises(ValueError):
+            self.log.correct_grade("A2", "Parcial", 12.0)
+        with self.assertRaises(ValueError):
+            self.log.set_attendance("A1", 0.5)
+        with self.assertRaises(ValueError):
+            self.log.set_policy("sin política")
+
+        self.log.set_policy(AttendanceCurvePolicy([(0.0, 4.0), (1.0, 0.0)]))
+        self.log.set_attendance("A1", 0.5)
+        with self.assertRaises(ValueError):
+            self.log.set_policy(AttendancePolicy(3.0))
+        self.assertEqual(self.log.final_grade("A1"), 5.5)
+        self.assertGreater(os.path.getsize(self.path), size)
+        self.assertEqual(len(self.log), 5)
+
+
+class TestGradeUncertaintySimulator(unittest.TestCase):
+    """Tests para la simulación Monte Carlo de probabilidad de aprobación."""
+
+    def setUp(self):
+        """Configuración inicial para cada test."""
+        self.calculator = GradeCalculator(AttendancePolicy(3.0), ExtraPointsPolicy(True, 2.0))
+        rng = np.random.default_rng(25)
+        self.grades = np.round(rng.uniform(5, 17, (400, 4)), 2)
+        self.weights = np.array([0.2, 0.3, 0.2, 0.3])
+        self.attendance = rng.random(400) < 0.8
+
+    def _full_path(self, simulator: GradeUncertaintySimulator) -> GradeUncertaintySimulator:
+        # Fuerza que cada ensayo pase por el calculador en lugar de los umbrales.
+        simulator.THRESHOLD_MIN_TRIALS = 10 ** 9
+        return simulator
+
+    def test_shouldMatchCalculatorWithoutPerturbation(self):
+        """Sin perturbación cada estudiante aprueba siempre o nunca, como con el calculador."""
+        expected = self.calculator.calculate_final_grades_batch(self.grades, self.weights, self.attendance) >= 11.0
+
+        result = GradeUncertaintySimulator(self.calculator).simulate(self.grades, self.weights, self.attendance,
+                                                                     trials=200, seed=1)
+
+        np.testing.assert_array_equal(result.baseline_passed, expected)
+        np.testing.assert_array_equal(result.pass_probability, expected.astype(float))
+        np.testing.assert_array_equal(result.pass_rates, np.full(200, expected.mean()))
+
+    def test_shouldMatchTrialByTrialCalculation(self):
+        """Los umbrales por estudiante deben dar exactamente lo mismo que calcular cada ensayo."""
+        calculators = [
+            self.calculator,
+            GradeCalculator(AttendancePolicy(3.0), TieredExtraPointsPolicy([(10.0, 0.5), (10.9, 1.0)])),
+            FixedPointGradeCalculator(AttendancePolicy(2.5), ExtraPointsPolicy(True, 0.75)),
+        ]
+        for calculator in calculators:
+            options = dict(trials=300, grade_shift=[0.0, 0.5, 0.0, 0.0], grade_spread=[0.0, 1.0, 0.0, 2.0],
+                           attendance_flip=0.1, seed=3)
+            fast = GradeUncertaintySimulator(calculator).simulate(self.grades, self.weights, self.attendance, **options)
+            full = self._full_path(GradeUncertaintySimulator(calculator)).simulate(
+                self.grades, self.weights, self.attendance, **options)
+
+            np.testing.assert_array_equal(fast.pass_probability, full.pass_probability)
+            np.testing.assert_array_equal(fast.pass_rates, full.pass_rates)
+
+    def test_shouldNotDependOnChunkSize(self):
+        """Con la misma semilla el resultado no debe depender del tamaño de tramo."""
+        options = dict(trials=150, grade_spread=1.5, distribution="uniform", attendance_flip=0.05, seed=9)
+
+        whole = GradeUncertaintySimulator(self.calculator).simulate(self.grades, self.weights, self.attendance, **options)
+        chunked = GradeUncertaintySimulator(self.calculator, chunk_size=1000).simulate(
+            self.grades, self.weights, self.attendance, **options)
+        other_seed = GradeUncertaintySimulator(self.calculator).simulate(
+            self.grades, self.weights, self.attendance, **dict(options, seed=10))
+
+        np.testing.assert_array_equal(whole.pass_probability, chunked.pass_probability)
+        np.testing.assert_array_equal(whole.pass_rates, chunked.pass_rates)
+        self.assertFalse(np.array_equal(whole.pass_rates, other_seed.pass_rates))
+
+    def test_shouldEstimatePassProbabilityForEachStudent(self):
+        """Debe estimar la probabilidad de aprobar de cada estudiante y la distribución de la tasa de aprobación."""
+        grades = [[20.0, 20.0], [0.0, 0.0], [11.0, 11.0]]
+        attendance = np.array([True, True, True])
+
+        result = GradeUncertaintySimulator(self.calculator).simulate(grades, [0.5, 0.5], attendance, trials=2000,
+                                                                     grade_spread=[0.0, 2.0], seed=5)
+
+        self.assertEqual(result.pass_probability[0], 1.0)
+        self.assertEqual(result.pass_probability[1], 0.0)
+        # 11.0 + 2.0 de puntos extra: solo pierde si la evaluación perturbada baja más de 4 puntos (2 sigmas).
+        self.assertAlmostEqual(result.pass_probability[2], 0.977, delta=0.015)
+        self.assertEqual(result.pass_rates.shape, (2000,))
+        self.assertAlmostEqual(result.pass_rates.mean(), result.pass_probability.mean())
+
+    def test_shouldPerturbAttendanceRates(self):
+        """Con proporciones de asistencia debe perturbarlas y recalcular la penalización por ensayo."""
+        calculator = GradeCalculator(AttendanceCurvePolicy([(0.5, 6.0), (0.9, 0.0)]), ExtraPointsPolicy(False))
+        rates = np.array([0.9, 0.9])
+        grades = [[13.0], [18.0]]
+
+        stable = GradeUncertaintySimulator(calculator).simulate(grades, [1.0], rates, trials=500, seed=2)
+        noisy = GradeUncertaintySimulator(calculator).simulate(grades, [1.0], rates, trials=500,
+                                                               attendance_spread=0.2, seed=2)
+
+        np.testing.assert_array_equal(stable.pass_probability, [1.0, 1.0])
+        self.assertLess(noisy.pass_probability[0], 1.0)
+        self.assertEqual(noisy.pass_probability[1], 1.0)
+
+    def test_shouldRejectInvalidParameters(self):
+        """Debe rechazar parámetros de simulación inválidos."""
+        simulator = GradeUncertaintySimulator(self.calculator)
+        arguments = (self.grades, self.weights, self.attendance)
+
+        with self.assertRaises(ValueError):
+            GradeUncertaintySimulator(self.calculator, pass_grade=25.0)
+        with self.assertRaises(ValueError):
+            GradeUncertaintySimulator(self.calculator, chunk_size=0)
+        with self.assertRaises(ValueError):
+            simulator.simulate(*arguments, trials=0)
+        with self.assertRaises(ValueError):
+            simulator.simulate(*arguments, trials=10, distribution="cauchy")
+        with self.assertRaises(ValueError):
+            simulator.simulate(*arguments, trials=10, grade_spread=-1.0)
+        with self.assertRaises(ValueError):
+            simulator.simulate(*arguments, trials=10, grade_spread=[1.0, 2.0])
+        with self.assertRaises(ValueError):
+            simulator.simulate(*arguments, trials=10, attendance_flip=1.5)
+        with self.assertRaises(ValueError):
+            simulator.simulate(*arguments, trials=10, attendance_spread=0.1)
+
+
 def run_tests():
     """Ejecuta todos los tests y muestra el reporte."""
     loader = unittest.TestLoader()
@@ -314,6 +2473,32 @@ def run_tests():
     suite.addTests(loader.loadTestsFromTestCase(TestExtraPointsPolicy))
     suite.addTests(loader.loadTestsFromTestCase(TestGradeCalculator))
     suite.addTests(loader.loadTestsFromTestCase(TestGradeCalculatorIntegration))
+    suite.addTests(loader.loadTestsFromTestCase(TestGradeCalculatorBatch))
+    suite.addTests(loader.loadTestsFromTestCase(TestCalculationResult))
+    suite.addTests(loader.loadTestsFromTestCase(TestEvaluationSet))
+    suite.addTests(loader.loadTestsFromTestCase(TestBatchGradeProcessor))
+    suite.addTests(loader.loadTestsFromTestCase(TestParallelGradeCalculator))
+    suite.addTests(loader.loadTestsFromTestCase(TestPerformanceSuite))
+    suite.addTests(loader.loadTestsFromTestCase(TestGradeService))
+    suite.addTests(loader.loadTestsFromTestCase(TestCachedGradeCalculator))
+    suite.addTests(loader.loadTestsFromTestCase(TestStudentGradeLedger))
+    suite.addTests(loader.loadTestsFromTestCase(TestRequiredGradeSolver))
+    suite.addTests(loader.loadTestsFromTestCase(TestValidatedEvaluations))
+    suite.addTests(loader.loadTestsFromTestCase(TestBulkValidator))
+    suite.addTests(loader.loadTestsFromTestCase(TestPolicyEngine))
+    suite.addTests(loader.loadTestsFromTestCase(TestGradeStore))
+    suite.addTests(loader.loadTestsFromTestCase(TestBinaryGradebook))
+    suite.addTests(loader.loadTestsFromTestCase(TestInstrumentation))
+    suite.addTests(loader.loadTestsFromTestCase(TestCohortStatistics))
+    suite.addTests(loader.loadTestsFromTestCase(TestFixedPointGradeCalculator))
+    suite.addTests(loader.loadTestsFromTestCase(TestCalculationDaemon))
+    suite.addTests(loader.loadTestsFromTestCase(TestGradeCurve))
+    suite.addTests(loader.loadTestsFromTestCase(TestGradeRanking))
+    suite.addTests(loader.loadTestsFromTestCase(TestEvaluationRules))
+    suite.addTests(loader.loadTestsFromTestCase(TestGradeCategories))
+    suite.addTests(loader.loadTestsFromTestCase(TestReportGenerator))
+    suite.addTests(loader.loadTestsFromTestCase(TestGradeEventLog))
+    suite.addTests(loader.loadTestsFromTestCase(TestGradeUncertaintySimulator))
 
     # Ejecutar tests con verbosidad
     runner = unittest.TextTestRunner(verbosity=2)
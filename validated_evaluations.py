@@ -0,0 +1,23 @@
+from typing import Iterable
+from evaluation import Evaluation
+from evaluation_set import EvaluationSet
+
+
+class ValidatedEvaluations(tuple):
+    __slots__ = ()
+
+    def __new__(cls, examsStudents: Iterable[Evaluation]):
+        if isinstance(examsStudents, ValidatedEvaluations):
+            return examsStudents
+        evaluations = super().__new__(cls, examsStudents)
+        if len(evaluations) == 0:
+            raise ValueError("Debe haber al menos una evaluación")
+        for evaluation in evaluations:
+            if not isinstance(evaluation, Evaluation):
+                raise ValueError("Todos los elementos deben ser instancias de Evaluation")
+        return evaluations
+
+    @classmethod
+    def from_arrays(cls, names: Iterable[str], grades: Iterable[float], weights: Iterable[float]) -> "ValidatedEvaluations":
+        # Construye la colección desde columnas con los mismos chequeos vectorizados de EvaluationSet.
+        return cls(EvaluationSet(names, grades, weights))